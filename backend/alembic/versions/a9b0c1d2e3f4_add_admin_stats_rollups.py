@@ -0,0 +1,43 @@
+"""add admin stats rollups
+
+Revision ID: a9b0c1d2e3f4
+Revises: f4b5c6d7e8f9
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "a9b0c1d2e3f4"
+down_revision: str = "f4b5c6d7e8f9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Refreshed by torale.scheduler.stats; read by the admin dashboard
+    op.execute("""
+        CREATE TABLE execution_stats_hourly (
+            hour TIMESTAMP WITH TIME ZONE PRIMARY KEY,
+            total_executions INTEGER NOT NULL DEFAULT 0,
+            failed_executions INTEGER NOT NULL DEFAULT 0,
+            notifications INTEGER NOT NULL DEFAULT 0,
+            refreshed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+        )
+    """)
+    op.execute("""
+        CREATE TABLE platform_stats (
+            id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+            total_tasks INTEGER NOT NULL DEFAULT 0,
+            triggered_tasks INTEGER NOT NULL DEFAULT 0,
+            popular_queries JSONB NOT NULL DEFAULT '[]'::jsonb,
+            refreshed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS platform_stats")
+    op.execute("DROP TABLE IF EXISTS execution_stats_hourly")
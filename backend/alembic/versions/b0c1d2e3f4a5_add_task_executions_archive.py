@@ -0,0 +1,47 @@
+"""add task_executions archive
+
+Revision ID: b0c1d2e3f4a5
+Revises: a9b0c1d2e3f4
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "b0c1d2e3f4a5"
+down_revision: str = "a9b0c1d2e3f4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Cold storage for executions past retention (torale.scheduler.retention).
+    # Partitioned by month so expiring old history is a DROP TABLE, not a
+    # DELETE; the job creates partitions before moving rows into them.
+    op.execute("""
+        CREATE TABLE task_executions_archive (
+            id UUID NOT NULL,
+            task_id UUID NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+            status TEXT NOT NULL,
+            started_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            completed_at TIMESTAMP WITH TIME ZONE,
+            notification TEXT,
+            error_message TEXT,
+            error_category TEXT,
+            retry_count INTEGER NOT NULL DEFAULT 0,
+            result JSONB,
+            grounding_sources JSONB,
+            archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (id, started_at)
+        ) PARTITION BY RANGE (started_at)
+    """)
+    op.execute("""
+        CREATE INDEX idx_task_executions_archive_task_started
+        ON task_executions_archive (task_id, started_at DESC)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS task_executions_archive")
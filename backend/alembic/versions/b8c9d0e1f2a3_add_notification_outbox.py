@@ -0,0 +1,45 @@
+"""add notification outbox
+
+Revision ID: b8c9d0e1f2a3
+Revises: d7e8f9a0b1c2
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "b8c9d0e1f2a3"
+down_revision: str = "d7e8f9a0b1c2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Written in the execution's finalizing transaction, drained by the
+    # notification dispatcher (torale.scheduler.outbox)
+    op.execute("""
+        CREATE TABLE notification_outbox (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            task_id UUID NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+            execution_id UUID NOT NULL REFERENCES task_executions(id) ON DELETE CASCADE,
+            user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            channel TEXT NOT NULL CHECK (channel IN ('email', 'webhook')),
+            payload JSONB NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            last_error TEXT,
+            processed_at TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+        )
+    """)
+    op.execute("""
+        CREATE INDEX idx_notification_outbox_pending
+        ON notification_outbox (next_attempt_at)
+        WHERE processed_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS notification_outbox")
@@ -0,0 +1,30 @@
+"""index processed notification outbox rows
+
+Revision ID: c1d2e3f4a5b6
+Revises: b0c1d2e3f4a5
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "c1d2e3f4a5b6"
+down_revision: str = "b0c1d2e3f4a5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Lets the retention job find processed rows to prune without scanning
+    # the whole outbox (torale.scheduler.outbox.prune_processed_notifications)
+    op.execute("""
+        CREATE INDEX idx_notification_outbox_processed
+        ON notification_outbox (processed_at)
+        WHERE processed_at IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_notification_outbox_processed")
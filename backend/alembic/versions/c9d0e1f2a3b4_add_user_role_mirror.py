@@ -0,0 +1,35 @@
+"""add user role mirror
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "c9d0e1f2a3b4"
+down_revision: str = "b8c9d0e1f2a3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Mirror of Clerk publicMetadata.role. role_synced_at stays NULL until the
+    # role has been read from Clerk (sync-user, admin role change or the
+    # verify_role fallback), so NULL role with a sync time means "no role".
+    op.execute("""
+        ALTER TABLE users
+            ADD COLUMN role TEXT CHECK (role IN ('admin', 'developer')),
+            ADD COLUMN role_synced_at TIMESTAMP WITH TIME ZONE
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE users
+            DROP COLUMN IF EXISTS role_synced_at,
+            DROP COLUMN IF EXISTS role
+    """)
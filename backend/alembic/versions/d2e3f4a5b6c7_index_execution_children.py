@@ -0,0 +1,34 @@
+"""index webhook deliveries and outbox rows by execution
+
+Revision ID: d2e3f4a5b6c7
+Revises: c1d2e3f4a5b6
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "d2e3f4a5b6c7"
+down_revision: str = "c1d2e3f4a5b6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # The retention job skips executions that still have deliveries or outbox
+    # rows (torale.scheduler.retention.archive_batch)
+    op.execute("""
+        CREATE INDEX idx_webhook_deliveries_execution_id
+        ON webhook_deliveries (execution_id)
+    """)
+    op.execute("""
+        CREATE INDEX idx_notification_outbox_execution_id
+        ON notification_outbox (execution_id)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_notification_outbox_execution_id")
+    op.execute("DROP INDEX IF EXISTS idx_webhook_deliveries_execution_id")
@@ -0,0 +1,59 @@
+"""add task execution counters
+
+Revision ID: d7e8f9a0b1c2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "d7e8f9a0b1c2"
+down_revision: str = "f6a7b8c9d0e1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Maintained by the scheduler in the same transaction as the execution row
+    op.execute("""
+        ALTER TABLE tasks
+            ADD COLUMN success_count INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN notification_count INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN failure_count INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN last_success_at TIMESTAMP WITH TIME ZONE
+    """)
+    # Backfill from history without touching updated_at
+    op.execute("ALTER TABLE tasks DISABLE TRIGGER update_tasks_updated_at")
+    op.execute("""
+        UPDATE tasks t
+        SET success_count = s.success_count,
+            notification_count = s.notification_count,
+            failure_count = s.failure_count,
+            last_success_at = s.last_success_at
+        FROM (
+            SELECT task_id,
+                   COUNT(*) FILTER (WHERE status = 'success') AS success_count,
+                   COUNT(*) FILTER (
+                       WHERE status = 'success' AND notification IS NOT NULL
+                   ) AS notification_count,
+                   COUNT(*) FILTER (WHERE status = 'failed') AS failure_count,
+                   MAX(completed_at) FILTER (WHERE status = 'success') AS last_success_at
+            FROM task_executions
+            GROUP BY task_id
+        ) s
+        WHERE t.id = s.task_id
+    """)
+    op.execute("ALTER TABLE tasks ENABLE TRIGGER update_tasks_updated_at")
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE tasks
+            DROP COLUMN IF EXISTS last_success_at,
+            DROP COLUMN IF EXISTS failure_count,
+            DROP COLUMN IF EXISTS notification_count,
+            DROP COLUMN IF EXISTS success_count
+    """)
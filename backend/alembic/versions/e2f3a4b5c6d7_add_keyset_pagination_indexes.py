@@ -0,0 +1,59 @@
+"""add keyset pagination indexes
+
+Revision ID: e2f3a4b5c6d7
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "e2f3a4b5c6d7"
+down_revision: str = "c9d0e1f2a3b4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (name, definition) for each keyset order served by an endpoint
+INDEXES = [
+    (
+        "idx_tasks_public_created_keyset",
+        "tasks (created_at DESC, id DESC) WHERE is_public = true",
+    ),
+    (
+        "idx_tasks_public_view_count_keyset",
+        "tasks (view_count DESC, id DESC) WHERE is_public = true",
+    ),
+    (
+        "idx_task_executions_task_started_keyset",
+        "task_executions (task_id, started_at DESC, id DESC)",
+    ),
+    (
+        "idx_task_executions_started_keyset",
+        "task_executions (started_at DESC, id DESC)",
+    ),
+    (
+        "idx_notification_sends_task_created_keyset",
+        "notification_sends (task_id, created_at DESC, id DESC)",
+    ),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+        # Superseded by idx_tasks_public_view_count_keyset
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_public_view_count")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_public_view_count "
+            "ON tasks(view_count) WHERE is_public = true"
+        )
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
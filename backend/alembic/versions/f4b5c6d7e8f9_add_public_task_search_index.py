@@ -0,0 +1,41 @@
+"""add public task search index
+
+Revision ID: f4b5c6d7e8f9
+Revises: e2f3a4b5c6d7
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "f4b5c6d7e8f9"
+down_revision: str = "e2f3a4b5c6d7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Must stay identical to torale.tasks.search.search_document() for the planner
+# to use the index
+SEARCH_DOCUMENT = (
+    "(setweight(to_tsvector('english', coalesce(name, '')), 'A')"
+    " || setweight(to_tsvector('english', coalesce(search_query, '')), 'B')"
+    " || setweight(to_tsvector('english', coalesce(condition_description, '')), 'C'))"
+)
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_public_search
+            ON tasks USING GIN ({SEARCH_DOCUMENT})
+            WHERE is_public = true
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_public_search")
@@ -0,0 +1,47 @@
+"""add task dispatch lease columns
+
+Revision ID: f6a7b8c9d0e1
+Revises: c5e8f9d23b41
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "f6a7b8c9d0e1"
+down_revision: str = "c5e8f9d23b41"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Retry state that APScheduler kept in job args, plus the dispatch lease
+    op.execute("""
+        ALTER TABLE tasks
+            ADD COLUMN scheduled_retry_count INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN scheduled_execution_id UUID,
+            ADD COLUMN lease_owner TEXT,
+            ADD COLUMN lease_expires_at TIMESTAMP WITH TIME ZONE
+    """)
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_due
+            ON tasks (next_run)
+            WHERE state = 'active'
+            """
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_tasks_due")
+    op.execute("""
+        ALTER TABLE tasks
+            DROP COLUMN IF EXISTS lease_expires_at,
+            DROP COLUMN IF EXISTS lease_owner,
+            DROP COLUMN IF EXISTS scheduled_execution_id,
+            DROP COLUMN IF EXISTS scheduled_retry_count
+    """)
@@ -1,3 +1,4 @@
+from .api_keys import ApiKeyCache, api_key_cache, flush_api_key_last_used
 from .auth import CurrentUser, OptionalUser, require_admin, require_developer
 from .auth_provider import (
     TEST_USER_NOAUTH_ID,
@@ -9,7 +10,9 @@ from .auth_provider import (
     set_auth_provider,
 )
 from .clerk_auth import ClerkUser, clerk_client
+from .principals import PrincipalCache, principal_cache
 from .repository import ApiKeyRepository, UserRepository
+from .roles import RoleCache, role_cache, role_from_metadata, store_role, store_roles
 
 __all__ = [
     "TEST_USER_NOAUTH_ID",
@@ -25,6 +28,16 @@ __all__ = [
     "require_developer",
     "clerk_client",
     "ClerkUser",
+    "PrincipalCache",
+    "principal_cache",
     "UserRepository",
     "ApiKeyRepository",
+    "ApiKeyCache",
+    "api_key_cache",
+    "flush_api_key_last_used",
+    "RoleCache",
+    "role_cache",
+    "role_from_metadata",
+    "store_role",
+    "store_roles",
 ]
@@ -0,0 +1,169 @@
+"""Fast path for API key verification.
+
+bcrypt is deliberately slow, and SDK clients send their key on every
+request. After one successful bcrypt check, the verified principal is cached
+under the key's prefix together with a SHA-256 digest of the full key, so
+later requests only compare digests. Entries expire after a short TTL and
+are dropped when the key is revoked. Like the principal cache they live in
+Redis when it is connected and in a bounded in-process LRU otherwise.
+
+last_used_at is recorded in memory and written in batches by
+flush_api_key_last_used instead of one UPDATE per request.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from redis.exceptions import RedisError
+
+from torale.core.config import settings
+from torale.core.database import db
+from torale.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "auth:api_key"
+
+
+@dataclass(frozen=True)
+class VerifiedApiKey:
+    """An API key that passed bcrypt verification and the user it belongs to."""
+
+    key_id: uuid.UUID
+    user_id: uuid.UUID
+    clerk_user_id: str
+    email: str
+
+
+def digest_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+class ApiKeyCache:
+    """TTL + LRU cache of VerifiedApiKey keyed by key prefix, guarded by key digest."""
+
+    def __init__(self, ttl_seconds: int | None = None, max_entries: int | None = None):
+        self.ttl_seconds = ttl_seconds or settings.api_key_cache_ttl_seconds
+        self.max_entries = max_entries or settings.api_key_cache_max_entries
+        self._local: OrderedDict[str, tuple[float, str, VerifiedApiKey]] = OrderedDict()
+
+    async def get(self, key_prefix: str, api_key: str) -> VerifiedApiKey | None:
+        digest = digest_api_key(api_key)
+        if redis_client.client is not None:
+            try:
+                raw = await redis_client.client.get(f"{REDIS_KEY_PREFIX}:{key_prefix}")
+            except RedisError:
+                logger.debug("Redis API key lookup failed", exc_info=True)
+            else:
+                return self._decode(raw, digest) if raw else None
+
+        entry = self._local.get(key_prefix)
+        if entry is None:
+            return None
+        expires_at, cached_digest, verified = entry
+        if expires_at <= time.monotonic():
+            del self._local[key_prefix]
+            return None
+        if not hmac.compare_digest(cached_digest, digest):
+            return None
+        self._local.move_to_end(key_prefix)
+        return verified
+
+    async def set(self, key_prefix: str, api_key: str, verified: VerifiedApiKey) -> None:
+        digest = digest_api_key(api_key)
+        if redis_client.client is not None:
+            try:
+                await redis_client.client.set(
+                    f"{REDIS_KEY_PREFIX}:{key_prefix}",
+                    self._encode(digest, verified),
+                    ex=self.ttl_seconds,
+                )
+                return
+            except RedisError:
+                logger.debug("Redis API key write failed", exc_info=True)
+
+        self._local[key_prefix] = (time.monotonic() + self.ttl_seconds, digest, verified)
+        self._local.move_to_end(key_prefix)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def invalidate(self, key_prefix: str) -> None:
+        """Forget a key, e.g. on revocation."""
+        self._local.pop(key_prefix, None)
+        if redis_client.client is not None:
+            try:
+                await redis_client.client.delete(f"{REDIS_KEY_PREFIX}:{key_prefix}")
+            except RedisError:
+                logger.warning(f"Failed to invalidate cached API key {key_prefix}", exc_info=True)
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    @staticmethod
+    def _encode(digest: str, verified: VerifiedApiKey) -> str:
+        return json.dumps(
+            {
+                "digest": digest,
+                "key_id": str(verified.key_id),
+                "user_id": str(verified.user_id),
+                "clerk_user_id": verified.clerk_user_id,
+                "email": verified.email,
+            }
+        )
+
+    @staticmethod
+    def _decode(raw: str, digest: str) -> VerifiedApiKey | None:
+        data = json.loads(raw)
+        if not hmac.compare_digest(data["digest"], digest):
+            return None
+        return VerifiedApiKey(
+            key_id=uuid.UUID(data["key_id"]),
+            user_id=uuid.UUID(data["user_id"]),
+            clerk_user_id=data["clerk_user_id"],
+            email=data["email"],
+        )
+
+
+api_key_cache = ApiKeyCache()
+
+# key_id -> most recent use not yet written to api_keys.last_used_at
+_pending_last_used: dict[uuid.UUID, datetime] = {}
+
+
+def record_api_key_use(key_id: uuid.UUID) -> None:
+    """Note a use of an API key; persisted by the next flush_api_key_last_used."""
+    _pending_last_used[key_id] = datetime.now(UTC)
+
+
+async def flush_api_key_last_used() -> int:
+    """Write buffered last_used_at timestamps in one statement. Returns keys updated."""
+    if not _pending_last_used:
+        return 0
+    pending = dict(_pending_last_used)
+    _pending_last_used.clear()
+    try:
+        await db.execute(
+            """
+            UPDATE api_keys ak
+            SET last_used_at = v.used_at
+            FROM unnest($1::uuid[], $2::timestamptz[]) AS v(id, used_at)
+            WHERE ak.id = v.id
+              AND (ak.last_used_at IS NULL OR ak.last_used_at < v.used_at)
+            """,
+            list(pending.keys()),
+            list(pending.values()),
+        )
+    except Exception:
+        logger.warning("Failed to flush API key last_used_at", exc_info=True)
+        # Keep the timestamps for the next flush unless a newer use replaced them
+        for key_id, used_at in pending.items():
+            _pending_last_used.setdefault(key_id, used_at)
+        return 0
+    return len(pending)
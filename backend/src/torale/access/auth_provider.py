@@ -1,5 +1,6 @@
 """Authentication provider abstraction and implementations."""
 
+import asyncio
 import logging
 import uuid
 from abc import ABC, abstractmethod
@@ -14,7 +15,10 @@ from fastapi.security import HTTPAuthorizationCredentials
 from torale.core.config import settings
 from torale.core.database import Database
 
+from .api_keys import VerifiedApiKey, api_key_cache, record_api_key_use
+from .principals import CachedPrincipal, principal_cache
 from .repository import ApiKeyRepository, UserRepository
+from .roles import role_cache
 
 logger = logging.getLogger(__name__)
 
@@ -131,6 +135,9 @@ class ProductionAuthProvider(AuthProvider):
         """
         Verify Clerk session token and return user information.
 
+        The JWT is always verified locally. The Clerk profile and DB user id
+        are served from principal_cache for known (sub, sid) sessions.
+
         Args:
             token: JWT token from Clerk
             db: Database instance
@@ -162,6 +169,17 @@ class ProductionAuthProvider(AuthProvider):
                 )
 
             clerk_user_id = jwt_payload["sub"]
+            session_id = jwt_payload.get("sid")
+
+            if session_id:
+                cached = await principal_cache.get(clerk_user_id, session_id)
+                if cached:
+                    return User(
+                        user_id=clerk_user_id,
+                        email=cached.email,
+                        email_verified=cached.email_verified,
+                        db_user_id=cached.db_user_id,
+                    )
 
             # Fetch user data from Clerk API to get email
             if not self.clerk_client:
@@ -171,8 +189,11 @@ class ProductionAuthProvider(AuthProvider):
                 )
 
             try:
-                # Fetch user directly - response is the User object
-                clerk_user = self.clerk_client.users.get(user_id=clerk_user_id)
+                # Fetch user directly - response is the User object. The SDK call
+                # is blocking, so keep it off the event loop.
+                clerk_user = await asyncio.to_thread(
+                    self.clerk_client.users.get, user_id=clerk_user_id
+                )
 
                 # Get primary email
                 primary_email = None
@@ -200,6 +221,18 @@ class ProductionAuthProvider(AuthProvider):
                 db_user = await user_repo.find_by_clerk_id(clerk_user_id)
                 db_user_id = db_user["id"] if db_user else None
 
+                # Users not synced yet resolve to a derived id; only cache real rows
+                if session_id and db_user_id:
+                    await principal_cache.set(
+                        clerk_user_id,
+                        session_id,
+                        CachedPrincipal(
+                            email=primary_email,
+                            email_verified=email_verified,
+                            db_user_id=db_user_id,
+                        ),
+                    )
+
                 return User(
                     user_id=clerk_user_id,
                     email=primary_email,
@@ -237,7 +270,9 @@ class ProductionAuthProvider(AuthProvider):
         Verify API key and return user information.
 
         Uses bcrypt for secure verification. Since bcrypt hashes include unique salts,
-        we look up by key prefix and then verify the hash with bcrypt.checkpw().
+        we look up by key prefix and then verify the hash with bcrypt.checkpw(), in a
+        worker thread so the event loop keeps serving other requests. Verified keys
+        are remembered in api_key_cache, so repeat requests skip bcrypt and the lookup.
 
         Args:
             api_key: The API key to verify
@@ -252,39 +287,52 @@ class ProductionAuthProvider(AuthProvider):
         # Extract prefix for lookup (first 15 chars + "...")
         key_prefix = api_key[:15] + "..."
 
-        # Look up API key by prefix
-        api_key_repo = ApiKeyRepository(db)
-        key_data = await api_key_repo.find_by_prefix(key_prefix)
+        verified = await api_key_cache.get(key_prefix, api_key)
+        if verified is None:
+            # Look up API key by prefix
+            api_key_repo = ApiKeyRepository(db)
+            key_data = await api_key_repo.find_by_prefix(key_prefix)
 
-        if not key_data:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid API key",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+            if not key_data:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid API key",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
 
-        # Verify the hash using bcrypt
-        stored_hash = key_data["key_hash"].encode()
-        if not bcrypt.checkpw(api_key.encode(), stored_hash):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid API key",
-                headers={"WWW-Authenticate": "Bearer"},
+            # Verify the hash using bcrypt
+            stored_hash = key_data["key_hash"].encode()
+            if not await asyncio.to_thread(bcrypt.checkpw, api_key.encode(), stored_hash):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid API key",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+
+            verified = VerifiedApiKey(
+                key_id=key_data["key_id"],
+                user_id=key_data["user_id"],
+                clerk_user_id=key_data["clerk_user_id"],
+                email=key_data["email"],
             )
+            await api_key_cache.set(key_prefix, api_key, verified)
 
-        # Update last_used_at timestamp
-        await api_key_repo.update_last_used(key_data["key_id"])
+        # last_used_at is written in batches by flush_api_key_last_used
+        record_api_key_use(verified.key_id)
 
         return User(
-            user_id=key_data["clerk_user_id"],
-            email=key_data["email"],
+            user_id=verified.clerk_user_id,
+            email=verified.email,
             email_verified=True,  # API keys are only created for verified users
-            db_user_id=key_data["user_id"],
+            db_user_id=verified.user_id,
         )
 
     async def verify_role(self, user: User, required_role: str) -> bool:
         """
-        Verify if the user has the required role by checking Clerk public metadata.
+        Verify if the user has the required role from Clerk public metadata.
+
+        Served from role_cache (memory, then the users.role mirror); Clerk is
+        only called for users whose role is unsynced or stale.
 
         Args:
             user: The authenticated user.
@@ -303,9 +351,7 @@ class ProductionAuthProvider(AuthProvider):
             )
 
         try:
-            clerk_user = self.clerk_client.users.get(user_id=user.user_id)
-            public_metadata = clerk_user.public_metadata or {}
-            role = public_metadata.get("role")
+            role = await role_cache.get_role(user.user_id, self.clerk_client)
 
             # For developer role, accept both "developer" and "admin"
             if required_role == "developer":
@@ -0,0 +1,120 @@
+"""Cache of verified Clerk principals.
+
+A Clerk session token only carries the user id (`sub`) and session id
+(`sid`); the email and the database user id cost a Clerk API call and a
+users lookup. Those are cached per (sub, sid) for a short TTL so most
+requests authenticate with local JWT verification alone. A new sign-in gets
+a new sid and therefore always starts from fresh Clerk data.
+
+Entries live in Redis when it is connected (shared across replicas) and in a
+bounded in-process LRU otherwise. Invalidate by `sub` whenever the user row
+changes (sync-user, deactivation).
+"""
+
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from redis.exceptions import RedisError
+
+from torale.core.config import settings
+from torale.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "auth:principal"
+
+
+@dataclass(frozen=True)
+class CachedPrincipal:
+    """What a Clerk token resolves to once the Clerk and DB lookups are done."""
+
+    email: str
+    email_verified: bool
+    db_user_id: uuid.UUID
+
+
+class PrincipalCache:
+    """TTL + LRU cache of CachedPrincipal keyed by (sub, sid)."""
+
+    def __init__(self, ttl_seconds: int | None = None, max_entries: int | None = None):
+        self.ttl_seconds = ttl_seconds or settings.auth_principal_cache_ttl_seconds
+        self.max_entries = max_entries or settings.auth_principal_cache_max_entries
+        self._local: OrderedDict[tuple[str, str], tuple[float, CachedPrincipal]] = OrderedDict()
+
+    async def get(self, sub: str, sid: str) -> CachedPrincipal | None:
+        if redis_client.client is not None:
+            try:
+                raw = await redis_client.client.hget(f"{REDIS_KEY_PREFIX}:{sub}", sid)
+            except RedisError:
+                logger.debug("Redis principal lookup failed", exc_info=True)
+            else:
+                return self._decode(raw) if raw else None
+
+        entry = self._local.get((sub, sid))
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            del self._local[(sub, sid)]
+            return None
+        self._local.move_to_end((sub, sid))
+        return principal
+
+    async def set(self, sub: str, sid: str, principal: CachedPrincipal) -> None:
+        if redis_client.client is not None:
+            key = f"{REDIS_KEY_PREFIX}:{sub}"
+            try:
+                async with redis_client.client.pipeline(transaction=False) as pipe:
+                    pipe.hset(key, sid, self._encode(principal))
+                    pipe.expire(key, self.ttl_seconds)
+                    await pipe.execute()
+                return
+            except RedisError:
+                logger.debug("Redis principal write failed", exc_info=True)
+
+        self._local[(sub, sid)] = (time.monotonic() + self.ttl_seconds, principal)
+        self._local.move_to_end((sub, sid))
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def invalidate(self, sub: str) -> None:
+        """Drop every cached session of a user."""
+        for key in [key for key in self._local if key[0] == sub]:
+            del self._local[key]
+        if redis_client.client is not None:
+            try:
+                await redis_client.client.delete(f"{REDIS_KEY_PREFIX}:{sub}")
+            except RedisError:
+                logger.warning(f"Failed to invalidate cached principal for {sub}", exc_info=True)
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def _encode(self, principal: CachedPrincipal) -> str:
+        return json.dumps(
+            {
+                "email": principal.email,
+                "email_verified": principal.email_verified,
+                "db_user_id": str(principal.db_user_id),
+                # The hash TTL is refreshed by every write; each entry carries its own
+                "expires_at": time.time() + self.ttl_seconds,
+            }
+        )
+
+    @staticmethod
+    def _decode(raw: str) -> CachedPrincipal | None:
+        data = json.loads(raw)
+        if data["expires_at"] <= time.time():
+            return None
+        return CachedPrincipal(
+            email=data["email"],
+            email_verified=data["email_verified"],
+            db_user_id=uuid.UUID(data["db_user_id"]),
+        )
+
+
+principal_cache = PrincipalCache()
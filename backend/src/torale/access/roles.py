@@ -0,0 +1,132 @@
+"""Role resolution for verify_role.
+
+Roles are owned by Clerk (publicMetadata.role) and mirrored into
+users.role / users.role_synced_at whenever Torale learns them: on
+/auth/sync-user, when an admin changes a role, and on a fallback read. Role
+checks are served from an in-process TTL cache backed by that mirror; Clerk
+is only asked, asynchronously and with bounded concurrency, for users whose
+role has never been synced or was synced more than role_mirror_max_age_seconds
+ago (roles can also be changed in the Clerk dashboard). If that refresh
+fails, the stale mirror is still served, except that it never grants admin.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+
+from torale.core.config import settings
+from torale.core.database import db
+
+logger = logging.getLogger(__name__)
+
+
+def role_from_metadata(public_metadata: dict | None) -> str | None:
+    role = (public_metadata or {}).get("role")
+    return role if role in ("admin", "developer") else None
+
+
+async def store_role(clerk_user_id: str, role: str | None) -> None:
+    """Mirror a role read from (or written to) Clerk and refresh the cache."""
+    await db.execute(
+        "UPDATE users SET role = $2, role_synced_at = NOW() WHERE clerk_user_id = $1",
+        clerk_user_id,
+        role,
+    )
+    role_cache.put(clerk_user_id, role)
+
+
+async def store_roles(clerk_user_ids: list[str], role: str | None) -> None:
+    """Mirror one role for many users (bulk admin update)."""
+    if not clerk_user_ids:
+        return
+    await db.execute(
+        """
+        UPDATE users SET role = $2, role_synced_at = NOW()
+        WHERE clerk_user_id = ANY($1::text[])
+        """,
+        clerk_user_ids,
+        role,
+    )
+    for clerk_user_id in clerk_user_ids:
+        role_cache.put(clerk_user_id, role)
+
+
+class RoleCache:
+    """clerk_user_id -> role, from memory, then users.role, then Clerk."""
+
+    def __init__(self, ttl_seconds: int | None = None, max_concurrent_fetches: int | None = None):
+        self.ttl_seconds = ttl_seconds or settings.role_cache_ttl_seconds
+        self._entries: dict[str, tuple[float, str | None]] = {}
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._fetch_slots = asyncio.Semaphore(
+            max_concurrent_fetches or settings.role_clerk_fallback_concurrency
+        )
+
+    def put(self, clerk_user_id: str, role: str | None) -> None:
+        self._entries[clerk_user_id] = (time.monotonic() + self.ttl_seconds, role)
+
+    def invalidate(self, clerk_user_id: str) -> None:
+        self._entries.pop(clerk_user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_role(self, clerk_user_id: str, clerk_client) -> str | None:
+        entry = self._entries.get(clerk_user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        row = await db.fetch_one(
+            "SELECT role, role_synced_at FROM users WHERE clerk_user_id = $1", clerk_user_id
+        )
+        synced_at = row["role_synced_at"] if row is not None else None
+        max_age = timedelta(seconds=settings.role_mirror_max_age_seconds)
+        if synced_at is not None and synced_at > datetime.now(UTC) - max_age:
+            self.put(clerk_user_id, row["role"])
+            return row["role"]
+
+        # Never synced, or stale: read it from Clerk once, shared by concurrent requests
+        while (in_flight := self._in_flight.get(clerk_user_id)) is not None:
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The fetching request was cancelled; fetch it ourselves
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[clerk_user_id] = future
+        try:
+            role = await self._fetch_from_clerk(clerk_user_id, clerk_client, mirror=row is not None)
+        except Exception as e:
+            if synced_at is None:
+                future.set_exception(e)
+                future.exception()  # Mark retrieved when nobody else is waiting
+                raise
+            # Clerk unavailable: keep the stale mirror (uncached), but fail closed for admin
+            logger.warning(f"Could not refresh stale role for {clerk_user_id}: {e}")
+            role = "developer" if row["role"] == "admin" else row["role"]
+            future.set_result(role)
+            return role
+        except BaseException:
+            future.cancel()  # Waiting requests retry rather than inherit our cancellation
+            raise
+        else:
+            future.set_result(role)
+            return role
+        finally:
+            del self._in_flight[clerk_user_id]
+
+    async def _fetch_from_clerk(self, clerk_user_id: str, clerk_client, mirror: bool) -> str | None:
+        async with self._fetch_slots:
+            clerk_user = await clerk_client.users.get_async(user_id=clerk_user_id)
+        role = role_from_metadata(clerk_user.public_metadata if clerk_user else None)
+        if mirror:
+            await store_role(clerk_user_id, role)
+        else:
+            # No users row yet (before sync-user); cache only
+            self.put(clerk_user_id, role)
+        return role
+
+
+role_cache = RoleCache()
@@ -13,6 +13,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from torale.access import (
     NoAuthProvider,
     ProductionAuthProvider,
+    flush_api_key_last_used,
     set_auth_provider,
 )
 from torale.api.rate_limiter import limiter
@@ -30,17 +31,31 @@ from torale.api.routers import (
     waitlist,
     webhooks,
 )
+from torale.api.utils.pagination import NEXT_CURSOR_HEADER
 from torale.core.config import PROJECT_ROOT, settings
 from torale.core.database import Database, db, get_db
 from torale.core.redis import redis_client
 from torale.core.views import flush_views_to_postgres
 from torale.lib.posthog import shutdown as shutdown_posthog
-from torale.scheduler import get_scheduler
-from torale.scheduler.migrate import reap_stale_executions, sync_jobs_from_database
+from torale.notifications import close_webhook_client
+from torale.scheduler import get_scheduler, shutdown_scheduler, start_scheduler
+from torale.scheduler.leases import backfill_missing_next_run, leases_enabled
+from torale.scheduler.migrate import (
+    reap_stale_executions,
+    remove_task_jobs,
+    sync_jobs_from_database,
+)
+from torale.scheduler.outbox import NotificationDispatcher
+from torale.scheduler.retention import enforce_execution_retention
+from torale.scheduler.stats import refresh_platform_stats
+from torale.scheduler.webhook_retries import retry_due_webhooks
+from torale.scheduler.worker import LeaseDispatcher
 
 logger = logging.getLogger(__name__)
 
 _startup_sync_ok = False
+_dispatcher: LeaseDispatcher | None = None
+_notification_dispatcher: NotificationDispatcher | None = None
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -89,17 +104,26 @@ async def lifespan(app: FastAPI):
         set_auth_provider(ProductionAuthProvider())
 
     # Start scheduler
-    scheduler = get_scheduler()
-    scheduler.start()
-    logger.info("APScheduler started")
-
-    global _startup_sync_ok
-    try:
-        await sync_jobs_from_database()
-        _startup_sync_ok = True
-        logger.info("Scheduler jobs synced from database")
-    except Exception as e:
-        logger.error(f"Failed to sync scheduler jobs from database: {e}", exc_info=True)
+    scheduler = await start_scheduler()
+
+    global _startup_sync_ok, _dispatcher, _notification_dispatcher
+    if leases_enabled():
+        try:
+            await remove_task_jobs()
+            await backfill_missing_next_run()
+            _startup_sync_ok = True
+        except Exception as e:
+            logger.error(f"Failed to prepare lease dispatch: {e}", exc_info=True)
+        if settings.scheduler_dispatch_in_api:
+            _dispatcher = LeaseDispatcher()
+            _dispatcher.start()
+    else:
+        try:
+            await sync_jobs_from_database()
+            _startup_sync_ok = True
+            logger.info("Scheduler jobs synced from database")
+        except Exception as e:
+            logger.error(f"Failed to sync scheduler jobs from database: {e}", exc_info=True)
 
     # Register stale execution reaper (runs every 15 minutes)
     scheduler.add_job(
@@ -110,6 +134,47 @@ async def lifespan(app: FastAPI):
         replace_existing=True,
     )
 
+    # Deliver notifications queued by executions in notification_outbox
+    if settings.notification_dispatch_in_api:
+        _notification_dispatcher = NotificationDispatcher()
+        _notification_dispatcher.start()
+
+    # Redeliver failed webhooks from webhook_deliveries.next_retry_at
+    scheduler.add_job(
+        retry_due_webhooks,
+        trigger="interval",
+        seconds=settings.webhook_retry_interval_seconds,
+        id="retry-webhook-deliveries",
+        replace_existing=True,
+    )
+
+    # Admin dashboard rollups (see torale.scheduler.stats)
+    scheduler.add_job(
+        refresh_platform_stats,
+        trigger="interval",
+        minutes=settings.admin_stats_refresh_minutes,
+        id="refresh-platform-stats",
+        replace_existing=True,
+    )
+
+    # Move expired execution history to the archive (see torale.scheduler.retention)
+    scheduler.add_job(
+        enforce_execution_retention,
+        trigger="interval",
+        minutes=settings.execution_archive_interval_minutes,
+        id="enforce-execution-retention",
+        replace_existing=True,
+    )
+
+    # Batched api_keys.last_used_at writes (see torale.access.api_keys)
+    scheduler.add_job(
+        flush_api_key_last_used,
+        trigger="interval",
+        seconds=settings.api_key_last_used_flush_seconds,
+        id="flush-api-key-last-used",
+        replace_existing=True,
+    )
+
     if redis_client.client is not None:
         scheduler.add_job(
             flush_views_to_postgres,
@@ -121,9 +186,16 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    scheduler.shutdown(wait=False)
-    logger.info("APScheduler shut down")
+    if _dispatcher is not None:
+        await _dispatcher.stop()
+        _dispatcher = None
+    await shutdown_scheduler()
+    if _notification_dispatcher is not None:
+        await _notification_dispatcher.stop()
+        _notification_dispatcher = None
     await flush_views_to_postgres()
+    await flush_api_key_last_used()
+    await close_webhook_client()
     await redis_client.disconnect()
     shutdown_posthog()
     logger.info("PostHog shut down")
@@ -153,6 +225,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Add security headers middleware
@@ -206,13 +279,24 @@ app.mount("/static", StaticFiles(directory=str(PROJECT_ROOT / "static")), name="
 async def health_check():
     scheduler = get_scheduler()
     scheduler_running = scheduler.running
-    if not scheduler_running or not _startup_sync_ok:
+    dispatcher_ok = _dispatcher.running if _dispatcher is not None else True
+    notification_dispatcher_ok = (
+        _notification_dispatcher.running if _notification_dispatcher is not None else True
+    )
+    if (
+        not scheduler_running
+        or not _startup_sync_ok
+        or not dispatcher_ok
+        or not notification_dispatcher_ok
+    ):
         return JSONResponse(
             status_code=503,
             content={
                 "status": "degraded",
                 "scheduler_running": scheduler_running,
                 "startup_sync_ok": _startup_sync_ok,
+                "dispatcher_running": dispatcher_ok,
+                "notification_dispatcher_running": notification_dispatcher_ok,
             },
         )
     return {"status": "healthy"}
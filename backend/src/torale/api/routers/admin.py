@@ -10,14 +10,25 @@ from uuid import UUID
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
-from torale.access import ClerkUser, clerk_client, require_admin
+from torale.access import (
+    ClerkUser,
+    clerk_client,
+    principal_cache,
+    require_admin,
+    store_role,
+    store_roles,
+)
 from torale.api.routers.tasks import start_task_execution
+from torale.api.utils.pagination import parse_cursor
 from torale.connectors import ComposioClientError, delete_connection, list_user_connections
 from torale.core.config import settings
 from torale.core.database import Database, get_db
+from torale.scheduler.concurrency import queue_stats
 from torale.scheduler.scheduler import get_scheduler
+from torale.scheduler.stats import read_platform_stats
 from torale.tasks import TaskState
 from torale.tasks.service import InvalidTransitionError, TaskService
+from torale.utils.cursor import encode_cursor
 
 router = APIRouter(prefix="/admin", tags=["admin"], include_in_schema=False)
 
@@ -84,57 +95,24 @@ async def get_platform_stats(
     - Task statistics (total/triggered/trigger_rate)
     - 24-hour execution metrics (total/failed/success_rate)
     - Popular queries (top 10 most common search queries)
+
+    Task and execution figures come from the rollups refreshed by
+    torale.scheduler.stats (see refreshed_at), so this reads a fixed number
+    of rows regardless of execution history size.
     """
     max_users = getattr(settings, "max_users", 100)
-    twenty_four_hours_ago = datetime.now(UTC) - timedelta(hours=24)
-
-    # Each db.fetch_* acquires its own pool connection — run concurrently
-    user_count_coro = db.fetch_val("SELECT COUNT(*) FROM users WHERE is_active = true")
-    task_coro = db.fetch_one(
-        """
-        SELECT
-            COUNT(*) as total_tasks,
-            COALESCE(SUM(CASE WHEN e.notification IS NOT NULL THEN 1 ELSE 0 END), 0) as triggered_tasks
-        FROM tasks t
-        LEFT JOIN task_executions e ON t.last_execution_id = e.id
-        WHERE t.state = 'active'
-        """
-    )
-    exec_coro = db.fetch_one(
-        """
-        SELECT
-            COUNT(*) as total_executions,
-            COALESCE(SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END), 0) as failed_executions
-        FROM task_executions
-        WHERE created_at >= $1
-        """,
-        twenty_four_hours_ago,
-    )
-    popular_coro = db.fetch_all(
-        """
-        SELECT
-            t.search_query,
-            COUNT(*) as task_count,
-            COALESCE(SUM(CASE WHEN e.notification IS NOT NULL THEN 1 ELSE 0 END), 0) as triggered_count
-        FROM tasks t
-        LEFT JOIN task_executions e ON t.last_execution_id = e.id
-        WHERE t.search_query IS NOT NULL
-        GROUP BY t.search_query
-        ORDER BY task_count DESC
-        LIMIT 10
-        """
-    )
 
-    total_users, task_row, exec_row, popular_rows = await asyncio.gather(
-        user_count_coro, task_coro, exec_coro, popular_coro
+    total_users, stats = await asyncio.gather(
+        db.fetch_val("SELECT COUNT(*) FROM users WHERE is_active = true"),
+        read_platform_stats(),
     )
 
-    total_tasks = task_row["total_tasks"] if task_row else 0
-    triggered_tasks = task_row["triggered_tasks"] if task_row else 0
+    total_tasks = stats["total_tasks"]
+    triggered_tasks = stats["triggered_tasks"]
     trigger_rate = (triggered_tasks / total_tasks * 100) if total_tasks > 0 else 0
 
-    total_executions = exec_row["total_executions"] if exec_row else 0
-    failed_executions = exec_row["failed_executions"] if exec_row else 0
+    total_executions = stats["total_executions"]
+    failed_executions = stats["failed_executions"]
     success_rate = (
         (total_executions - failed_executions) / total_executions * 100
         if total_executions > 0
@@ -144,10 +122,10 @@ async def get_platform_stats(
     popular_queries = [
         {
             "search_query": row["search_query"],
-            "count": row["task_count"],
+            "count": row["count"],
             "triggered_count": row["triggered_count"],
         }
-        for row in popular_rows
+        for row in stats["popular_queries"]
     ]
 
     return {
@@ -167,6 +145,7 @@ async def get_platform_stats(
             "success_rate": f"{success_rate:.1f}%",
         },
         "popular_queries": popular_queries,
+        "refreshed_at": stats["refreshed_at"].isoformat() if stats["refreshed_at"] else None,
     }
 
 
@@ -203,16 +182,14 @@ async def list_all_queries(
             le.notification as last_notification,
             t.created_at,
             u.email as user_email,
-            COUNT(te.id) as execution_count,
-            SUM(CASE WHEN te.notification IS NOT NULL THEN 1 ELSE 0 END) as trigger_count,
+            t.success_count + t.failure_count as execution_count,
+            t.notification_count as trigger_count,
             t.last_known_state,
             t.state_changed_at
         FROM tasks t
         JOIN users u ON u.id = t.user_id
         LEFT JOIN task_executions le ON t.last_execution_id = le.id
-        LEFT JOIN task_executions te ON te.task_id = t.id
         WHERE 1=1 {active_filter}
-        GROUP BY t.id, u.email, le.notification, t.last_known_state, t.state_changed_at
         ORDER BY t.created_at DESC
         LIMIT $1
         """,
@@ -243,6 +220,13 @@ async def list_all_queries(
     return {"queries": queries, "total": len(queries)}
 
 
+def _next_cursor(rows, limit: int) -> str | None:
+    """Keyset cursor on (started_at, id) when the page is full."""
+    if len(rows) < limit:
+        return None
+    return encode_cursor(rows[-1]["started_at"], rows[-1]["id"])
+
+
 @router.get("/executions")
 async def list_recent_executions(
     admin: ClerkUser = Depends(require_admin),
@@ -250,6 +234,7 @@ async def list_recent_executions(
     limit: int = Query(default=50, le=200),
     status_filter: str | None = Query(default=None, alias="status"),
     task_id: UUID | None = Query(default=None),
+    cursor: str | None = Query(default=None),
 ):
     """
     List task execution history across all users.
@@ -258,6 +243,7 @@ async def list_recent_executions(
     - limit: Maximum number of results (default: 50, max: 200)
     - status: Filter by status ('success', 'failed', 'running')
     - task_id: Filter by specific task ID
+    - cursor: next_cursor from the previous page
 
     Returns detailed execution results with:
     - Execution metadata (status, timestamps, duration)
@@ -280,6 +266,11 @@ async def list_recent_executions(
         param_idx += 1
         conditions.append(f"te.task_id = ${param_idx}")
         params.append(task_id)
+    before = parse_cursor(cursor, datetime, UUID)
+    if before is not None:
+        conditions.append(f"(te.started_at, te.id) < (${param_idx + 1}, ${param_idx + 2})")
+        params.extend(before)
+        param_idx += 2
 
     param_idx += 1
     where_clause = " AND ".join(conditions)
@@ -302,7 +293,7 @@ async def list_recent_executions(
         JOIN tasks t ON t.id = te.task_id
         JOIN users u ON u.id = t.user_id
         WHERE {where_clause}
-        ORDER BY te.started_at DESC
+        ORDER BY te.started_at DESC, te.id DESC
         LIMIT ${param_idx}
         """,
         *params,
@@ -326,7 +317,11 @@ async def list_recent_executions(
         for row in rows
     ]
 
-    return {"executions": executions, "total": len(executions)}
+    return {
+        "executions": executions,
+        "total": len(executions),
+        "next_cursor": _next_cursor(rows, limit),
+    }
 
 
 @router.get("/scheduler/jobs")
@@ -351,17 +346,27 @@ async def list_scheduler_jobs(
     return {"jobs": jobs, "total": len(jobs)}
 
 
+@router.get("/scheduler/queue")
+async def get_execution_queue_stats(
+    admin: ClerkUser = Depends(require_admin),
+):
+    """Execution queue depth, in-flight counts and wait times for this API process."""
+    return queue_stats()
+
+
 @router.get("/errors")
 async def list_recent_errors(
     admin: ClerkUser = Depends(require_admin),
     db: Database = Depends(get_db),
     limit: int = Query(default=50, le=200),
+    cursor: str | None = Query(default=None),
 ):
     """
     List recent failed executions with error details.
 
     Query Parameters:
     - limit: Maximum number of results (default: 50, max: 200)
+    - cursor: next_cursor from the previous page
 
     Returns:
     - Failed execution details
@@ -369,8 +374,10 @@ async def list_recent_errors(
     - Associated user and task info
     - Timestamp of failure
     """
+    before = parse_cursor(cursor, datetime, UUID)
+    keyset = "AND (te.started_at, te.id) < ($2, $3)" if before is not None else ""
     rows = await db.fetch_all(
-        """
+        f"""
         SELECT
             te.id,
             te.task_id,
@@ -383,11 +390,12 @@ async def list_recent_errors(
         FROM task_executions te
         JOIN tasks t ON t.id = te.task_id
         JOIN users u ON u.id = t.user_id
-        WHERE te.status = 'failed'
-        ORDER BY te.started_at DESC
+        WHERE te.status = 'failed' {keyset}
+        ORDER BY te.started_at DESC, te.id DESC
         LIMIT $1
         """,
         limit,
+        *(before or ()),
     )
 
     errors = [
@@ -404,7 +412,7 @@ async def list_recent_errors(
         for row in rows
     ]
 
-    return {"errors": errors, "total": len(errors)}
+    return {"errors": errors, "total": len(errors), "next_cursor": _next_cursor(rows, limit)}
 
 
 @router.get("/users")
@@ -433,13 +441,19 @@ async def list_users(
             u.clerk_user_id,
             u.is_active,
             u.created_at,
-            COUNT(DISTINCT t.id) as task_count,
-            COUNT(te.id) as total_executions,
-            SUM(CASE WHEN te.notification IS NOT NULL THEN 1 ELSE 0 END) as notifications_count
+            COALESCE(s.task_count, 0) as task_count,
+            COALESCE(s.total_executions, 0) as total_executions,
+            COALESCE(s.notifications_count, 0) as notifications_count
         FROM users u
-        LEFT JOIN tasks t ON t.user_id = u.id
-        LEFT JOIN task_executions te ON te.task_id = t.id
-        GROUP BY u.id
+        LEFT JOIN (
+            -- Maintained per-task counters; execution history is never scanned
+            SELECT user_id,
+                   COUNT(*) as task_count,
+                   SUM(success_count + failure_count) as total_executions,
+                   SUM(notification_count) as notifications_count
+            FROM tasks
+            GROUP BY user_id
+        ) s ON s.user_id = u.id
         ORDER BY u.created_at DESC
         """
     )
@@ -521,7 +535,7 @@ async def deactivate_user(
     Returns:
     - Status confirmation with count of tasks paused
     """
-    check_row = await db.fetch_one("SELECT id FROM users WHERE id = $1", user_id)
+    check_row = await db.fetch_one("SELECT id, clerk_user_id FROM users WHERE id = $1", user_id)
     if not check_row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -549,6 +563,7 @@ async def deactivate_user(
         "UPDATE users SET is_active = false, updated_at = NOW() WHERE id = $1",
         user_id,
     )
+    await principal_cache.invalidate(check_row["clerk_user_id"])
 
     return {
         "status": "deactivated",
@@ -627,19 +642,20 @@ async def update_user_role(
             user_id=target_clerk_user_id,
             public_metadata={"role": role},
         )
-
-        return {
-            "status": "updated",
-            "user_id": str(user_id),
-            "role": role,
-        }
-
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update user role: {str(e)}",
         ) from e
 
+    await store_role(target_clerk_user_id, role)
+
+    return {
+        "status": "updated",
+        "user_id": str(user_id),
+        "role": role,
+    }
+
 
 @router.patch("/users/roles")
 async def bulk_update_user_roles(
@@ -732,7 +748,7 @@ async def bulk_update_user_roles(
                 public_metadata={"role": role},
             )
             update_tasks.append(update_coro)
-            task_metadata.append({"user_id": user_id})
+            task_metadata.append({"user_id": user_id, "clerk_user_id": target_clerk_user_id})
 
         except Exception as e:
             failed_count += 1
@@ -741,12 +757,15 @@ async def bulk_update_user_roles(
     if update_tasks:
         results = await asyncio.gather(*update_tasks, return_exceptions=True)
 
+        updated_clerk_ids = []
         for i, result in enumerate(results):
             if isinstance(result, Exception):
                 failed_count += 1
                 errors.append({"user_id": task_metadata[i]["user_id"], "error": str(result)})
             else:
                 updated_count += 1
+                updated_clerk_ids.append(task_metadata[i]["clerk_user_id"])
+        await store_roles(updated_clerk_ids, role)
 
     return {
         "updated": updated_count,
@@ -1,5 +1,6 @@
 """Authentication and user management endpoints."""
 
+import asyncio
 import secrets
 import uuid
 from datetime import UTC, datetime
@@ -15,7 +16,11 @@ from torale.access import (
     CurrentUser,
     ProductionAuthProvider,
     UserRepository,
+    api_key_cache,
     get_auth_provider,
+    principal_cache,
+    role_from_metadata,
+    store_role,
 )
 from torale.access.models import UserRead
 from torale.api.rate_limiter import get_user_or_ip, limiter
@@ -41,13 +46,22 @@ async def sync_user(
 
     Called automatically on first login from frontend.
     Creates user if doesn't exist, updates email and first_name if changed.
+    Drops the user's cached principals so the next request re-reads them, and
+    mirrors the Clerk role into users.role for role checks.
     """
     first_name = None
+    clerk_role_known = False
+    role = None
     provider = get_auth_provider()
     if isinstance(provider, ProductionAuthProvider) and provider.clerk_client:
         try:
-            clerk_user_data = provider.clerk_client.users.get(user_id=clerk_user.clerk_user_id)
+            clerk_user_data = await asyncio.to_thread(
+                provider.clerk_client.users.get, user_id=clerk_user.clerk_user_id
+            )
             first_name = clerk_user_data.first_name if clerk_user_data else None
+            if clerk_user_data:
+                role = role_from_metadata(clerk_user_data.public_metadata)
+                clerk_role_known = True
         except Exception:
             pass
 
@@ -90,6 +104,9 @@ async def sync_user(
                 old_email,
                 existing["id"],
             )
+            await principal_cache.invalidate(clerk_user.clerk_user_id)
+        if clerk_role_known:
+            await store_role(clerk_user.clerk_user_id, role)
 
         return SyncUserResponse(
             user=UserRead(**existing),
@@ -114,6 +131,9 @@ async def sync_user(
             True,
             datetime.now(UTC),
         )
+        await principal_cache.invalidate(clerk_user.clerk_user_id)
+        if clerk_role_known:
+            await store_role(clerk_user.clerk_user_id, role)
 
         return SyncUserResponse(
             user=UserRead(**new_user),
@@ -194,7 +214,7 @@ async def create_api_key(
         )
 
     key = f"sk_{secrets.token_urlsafe(32)}"
-    key_hash = bcrypt.hashpw(key.encode(), bcrypt.gensalt()).decode()
+    key_hash = (await asyncio.to_thread(bcrypt.hashpw, key.encode(), bcrypt.gensalt())).decode()
     key_prefix = key[:15] + "..."
 
     api_key_repo = ApiKeyRepository(db)
@@ -270,7 +290,7 @@ async def revoke_api_key(
         UPDATE api_keys
         SET is_active = false, updated_at = NOW()
         WHERE id = $1 AND user_id = $2
-        RETURNING id
+        RETURNING id, key_prefix
         """,
         key_id,
         user["id"],
@@ -282,6 +302,8 @@ async def revoke_api_key(
             detail="API key not found",
         )
 
+    await api_key_cache.invalidate(row["key_prefix"])
+
     return {"status": "revoked"}
 
 
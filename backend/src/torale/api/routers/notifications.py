@@ -1,11 +1,14 @@
 """Notification history API endpoints."""
 
+from datetime import datetime
 from uuid import UUID
 
 from fastapi import APIRouter, Depends
 
 from torale.access import CurrentUser
+from torale.api.utils.pagination import estimate_total, parse_cursor
 from torale.core.database import Database, get_db
+from torale.utils.cursor import encode_cursor
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
@@ -17,6 +20,7 @@ async def list_notification_sends(
     task_id: str | None = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
     db: Database = Depends(get_db),
 ):
     """
@@ -26,10 +30,15 @@ async def list_notification_sends(
     - notification_type: Filter by 'email' or 'webhook'
     - task_id: Filter by specific task
     - limit: Max results to return (default: 50)
-    - offset: Pagination offset (default: 0)
+    - offset: Pagination offset (default: 0, ignored with cursor)
+    - cursor: next_cursor from the previous page (keyset on created_at, id)
 
-    Returns paginated notification sends with total count.
+    Returns paginated notification sends with next_cursor. The total is only
+    computed for the first page (cursor pages return total=null) and is a
+    planner estimate for large histories.
     """
+    after = parse_cursor(cursor, datetime, UUID)
+
     # Build query with filters
     where_clauses = ["t.user_id = $1"]
     params = [user.id]
@@ -47,14 +56,20 @@ async def list_notification_sends(
 
     where_clause = " AND ".join(where_clauses)
 
-    # Get total count
-    count_query = f"""
-        SELECT COUNT(*)
-        FROM notification_sends ns
-        JOIN tasks t ON ns.task_id = t.id
-        WHERE {where_clause}
-    """
-    total = await db.fetch_val(count_query, *params)
+    total = None
+    if after is None:
+        count_query = f"""
+            SELECT ns.id
+            FROM notification_sends ns
+            JOIN tasks t ON ns.task_id = t.id
+            WHERE {where_clause}
+        """
+        total = await estimate_total(db, count_query, *params)
+    else:
+        offset = 0
+        where_clause += f" AND (ns.created_at, ns.id) < (${param_count + 1}, ${param_count + 2})"
+        params.extend(after)
+        param_count += 2
 
     # Get paginated results
     param_count += 1
@@ -76,13 +91,17 @@ async def list_notification_sends(
         FROM notification_sends ns
         JOIN tasks t ON ns.task_id = t.id
         WHERE {where_clause}
-        ORDER BY ns.created_at DESC
+        ORDER BY ns.created_at DESC, ns.id DESC
         LIMIT {limit_param} OFFSET {offset_param}
     """
 
     sends = await db.fetch_all(query, *params, limit, offset)
+    next_cursor = (
+        encode_cursor(sends[-1]["created_at"], sends[-1]["id"]) if len(sends) == limit else None
+    )
 
     return {
         "sends": [dict(row) for row in sends],
         "total": total,
+        "next_cursor": next_cursor,
     }
@@ -1,6 +1,8 @@
 """Public task discovery and RSS feeds."""
 
+import json
 import xml.etree.ElementTree as ET
+from datetime import datetime
 from email.utils import format_datetime
 from uuid import UUID
 
@@ -10,13 +12,25 @@ from pydantic import BaseModel, ConfigDict
 from torale.access import OptionalUser
 from torale.api.rate_limiter import limiter
 from torale.api.routers.tasks import get_task
+from torale.api.utils.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified,
+    public_cache_control,
+    validator_headers,
+)
+from torale.api.utils.pagination import estimate_total, parse_cursor
 from torale.api.utils.task_parsers import (
     fetch_feed_executions,
     parse_task_with_execution,
 )
 from torale.core.config import settings
 from torale.core.database import Database, get_db
+from torale.core.response_cache import PUBLIC_FEED, PUBLIC_TASKS, TASK_RSS, response_cache
+from torale.core.views import increment_view
 from torale.tasks import FeedExecution, Task
+from torale.tasks.search import search_document, search_query, search_rank
+from torale.utils.cursor import encode_cursor
 from torale.utils.jsonb import parse_jsonb
 
 # Register atom namespace once at module level (avoids per-request global mutation)
@@ -44,6 +58,14 @@ class PublicTasksResponse(BaseModel):
     total: int
     offset: int
     limit: int
+    next_cursor: str | None = None
+
+
+# Keyset order per sort option: (column, cursor value type). Ties break on id.
+PUBLIC_TASK_SORT_KEYS = {
+    "recent": ("created_at", datetime),
+    "popular": ("view_count", int),
+}
 
 
 @router.get("/tasks", response_model=PublicTasksResponse)
@@ -51,9 +73,13 @@ class PublicTasksResponse(BaseModel):
 async def list_public_tasks(
     request: Request,
     user: OptionalUser,
-    offset: int = Query(0, ge=0, description="Number of tasks to skip"),
+    offset: int = Query(0, ge=0, description="Number of tasks to skip (ignored with cursor)"),
     limit: int = Query(20, ge=1, le=100, description="Number of tasks to return"),
     sort_by: str = Query("recent", enum=["recent", "popular"], description="Sort order"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    q: str | None = Query(
+        None, min_length=1, max_length=200, description="Full-text search (ranked by relevance)"
+    ),
     db: Database = Depends(get_db),
 ):
     """
@@ -62,59 +88,129 @@ async def list_public_tasks(
     Sort options:
     - recent: Most recently created tasks
     - popular: Most viewed tasks
+
+    With q, tasks are matched on name, search query and condition (see
+    torale.tasks.search) and ordered by relevance instead of sort_by.
+
+    Pass the returned next_cursor to fetch the following page; cursor pages
+    are read by keyset from an index, so deep pages cost the same as the
+    first. Pages are cached unscrubbed (see torale.core.response_cache) and
+    scrubbed per viewer below.
     """
-    # Build query with dynamic ORDER BY clause (validated by FastAPI enum)
-    # Use dictionary mapping to prevent any possibility of SQL injection
-    order_clauses = {
-        "popular": "ORDER BY t.view_count DESC, t.created_at DESC",
-        "recent": "ORDER BY t.created_at DESC",
-    }
-    order_clause = order_clauses[sort_by]
+    q = q.strip() if q else None
+    order = "search" if q else sort_by
+    cursor_type = float if q else PUBLIC_TASK_SORT_KEYS[sort_by][1]
+    after = parse_cursor(cursor, cursor_type, UUID)
+    if after is not None:
+        offset = 0
+    page = json.loads(
+        await response_cache.get_or_set(
+            PUBLIC_TASKS,
+            f"{order}:{cursor or offset}:{limit}:{q or ''}",
+            lambda: _render_public_tasks_page(db, sort_by, q, after, offset, limit),
+        )
+    )
+    tasks = [Task.model_validate(task) for task in page["tasks"]]
+
+    # Scrub sensitive fields for public viewers (non-owners)
+    scrubbed_tasks = []
+    for task in tasks:
+        is_owner = user is not None and task.user_id == user.id
+        if not is_owner:
+            task = task.model_copy(
+                update={"notification_email": None, "webhook_url": None, "notifications": []}
+            )
+        scrubbed_tasks.append(PublicTask.model_validate(task))
+
+    return PublicTasksResponse(
+        tasks=scrubbed_tasks,
+        total=await _public_task_total(db, q),
+        offset=offset,
+        limit=limit,
+        next_cursor=page["next_cursor"],
+    )
+
+
+async def _render_public_tasks_page(
+    db: Database,
+    sort_by: str,
+    q: str | None,
+    after: tuple | None,
+    offset: int,
+    limit: int,
+) -> str:
+    """One page of public tasks with their last execution, as cacheable JSON."""
+    params: list = [limit, offset]
+    conditions = ["t.is_public = true"]
+    if q:
+        params.append(q)
+        sort_key = "search_rank"
+        sort_expression = search_rank("t", "$3")
+        conditions.append(f"{search_document('t')} @@ {search_query('$3')}")
+    else:
+        # Column names come from PUBLIC_TASK_SORT_KEYS (validated by FastAPI
+        # enum), never from the request
+        sort_key = PUBLIC_TASK_SORT_KEYS[sort_by][0]
+        sort_expression = f"t.{sort_key}"
+    if after is not None:
+        conditions.append(f"({sort_expression}, t.id) < (${len(params) + 1}, ${len(params) + 2})")
+        params.extend(after)
 
     tasks_query = f"""
         SELECT t.*,
+               {sort_expression} as sort_key,
                e.id as exec_id,
                e.notification as exec_notification,
                e.started_at as exec_started_at,
                e.completed_at as exec_completed_at,
                e.status as exec_status,
                e.result as exec_result,
-               e.grounding_sources as exec_grounding_sources,
-               count(*) OVER() as total_count
+               e.grounding_sources as exec_grounding_sources
         FROM tasks t
         LEFT JOIN task_executions e ON t.last_execution_id = e.id
-        WHERE t.is_public = true
-        {order_clause}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY sort_key DESC, t.id DESC
         LIMIT $1 OFFSET $2
     """
 
-    rows = await db.fetch_all(tasks_query, limit, offset)
-    if rows:
-        total = rows[0]["total_count"]
-    else:
-        # Window function returns nothing when offset is past end; fall back to COUNT
-        count_row = await db.fetch_one("SELECT COUNT(*) as total FROM tasks WHERE is_public = true")
-        total = count_row["total"] if count_row else 0
+    rows = await db.fetch_all(tasks_query, *params)
+    next_cursor = (
+        encode_cursor(rows[-1]["sort_key"], rows[-1]["id"]) if len(rows) == limit else None
+    )
 
     # Parse tasks using shared utility
     tasks = [parse_task_with_execution(row) for row in rows]
+    return json.dumps(
+        {"tasks": [task.model_dump(mode="json") for task in tasks], "next_cursor": next_cursor}
+    )
 
-    # Scrub sensitive fields for public viewers (non-owners)
-    scrubbed_tasks = []
-    for task in tasks:
-        is_owner = user is not None and task.user_id == user.id
-        if not is_owner:
-            task = task.model_copy(
-                update={"notification_email": None, "webhook_url": None, "notifications": []}
-            )
-        scrubbed_tasks.append(PublicTask.model_validate(task))
 
-    return PublicTasksResponse(
-        tasks=scrubbed_tasks,
-        total=total,
-        offset=offset,
-        limit=limit,
+async def _public_task_total(db: Database, q: str | None = None) -> int:
+    """Public (or matching) task count, cached and invalidated with the pages.
+
+    The unfiltered total is a planner estimate once there are many public
+    tasks; search totals are counted exactly, since full-text match
+    estimates are too coarse to show.
+    """
+    total = await response_cache.get_or_set(
+        PUBLIC_TASKS,
+        f"total:{q}" if q else "total",
+        lambda: _count_public_tasks(db, q),
+    )
+    return int(total)
+
+
+async def _count_public_tasks(db: Database, q: str | None) -> str:
+    if not q:
+        return str(await estimate_total(db, "SELECT id FROM tasks WHERE is_public = true"))
+    total = await db.fetch_val(
+        f"""
+        SELECT COUNT(*) FROM tasks
+        WHERE is_public = true AND {search_document()} @@ {search_query("$1")}
+        """,
+        q,
     )
+    return str(total or 0)
 
 
 @router.get("/feed", response_model=list[PublicFeedExecution])
@@ -128,23 +224,57 @@ async def get_public_feed(
     Get a global feed of recent successful executions across all public tasks.
     Only returns executions that produced a notification (condition met).
     """
-    executions = await fetch_feed_executions(
-        db, where_clause="t.is_public = true", params=[], limit=limit
-    )
-    return [PublicFeedExecution.model_validate(e) for e in executions]
+
+    async def render() -> str:
+        executions = await fetch_feed_executions(
+            db, where_clause="t.is_public = true", params=[], limit=limit
+        )
+        feed = [PublicFeedExecution.model_validate(e) for e in executions]
+        return json.dumps([e.model_dump(mode="json") for e in feed])
+
+    content = await response_cache.get_or_set(PUBLIC_FEED, str(limit), render)
+    return [PublicFeedExecution.model_validate(e) for e in json.loads(content)]
 
 
 @router.get("/tasks/id/{task_id}", response_model=PublicTask)
 @limiter.limit("20/minute")
 async def get_public_task_by_id(
     request: Request,
+    response: Response,
     task_id: UUID,
     user: OptionalUser,
     db: Database = Depends(get_db),
 ):
     """
     Get a public task by UUID (NO AUTH REQUIRED).
+
+    Anonymous responses are CDN-cacheable; owners (who see unscrubbed fields)
+    get a private, per-viewer validator.
     """
+    validator = await db.fetch_one(
+        "SELECT user_id, is_public, updated_at, last_execution_id FROM tasks WHERE id = $1",
+        task_id,
+    )
+    is_owner = validator is not None and user is not None and validator["user_id"] == user.id
+    if validator is not None and (is_owner or validator["is_public"]):
+        etag = make_etag(
+            task_id,
+            validator["updated_at"],
+            validator["last_execution_id"],
+            "owner" if is_owner else "public",
+        )
+        headers = validator_headers(
+            etag,
+            validator["updated_at"],
+            public_cache_control() if user is None else "private, no-cache",
+        )
+        headers["Vary"] = "Authorization"
+        if is_not_modified(request, etag, validator["updated_at"]):
+            if not is_owner:
+                increment_view(task_id)
+            return not_modified(headers)
+        response.headers.update(headers)
+
     # Delegates to the shared get_task logic (handles owner vs public access)
     task = await get_task(task_id, user, db)
     return PublicTask.model_validate(task)
@@ -165,7 +295,32 @@ async def get_task_rss_feed(
     RSS 2.0 feed for a public task's execution results (NO AUTH REQUIRED).
 
     Subscribe to this feed to get notified of new monitoring results.
+
+    Every execution bumps tasks.updated_at and last_execution_id, so those
+    validate the feed: readers polling with If-None-Match/If-Modified-Since get
+    a 304 without the executions being read or the XML rebuilt.
     """
+    validator = await db.fetch_one(
+        "SELECT is_public, updated_at, last_execution_id FROM tasks WHERE id = $1", task_id
+    )
+    if not validator or not validator["is_public"]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+    feed_url = str(request.url_for("get_task_rss_feed", task_id=task_id)).replace(
+        "http://", "https://", 1
+    )
+    etag = make_etag(feed_url, validator["updated_at"], validator["last_execution_id"])
+    headers = validator_headers(etag, validator["updated_at"])
+    if is_not_modified(request, etag, validator["updated_at"]):
+        return not_modified(headers)
+
+    xml_output = await response_cache.get_or_set(
+        f"{TASK_RSS}:{task_id}", feed_url, lambda: _render_task_rss(db, task_id, feed_url)
+    )
+    return Response(content=xml_output, media_type="application/rss+xml", headers=headers)
+
+
+async def _render_task_rss(db: Database, task_id: UUID, feed_url: str) -> str:
     # Look up task and verify it's public
     task_query = "SELECT id, name, condition_description, is_public FROM tasks WHERE id = $1"
     task_row = await db.fetch_one(task_query, task_id)
@@ -184,9 +339,6 @@ async def get_task_rss_feed(
     executions = await db.fetch_all(executions_query, task_id)
 
     task_link = f"{settings.frontend_url}/tasks/{task_id}"
-    feed_url = str(request.url_for("get_task_rss_feed", task_id=task_id)).replace(
-        "http://", "https://", 1
-    )
 
     # Build RSS 2.0 feed
     rss = ET.Element("rss", version="2.0")
@@ -244,5 +396,4 @@ async def get_task_rss_feed(
         if notification_text:
             ET.SubElement(item, "category").text = "Condition Met"
 
-    xml_output = ET.tostring(rss, encoding="utf-8", xml_declaration=True)
-    return Response(content=xml_output, media_type="application/rss+xml")
+    return ET.tostring(rss, encoding="unicode", xml_declaration=True)
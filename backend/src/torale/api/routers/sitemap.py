@@ -1,79 +1,170 @@
 """Sitemap generation for SEO."""
 
 import json
+import math
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
 from email.utils import format_datetime
 from pathlib import Path
+from uuid import UUID
+from xml.sax.saxutils import escape
 
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi import Path as PathParam
+from fastapi.responses import StreamingResponse
 
+from torale.api.utils.conditional import is_not_modified, make_etag, not_modified, validator_headers
 from torale.core.config import PROJECT_ROOT, settings
 from torale.core.database import Database, get_db
+from torale.core.response_cache import SITEMAP, response_cache
 
 # Register atom namespace once at module level (avoids per-request global mutation)
 ET.register_namespace("atom", "http://www.w3.org/2005/Atom")
 
 router = APIRouter(tags=["seo"])
 
+# Rows fetched per cursor round trip and URLs per streamed chunk
+SHARD_STREAM_BATCH_SIZE = 1000
+
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+# Public task URLs are split into shards of at most settings.sitemap_shard_size
+# (the protocol allows 50,000 URLs per sitemap), ordered by creation so new
+# tasks land in the last shard and earlier shards stay stable. Each shard is
+# read by keyset from its first (created_at, id), never by OFFSET.
+TASK_SHARD_ORDER = "ORDER BY created_at, id"
+
+
+async def _sitemap_validators(db: Database, name: str) -> tuple[str, datetime, int]:
+    """
+    ETag, Last-Modified and public task count for a sitemap, from MAX(updated_at)
+    and the number of public tasks (a task going private or being deleted
+    changes the count but not necessarily the max). The landing page and the
+    index stamp today's date, so the day is part of the validator too.
+    """
+    row = await db.fetch_one(
+        "SELECT MAX(updated_at) AS last_modified, COUNT(*) AS total FROM tasks WHERE is_public = true"
+    )
+    start_of_day = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    last_modified = max(filter(None, (row["last_modified"], start_of_day)))
+    etag = make_etag(name, settings.frontend_url, row["last_modified"], row["total"], start_of_day)
+    return etag, last_modified, row["total"]
+
 
 @router.get("/sitemap.xml")
-async def generate_sitemap_index(db: Database = Depends(get_db)):
+async def generate_sitemap_index(request: Request, db: Database = Depends(get_db)):
     """
     Sitemap index pointing at the static (frontend-served) and dynamic (backend)
     child sitemaps. Frontend owns enumerated SEO routes (publicRoutes.ts);
-    backend owns DB-derived public task pages.
+    backend owns DB-derived pages and the sharded public task sitemaps.
     """
-    base_url = settings.frontend_url
+    etag, last_modified, _ = await _sitemap_validators(db, "index")
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
 
-    latest_task_lastmod = await db.fetch_val(
-        "SELECT MAX(updated_at) FROM tasks WHERE is_public = true"
+    xml_output = await response_cache.get_or_set(
+        SITEMAP, "index", lambda: _render_sitemap_index(db)
     )
-    dynamic_lastmod = (
-        latest_task_lastmod.strftime("%Y-%m-%d")
-        if latest_task_lastmod
-        else datetime.now().strftime("%Y-%m-%d")
+    return Response(content=xml_output, media_type="application/xml", headers=headers)
+
+
+async def _fetch_task_shards(db: Database) -> list:
+    """One row per shard: its lastmod and first (created_at, id) key.
+
+    The tasks themselves never leave Postgres.
+    """
+    return await db.fetch_all(
+        f"""
+        SELECT row_index / $1 AS shard,
+               MAX(updated_at) AS lastmod,
+               MIN(created_at) AS first_created_at,
+               (ARRAY_AGG(id) FILTER (WHERE row_index % $1 = 0))[1] AS first_id
+        FROM (
+            SELECT id, created_at, updated_at,
+                   ROW_NUMBER() OVER ({TASK_SHARD_ORDER}) - 1 AS row_index
+            FROM tasks
+            WHERE is_public = true
+        ) numbered
+        GROUP BY 1
+        ORDER BY 1
+        """,
+        settings.sitemap_shard_size,
     )
-    static_lastmod = datetime.now().strftime("%Y-%m-%d")
 
-    sitemapindex = ET.Element("sitemapindex", xmlns="http://www.sitemaps.org/schemas/sitemap/0.9")
-    for loc, lastmod in (
-        (f"{base_url}/sitemap-static.xml", static_lastmod),
-        (f"{base_url}/sitemap-dynamic.xml", dynamic_lastmod),
-    ):
+
+async def _render_task_shard_starts(db: Database) -> str:
+    shards = await _fetch_task_shards(db)
+    return json.dumps(
+        [[shard["first_created_at"].isoformat(), str(shard["first_id"])] for shard in shards]
+    )
+
+
+async def _render_sitemap_index(db: Database) -> str:
+    base_url = settings.frontend_url
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    shards = await _fetch_task_shards(db)
+    dynamic_lastmod = max((shard["lastmod"] for shard in shards), default=None)
+
+    sitemaps = [
+        (f"{base_url}/sitemap-static.xml", today),
+        (
+            f"{base_url}/sitemap-dynamic.xml",
+            dynamic_lastmod.strftime("%Y-%m-%d") if dynamic_lastmod else today,
+        ),
+    ]
+    sitemaps.extend(
+        (
+            f"{base_url}/sitemaps/tasks-{shard['shard'] + 1}.xml",
+            shard["lastmod"].strftime("%Y-%m-%d"),
+        )
+        for shard in shards
+    )
+
+    sitemapindex = ET.Element("sitemapindex", xmlns=SITEMAP_NS)
+    for loc, lastmod in sitemaps:
         sitemap_elem = ET.SubElement(sitemapindex, "sitemap")
         ET.SubElement(sitemap_elem, "loc").text = loc
         ET.SubElement(sitemap_elem, "lastmod").text = lastmod
 
-    xml_output = ET.tostring(sitemapindex, encoding="utf-8", xml_declaration=True)
-    return Response(content=xml_output, media_type="application/xml")
+    return ET.tostring(sitemapindex, encoding="unicode", xml_declaration=True)
 
 
 @router.get("/sitemap-dynamic.xml")
-async def generate_sitemap_dynamic(db: Database = Depends(get_db)):
+async def generate_sitemap_dynamic(request: Request, db: Database = Depends(get_db)):
     """
-    Dynamic sitemap covering DB-derived public pages: landing, explore, changelog,
-    and every public task. Linked from /sitemap.xml (the index).
-    """
-    tasks_query = """
-        SELECT t.id, t.updated_at
-        FROM tasks t
-        WHERE t.is_public = true
-        ORDER BY t.updated_at DESC
+    Dynamic sitemap covering DB-derived landing, explore and changelog pages.
+    Public task pages are listed in the /sitemaps/tasks-N.xml shards. Linked
+    from /sitemap.xml (the index).
     """
+    etag, last_modified, _ = await _sitemap_validators(db, "dynamic")
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
+
+    xml_output = await response_cache.get_or_set(
+        SITEMAP, "dynamic", lambda: _render_sitemap_dynamic(db)
+    )
+    return Response(content=xml_output, media_type="application/xml", headers=headers)
 
-    tasks = await db.fetch_all(tasks_query)
 
+async def _render_sitemap_dynamic(db: Database) -> str:
     # Build XML sitemap using xml.etree
     base_url = settings.frontend_url
 
     # Create root element with namespace
-    urlset = ET.Element("urlset", xmlns="http://www.sitemaps.org/schemas/sitemap/0.9")
+    urlset = ET.Element("urlset", xmlns=SITEMAP_NS)
 
     # Get max updated_at from public tasks for explore page lastmod
+    latest_task_lastmod = await db.fetch_val(
+        "SELECT MAX(updated_at) FROM tasks WHERE is_public = true"
+    )
     explore_lastmod = (
-        max(task["updated_at"] for task in tasks).strftime("%Y-%m-%d")
-        if tasks
+        latest_task_lastmod.strftime("%Y-%m-%d")
+        if latest_task_lastmod
         else datetime.now().strftime("%Y-%m-%d")
     )
 
@@ -123,21 +214,83 @@ async def generate_sitemap_dynamic(db: Database = Depends(get_db)):
         if "lastmod" in page:
             ET.SubElement(url_elem, "lastmod").text = page["lastmod"]
 
-    # Public task pages
-    for task in tasks:
-        task_url = f"{base_url}/tasks/{task['id']}"
-        lastmod = task["updated_at"].strftime("%Y-%m-%d")
+    # Convert to XML with declaration
+    return ET.tostring(urlset, encoding="unicode", xml_declaration=True)
 
-        url_elem = ET.SubElement(urlset, "url")
-        ET.SubElement(url_elem, "loc").text = task_url
-        ET.SubElement(url_elem, "lastmod").text = lastmod
-        ET.SubElement(url_elem, "changefreq").text = "weekly"
-        ET.SubElement(url_elem, "priority").text = "0.8"
 
-    # Convert to XML with declaration
-    xml_output = ET.tostring(urlset, encoding="utf-8", xml_declaration=True)
+@router.get("/sitemaps/tasks-{shard}.xml")
+async def generate_sitemap_tasks(
+    request: Request, shard: int = PathParam(..., ge=1), db: Database = Depends(get_db)
+):
+    """
+    One shard of public task pages, streamed from a server-side cursor so
+    memory stays flat however many public tasks exist. Not held in the
+    response cache; the validators below and Cache-Control cover repeat
+    crawls.
+    """
+    etag, last_modified, total = await _sitemap_validators(db, f"tasks-{shard}")
+    if shard > max(1, math.ceil(total / settings.sitemap_shard_size)):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sitemap not found")
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
+
+    # Shard start keys, cached and invalidated with the sitemaps
+    starts = json.loads(
+        await response_cache.get_or_set(
+            SITEMAP, "task-shard-starts", lambda: _render_task_shard_starts(db)
+        )
+    )
+    if shard > len(starts):
+        if shard > 1:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sitemap not found")
+        start = None  # No public tasks yet: an empty first shard
+    else:
+        created_at, task_id = starts[shard - 1]
+        start = (datetime.fromisoformat(created_at), UUID(task_id))
+
+    return StreamingResponse(
+        _stream_task_shard(db, start), media_type="application/xml", headers=headers
+    )
+
 
-    return Response(content=xml_output, media_type="application/xml")
+async def _stream_task_shard(
+    db: Database, start: tuple[datetime, UUID] | None
+) -> AsyncIterator[str]:
+    """Stream the shard beginning at the `start` (created_at, id) key."""
+    task_url = f"{escape(settings.frontend_url)}/tasks/"
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">'
+
+    if start is None:
+        yield "</urlset>"
+        return
+
+    async with db.acquire() as conn, conn.transaction(readonly=True):
+        batch = []
+        async for task in conn.cursor(
+            f"""
+            SELECT id, updated_at
+            FROM tasks
+            WHERE is_public = true AND (created_at, id) >= ($1, $2)
+            {TASK_SHARD_ORDER}
+            LIMIT $3
+            """,
+            *start,
+            settings.sitemap_shard_size,
+            prefetch=SHARD_STREAM_BATCH_SIZE,
+        ):
+            batch.append(
+                f"<url><loc>{task_url}{task['id']}</loc>"
+                f"<lastmod>{task['updated_at'].strftime('%Y-%m-%d')}</lastmod>"
+                "<changefreq>weekly</changefreq><priority>0.8</priority></url>"
+            )
+            if len(batch) >= SHARD_STREAM_BATCH_SIZE:
+                yield "".join(batch)
+                batch.clear()
+        if batch:
+            yield "".join(batch)
+
+    yield "</urlset>"
 
 
 @router.get("/changelog.xml")
@@ -1,4 +1,3 @@
-import asyncio
 import json
 import logging
 import secrets
@@ -7,11 +6,21 @@ from uuid import UUID
 
 from apscheduler.jobstores.base import JobLookupError
 from asyncpg.exceptions import UniqueViolationError
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from pydantic import BaseModel, Field
 
 from torale.access import CurrentUser, OptionalUser
 from torale.api.rate_limiter import get_user_or_ip, limiter
+from torale.api.utils.pagination import NEXT_CURSOR_HEADER, parse_cursor
 from torale.api.utils.task_parsers import (
     fetch_feed_executions,
     parse_execution_row,
@@ -20,9 +29,11 @@ from torale.api.utils.task_parsers import (
 )
 from torale.core.config import settings
 from torale.core.database import Database, get_db
+from torale.core.response_cache import invalidate_public_task
 from torale.core.views import increment_view
 from torale.notifications import NotificationValidationError, validate_notification
 from torale.scheduler.job import execute_task_job_manual
+from torale.scheduler.leases import leases_enabled, unschedule_task
 from torale.scheduler.scheduler import get_scheduler
 from torale.tasks import (
     FeedExecution,
@@ -35,6 +46,7 @@ from torale.tasks import (
 )
 from torale.tasks.repository import TaskRepository
 from torale.tasks.service import InvalidTransitionError, TaskService
+from torale.utils.cursor import encode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -331,12 +343,15 @@ async def start_task_execution(
         )
 
     # Cancel any pending retry jobs before starting manual execution
-    scheduler = get_scheduler()
-    job_id = f"task-{task_id}"
-    existing_job = await asyncio.to_thread(scheduler.get_job, job_id)
-    if existing_job:
-        await asyncio.to_thread(scheduler.remove_job, job_id)
-        logger.info(f"Cancelled pending retry job for task {task_id} (manual run triggered)")
+    if leases_enabled():
+        await unschedule_task(task_id)
+    else:
+        scheduler = get_scheduler()
+        job_id = f"task-{task_id}"
+        existing_job = scheduler.get_job(job_id)
+        if existing_job:
+            scheduler.remove_job(job_id)
+            logger.info(f"Cancelled pending retry job for task {task_id} (manual run triggered)")
 
     # Inherit retry count from last execution (if it exists)
     last_execution = await db.fetch_one(
@@ -459,6 +474,8 @@ async def update_task_visibility(
         request.is_public,
         task_id,
     )
+    if task["is_public"] or request.is_public:
+        await invalidate_public_task(task_id)
 
     return VisibilityUpdateResponse(is_public=request.is_public)
 
@@ -588,6 +605,9 @@ async def fork_task(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to fork task",
         )
+    if source["is_public"] and not is_owner:
+        # subscriber_count changed
+        await invalidate_public_task(task_id)
 
     return Task(**parse_task_row(forked_row))
 
@@ -739,6 +759,8 @@ async def update_task(
     fresh_row = await repo.find_by_id_with_execution(task_id)
     if not fresh_row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    if existing.get("is_public"):
+        await invalidate_public_task(task_id)
 
     return parse_task_with_execution(fresh_row)
 
@@ -747,7 +769,7 @@ async def update_task(
 async def delete_task(task_id: UUID, user: CurrentUser, db: Database = Depends(get_db)):
     # Delete from DB first (verifies ownership before touching scheduler)
     row = await db.fetch_one(
-        "DELETE FROM tasks WHERE id = $1 AND user_id = $2 RETURNING id",
+        "DELETE FROM tasks WHERE id = $1 AND user_id = $2 RETURNING id, is_public",
         task_id,
         user.id,
     )
@@ -757,6 +779,12 @@ async def delete_task(task_id: UUID, user: CurrentUser, db: Database = Depends(g
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
         )
+    if row.get("is_public"):
+        await invalidate_public_task(task_id)
+
+    if leases_enabled():
+        # The tasks row was the schedule; nothing left to remove
+        return None
 
     # Now safe to remove scheduler job — ownership verified by successful DELETE
     job_id = f"task-{task_id}"
@@ -810,14 +838,31 @@ async def execute_task(
 
 
 async def _fetch_task_executions(
-    db: Database, task_id: UUID, user, limit: int, *, notifications_only: bool = False
+    db: Database,
+    task_id: UUID,
+    user,
+    limit: int,
+    response: Response,
+    cursor: str | None = None,
+    *,
+    notifications_only: bool = False,
 ) -> list[TaskExecution]:
-    """Fetch task executions with access control. Optionally filter to notifications only."""
+    """
+    Fetch task executions with access control. Optionally filter to notifications only.
+
+    Pages are read by keyset on (started_at, id); when the page is full the
+    cursor for the next one is returned in the X-Next-Cursor header.
+    """
+    before = parse_cursor(cursor, datetime, UUID)
     _, is_owner = await _check_task_access(db, task_id, user)
 
+    params: list = [task_id, limit]
     where = "WHERE task_id = $1"
     if notifications_only:
         where += " AND notification IS NOT NULL"
+    if before is not None:
+        where += " AND (started_at, id) < ($3, $4)"
+        params.extend(before)
 
     query = f"""
         SELECT id, task_id, status, started_at, completed_at,
@@ -825,11 +870,13 @@ async def _fetch_task_executions(
                created_at
         FROM task_executions
         {where}
-        ORDER BY started_at DESC
+        ORDER BY started_at DESC, id DESC
         LIMIT $2
     """
 
-    rows = await db.fetch_all(query, task_id, limit)
+    rows = await db.fetch_all(query, *params)
+    if len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1]["started_at"], rows[-1]["id"])
 
     executions = [TaskExecution(**parse_execution_row(row)) for row in rows]
     if not is_owner:
@@ -840,17 +887,29 @@ async def _fetch_task_executions(
 
 @router.get("/{task_id}/executions", response_model=list[TaskExecution])
 async def get_task_executions(
-    task_id: UUID, user: OptionalUser, limit: int = 100, db: Database = Depends(get_db)
+    task_id: UUID,
+    user: OptionalUser,
+    response: Response,
+    limit: int = 100,
+    cursor: str | None = None,
+    db: Database = Depends(get_db),
 ):
-    return await _fetch_task_executions(db, task_id, user, limit)
+    return await _fetch_task_executions(db, task_id, user, limit, response, cursor)
 
 
 @router.get("/{task_id}/notifications", response_model=list[TaskExecution])
 async def get_task_notifications(
-    task_id: UUID, user: OptionalUser, limit: int = 100, db: Database = Depends(get_db)
+    task_id: UUID,
+    user: OptionalUser,
+    response: Response,
+    limit: int = 100,
+    cursor: str | None = None,
+    db: Database = Depends(get_db),
 ):
     """
     Get task executions where the condition was met (notifications).
     This filters executions to only show when the monitoring condition triggered.
     """
-    return await _fetch_task_executions(db, task_id, user, limit, notifications_only=True)
+    return await _fetch_task_executions(
+        db, task_id, user, limit, response, cursor, notifications_only=True
+    )
@@ -123,7 +123,6 @@ async def test_webhook(request: Request, test_req: WebhookTestRequest, user: Cur
     success, http_status, error, _ = await service.deliver(
         str(test_req.webhook_url), payload, test_req.webhook_secret, attempt=1
     )
-    await service.close()
 
     if success:
         return {
@@ -0,0 +1,62 @@
+"""Conditional GET (ETag / Last-Modified / 304) for public reads.
+
+Validators are derived from cheap columns (tasks.updated_at,
+last_execution_id, MAX(updated_at)) so a matching If-None-Match or
+If-Modified-Since can be answered before any rows are fetched or XML is
+serialized.
+"""
+
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+from torale.core.config import settings
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the validator parts (same parts -> same body)."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def public_cache_control() -> str:
+    return (
+        f"public, max-age={settings.public_http_max_age_seconds}, "
+        f"stale-while-revalidate={settings.public_http_stale_while_revalidate_seconds}"
+    )
+
+
+def validator_headers(
+    etag: str, last_modified: datetime | None, cache_control: str | None = None
+) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": cache_control or public_cache_control()}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(UTC), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since per RFC 9110."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison: W/ prefixes are ignored
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    # HTTP dates have second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -0,0 +1,38 @@
+"""Keyset pagination helpers for API endpoints (see torale.utils.cursor)."""
+
+import json
+
+from fastapi import HTTPException, status
+
+from torale.core.database import Database
+from torale.utils.cursor import decode_cursor
+
+# Endpoints that return a bare list carry the next page's cursor in a header
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Totals the planner estimates below this are counted exactly; above it the
+# estimate is returned, since an exact COUNT(*) scans every matching row
+EXACT_COUNT_THRESHOLD = 10_000
+
+
+def parse_cursor(cursor: str | None, *types: type) -> tuple | None:
+    """Decode a ``cursor`` query parameter, rejecting malformed values with 400."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, *types)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from e
+
+
+async def estimate_total(db: Database, query: str, *args) -> int:
+    """Row count of a SELECT for a paginated total, approximate when large.
+
+    Uses the planner's row estimate (EXPLAIN), falling back to an exact
+    COUNT(*) when the estimate is under EXACT_COUNT_THRESHOLD, where counting
+    is cheap and statistics on small tables are least reliable.
+    """
+    plan = json.loads(await db.fetch_val(f"EXPLAIN (FORMAT JSON) {query}", *args))
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate >= EXACT_COUNT_THRESHOLD:
+        return estimate
+    return await db.fetch_val(f"SELECT COUNT(*) FROM ({query}) AS counted", *args) or 0
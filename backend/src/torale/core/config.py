@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -24,6 +25,8 @@ class Settings(BaseSettings):
     agent_url: str = "http://localhost:8001"  # Keep for backward compatibility
     agent_url_free: str = "http://localhost:8001"
     agent_url_paid: str = "http://localhost:8002"
+    # Wait for agent results over SSE (message/stream); tasks/get polling is the fallback
+    agent_streaming: bool = True
 
     openai_api_key: str | None = None
     anthropic_api_key: str | None = None
@@ -58,6 +61,21 @@ class Settings(BaseSettings):
     # Path to changelog.json file (relative to project root or absolute path)
     changelog_json_path: str = "static/changelog.json"
 
+    # Verified Clerk principals (email, DB user id) cached per JWT sub+sid;
+    # shared through Redis when configured
+    auth_principal_cache_ttl_seconds: int = 300
+    auth_principal_cache_max_entries: int = 10000
+    # Verified API keys skip bcrypt for this long; revocation drops them at once
+    api_key_cache_ttl_seconds: int = 60
+    api_key_cache_max_entries: int = 10000
+    api_key_last_used_flush_seconds: int = 60
+    # Role checks read users.role (mirrored from Clerk) through an in-process
+    # cache; Clerk is only asked for never-synced users and mirror rows older
+    # than role_mirror_max_age_seconds, this many at a time
+    role_cache_ttl_seconds: int = 300
+    role_mirror_max_age_seconds: int = 3600
+    role_clerk_fallback_concurrency: int = 4
+
     # Development/testing mode - disable authentication
     torale_noauth: bool = False
     torale_noauth_email: str = "test@example.com"
@@ -66,10 +84,82 @@ class Settings(BaseSettings):
     max_users: int = 100
     max_active_tasks_per_user: int = 50
 
+    # Task dispatch backend. "apscheduler" fires task-{id} jobs from one in-process
+    # scheduler (single replica only). "lease" claims due tasks from tasks.next_run
+    # with FOR UPDATE SKIP LOCKED, so API replicas and workers can all dispatch.
+    scheduler_backend: Literal["apscheduler", "lease"] = "apscheduler"
+    # Run the lease dispatcher inside the API process. Disable when a separate
+    # worker deployment (python -m torale.scheduler.worker) does the dispatching.
+    scheduler_dispatch_in_api: bool = True
+    scheduler_poll_interval_seconds: float = 5.0
+    scheduler_claim_batch_size: int = 20
+    scheduler_max_in_flight: int = 20
+    # Extended every third of its length while the execution is queued or running;
+    # a lease only expires (and can be re-claimed) when its node stops renewing it
+    scheduler_lease_seconds: int = 900
+
+    # Execution concurrency, per API/worker process (0 = unlimited). Runs beyond
+    # the caps wait in a queue served round-robin across users.
+    execution_max_concurrency: int = 20
+    execution_max_per_user: int = 3
+    # In-flight agent calls per tier; keeps bursts from tripping free-tier 429s
+    agent_max_concurrency_free: int = 8
+    agent_max_concurrency_paid: int = 4
+
+    # Shared webhook HTTP client (per process). Connections to customer
+    # endpoints are kept alive and reused across deliveries.
+    webhook_max_connections: int = 100
+    webhook_max_connections_per_host: int = 10
+    webhook_keepalive_expiry_seconds: float = 30.0
+    # Failed deliveries are retried from webhook_deliveries.next_retry_at
+    webhook_retry_interval_seconds: int = 30
+    webhook_retry_batch_size: int = 50
+    # Notification outbox dispatcher (torale.scheduler.outbox). Runs in the API
+    # unless disabled; the standalone worker always runs one.
+    notification_dispatch_in_api: bool = True
+    notification_poll_interval_seconds: float = 5.0
+    notification_batch_size: int = 50
+    notification_max_concurrency: int = 20
+    # Processed outbox rows are deleted after this long (0 keeps them forever)
+    notification_outbox_retention_days: int = 14
+
+    # Public explore/feed/RSS/sitemap responses (torale.core.response_cache)
+    public_cache_ttl_seconds: int = 300
+    public_cache_max_entries: int = 1000
+    # Cache-Control on conditional public reads (RSS, sitemaps, public task),
+    # so CDNs and feed readers can absorb polling
+    public_http_max_age_seconds: int = 300
+    public_http_stale_while_revalidate_seconds: int = 600
+    # Public task URLs per sitemap shard (protocol maximum is 50,000)
+    sitemap_shard_size: int = 50000
+
+    # Admin dashboard rollups (torale.scheduler.stats)
+    admin_stats_refresh_minutes: int = 5
+    # Recent hours re-aggregated on each refresh (executions change status after starting)
+    admin_stats_rollup_lookback_hours: int = 6
+
+    # Execution history retention (torale.scheduler.retention)
+    # Finished executions older than this move to task_executions_archive (0 disables)
+    execution_retention_days: int = 90
+    # Newest successful executions always kept per task (prompt history, RSS)
+    execution_keep_last_per_task: int = 50
+    # Monthly archive partitions older than this are dropped (0 keeps them forever)
+    execution_archive_retention_months: int = 24
+    execution_archive_batch_size: int = 1000
+    execution_archive_interval_minutes: int = 60
+
     # Redis (optional — for async view counting)
     redis_host: str | None = None
     redis_port: int = 6379
     redis_password: str | None = None
+    # Views are coalesced in memory per task, then sent to Redis in one
+    # pipeline every view_flush_interval_ms or view_flush_max_events views;
+    # without Redis they are written to Postgres every view_db_flush_seconds
+    view_flush_interval_ms: int = 250
+    view_flush_max_events: int = 500
+    view_db_flush_seconds: int = 30
+    # Tasks per UPDATE (and per HSCAN page) when writing view counts to Postgres
+    view_flush_chunk_size: int = 5000
 
     # PostHog analytics
     posthog_api_key: str | None = None
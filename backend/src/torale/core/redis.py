@@ -17,7 +17,7 @@ class RedisClient:
     async def connect(self):
         """Create Redis connection. No-op if Redis is not configured."""
         if not settings.redis_host:
-            logger.info("Redis not configured, view counting disabled")
+            logger.info("Redis not configured, view counts written to Postgres directly")
             return
         if self.client is not None:
             return
@@ -34,7 +34,9 @@ class RedisClient:
             await self.client.ping()
             logger.info("Redis connection established")
         except RedisError:
-            logger.warning("Redis connection failed, view counting disabled", exc_info=True)
+            logger.warning(
+                "Redis connection failed, view counts written to Postgres directly", exc_info=True
+            )
             self.client = None
 
     async def disconnect(self):
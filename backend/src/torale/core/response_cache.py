@@ -0,0 +1,109 @@
+"""Read-through cache for public, DB-derived responses.
+
+Explore, feed, RSS and sitemap traffic is mostly anonymous and crawler
+driven, and those responses change only when a public task does. Rendered
+bodies are cached per namespace (endpoint) and key (parameters) in Redis when
+it is connected, or in a bounded in-process LRU otherwise. Everything that
+changes a public task calls invalidate_public_task; a TTL bounds staleness
+for what is not invalidated explicitly (e.g. view counts behind "popular").
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from torale.core.config import settings
+from torale.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Namespaces
+PUBLIC_TASKS = "public_tasks"
+PUBLIC_FEED = "public_feed"
+SITEMAP = "sitemap"
+TASK_RSS = "task_rss"
+
+REDIS_KEY_PREFIX = "cache"
+
+
+class ResponseCache:
+    """Namespaced TTL cache of rendered response bodies."""
+
+    def __init__(self, ttl_seconds: int | None = None, max_entries: int | None = None):
+        self.ttl_seconds = ttl_seconds or settings.public_cache_ttl_seconds
+        self.max_entries = max_entries or settings.public_cache_max_entries
+        self._local: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+
+    async def get(self, namespace: str, key: str) -> str | None:
+        if redis_client.client is not None:
+            try:
+                return await redis_client.client.get(f"{REDIS_KEY_PREFIX}:{namespace}:{key}")
+            except RedisError:
+                logger.debug("Redis response cache read failed", exc_info=True)
+
+        entry = self._local.get((namespace, key))
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._local[(namespace, key)]
+            return None
+        self._local.move_to_end((namespace, key))
+        return entry[1]
+
+    async def set(self, namespace: str, key: str, value: str) -> None:
+        if redis_client.client is not None:
+            redis_key = f"{REDIS_KEY_PREFIX}:{namespace}:{key}"
+            index_key = f"{REDIS_KEY_PREFIX}:{namespace}:keys"
+            try:
+                async with redis_client.client.pipeline(transaction=False) as pipe:
+                    pipe.set(redis_key, value, ex=self.ttl_seconds)
+                    pipe.sadd(index_key, redis_key)
+                    pipe.expire(index_key, self.ttl_seconds)
+                    await pipe.execute()
+                return
+            except RedisError:
+                logger.debug("Redis response cache write failed", exc_info=True)
+
+        self._local[(namespace, key)] = (time.monotonic() + self.ttl_seconds, value)
+        self._local.move_to_end((namespace, key))
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def invalidate(self, *namespaces: str) -> None:
+        """Drop every cached entry in the given namespaces."""
+        for key in [key for key in self._local if key[0] in namespaces]:
+            del self._local[key]
+        if redis_client.client is None:
+            return
+        try:
+            for namespace in namespaces:
+                index_key = f"{REDIS_KEY_PREFIX}:{namespace}:keys"
+                keys = await redis_client.client.smembers(index_key)
+                await redis_client.client.delete(index_key, *keys)
+        except RedisError:
+            logger.warning(f"Failed to invalidate response cache {namespaces}", exc_info=True)
+
+    async def get_or_set(
+        self, namespace: str, key: str, build: Callable[[], Awaitable[str]]
+    ) -> str:
+        """Return the cached body, or build, cache and return it."""
+        value = await self.get(namespace, key)
+        if value is None:
+            value = await build()
+            await self.set(namespace, key, value)
+        return value
+
+    def clear(self) -> None:
+        self._local.clear()
+
+
+response_cache = ResponseCache()
+
+
+async def invalidate_public_task(task_id: UUID | str) -> None:
+    """Drop cached public responses that may include this task."""
+    await response_cache.invalidate(PUBLIC_TASKS, PUBLIC_FEED, SITEMAP, f"{TASK_RSS}:{task_id}")
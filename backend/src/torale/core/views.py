@@ -1,9 +1,23 @@
+"""Public task view counting.
+
+increment_view only bumps an in-process counter. ViewAggregator coalesces
+those per task and flushes them in the background: with Redis, as one
+pipelined HINCRBY batch into the task_views hash (written to Postgres by
+flush_views_to_postgres); without Redis, straight into tasks.view_count.
+A flush starts after a short delay or once enough views are pending, so a
+crawler burst costs a handful of round-trips instead of one task and one
+Redis call per view. After a failed Postgres write the views are kept and
+retried after view_db_flush_seconds, not on the next view.
+"""
+
 import asyncio
 import logging
+from collections import Counter
 from uuid import UUID
 
 from redis.exceptions import RedisError, ResponseError
 
+from torale.core.config import settings
 from torale.core.database import db
 from torale.core.redis import redis_client
 
@@ -13,47 +27,158 @@ TASK_VIEWS_KEY = "task_views"
 _PROCESSING_KEY = f"{TASK_VIEWS_KEY}:processing"
 
 
-async def _increment_view(task_id: UUID) -> None:
-    try:
-        await redis_client.client.hincrby(TASK_VIEWS_KEY, str(task_id), 1)
-    except RedisError:
-        logger.debug("Redis view increment failed", exc_info=True)
+async def _add_view_counts(updates: list[tuple[int, str]]) -> None:
+    """Add (count, task_id) view increments to tasks.view_count.
+
+    One set-based UPDATE per view_flush_chunk_size tasks. Rows are locked
+    explicitly in id order first (the UPDATE's join plan would otherwise pick
+    the order), so concurrent flushes touching the same tasks cannot deadlock.
+    """
+    chunk_size = settings.view_flush_chunk_size
+    for start in range(0, len(updates), chunk_size):
+        chunk = updates[start : start + chunk_size]
+        await db.execute(
+            """
+            WITH locked AS (
+                SELECT t.id, v.views
+                FROM tasks t
+                JOIN unnest($1::uuid[], $2::int[]) AS v(id, views) ON t.id = v.id
+                ORDER BY t.id
+                FOR UPDATE OF t
+            )
+            UPDATE tasks t
+            SET view_count = t.view_count + locked.views
+            FROM locked
+            WHERE t.id = locked.id
+            """,
+            [task_id for _, task_id in chunk],
+            [count for count, _ in chunk],
+        )
+
+
+class ViewAggregator:
+    """task_id -> views not yet sent to Redis (or Postgres), flushed in batches."""
+
+    def __init__(self):
+        self._pending: Counter[UUID] = Counter()
+        self._pending_events = 0
+        self._timer: asyncio.TimerHandle | None = None
+        # Set after a failed write: the retry waits for the timer, however many
+        # views arrive meanwhile
+        self._retrying = False
+        self._flushes: set[asyncio.Task] = set()
+
+    @property
+    def pending_events(self) -> int:
+        return self._pending_events
+
+    def add(self, task_id: UUID) -> None:
+        self._pending[task_id] += 1
+        self._pending_events += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop (sync caller); the next explicit flush picks it up
+
+        if self._pending_events >= settings.view_flush_max_events and not self._retrying:
+            self._start_flush()
+        elif self._timer is None:
+            delay = (
+                settings.view_flush_interval_ms / 1000
+                if redis_client.client is not None
+                else settings.view_db_flush_seconds
+            )
+            self._timer = loop.call_later(delay, self._start_flush)
+
+    def _start_flush(self) -> None:
+        task = asyncio.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> int:
+        """Send pending views to Redis, or Postgres without it. Returns tasks flushed."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._retrying = False
+        if not self._pending:
+            return 0
+        pending = self._pending
+        self._pending = Counter()
+        self._pending_events = 0
+
+        if redis_client.client is not None:
+            try:
+                async with redis_client.client.pipeline(transaction=False) as pipe:
+                    for task_id, count in pending.items():
+                        pipe.hincrby(TASK_VIEWS_KEY, str(task_id), count)
+                    await pipe.execute()
+                return len(pending)
+            except RedisError:
+                logger.debug("Redis view increment failed, writing to Postgres", exc_info=True)
+
+        try:
+            await _add_view_counts([(count, str(task_id)) for task_id, count in pending.items()])
+        except Exception:
+            logger.warning("Failed to write view counts", exc_info=True)
+            # Keep the views, and retry on the Postgres flush interval
+            self._pending.update(pending)
+            self._pending_events += sum(pending.values())
+            self._retrying = True
+            if self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(
+                    settings.view_db_flush_seconds, self._start_flush
+                )
+            return 0
+        return len(pending)
+
+
+view_aggregator = ViewAggregator()
 
 
 def increment_view(task_id: UUID) -> None:
-    """Fire-and-forget view count increment. Does not block the caller."""
-    if redis_client.client is None:
-        return
-    asyncio.create_task(_increment_view(task_id))
+    """Count a view of a task. Does not block the caller."""
+    view_aggregator.add(task_id)
 
 
 async def _flush_key(key: str) -> int:
-    """Flush a single Redis hash of view counts to Postgres. Returns count flushed."""
-    counts = await redis_client.client.hgetall(key)
-    if not counts:
-        await redis_client.client.delete(key)
-        return 0
-
-    updates = []
-    for task_id, count_str in counts.items():
+    """Flush a single Redis hash of view counts to Postgres. Returns count flushed.
+
+    The hash is read with HSCAN a chunk at a time; each chunk is written and
+    then removed from the hash, so memory stays bounded and a failed flush
+    leaves only the unwritten counts behind for recovery.
+    """
+    flushed = 0
+    chunk: list[tuple[int, str]] = []
+    async for task_id, count_str in redis_client.client.hscan_iter(
+        key, count=settings.view_flush_chunk_size
+    ):
         n = int(count_str)
         if n > 0:
-            updates.append((n, task_id))
+            chunk.append((n, task_id))
+        if len(chunk) >= settings.view_flush_chunk_size:
+            flushed += await _flush_chunk(key, chunk)
+            chunk = []
+    if chunk:
+        flushed += await _flush_chunk(key, chunk)
 
-    if not updates:
-        await redis_client.client.delete(key)
-        return 0
-
-    await db.executemany(
-        "UPDATE tasks SET view_count = view_count + $1 WHERE id = $2::uuid",
-        updates,
-    )
     await redis_client.client.delete(key)
-    return len(updates)
+    return flushed
+
+
+async def _flush_chunk(key: str, chunk: list[tuple[int, str]]) -> int:
+    await _add_view_counts(chunk)
+    await redis_client.client.hdel(key, *(task_id for _, task_id in chunk))
+    return len(chunk)
 
 
 async def flush_views_to_postgres() -> None:
-    """Sync accumulated Redis view counts to Postgres, then clear."""
+    """Sync accumulated Redis view counts to Postgres, then clear.
+
+    Views still buffered in this process are flushed first, so calling this
+    at shutdown loses nothing.
+    """
+    await view_aggregator.flush()
     if redis_client.client is None:
         return
 
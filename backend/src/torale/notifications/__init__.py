@@ -12,7 +12,14 @@ from pydantic import ValidationError as PydanticValidationError
 
 from .email import EmailVerificationService
 from .novu_service import novu_service
-from .webhook import WebhookDeliveryService, WebhookPayload, WebhookSignature, build_webhook_payload
+from .webhook import (
+    WebhookDeliveryService,
+    WebhookPayload,
+    WebhookSignature,
+    build_webhook_payload,
+    close_webhook_client,
+    get_webhook_client,
+)
 
 __all__ = [
     "NotificationValidationError",
@@ -22,6 +29,8 @@ __all__ = [
     "EmailVerificationService",
     "WebhookDeliveryService",
     "build_webhook_payload",
+    "close_webhook_client",
+    "get_webhook_client",
     "WebhookPayload",
     "WebhookSignature",
     "novu_service",
@@ -2,21 +2,86 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import hmac
+import importlib.util
 import secrets
 import time
-from datetime import datetime, timedelta
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Literal
+from urllib.parse import urlsplit
 
 import httpx
 from pydantic import BaseModel
 
+from torale.core.config import settings
 from torale.utils.jsonb import parse_jsonb
 
 if TYPE_CHECKING:
     from torale.scheduler.models import EnrichedExecutionResult
 
+WEBHOOK_TIMEOUT = 10  # seconds
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_client: httpx.AsyncClient | None = None
+# host -> [semaphore, holders]; entries are dropped when no delivery holds them
+_host_slots: dict[str, list] = {}
+
+
+def get_webhook_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for webhook deliveries, created on first use.
+
+    Closed by close_webhook_client() on API/worker shutdown.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=WEBHOOK_TIMEOUT,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.webhook_max_connections,
+                max_keepalive_connections=settings.webhook_max_connections,
+                keepalive_expiry=settings.webhook_keepalive_expiry_seconds,
+            ),
+        )
+    return _client
+
+
+async def close_webhook_client() -> None:
+    """Close the shared webhook client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@asynccontextmanager
+async def _host_slot(url: str) -> AsyncIterator[None]:
+    """Cap concurrent deliveries (and so pooled connections) per destination host.
+
+    httpx only limits the pool as a whole, so one slow endpoint could
+    otherwise hold every connection.
+    """
+    limit = settings.webhook_max_connections_per_host
+    if limit <= 0:
+        yield
+        return
+    host = urlsplit(url).netloc.lower()
+    entry = _host_slots.setdefault(host, [asyncio.Semaphore(limit), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _host_slots[host]
+
 
 class WebhookPayload(BaseModel):
     """Standard webhook payload format (inspired by Stripe/GitHub)."""
@@ -93,14 +158,17 @@ class WebhookSignature:
 
 
 class WebhookDeliveryService:
-    """Handle webhook HTTP delivery with retries."""
+    """Handle webhook HTTP delivery with retries.
+
+    Uses the process-wide pooled client unless one is passed in.
+    """
 
     # Exponential backoff schedule: 1min, 5min, 15min (total ~21 minutes)
     RETRY_DELAYS = [60, 300, 900]  # seconds
-    TIMEOUT = 10  # seconds
+    TIMEOUT = WEBHOOK_TIMEOUT
 
-    def __init__(self):
-        self.client = httpx.AsyncClient(timeout=self.TIMEOUT)
+    def __init__(self, client: httpx.AsyncClient | None = None):
+        self.client = client or get_webhook_client()
 
     async def deliver(
         self,
@@ -137,7 +205,8 @@ class WebhookDeliveryService:
                     headers[k] = v
 
         try:
-            response = await self.client.post(url, content=payload_json, headers=headers)
+            async with _host_slot(url):
+                response = await self.client.post(url, content=payload_json, headers=headers)
 
             # Consider 2xx as success
             if 200 <= response.status_code < 300:
@@ -155,10 +224,6 @@ class WebhookDeliveryService:
         except httpx.RequestError as e:
             return (False, None, f"Request error: {str(e)}", signature)
 
-    async def close(self):
-        """Close HTTP client."""
-        await self.client.aclose()
-
     @classmethod
     def get_next_retry_time(cls, attempt: int) -> datetime | None:
         """Calculate next retry time based on attempt number."""
@@ -166,7 +231,7 @@ class WebhookDeliveryService:
             return None  # No more retries
 
         delay_seconds = cls.RETRY_DELAYS[attempt - 1]
-        return datetime.utcnow() + timedelta(seconds=delay_seconds)
+        return datetime.now(UTC) + timedelta(seconds=delay_seconds)
 
 
 def build_webhook_payload(
@@ -129,13 +129,13 @@ class WebhookRepository(BaseRepository):
             List of delivery records ready for retry
         """
         query = PostgreSQLQuery.from_(self.deliveries).select("*")
-        query = query.where(self.deliveries.status == Parameter("$1"))
-        query = query.where(self.deliveries.next_retry_at.isnotnull())
+        query = query.where(self.deliveries.delivered_at.isnull())
+        query = query.where(self.deliveries.failed_at.isnull())
         query = query.where(self.deliveries.next_retry_at <= Now())
         query = query.orderby(self.deliveries.next_retry_at, order=Order.asc)
-        query = query.limit(Parameter("$2"))
+        query = query.limit(Parameter("$1"))
 
-        return await self.db.fetch_all(str(query), "failed", limit)
+        return await self.db.fetch_all(str(query), limit)
 
     async def find_by_task(self, task_id: UUID, limit: int = 50, offset: int = 0) -> list[dict]:
         """Find webhook deliveries for a task.
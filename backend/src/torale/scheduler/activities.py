@@ -20,9 +20,11 @@ from torale.scheduler.history import ExecutionRecord
 from torale.scheduler.models import (
     AgentExecutionResult,
     EnrichedExecutionResult,
+    ExecutionContext,
     NotificationContext,
 )
 from torale.tasks import NotificationConfig, TaskStatus
+from torale.utils.jsonb import parse_jsonb
 
 logger = logging.getLogger(__name__)
 
@@ -61,42 +63,244 @@ async def persist_execution_result(
     - notification, grounding_sources -> task_executions columns
     - Full agent_result -> result JSONB
     """
-    now_utc = datetime.now(UTC)
+    finalizer = ExecutionFinalizer(task_id, execution_id)
+    finalizer.succeed(agent_result)
+    await finalizer.commit()
 
-    evidence = agent_result.evidence
-    last_known_state = {"evidence": evidence} if evidence else None
-    grounding_sources_json = json.dumps([s.model_dump() for s in agent_result.grounding_sources])
 
-    async with db.acquire() as conn:
-        async with conn.transaction():
-            await conn.execute(
-                """
-                UPDATE task_executions
-                SET status = $1, result = $2, completed_at = $3,
-                    notification = $4, grounding_sources = $5
-                WHERE id = $6
-                """,
-                TaskStatus.SUCCESS.value,
-                agent_result.model_dump_json(),
-                now_utc,
-                agent_result.notification,
-                grounding_sources_json,
-                UUID(execution_id),
-            )
+class ExecutionFinalizer:
+    """Write-behind buffer for an execution's terminal writes.
 
-            await conn.execute(
-                """
-                UPDATE tasks
-                SET last_known_state = $1,
-                    updated_at = $2,
-                    last_execution_id = $3
-                WHERE id = $4
-                """,
-                json.dumps(last_known_state) if last_known_state else None,
-                now_utc,
-                UUID(execution_id),
-                UUID(task_id),
-            )
+    Collects the success result, task updates (rename, next_run), outbox
+    notifications and connector usage while an execution runs, then commits
+    them all in one transaction on one connection.
+    """
+
+    def __init__(self, task_id: str, execution_id: str):
+        self.task_id = UUID(task_id)
+        self.execution_id = UUID(execution_id)
+        self.completed_at: datetime | None = None
+        self._agent_result: AgentExecutionResult | None = None
+        self._result_flags: dict = {}
+        self._task_name: str | None = None
+        self._set_next_run = False
+        self._next_run: datetime | None = None
+        self._outbox: list[tuple] = []
+        self._connector_user_id: UUID | None = None
+        self._connector_slugs: list[str] = []
+
+    def succeed(self, agent_result: AgentExecutionResult) -> None:
+        self._agent_result = agent_result
+        self.completed_at = datetime.now(UTC)
+
+    def merge_result(self, data: dict) -> None:
+        """Merge extra keys (e.g. notification_failed) into the execution's result JSONB."""
+        self._result_flags.update(data)
+
+    def rename_task(self, name: str) -> None:
+        self._task_name = name
+
+    def set_next_run(self, next_run: datetime | None) -> None:
+        """Persist tasks.next_run (None clears it) and reset any pending retry state."""
+        self._set_next_run = True
+        self._next_run = next_run
+
+    def mark_connectors_used(self, user_id: UUID, toolkit_slugs: list[str]) -> None:
+        self._connector_user_id = user_id
+        self._connector_slugs = list(toolkit_slugs)
+
+    def enqueue_notification(
+        self, user_id: str, channel: str, task_name: str, result: EnrichedExecutionResult
+    ) -> None:
+        """Queue a notification for the outbox dispatcher; written with the result."""
+        payload = {"task_name": task_name, "result": result.model_dump(mode="json")}
+        self._outbox.append(
+            (self.task_id, self.execution_id, UUID(user_id), channel, json.dumps(payload))
+        )
+
+    async def commit(self) -> None:
+        async with db.acquire() as conn:
+            async with conn.transaction():
+                await self._write_execution(conn)
+                await self._write_task(conn)
+                if self._outbox:
+                    await conn.executemany(
+                        """
+                        INSERT INTO notification_outbox
+                        (task_id, execution_id, user_id, channel, payload)
+                        VALUES ($1, $2, $3, $4, $5::jsonb)
+                        """,
+                        self._outbox,
+                    )
+                if self._connector_slugs:
+                    await self._write_connectors_used(conn)
+
+    async def _write_execution(self, conn) -> None:
+        flags_json = json.dumps(self._result_flags)
+        if self._agent_result is None:
+            if self._result_flags:
+                await conn.execute(
+                    """
+                    UPDATE task_executions
+                    SET result = COALESCE(result, '{}'::jsonb) || $1::jsonb
+                    WHERE id = $2
+                    """,
+                    flags_json,
+                    self.execution_id,
+                )
+            return
+
+        agent_result = self._agent_result
+        await conn.execute(
+            """
+            UPDATE task_executions
+            SET status = $1, result = $2::jsonb || $7::jsonb, completed_at = $3,
+                notification = $4, grounding_sources = $5
+            WHERE id = $6
+            """,
+            TaskStatus.SUCCESS.value,
+            agent_result.model_dump_json(),
+            self.completed_at,
+            agent_result.notification,
+            json.dumps([s.model_dump() for s in agent_result.grounding_sources]),
+            self.execution_id,
+            flags_json,
+        )
+
+    async def _write_task(self, conn) -> None:
+        if self._agent_result is None and self._task_name is None and not self._set_next_run:
+            return
+        evidence = self._agent_result.evidence if self._agent_result else None
+        last_known_state = {"evidence": evidence} if evidence else None
+        await conn.execute(
+            """
+            UPDATE tasks
+            SET last_known_state = CASE WHEN $8::boolean THEN $1::jsonb
+                                        ELSE last_known_state END,
+                updated_at = $2,
+                last_execution_id = COALESCE($3, last_execution_id),
+                name = COALESCE($5, name),
+                next_run = CASE WHEN $6::boolean THEN $7 ELSE next_run END,
+                scheduled_retry_count = CASE WHEN $6::boolean THEN 0
+                                             ELSE scheduled_retry_count END,
+                scheduled_execution_id = CASE WHEN $6::boolean THEN NULL
+                                              ELSE scheduled_execution_id END,
+                success_count = success_count + CASE WHEN $8::boolean THEN 1 ELSE 0 END,
+                notification_count = notification_count
+                                     + CASE WHEN $9::boolean THEN 1 ELSE 0 END,
+                last_success_at = CASE WHEN $8::boolean THEN $2 ELSE last_success_at END
+            WHERE id = $4
+            """,
+            json.dumps(last_known_state) if last_known_state else None,
+            self.completed_at or datetime.now(UTC),
+            self.execution_id if self._agent_result else None,
+            self.task_id,
+            self._task_name,
+            self._set_next_run,
+            self._next_run,
+            self._agent_result is not None,
+            bool(self._agent_result and self._agent_result.notification),
+        )
+
+    async def _write_connectors_used(self, conn) -> None:
+        # Best-effort, like mark_connectors_used: a savepoint keeps a failure
+        # here from rolling back the execution result.
+        try:
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    UPDATE user_connectors
+                    SET last_used_at = NOW(), updated_at = NOW()
+                    WHERE user_id = $1 AND toolkit_slug = ANY($2::text[])
+                    """,
+                    self._connector_user_id,
+                    self._connector_slugs,
+                )
+        except Exception as e:
+            logger.warning(f"Failed to mark connectors used for {self._connector_user_id}: {e}")
+
+
+async def load_execution_context(
+    task_id: str, execution_id: str, history_limit: int = 5
+) -> ExecutionContext:
+    """Reset the execution to RUNNING and load everything the run needs, in one round trip.
+
+    The reset clears terminal-state leftovers from a prior attempt on the same
+    row: retries reuse execution_id, so the row may still hold error_message /
+    internal_error / error_category from the failed attempt, or transient
+    flags like notification_failed merged into result. Keeping "a RUNNING row
+    is clean" makes this a no-op for fresh rows.
+
+    Also returns the task row (with its maintained counters), the owner's
+    ACTIVE connectors among the task's attached ones, and the last
+    `history_limit` successful executions.
+    """
+    row = await db.fetch_one(
+        """
+        WITH reset AS (
+            UPDATE task_executions
+            SET status = $3,
+                error_message = NULL,
+                internal_error = NULL,
+                error_category = NULL,
+                completed_at = NULL,
+                result = '{}'::jsonb
+            WHERE id = $2
+            RETURNING id, started_at, retry_count
+        ),
+        task AS (
+            SELECT * FROM tasks WHERE id = $1
+        )
+        SELECT task.*,
+               reset.started_at AS execution_started_at,
+               reset.retry_count AS execution_retry_count,
+               (SELECT COALESCE(array_agg(uc.toolkit_slug), '{}')
+                FROM user_connectors uc
+                WHERE uc.user_id = task.user_id
+                  AND uc.toolkit_slug = ANY(task.attached_connector_slugs)
+                  AND uc.status = 'ACTIVE') AS active_connector_slugs,
+               (SELECT COALESCE(jsonb_agg(h ORDER BY h.completed_at DESC), '[]'::jsonb)
+                FROM (SELECT completed_at, result, notification, grounding_sources
+                      FROM task_executions
+                      WHERE task_id = $1 AND status = $4
+                      ORDER BY completed_at DESC
+                      LIMIT $5) h) AS execution_history
+        FROM task
+        LEFT JOIN reset ON TRUE
+        """,
+        UUID(task_id),
+        UUID(execution_id),
+        TaskStatus.RUNNING.value,
+        TaskStatus.SUCCESS.value,
+        history_limit,
+    )
+
+    if not row:
+        raise RuntimeError(f"Task {task_id} not found")
+
+    task = dict(row)
+    history_rows = parse_jsonb(task.pop("execution_history"), "execution_history", list, [])
+    history = []
+    for history_row in history_rows:
+        completed_at = history_row.get("completed_at")
+        if isinstance(completed_at, str):
+            history_row["completed_at"] = datetime.fromisoformat(completed_at)
+        history.append(ExecutionRecord.from_db_row(history_row))
+
+    execution = {
+        "id": UUID(execution_id),
+        "task_id": UUID(task_id),
+        "status": TaskStatus.RUNNING.value,
+        "started_at": task.pop("execution_started_at"),
+        "retry_count": task.pop("execution_retry_count"),
+    }
+
+    return ExecutionContext(
+        task=task,
+        execution=execution,
+        history=history,
+        active_connector_slugs=list(task.pop("active_connector_slugs") or []),
+    )
 
 
 async def fetch_notification_context(
@@ -126,20 +330,28 @@ async def fetch_notification_context(
     if not execution:
         raise RuntimeError(f"Execution {execution_id} not found")
 
-    # Parse notification configs from JSONB
-    webhook_headers: dict[str, str] | None = None
+    return build_notification_context(dict(task), dict(execution))
+
+
+def resolve_webhook_headers(task: dict) -> dict[str, str] | None:
+    """Custom headers from the task's webhook notification config, if any."""
     raw_notifications = task.get("notifications") or []
     if isinstance(raw_notifications, str):
         raw_notifications = json.loads(raw_notifications)
     notifications = [NotificationConfig(**n) for n in raw_notifications]
     for notif in notifications:
         if notif.type == "webhook" and notif.headers:
-            webhook_headers = notif.headers
-            break
+            return notif.headers
+    return None
+
+
+def build_notification_context(task: dict, execution: dict) -> NotificationContext:
+    """Build notification context from a task row (joined with user fields) and execution row."""
+    webhook_headers = resolve_webhook_headers(task)
 
     return NotificationContext(
-        task=dict(task),
-        execution=dict(execution),
+        task=task,
+        execution=execution,
         clerk_email=task["clerk_email"],
         verified_emails=task["verified_notification_emails"] or [],
         notification_channels=task.get("notification_channels") or ["email"],
@@ -259,9 +471,14 @@ async def send_email_notification(
 
 
 async def send_webhook_notification(
-    notification_context: NotificationContext, result: EnrichedExecutionResult
-) -> None:
-    """Send webhook notification."""
+    notification_context: NotificationContext,
+    result: EnrichedExecutionResult,
+) -> bool:
+    """Send webhook notification. Returns True if delivered on the first attempt.
+
+    A failed attempt is recorded with next_retry_at and redelivered by
+    retry_due_webhooks, so it never re-runs the execution.
+    """
     task = notification_context.task
     execution = notification_context.execution
     task_id = str(task["id"])
@@ -276,17 +493,13 @@ async def send_webhook_notification(
     payload = build_webhook_payload(execution_id, task, execution, result)
 
     service = WebhookDeliveryService()
-    signature: str | None = None
-    try:
-        success, http_status, error, signature = await service.deliver(
-            webhook_url,
-            payload,
-            webhook_secret,
-            attempt=1,
-            custom_headers=notification_context.webhook_headers,
-        )
-    finally:
-        await service.close()
+    success, http_status, error, signature = await service.deliver(
+        webhook_url,
+        payload,
+        webhook_secret,
+        attempt=1,
+        custom_headers=notification_context.webhook_headers,
+    )
 
     if success:
         await db.execute(
@@ -305,7 +518,6 @@ async def send_webhook_notification(
             http_status,
             1,
         )
-        logger.info(f"Webhook delivered for task {task_id}")
     else:
         next_retry = WebhookDeliveryService.get_next_retry_time(1)
         await db.execute(
@@ -326,8 +538,12 @@ async def send_webhook_notification(
             1,
             next_retry,
         )
-        logger.error(f"Webhook delivery failed: {error}")
-        raise RuntimeError(f"Webhook delivery failed: {error}")
+
+    if success:
+        logger.info(f"Webhook delivered for task {task_id}")
+    else:
+        logger.warning(f"Webhook delivery failed for task {task_id}, queued for retry: {error}")
+    return success
 
 
 async def fetch_recent_executions(task_id: str, limit: int = 5) -> list[ExecutionRecord]:
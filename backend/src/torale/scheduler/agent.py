@@ -12,6 +12,7 @@ import httpx
 from a2a.client import A2AClient
 from a2a.client.errors import A2AClientHTTPError
 from a2a.types import (
+    Artifact,
     DataPart,
     GetTaskRequest,
     JSONRPCErrorResponse,
@@ -21,14 +22,18 @@ from a2a.types import (
     Part,
     Role,
     SendMessageRequest,
+    SendStreamingMessageRequest,
     Task,
+    TaskArtifactUpdateEvent,
     TaskQueryParams,
     TaskState,
+    TaskStatusUpdateEvent,
     TextPart,
 )
 
 from torale.core.config import settings
 from torale.lib.posthog import capture as posthog_capture
+from torale.scheduler.concurrency import agent_tiers
 from torale.scheduler.models import MonitoringResponse
 
 logger = logging.getLogger(__name__)
@@ -37,6 +42,11 @@ AGENT_TIMEOUT = 120  # seconds
 POLL_BACKOFF = [0.5, 1, 2, 4, 8, 16, 32]  # exponential backoff steps
 MAX_CONSECUTIVE_POLL_FAILURES = 3
 
+# States after which the agent will not emit further updates for a task.
+TERMINAL_STATES = frozenset(
+    {TaskState.completed, TaskState.failed, TaskState.canceled, TaskState.rejected}
+)
+
 # Upstream model failures worth retrying on the paid tier.
 FALLBACK_STATUS_CODES = frozenset({HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE})
 
@@ -132,9 +142,10 @@ async def call_agent(
     no-connectors path.
     """
     try:
-        result = await _call_agent_internal(
-            settings.agent_url_free, prompt, user_id, task_id, mcp_servers
-        )
+        async with agent_tiers["free"].slot(user_id or ""):
+            result = await _call_agent_internal(
+                settings.agent_url_free, prompt, user_id, task_id, mcp_servers
+            )
         tier, fallback = "free", False
     except A2AClientHTTPError as e:
         if e.status_code not in FALLBACK_STATUS_CODES:
@@ -144,9 +155,10 @@ async def call_agent(
             e.status_code,
             extra={"status_code": e.status_code},
         )
-        result = await _call_agent_internal(
-            settings.agent_url_paid, prompt, user_id, task_id, mcp_servers
-        )
+        async with agent_tiers["paid"].slot(user_id or ""):
+            result = await _call_agent_internal(
+                settings.agent_url_paid, prompt, user_id, task_id, mcp_servers
+            )
         tier, fallback = "paid", True
 
     if user_id:
@@ -168,13 +180,20 @@ async def _call_agent_internal(
     task_id: str | None = None,
     mcp_servers: list[dict] | None = None,
 ) -> MonitoringResponse:
-    """Send task to torale-agent via A2A and poll for result."""
+    """Send task to torale-agent via A2A and wait for the result.
+
+    With settings.agent_streaming enabled, the message is sent over
+    `message/stream` and the result is returned as soon as the agent emits a
+    terminal event. Polling `tasks/get` remains as the fallback when streaming
+    is disabled, unsupported by the agent, or the stream drops mid-run.
+    """
     message_id = f"msg-{uuid.uuid4().hex[:12]}"
     request_id = f"req-{uuid.uuid4().hex[:12]}"
 
     httpx_client = _get_httpx_client()
     client = A2AClient(httpx_client=httpx_client, url=base_url)
-    poll_start_time = time.monotonic()
+    start_time = time.monotonic()
+    deadline = start_time + AGENT_TIMEOUT
 
     message = Message(
         role=Role.user,
@@ -189,15 +208,36 @@ async def _call_agent_internal(
     if mcp_servers:
         metadata["mcp_servers"] = mcp_servers
 
-    request = SendMessageRequest(
-        id=request_id,
-        params=MessageSendParams(
-            message=message,
-            configuration=configuration,
-            metadata=metadata,
-        ),
+    params = MessageSendParams(
+        message=message,
+        configuration=configuration,
+        metadata=metadata,
+    )
+
+    a2a_task_id: str | None = None
+    if settings.agent_streaming:
+        terminal_task, a2a_task_id = await _stream_until_terminal(
+            client, request_id, params, deadline
+        )
+        if terminal_task is not None:
+            return _resolve_terminal_task(
+                terminal_task, user_id, start_time, completion_mode="stream", poll_count=0
+            )
+
+    if a2a_task_id is None:
+        a2a_task_id = await _send_message(client, base_url, request_id, params)
+
+    return await _poll_until_terminal(
+        client, request_id, a2a_task_id, deadline, user_id, start_time
     )
 
+
+async def _send_message(
+    client: A2AClient, base_url: str, request_id: str, params: MessageSendParams
+) -> str:
+    """Submit the message via `message/send`. Returns the agent's A2A task id."""
+    request = SendMessageRequest(id=request_id, params=params)
+
     try:
         send_response = await client.send_message(request)
     except A2AClientHTTPError as e:
@@ -214,12 +254,78 @@ async def _call_agent_internal(
     if isinstance(response, JSONRPCErrorResponse):
         raise RuntimeError(f"Agent returned error: {response.error}")
 
-    task = response.result
-    a2a_task_id = task.id
+    a2a_task_id = response.result.id
     logger.info(f"Agent task sent successfully, task_id={a2a_task_id}")
+    return a2a_task_id
+
+
+async def _stream_until_terminal(
+    client: A2AClient, request_id: str, params: MessageSendParams, deadline: float
+) -> tuple[Task | None, str | None]:
+    """Send the message via `message/stream` and consume SSE events until a terminal state.
+
+    Returns (terminal_task, a2a_task_id). terminal_task is None when the stream
+    could not be used or ended early; a2a_task_id is set once the agent has
+    accepted the task so the caller can resume by polling instead of resending.
+    Fallback-eligible upstream failures before acceptance are re-raised so
+    call_agent can retry on the paid tier.
+    """
+    a2a_task_id: str | None = None
+    context_id = ""
+    artifacts: list[Artifact] = []
 
-    # Poll for completion
-    deadline = time.monotonic() + AGENT_TIMEOUT
+    try:
+        async with asyncio.timeout(max(deadline - time.monotonic(), 0)):
+            async for response in client.send_message_streaming(
+                SendStreamingMessageRequest(id=request_id, params=params)
+            ):
+                result = response.root
+                if isinstance(result, JSONRPCErrorResponse):
+                    logger.warning(f"Agent stream returned error: {result.error}")
+                    break
+
+                event = result.result
+                if isinstance(event, TaskArtifactUpdateEvent):
+                    artifacts.append(event.artifact)
+                    continue
+                if isinstance(event, Task):
+                    a2a_task_id, context_id = event.id, event.context_id
+                    if event.artifacts:
+                        artifacts = list(event.artifacts)
+                elif isinstance(event, TaskStatusUpdateEvent):
+                    a2a_task_id, context_id = event.task_id, event.context_id
+                else:
+                    continue
+
+                if a2a_task_id and event.status.state in TERMINAL_STATES:
+                    terminal_task = Task(
+                        id=a2a_task_id,
+                        context_id=context_id,
+                        status=event.status,
+                        artifacts=artifacts or None,
+                    )
+                    return terminal_task, a2a_task_id
+    except TimeoutError:
+        raise TimeoutError(f"Agent did not complete within {AGENT_TIMEOUT}s") from None
+    except A2AClientHTTPError as e:
+        if a2a_task_id is None and e.status_code in FALLBACK_STATUS_CODES:
+            raise
+        logger.warning(f"Agent stream failed (status={e.status_code}), falling back to polling")
+    except Exception as e:
+        logger.warning(f"Agent stream failed ({e}), falling back to polling")
+
+    return None, a2a_task_id
+
+
+async def _poll_until_terminal(
+    client: A2AClient,
+    request_id: str,
+    a2a_task_id: str,
+    deadline: float,
+    user_id: str | None,
+    start_time: float,
+) -> MonitoringResponse:
+    """Poll `tasks/get` with exponential backoff until the agent task finishes."""
     backoff_idx = 0
     consecutive_poll_failures = 0
     poll_count = 0
@@ -267,27 +373,45 @@ async def _call_agent_internal(
         logger.debug(f"Agent task {a2a_task_id} state: {state}")
 
         match state:
-            case TaskState.completed:
-                parsed = _parse_agent_response(task)
-                poll_duration = time.monotonic() - poll_start_time
-                if user_id:
-                    posthog_capture(
-                        distinct_id=user_id,
-                        event="agent_task_completed",
-                        properties={
-                            "poll_duration_seconds": round(poll_duration, 2),
-                            "poll_iterations": poll_count,
-                        },
-                    )
-                return MonitoringResponse.model_validate(parsed)
-            case TaskState.failed:
-                _handle_failed_task(task)
+            case TaskState.completed | TaskState.failed:
+                return _resolve_terminal_task(
+                    task, user_id, start_time, completion_mode="poll", poll_count=poll_count
+                )
             case TaskState.working | TaskState.submitted:
                 continue
 
     raise TimeoutError(f"Agent did not complete within {AGENT_TIMEOUT}s")
 
 
+def _resolve_terminal_task(
+    task: Task,
+    user_id: str | None,
+    start_time: float,
+    completion_mode: str,
+    poll_count: int,
+) -> MonitoringResponse:
+    """Turn a terminal A2A task into a MonitoringResponse, or raise on failure."""
+    state = task.status.state
+    if state == TaskState.failed:
+        _handle_failed_task(task)
+    if state != TaskState.completed:
+        raise RuntimeError(f"Agent task {task.id} ended in state {state.value}")
+
+    parsed = _parse_agent_response(task)
+    duration = time.monotonic() - start_time
+    if user_id:
+        posthog_capture(
+            distinct_id=user_id,
+            event="agent_task_completed",
+            properties={
+                "poll_duration_seconds": round(duration, 2),
+                "poll_iterations": poll_count,
+                "completion_mode": completion_mode,
+            },
+        )
+    return MonitoringResponse.model_validate(parsed)
+
+
 def _parse_agent_response(task: Task) -> dict:
     """Parse A2A Task into monitoring result shape.
 
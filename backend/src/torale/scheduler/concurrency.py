@@ -0,0 +1,158 @@
+"""Process-local concurrency limits for task executions and agent calls.
+
+Every scheduled or manual run waits for a slot in `execution_queue` (global
+and per-user caps), and every agent call waits for a slot on its tier in
+`agent_tiers`. Waiters are served round-robin across users, so one user with
+hundreds of tasks due in the same minute cannot starve everyone else, and a
+burst drains at the configured rate instead of flooding the free-tier agent.
+"""
+
+import asyncio
+import time
+from collections import Counter, OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from torale.core.config import settings
+
+# Number of recent waits kept for the avg/max wait statistics
+WAIT_SAMPLE_SIZE = 200
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class FairLimiter:
+    """Concurrency limiter with a global cap, a per-key cap and round-robin fairness.
+
+    A limit of 0 means unlimited. Keys are typically user ids.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_per_key: int = 0):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_per_key = max_per_key
+        self._active = 0
+        self._active_by_key: Counter[str] = Counter()
+        # Insertion order doubles as the round-robin order of keys
+        self._waiters: OrderedDict[str, deque[_Waiter]] = OrderedDict()
+        self._recent_waits: deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._total_acquired = 0
+
+    def _has_capacity(self, key: str) -> bool:
+        if self.max_concurrent and self._active >= self.max_concurrent:
+            return False
+        if self.max_per_key and self._active_by_key[key] >= self.max_per_key:
+            return False
+        return True
+
+    def _grant(self, key: str) -> None:
+        self._active += 1
+        self._active_by_key[key] += 1
+        self._total_acquired += 1
+
+    def _release(self, key: str) -> None:
+        self._active -= 1
+        self._active_by_key[key] -= 1
+        if self._active_by_key[key] <= 0:
+            del self._active_by_key[key]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiting keys, one waiter per key per pass."""
+        granted = True
+        while granted and self._waiters:
+            granted = False
+            for key in list(self._waiters):
+                if not self._has_capacity(key):
+                    continue
+                queue = self._waiters[key]
+                waiter = queue.popleft()
+                if queue:
+                    self._waiters.move_to_end(key)
+                else:
+                    del self._waiters[key]
+                granted = True
+                if waiter.future.done():
+                    continue
+                self._grant(key)
+                waiter.future.set_result(None)
+
+    def _remove_waiter(self, key: str, waiter: _Waiter) -> None:
+        queue = self._waiters.get(key)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        if not queue:
+            del self._waiters[key]
+
+    @asynccontextmanager
+    async def slot(self, key: str = "") -> AsyncIterator[float]:
+        """Hold one slot for `key`. Yields the seconds spent waiting for it."""
+        if self._has_capacity(key) and key not in self._waiters:
+            self._grant(key)
+            waited = 0.0
+        else:
+            waiter = _Waiter(future=asyncio.get_running_loop().create_future())
+            self._waiters.setdefault(key, deque()).append(waiter)
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    # Slot was granted just before cancellation; hand it back
+                    self._release(key)
+                else:
+                    self._remove_waiter(key, waiter)
+                raise
+            waited = time.monotonic() - waiter.enqueued_at
+
+        self._recent_waits.append(waited)
+        try:
+            yield waited
+        finally:
+            self._release(key)
+
+    def stats(self) -> dict:
+        """Snapshot of in-flight work, queue depth and recent wait times."""
+        now = time.monotonic()
+        heads = [queue[0].enqueued_at for queue in self._waiters.values() if queue]
+        waits = list(self._recent_waits)
+        return {
+            "name": self.name,
+            "max_concurrent": self.max_concurrent,
+            "max_per_key": self.max_per_key,
+            "in_flight": self._active,
+            "queued": sum(len(queue) for queue in self._waiters.values()),
+            "queued_keys": len(self._waiters),
+            "oldest_wait_seconds": round(now - min(heads), 3) if heads else 0.0,
+            "avg_wait_seconds": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            "max_wait_seconds": round(max(waits), 3) if waits else 0.0,
+            "total_acquired": self._total_acquired,
+        }
+
+
+execution_queue = FairLimiter(
+    "executions",
+    max_concurrent=settings.execution_max_concurrency,
+    max_per_key=settings.execution_max_per_user,
+)
+
+agent_tiers: dict[str, FairLimiter] = {
+    "free": FairLimiter("agent-free", max_concurrent=settings.agent_max_concurrency_free),
+    "paid": FairLimiter("agent-paid", max_concurrent=settings.agent_max_concurrency_paid),
+}
+
+
+def queue_stats() -> dict:
+    """Stats for the execution queue and each agent tier, for admin/ops endpoints."""
+    return {
+        "executions": execution_queue.stats(),
+        "agent_tiers": {tier: limiter.stats() for tier, limiter in agent_tiers.items()},
+    }
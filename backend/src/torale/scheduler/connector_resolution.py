@@ -28,31 +28,36 @@ async def resolve_mcp_servers(
     db: Database,
     user_id: UUID,
     attached_slugs: list[str] | None,
+    active_slugs: list[str] | None = None,
 ) -> list[McpServerDescriptor]:
     """Return MCP server descriptors for a task's ACTIVE attached connectors.
 
     Intersects `attached_slugs` with the user's ACTIVE rows in `user_connectors`.
     Silently drops slugs that are unknown, not connected, or not ACTIVE — the
     agent just sees fewer tools; the UI surfaces the degraded state separately.
+    Pass `active_slugs` when the caller already loaded the ACTIVE rows (see
+    load_execution_context) to skip the query.
     """
     if not attached_slugs:
         return []
 
-    rows = await db.fetch_all(
-        """
-        SELECT toolkit_slug FROM user_connectors
-        WHERE user_id = $1
-            AND toolkit_slug = ANY($2::text[])
-            AND status = 'ACTIVE'
-        """,
-        user_id,
-        attached_slugs,
-    )
-    active_slugs = {r["toolkit_slug"] for r in rows}
+    if active_slugs is None:
+        rows = await db.fetch_all(
+            """
+            SELECT toolkit_slug FROM user_connectors
+            WHERE user_id = $1
+                AND toolkit_slug = ANY($2::text[])
+                AND status = 'ACTIVE'
+            """,
+            user_id,
+            attached_slugs,
+        )
+        active_slugs = [r["toolkit_slug"] for r in rows]
+    active = set(active_slugs)
 
     slugs_to_resolve: list[str] = []
     for slug in attached_slugs:
-        if slug not in active_slugs:
+        if slug not in active:
             continue
         if get_toolkit(slug) is None:
             logger.warning("Task references unknown toolkit %r; skipping", slug)
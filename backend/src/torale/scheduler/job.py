@@ -1,6 +1,6 @@
 """Task execution orchestrator.
 
-Coordinates agent calls, DB persistence, notifications, and state transitions.
+Coordinates agent calls, DB persistence, notification queueing, and state transitions.
 Imports from activities (data access) and service (state machine) -- no circular deps.
 """
 
@@ -14,21 +14,17 @@ from urllib.parse import urlparse
 from apscheduler.triggers.date import DateTrigger
 
 from torale.core.database import db
+from torale.core.response_cache import invalidate_public_task
 from torale.lib.posthog import capture as posthog_capture
 from torale.scheduler import JOB_FUNC_REF
 from torale.scheduler.activities import (
+    ExecutionFinalizer,
     create_execution_record,
-    fetch_notification_context,
-    fetch_recent_executions,
-    persist_execution_result,
-    send_email_notification,
-    send_webhook_notification,
+    load_execution_context,
 )
 from torale.scheduler.agent import call_agent
-from torale.scheduler.connector_resolution import (
-    mark_connectors_used,
-    resolve_mcp_servers,
-)
+from torale.scheduler.concurrency import execution_queue
+from torale.scheduler.connector_resolution import resolve_mcp_servers
 from torale.scheduler.errors import (
     classify_error,
     get_retry_delay,
@@ -36,12 +32,14 @@ from torale.scheduler.errors import (
     should_retry,
 )
 from torale.scheduler.history import format_execution_history
+from torale.scheduler.leases import leases_enabled, schedule_task
 from torale.scheduler.models import (
     AgentExecutionResult,
     EnrichedExecutionResult,
     GroundingSource,
     MonitoringResponse,
 )
+from torale.scheduler.outbox import wake_notification_dispatcher
 from torale.scheduler.prompt_sanitizer import PromptSanitizer
 from torale.scheduler.scheduler import get_scheduler
 from torale.tasks import TaskState, TaskStatus
@@ -49,6 +47,9 @@ from torale.tasks.service import TaskService
 
 logger = logging.getLogger(__name__)
 
+# Queue waits at or above this are logged with current queue depth
+QUEUE_WAIT_LOG_THRESHOLD = 1.0
+
 
 def _parse_next_run(value: str | None) -> datetime | None:
     if not value:
@@ -83,23 +84,34 @@ async def _schedule_next_run(
     next_run_dt: datetime,
     execution_id: str | None,
     retry_count: int = 0,
+    persisted: bool = False,
 ) -> None:
-    """Schedule an APScheduler job and persist next_run to DB."""
+    """Schedule the next run and persist next_run to DB.
+
+    With lease dispatch the tasks row is the schedule; otherwise an APScheduler
+    job carries the retry state in its args. `persisted=True` means an
+    ExecutionFinalizer already wrote next_run, so only the job is registered.
+    """
     try:
-        scheduler = get_scheduler()
-        job_id = f"task-{task_id}"
-        scheduler.add_job(
-            JOB_FUNC_REF,
-            trigger=DateTrigger(run_date=next_run_dt),
-            id=job_id,
-            args=[task_id, user_id, task_name, retry_count, execution_id],
-            replace_existing=True,
-        )
-        await db.execute(
-            "UPDATE tasks SET next_run = $1 WHERE id = $2",
-            next_run_dt,
-            uuid.UUID(task_id),
-        )
+        if leases_enabled():
+            if not persisted:
+                await schedule_task(task_id, next_run_dt, retry_count, execution_id)
+        else:
+            scheduler = get_scheduler()
+            job_id = f"task-{task_id}"
+            scheduler.add_job(
+                JOB_FUNC_REF,
+                trigger=DateTrigger(run_date=next_run_dt),
+                id=job_id,
+                args=[task_id, user_id, task_name, retry_count, execution_id],
+                replace_existing=True,
+            )
+            if not persisted:
+                await db.execute(
+                    "UPDATE tasks SET next_run = $1 WHERE id = $2",
+                    next_run_dt,
+                    uuid.UUID(task_id),
+                )
         logger.info(f"Scheduled task {task_id} next run at {next_run_dt.isoformat()}")
     except Exception as e:
         logger.error(f"Failed to schedule next run for task {task_id}: {e}", exc_info=True)
@@ -132,47 +144,25 @@ async def _execute(
         execution_id = await create_execution_record(task_id)
 
     next_run_value: str | None = None
+    resolved_next_run: datetime | None = None
     execution_succeeded = False
     start_time = time.monotonic()
 
     try:
-        # Clear any terminal-state leftovers from a prior attempt on the same row.
-        # Within a single execution lifecycle, retries reuse execution_id, so the
-        # row may still hold error_message/internal_error/error_category from the
-        # failed prior attempt, or transient flags like notification_failed /
-        # auto_complete_failed merged into result. Clearing here keeps the
-        # invariant "a RUNNING row is clean" and is a no-op for fresh rows.
-        await db.execute(
-            """UPDATE task_executions
-               SET status = $2,
-                   error_message = NULL,
-                   internal_error = NULL,
-                   error_category = NULL,
-                   completed_at = NULL,
-                   result = '{}'::jsonb
-               WHERE id = $1""",
-            uuid.UUID(execution_id),
-            TaskStatus.RUNNING.value,
-        )
-
-        task = await db.fetch_one(
-            """SELECT search_query, condition_description, name, notification_channels,
-                      attached_connector_slugs, user_id
-               FROM tasks WHERE id = $1""",
-            uuid.UUID(task_id),
-        )
-
-        if not task:
-            raise RuntimeError(f"Task {task_id} not found")
+        # One round trip: reset the row to RUNNING and load task, owner,
+        # active connectors and recent history.
+        context = await load_execution_context(task_id, execution_id)
+        task = context.task
 
         mcp_servers = await resolve_mcp_servers(
-            db, task["user_id"], task["attached_connector_slugs"]
+            db,
+            task["user_id"],
+            task["attached_connector_slugs"],
+            active_slugs=context.active_connector_slugs,
         )
         mcp_metadata = [s.model_dump() for s in mcp_servers] if mcp_servers else None
 
         # Build agent prompt
-        recent_executions = await fetch_recent_executions(task_id)
-
         prompt_parts = [
             f"task_id: {task_id}",
             f"user_id: {user_id}",
@@ -194,7 +184,7 @@ async def _execute(
                 )
             )
 
-        history_block = format_execution_history(recent_executions)
+        history_block = format_execution_history(context.history)
         if history_block:
             prompt_parts.append(history_block)
 
@@ -205,8 +195,11 @@ async def _execute(
             mcp_servers=mcp_metadata,
         )
 
+        # Terminal writes are buffered and committed together below
+        finalizer = ExecutionFinalizer(task_id, execution_id)
+
         if mcp_servers:
-            await mark_connectors_used(db, task["user_id"], [s.toolkit for s in mcp_servers])
+            finalizer.mark_connectors_used(task["user_id"], [s.toolkit for s in mcp_servers])
 
         notification = agent_response.notification
         evidence = agent_response.evidence
@@ -214,16 +207,10 @@ async def _execute(
 
         # Auto-name task if agent provided a topic and name is still the default
         if topic and task["name"] == "New Monitor":
-            try:
-                await db.execute(
-                    "UPDATE tasks SET name = $1 WHERE id = $2",
-                    topic,
-                    uuid.UUID(task_id),
-                )
-                task_name = topic
-                logger.info(f"Named task {task_id}: '{topic}'")
-            except Exception as e:
-                logger.error(f"Failed to name task {task_id}: {e}")
+            finalizer.rename_task(topic)
+            task_name = topic
+            task["name"] = topic
+            logger.info(f"Named task {task_id}: '{topic}'")
 
         sources = agent_response.sources
         confidence = agent_response.confidence
@@ -243,55 +230,38 @@ async def _execute(
             grounding_sources=grounding_sources,
             activity=activity,
         )
-        await persist_execution_result(
-            task_id=task_id,
-            execution_id=execution_id,
-            agent_result=agent_exec_result,
-        )
+        finalizer.succeed(agent_exec_result)
 
-        # Send notifications if notification text present
-        notification_failed = False
-        if notification and not suppress_notifications:
-            try:
-                notification_context = await fetch_notification_context(
-                    task_id, execution_id, user_id
-                )
-
-                channels = notification_context.notification_channels
-
-                execution_count = await db.fetch_val(
-                    "SELECT COUNT(*) FROM task_executions WHERE task_id = $1 AND status = $2",
-                    uuid.UUID(task_id),
-                    TaskStatus.SUCCESS.value,
-                )
-
-                enriched_result = EnrichedExecutionResult(
-                    execution_id=execution_id,
-                    summary=notification or evidence,
-                    sources=grounding_sources,
-                    notification=notification,
-                    is_first_execution=execution_count == 1,
-                    next_run=next_run,
-                    confidence=confidence,
-                )
-
-                if "email" in channels:
-                    email_delivered = await send_email_notification(
-                        user_id, task_name, notification_context, enriched_result
-                    )
-                    if not email_delivered:
-                        notification_failed = True
-
-                if "webhook" in channels:
-                    await send_webhook_notification(notification_context, enriched_result)
-            except Exception as e:
-                notification_failed = True
-                logger.error(f"Notification failed for task {task_id}: {e}", exc_info=True)
+        # Queue notifications in the outbox; they commit with the result and
+        # the notification dispatcher delivers them off the execution path.
+        notify = bool(notification) and not suppress_notifications
+        if notify:
+            enriched_result = EnrichedExecutionResult(
+                execution_id=execution_id,
+                summary=notification or evidence,
+                sources=grounding_sources,
+                notification=notification,
+                is_first_execution=task["success_count"] == 0,
+                next_run=next_run,
+                confidence=confidence,
+            )
+            channels = task.get("notification_channels") or ["email"]
+            for channel in ("email", "webhook"):
+                if channel in channels:
+                    finalizer.enqueue_notification(user_id, channel, task_name, enriched_result)
 
-        if notification_failed:
-            await _merge_execution_result(execution_id, {"notification_failed": True})
+        # next_run=null -> monitoring complete; otherwise persist the next check
+        if next_run_value is not None:
+            resolved_next_run = _resolve_next_run(next_run_value)
+        finalizer.set_next_run(resolved_next_run)
 
+        await finalizer.commit()
         execution_succeeded = True
+        if notify:
+            wake_notification_dispatcher()
+        if task.get("is_public"):
+            # New result shows on the explore page, feed, RSS and sitemap
+            await invalidate_public_task(task_id)
 
         # Track successful execution
         execution_duration = time.monotonic() - start_time
@@ -375,15 +345,24 @@ async def _execute(
                 # Truncate internal_error to prevent storing overly large stack traces
                 internal_error = str(e)[:2000]  # Limit to 2000 chars for security/storage
 
+                # A permanent failure also bumps the task's failure_count, in
+                # the same statement so the counter never drifts from the row.
                 await db.execute(
-                    """UPDATE task_executions
-                       SET status = $1,
-                           error_message = $2,
-                           internal_error = $3,
-                           error_category = $4,
-                           retry_count = $5,
-                           completed_at = $6
-                       WHERE id = $7""",
+                    """WITH execution AS (
+                           UPDATE task_executions
+                           SET status = $1,
+                               error_message = $2,
+                               internal_error = $3,
+                               error_category = $4,
+                               retry_count = $5,
+                               completed_at = $6
+                           WHERE id = $7
+                           RETURNING task_id
+                       )
+                       UPDATE tasks
+                       SET failure_count = failure_count + 1
+                       FROM execution
+                       WHERE tasks.id = execution.task_id AND $1 = 'failed'""",
                     status.value,
                     user_message,
                     internal_error,
@@ -413,38 +392,49 @@ async def _execute(
         # For permanent failures, the task is marked FAILED and no further retries are scheduled.
         # The task will not be automatically rescheduled - user needs to fix the issue and manually re-activate if desired.
     finally:
-        if execution_succeeded and next_run_value is None:
-            # Agent returned next_run=null → monitoring complete
+        if execution_succeeded and resolved_next_run is None:
+            # Agent returned next_run=null → monitoring complete (next_run already cleared)
             try:
                 task_service = TaskService(db=db)
                 await task_service.complete(
                     task_id=uuid.UUID(task_id), current_state=TaskState.ACTIVE
                 )
-                await db.execute(
-                    "UPDATE tasks SET next_run = NULL WHERE id = $1",
-                    uuid.UUID(task_id),
-                )
                 logger.info(f"Task {task_id} completed (agent returned next_run=null)")
             except Exception as e:
                 logger.error(f"Auto-complete failed for task {task_id}: {e}", exc_info=True)
                 await _merge_execution_result(execution_id, {"auto_complete_failed": True})
         elif execution_succeeded:
-            # Agent returned a next_run date → schedule next check.
+            # Agent returned a next_run date → schedule next check. The finalizer
+            # already persisted next_run; this registers the APScheduler job.
             # Pass execution_id=None so the next scheduled run creates its own
             # row. Reusing the current execution_id would cause subsequent runs
             # to overwrite this row's completed_at, producing inflated durations
             # and collapsing history.
-            resolved_dt = _resolve_next_run(next_run_value)
             await _schedule_next_run(
                 task_id=task_id,
                 user_id=user_id,
                 task_name=task_name,
-                next_run_dt=resolved_dt,
+                next_run_dt=resolved_next_run,
                 execution_id=None,
                 retry_count=0,  # Reset retry count on successful execution
+                persisted=True,
             )
 
 
+def _log_queue_wait(task_id: str, waited: float) -> None:
+    if waited >= QUEUE_WAIT_LOG_THRESHOLD:
+        stats = execution_queue.stats()
+        logger.info(
+            f"Task {task_id} waited {waited:.1f}s for an execution slot",
+            extra={
+                "task_id": task_id,
+                "queue_wait_seconds": round(waited, 2),
+                "queue_depth": stats["queued"],
+                "in_flight": stats["in_flight"],
+            },
+        )
+
+
 async def execute_task_job(
     task_id: str,
     user_id: str,
@@ -452,14 +442,16 @@ async def execute_task_job(
     retry_count: int = 0,
     execution_id: str | None = None,
 ) -> None:
-    """Entry point for APScheduler scheduled jobs."""
-    await _execute(
-        task_id=task_id,
-        execution_id=execution_id,
-        user_id=user_id,
-        task_name=task_name,
-        retry_count=retry_count,
-    )
+    """Entry point for scheduled jobs (APScheduler or lease dispatch)."""
+    async with execution_queue.slot(user_id) as waited:
+        _log_queue_wait(task_id, waited)
+        await _execute(
+            task_id=task_id,
+            execution_id=execution_id,
+            user_id=user_id,
+            task_name=task_name,
+            retry_count=retry_count,
+        )
 
 
 async def execute_task_job_manual(
@@ -471,11 +463,13 @@ async def execute_task_job_manual(
     retry_count: int = 0,
 ) -> None:
     """Entry point for manual task execution."""
-    await _execute(
-        task_id=task_id,
-        execution_id=execution_id,
-        user_id=user_id,
-        task_name=task_name,
-        suppress_notifications=suppress_notifications,
-        retry_count=retry_count,
-    )
+    async with execution_queue.slot(user_id) as waited:
+        _log_queue_wait(task_id, waited)
+        await _execute(
+            task_id=task_id,
+            execution_id=execution_id,
+            user_id=user_id,
+            task_name=task_name,
+            suppress_notifications=suppress_notifications,
+            retry_count=retry_count,
+        )
@@ -0,0 +1,239 @@
+"""APScheduler job store backed by the shared asyncpg pool.
+
+APScheduler 3.x calls job stores synchronously from the event loop, so a
+store that talks to Postgres directly blocks request handling on every
+add_job/reschedule_job. AsyncpgJobStore instead serves all reads from memory
+(it is a MemoryJobStore) and writes changes through to the existing
+apscheduler_jobs table from a background task on `core.database.db.pool`.
+
+Jobs are loaded once at startup (`load()`, before `scheduler.start()`), and
+pending writes are flushed on shutdown (`close()`). The table layout is the
+one SQLAlchemyJobStore created, so existing rows are picked up unchanged.
+The tasks table stays the source of truth: sync_jobs_from_database repairs
+any write lost to a crash on the next startup.
+"""
+
+import asyncio
+import logging
+import pickle
+from collections import OrderedDict
+
+from apscheduler.job import Job
+from apscheduler.jobstores.base import ConflictingIdError
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.util import datetime_to_utc_timestamp
+
+from torale.core.database import Database, db
+
+logger = logging.getLogger(__name__)
+
+# Sentinel op key for remove_all_jobs
+_ALL = object()
+
+
+def _sort_key(entry: tuple[Job, float | None]) -> tuple[float, str]:
+    # Same ordering MemoryJobStore keeps: next run time (paused last), then id
+    job, timestamp = entry
+    return (float("inf") if timestamp is None else timestamp, job.id)
+
+
+class AsyncpgJobStore(MemoryJobStore):
+    """In-memory job store with asynchronous write-through to Postgres."""
+
+    def __init__(
+        self,
+        database: Database = db,
+        tablename: str = "apscheduler_jobs",
+        pickle_protocol: int = pickle.HIGHEST_PROTOCOL,
+    ):
+        super().__init__()
+        self.database = database
+        self.tablename = tablename
+        self.pickle_protocol = pickle_protocol
+        self._loaded_rows: list = []
+        self._queue: asyncio.Queue | None = None
+        self._writer: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def load(self) -> int:
+        """Create the table if needed and read persisted jobs. Returns the row count.
+
+        Jobs are reconstituted in start(), once the scheduler is attached.
+        """
+        await self.database.execute(
+            f"""CREATE TABLE IF NOT EXISTS {self.tablename} (
+                    id VARCHAR(191) PRIMARY KEY,
+                    next_run_time DOUBLE PRECISION,
+                    job_state BYTEA NOT NULL
+                )"""
+        )
+        await self.database.execute(
+            f"""CREATE INDEX IF NOT EXISTS ix_{self.tablename}_next_run_time
+                ON {self.tablename} (next_run_time)"""
+        )
+        self._loaded_rows = await self.database.fetch_all(
+            f"SELECT id, job_state FROM {self.tablename} ORDER BY next_run_time"
+        )
+        return len(self._loaded_rows)
+
+    def start(self, scheduler, alias):
+        super().start(scheduler, alias)
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._writer = self._loop.create_task(self._write_loop(), name="jobstore-writer")
+
+        jobs, failed_ids = [], []
+        for row in self._loaded_rows:
+            try:
+                jobs.append(self._reconstitute_job(row["job_state"]))
+            except Exception:
+                logger.exception(f'Unable to restore job "{row["id"]}" -- removing it')
+                failed_ids.append(row["id"])
+        self._loaded_rows = []
+        self._insert(jobs)
+        for job_id in failed_ids:
+            self._enqueue(job_id, None)
+
+    def add_job(self, job):
+        super().add_job(job)
+        self._enqueue(job.id, self._serialize(job))
+
+    def update_job(self, job):
+        super().update_job(job)
+        self._enqueue(job.id, self._serialize(job))
+
+    def remove_job(self, job_id):
+        super().remove_job(job_id)
+        self._enqueue(job_id, None)
+
+    def remove_all_jobs(self):
+        super().remove_all_jobs()
+        self._enqueue(_ALL, None)
+
+    def add_jobs(self, jobs: list[Job]) -> None:
+        """Add many jobs with one sort and one write batch.
+
+        add_job does a sorted list insert per job, which is quadratic when a
+        startup sync adds tens of thousands of jobs.
+        """
+        new_ids = {job.id for job in jobs}
+        if len(new_ids) != len(jobs):
+            raise ValueError("Duplicate job ids in bulk add")
+        for job_id in new_ids:
+            if job_id in self._jobs_index:
+                raise ConflictingIdError(job_id)
+
+        self._insert(jobs)
+        for job in jobs:
+            self._enqueue(job.id, self._serialize(job))
+
+    def remove_jobs(self, job_ids: list[str]) -> int:
+        """Remove many jobs with a single pass over the sorted list. Returns the count removed."""
+        ids = {job_id for job_id in job_ids if job_id in self._jobs_index}
+        if not ids:
+            return 0
+        self._jobs = [entry for entry in self._jobs if entry[0].id not in ids]
+        for job_id in ids:
+            del self._jobs_index[job_id]
+            self._enqueue(job_id, None)
+        return len(ids)
+
+    def shutdown(self):
+        # Drop the in-memory copy only; persisted jobs must survive a restart
+        MemoryJobStore.remove_all_jobs(self)
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Flush pending writes and stop the writer task."""
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            except TimeoutError:
+                logger.error(f"Job store flush timed out with {self._queue.qsize()} pending")
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+
+    async def flush(self) -> None:
+        """Wait until every queued write has been applied."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def _insert(self, jobs: list[Job]) -> None:
+        entries = [(job, datetime_to_utc_timestamp(job.next_run_time)) for job in jobs]
+        self._jobs.extend(entries)
+        self._jobs.sort(key=_sort_key)
+        for entry in entries:
+            self._jobs_index[entry[0].id] = entry
+
+    def _serialize(self, job: Job) -> tuple[float | None, bytes]:
+        state = pickle.dumps(job.__getstate__(), self.pickle_protocol)
+        return datetime_to_utc_timestamp(job.next_run_time), state
+
+    def _reconstitute_job(self, job_state: bytes) -> Job:
+        state = pickle.loads(job_state)
+        state["jobstore"] = self
+        job = Job.__new__(Job)
+        job.__setstate__(state)
+        job._scheduler = self._scheduler
+        job._jobstore_alias = self._alias
+        return job
+
+    def _enqueue(self, key, value) -> None:
+        if self._queue is None:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._queue.put_nowait((key, value))
+        else:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, (key, value))
+
+    async def _write_loop(self) -> None:
+        while True:
+            ops = [await self._queue.get()]
+            while not self._queue.empty():
+                ops.append(self._queue.get_nowait())
+            try:
+                await self._apply(ops)
+            except Exception as e:
+                logger.error(f"Failed to persist {len(ops)} job store changes: {e}", exc_info=True)
+            finally:
+                for _ in ops:
+                    self._queue.task_done()
+
+    async def _apply(self, ops: list) -> None:
+        """Apply a drained batch of changes in one transaction, keeping the last op per job."""
+        clear_all = False
+        latest: OrderedDict[str, tuple | None] = OrderedDict()
+        for key, value in ops:
+            if key is _ALL:
+                clear_all = True
+                latest.clear()
+            else:
+                latest[key] = value
+                latest.move_to_end(key)
+
+        upserts = [(job_id, *value) for job_id, value in latest.items() if value is not None]
+        deletes = [(job_id,) for job_id, value in latest.items() if value is None]
+
+        async with self.database.acquire() as conn:
+            async with conn.transaction():
+                if clear_all:
+                    await conn.execute(f"DELETE FROM {self.tablename}")
+                if deletes:
+                    await conn.executemany(f"DELETE FROM {self.tablename} WHERE id = $1", deletes)
+                if upserts:
+                    await conn.executemany(
+                        f"""INSERT INTO {self.tablename} (id, next_run_time, job_state)
+                            VALUES ($1, $2, $3)
+                            ON CONFLICT (id) DO UPDATE
+                            SET next_run_time = EXCLUDED.next_run_time,
+                                job_state = EXCLUDED.job_state""",
+                        upserts,
+                    )
@@ -0,0 +1,145 @@
+"""Lease-based task dispatch state, stored on the tasks row.
+
+With SCHEDULER_BACKEND=lease, tasks.next_run is the schedule: any process
+running a LeaseDispatcher claims due rows with FOR UPDATE SKIP LOCKED and
+holds a time-bounded lease while the execution runs. The holder keeps
+extending the lease for as long as the execution is alive (queued for a slot
+or running), so two replicas can never fire the same task, and a crashed
+node's lease simply expires so another node picks the task up again.
+
+Retry state that APScheduler kept in job args (retry_count, execution_id)
+lives in tasks.scheduled_retry_count / tasks.scheduled_execution_id.
+"""
+
+import logging
+import uuid
+from datetime import datetime
+
+import asyncpg
+
+from torale.core.config import settings
+from torale.core.database import db
+
+logger = logging.getLogger(__name__)
+
+
+def leases_enabled() -> bool:
+    """True when tasks are dispatched from tasks.next_run instead of APScheduler jobs."""
+    return settings.scheduler_backend == "lease"
+
+
+async def schedule_task(
+    task_id: str | uuid.UUID,
+    next_run: datetime,
+    retry_count: int = 0,
+    execution_id: str | None = None,
+) -> None:
+    """Persist the next run (and any pending retry) for a task."""
+    await db.execute(
+        """UPDATE tasks
+           SET next_run = $1,
+               scheduled_retry_count = $2,
+               scheduled_execution_id = $3
+           WHERE id = $4""",
+        next_run,
+        retry_count,
+        uuid.UUID(execution_id) if execution_id else None,
+        uuid.UUID(str(task_id)),
+    )
+
+
+async def unschedule_task(task_id: str | uuid.UUID) -> None:
+    """Drop a task's pending run. Lease equivalent of removing its APScheduler job."""
+    await db.execute(
+        """UPDATE tasks
+           SET next_run = NULL,
+               scheduled_retry_count = 0,
+               scheduled_execution_id = NULL
+           WHERE id = $1""",
+        uuid.UUID(str(task_id)),
+    )
+
+
+async def claim_due_tasks(owner: str, limit: int, lease_seconds: int) -> list[asyncpg.Record]:
+    """Claim up to `limit` due active tasks for `owner`.
+
+    Rows locked by another claimer are skipped rather than waited on, and rows
+    with an unexpired lease are invisible, so concurrent dispatchers partition
+    the due set between them.
+    """
+    if limit <= 0:
+        return []
+    return await db.fetch_all(
+        """
+        WITH due AS (
+            SELECT id FROM tasks
+            WHERE state = 'active'
+              AND next_run <= NOW()
+              AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+            ORDER BY next_run
+            LIMIT $1
+            FOR UPDATE SKIP LOCKED
+        )
+        UPDATE tasks t
+        SET lease_owner = $2,
+            lease_expires_at = NOW() + make_interval(secs => $3)
+        FROM due
+        WHERE t.id = due.id
+        RETURNING t.id, t.user_id, t.name, t.next_run,
+                  t.scheduled_retry_count, t.scheduled_execution_id
+        """,
+        limit,
+        owner,
+        lease_seconds,
+    )
+
+
+async def extend_lease(task_id: uuid.UUID, owner: str, lease_seconds: int) -> bool:
+    """Push out a held lease. Returns False if `owner` no longer holds it."""
+    result = await db.execute(
+        """UPDATE tasks
+           SET lease_expires_at = NOW() + make_interval(secs => $3)
+           WHERE id = $1 AND lease_owner = $2""",
+        task_id,
+        owner,
+        lease_seconds,
+    )
+    return int(result.split()[-1]) > 0
+
+
+async def release_lease(task_id: uuid.UUID, owner: str, claimed_next_run: datetime) -> None:
+    """Release a lease after the execution finished.
+
+    If the run did not reschedule the task (permanent failure), the consumed
+    next_run is cleared so the task is not re-claimed -- the same outcome as
+    APScheduler discarding a fired DateTrigger job.
+    """
+    await db.execute(
+        """UPDATE tasks
+           SET lease_owner = NULL,
+               lease_expires_at = NULL,
+               next_run = CASE WHEN next_run <= $3 THEN NULL ELSE next_run END
+           WHERE id = $1 AND lease_owner = $2""",
+        task_id,
+        owner,
+        claimed_next_run,
+    )
+
+
+async def backfill_missing_next_run() -> int:
+    """Give active tasks without a next_run a run 24h out. Returns rows updated.
+
+    Lease-mode counterpart of sync_jobs_from_database's now + 24h fallback.
+    """
+    result = await db.execute(
+        """UPDATE tasks
+           SET next_run = NOW() + INTERVAL '24 hours'
+           WHERE state = 'active' AND next_run IS NULL"""
+    )
+    try:
+        count = int(result.split()[-1])
+    except (ValueError, IndexError, AttributeError):
+        return 0
+    if count:
+        logger.info(f"Backfilled next_run for {count} active tasks")
+    return count
@@ -1,11 +1,18 @@
+import asyncio
 import logging
+import time
 from datetime import UTC, datetime, timedelta
 
 from apscheduler.triggers.date import DateTrigger
 
 from torale.core.database import db
 from torale.scheduler import JOB_FUNC_REF
-from torale.scheduler.scheduler import get_scheduler
+from torale.scheduler.scheduler import (
+    add_jobs_bulk,
+    flush_job_store,
+    get_scheduler,
+    remove_jobs_bulk,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +22,22 @@ async def reap_stale_executions() -> None:
     now = datetime.now(UTC)
     cutoff_time = now - timedelta(minutes=30)
     result = await db.fetch_all(
-        """UPDATE task_executions
-           SET status = 'failed',
-               error_message = 'Reaped: execution stuck in running state',
-               completed_at = $1
-           WHERE status = 'running'
-             AND started_at < $2
-           RETURNING id""",
+        """WITH reaped AS (
+               UPDATE task_executions
+               SET status = 'failed',
+                   error_message = 'Reaped: execution stuck in running state',
+                   completed_at = $1
+               WHERE status = 'running'
+                 AND started_at < $2
+               RETURNING id, task_id
+           ),
+           counted AS (
+               UPDATE tasks t
+               SET failure_count = t.failure_count + r.reaped
+               FROM (SELECT task_id, COUNT(*) AS reaped FROM reaped GROUP BY task_id) r
+               WHERE t.id = r.task_id
+           )
+           SELECT id FROM reaped""",
         now,
         cutoff_time,
     )
@@ -29,71 +45,139 @@ async def reap_stale_executions() -> None:
         logger.warning(f"Reaped {len(result)} stale executions stuck in running state")
 
 
-async def sync_jobs_from_database() -> None:
+# Job changes applied between yields to the event loop during a sync
+SYNC_BATCH_SIZE = 10_000
+
+
+async def sync_jobs_from_database() -> dict:
     """Ensure APScheduler jobs match active/paused tasks in the database.
 
-    Runs on every startup as a consistency check. Creates missing jobs,
-    removes orphaned jobs.
+    Runs on every startup as a consistency check. One query diffs tasks
+    against the persisted job store and returns only what needs changing:
+    missing jobs, jobs whose paused state is wrong, and orphaned jobs. Changes
+    are applied in batches, and the job store writes each batch back in a
+    single transaction. Returns counts and per-phase timings.
     """
     scheduler = get_scheduler()
+    timings: dict[str, float] = {}
 
+    phase_start = time.monotonic()
+    # Jobs restored or removed at load time must be visible to the diff
+    await flush_job_store()
     rows = await db.fetch_all(
-        """SELECT id, user_id, name, next_run, state
-           FROM tasks
-           WHERE state IN ('active', 'paused')"""
+        """SELECT t.id AS task_id, t.user_id, t.name, t.next_run, t.state,
+                  j.id AS job_id
+           FROM (SELECT id, user_id, name, next_run, state
+                 FROM tasks
+                 WHERE state IN ('active', 'paused')) t
+           FULL OUTER JOIN (SELECT id, next_run_time
+                            FROM apscheduler_jobs
+                            WHERE id LIKE 'task-%') j
+             ON j.id = 'task-' || t.id::text
+           WHERE j.id IS NULL
+              OR t.id IS NULL
+              OR (t.state = 'paused' AND j.next_run_time IS NOT NULL)
+              OR (t.state = 'active' AND j.next_run_time IS NULL)
+           -- Pre-sorted batches keep the job store's merge sort near-linear
+           ORDER BY t.next_run NULLS LAST"""
     )
+    timings["diff"] = time.monotonic() - phase_start
 
-    expected_job_ids = set()
-    failed_count = 0
+    missing = [row for row in rows if row["task_id"] is not None and row["job_id"] is None]
+    mismatched = [row for row in rows if row["task_id"] is not None and row["job_id"] is not None]
+    orphaned = [row["job_id"] for row in rows if row["task_id"] is None]
 
+    add_failed = 0
+    pause_resume_failed = 0
     now = datetime.now(UTC)
 
-    for row in rows:
+    phase_start = time.monotonic()
+    specs = []
+    for row in missing:
+        task_id = str(row["task_id"])
+        # Use next_run from DB; fallback to now + 24h if null
+        next_run = row["next_run"]
+        if next_run is None or next_run <= now:
+            next_run = now + timedelta(hours=24)
+        specs.append(
+            {
+                "id": f"task-{task_id}",
+                "trigger": DateTrigger(run_date=next_run),
+                # retry_count=0, execution_id=None on sync
+                "args": [task_id, str(row["user_id"]), row["name"], 0, None],
+                # Paused tasks get a paused job directly instead of add + pause
+                "next_run_time": None if row["state"] == "paused" else next_run,
+            }
+        )
+    for i in range(0, len(specs), SYNC_BATCH_SIZE):
+        batch = specs[i : i + SYNC_BATCH_SIZE]
+        try:
+            add_jobs_bulk(JOB_FUNC_REF, batch)
+        except Exception as e:
+            logger.error(f"Bulk job add failed, retrying batch one by one: {e}", exc_info=True)
+            for spec in batch:
+                try:
+                    add_jobs_bulk(JOB_FUNC_REF, [spec])
+                except Exception as e:
+                    add_failed += 1
+                    logger.error(f"Failed to sync job {spec['id']}: {e}", exc_info=True)
+        await asyncio.sleep(0)
+    timings["add"] = time.monotonic() - phase_start
+
+    phase_start = time.monotonic()
+    for i, row in enumerate(mismatched):
         try:
-            task_id = str(row["id"])
-            job_id = f"task-{task_id}"
-            expected_job_ids.add(job_id)
-
-            existing_job = scheduler.get_job(job_id)
-
-            # Use next_run from DB; fallback to now + 24h if null
-            next_run = row["next_run"]
-            if next_run is None or next_run <= now:
-                next_run = now + timedelta(hours=24)
-
-            if existing_job is None:
-                scheduler.add_job(
-                    JOB_FUNC_REF,
-                    trigger=DateTrigger(run_date=next_run),
-                    id=job_id,
-                    args=[
-                        task_id,
-                        str(row["user_id"]),
-                        row["name"],
-                        0,
-                        None,
-                    ],  # retry_count=0, execution_id=None on sync
-                    replace_existing=True,
-                )
-                if row["state"] == "paused":
-                    scheduler.pause_job(job_id)
-                logger.info(f"Synced job {job_id} (state={row['state']})")
+            if row["state"] == "paused":
+                scheduler.pause_job(row["job_id"])
             else:
-                if row["state"] == "paused" and existing_job.next_run_time is not None:
-                    scheduler.pause_job(job_id)
-                elif row["state"] == "active" and existing_job.next_run_time is None:
-                    scheduler.resume_job(job_id)
+                scheduler.resume_job(row["job_id"])
         except Exception as e:
-            failed_count += 1
-            logger.error(f"Failed to sync job for task {row['id']}: {e}", exc_info=True)
-            continue
-
-    for job in scheduler.get_jobs():
-        if job.id.startswith("task-") and job.id not in expected_job_ids:
-            scheduler.remove_job(job.id)
-            logger.info(f"Removed orphaned job {job.id}")
-
+            pause_resume_failed += 1
+            logger.error(f"Failed to sync job for task {row['task_id']}: {e}", exc_info=True)
+        if (i + 1) % SYNC_BATCH_SIZE == 0:
+            await asyncio.sleep(0)
+    timings["pause_resume"] = time.monotonic() - phase_start
+
+    phase_start = time.monotonic()
+    removed = 0
+    for i in range(0, len(orphaned), SYNC_BATCH_SIZE):
+        removed += remove_jobs_bulk(orphaned[i : i + SYNC_BATCH_SIZE])
+        await asyncio.sleep(0)
+    timings["remove"] = time.monotonic() - phase_start
+
+    phase_start = time.monotonic()
+    await flush_job_store()
+    timings["persist"] = time.monotonic() - phase_start
+
+    failed_count = add_failed + pause_resume_failed
+    report = {
+        "added": len(missing) - add_failed,
+        "pause_resumed": len(mismatched) - pause_resume_failed,
+        "removed": removed,
+        "failed": failed_count,
+        "timings": {phase: round(seconds, 3) for phase, seconds in timings.items()},
+    }
+    phases = ", ".join(f"{phase}={seconds:.2f}s" for phase, seconds in report["timings"].items())
+    summary = (
+        f"{report['added']} added, {report['pause_resumed']} paused/resumed, "
+        f"{report['removed']} orphaned removed ({phases})"
+    )
     if failed_count:
-        logger.warning(f"Job sync completed with {failed_count} failures out of {len(rows)} tasks")
+        logger.warning(f"Job sync completed with {failed_count} failures: {summary}")
     else:
-        logger.info(f"Job sync completed: {len(rows)} tasks synced, 0 failures")
+        logger.info(f"Job sync completed: {summary}")
+    return report
+
+
+async def remove_task_jobs() -> None:
+    """Remove task-* jobs from the APScheduler store.
+
+    Used at startup under lease dispatch, where tasks.next_run is the schedule
+    and leftover jobs from the APScheduler backend would double-fire tasks.
+    """
+    scheduler = get_scheduler()
+    removed = remove_jobs_bulk(
+        [job.id for job in scheduler.get_jobs() if job.id.startswith("task-")]
+    )
+    if removed:
+        logger.info(f"Removed {removed} APScheduler task jobs (lease dispatch enabled)")
@@ -2,6 +2,8 @@
 
 from pydantic import BaseModel, Field
 
+from torale.scheduler.history import ExecutionRecord
+
 
 class GroundingSource(BaseModel):
     """A URL source backing agent evidence."""
@@ -23,6 +25,19 @@ class NotificationContext(BaseModel):
     webhook_headers: dict[str, str] | None = None
 
 
+class ExecutionContext(BaseModel):
+    """Everything an execution reads before calling the agent, from one query.
+
+    `task` is the tasks row (including its maintained execution counters);
+    `execution` is the execution row as reset to RUNNING.
+    """
+
+    task: dict
+    execution: dict
+    history: list[ExecutionRecord] = Field(default_factory=list)
+    active_connector_slugs: list[str] = Field(default_factory=list)
+
+
 class AgentExecutionResult(BaseModel):
     """Agent output persisted to DB. Constructed in job.py, consumed by persist_execution_result."""
 
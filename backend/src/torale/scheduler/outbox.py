@@ -0,0 +1,274 @@
+"""Notification outbox dispatcher.
+
+Executions never send notifications themselves: ExecutionFinalizer writes one
+notification_outbox row per channel in the same transaction as the execution
+result, so a notification exists if and only if its result does. The
+NotificationDispatcher drains the outbox with its own batching and
+concurrency, which keeps slow Novu calls or customer endpoints off the
+execution path and lets delivery scale independently.
+
+Rows are claimed with FOR UPDATE SKIP LOCKED plus a claim lease on
+next_attempt_at (the same pattern as torale.scheduler.leases), so any number
+of API replicas and workers can dispatch. Delivery is at-least-once: a crash
+between sending and marking a row processed re-sends it after the lease.
+
+Processed rows (delivered or given up on) are deleted once they are older
+than notification_outbox_retention_days, by the execution retention job.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import asyncpg
+
+from torale.core.config import settings
+from torale.core.database import db
+from torale.scheduler.activities import (
+    build_notification_context,
+    send_email_notification,
+    send_webhook_notification,
+)
+from torale.scheduler.models import EnrichedExecutionResult
+from torale.utils.jsonb import parse_jsonb
+
+logger = logging.getLogger(__name__)
+
+# Backoff between attempts; a row is given up on after len(RETRY_DELAYS) + 1 attempts
+RETRY_DELAYS = [60, 300, 900]  # seconds
+# How long a claimed row stays invisible to other dispatchers
+CLAIM_LEASE_SECONDS = 300
+
+_dispatcher: "NotificationDispatcher | None" = None
+
+
+def wake_notification_dispatcher() -> None:
+    """Nudge this process's dispatcher to poll now instead of at the next interval."""
+    if _dispatcher is not None:
+        _dispatcher.wake()
+
+
+async def claim_due_notifications(limit: int) -> list[asyncpg.Record]:
+    """Claim up to `limit` unprocessed outbox rows that are due."""
+    if limit <= 0:
+        return []
+    return await db.fetch_all(
+        """
+        WITH due AS (
+            SELECT id FROM notification_outbox
+            WHERE processed_at IS NULL
+              AND next_attempt_at <= NOW()
+            ORDER BY next_attempt_at
+            LIMIT $1
+            FOR UPDATE SKIP LOCKED
+        )
+        UPDATE notification_outbox o
+        SET next_attempt_at = NOW() + make_interval(secs => $2)
+        FROM due
+        WHERE o.id = due.id
+        RETURNING o.id, o.task_id, o.execution_id, o.user_id, o.channel,
+                  o.payload, o.attempts
+        """,
+        limit,
+        CLAIM_LEASE_SECONDS,
+    )
+
+
+async def prune_processed_notifications(now: datetime | None = None) -> int:
+    """Delete outbox rows processed more than the retention period ago.
+
+    Deletes in batches of execution_archive_batch_size. Returns rows deleted.
+    """
+    if settings.notification_outbox_retention_days <= 0:
+        return 0
+    cutoff = (now or datetime.now(UTC)) - timedelta(
+        days=settings.notification_outbox_retention_days
+    )
+    batch_size = settings.execution_archive_batch_size
+    deleted = 0
+    while True:
+        result = await db.execute(
+            """
+            DELETE FROM notification_outbox
+            WHERE id IN (
+                SELECT id FROM notification_outbox
+                WHERE processed_at < $1
+                LIMIT $2
+            )
+            """,
+            cutoff,
+            batch_size,
+        )
+        count = int(result.split()[-1])
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+
+async def _load_targets(rows: list[asyncpg.Record]) -> tuple[dict, dict]:
+    """Current task (joined with owner notification fields) and execution rows."""
+    tasks = await db.fetch_all(
+        """
+        SELECT t.*, u.email AS clerk_email,
+               u.verified_notification_emails,
+               u.webhook_url AS user_webhook_url,
+               u.webhook_secret AS user_webhook_secret
+        FROM tasks t
+        JOIN users u ON t.user_id = u.id
+        WHERE t.id = ANY($1::uuid[])
+        """,
+        list({row["task_id"] for row in rows}),
+    )
+    executions = await db.fetch_all(
+        "SELECT * FROM task_executions WHERE id = ANY($1::uuid[])",
+        list({row["execution_id"] for row in rows}),
+    )
+    return (
+        {task["id"]: dict(task) for task in tasks},
+        {execution["id"]: dict(execution) for execution in executions},
+    )
+
+
+async def _send(row: asyncpg.Record, task: dict, execution: dict) -> bool:
+    """Deliver one outbox row. Returns False when the notification was not sent."""
+    payload = parse_jsonb(row["payload"], "payload", dict, {})
+    result = EnrichedExecutionResult.model_validate(payload["result"])
+    context = build_notification_context(task, execution)
+
+    if row["channel"] == "email":
+        return await send_email_notification(
+            str(row["user_id"]), payload["task_name"], context, result
+        )
+    # Failed webhook attempts are queued for retry_due_webhooks
+    await send_webhook_notification(context, result)
+    return True
+
+
+class NotificationDispatcher:
+    """Poll-claim-deliver loop over notification_outbox."""
+
+    def __init__(
+        self,
+        poll_interval: float | None = None,
+        batch_size: int | None = None,
+        max_concurrency: int | None = None,
+    ):
+        self.poll_interval = poll_interval or settings.notification_poll_interval_seconds
+        self.batch_size = batch_size or settings.notification_batch_size
+        self.max_concurrency = max_concurrency or settings.notification_max_concurrency
+        self._loop_task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._loop_task is not None and not self._loop_task.done()
+
+    def start(self) -> None:
+        global _dispatcher
+        if self.running:
+            return
+        _dispatcher = self
+        self._loop_task = asyncio.create_task(self._run_loop(), name="notification-dispatcher")
+        logger.info("Notification dispatcher started")
+
+    async def stop(self) -> None:
+        """Stop after the batch in progress; unsent rows stay in the outbox."""
+        global _dispatcher
+        if _dispatcher is self:
+            _dispatcher = None
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+        logger.info("Notification dispatcher stopped")
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def _run_loop(self) -> None:
+        while True:
+            try:
+                claimed = await self.tick()
+            except Exception as e:
+                # Keep polling through any failure (e.g. a dropped connection);
+                # the poll interval is the backoff
+                logger.error(f"Notification dispatcher tick failed: {e}", exc_info=True)
+                claimed = 0
+            # A full batch means more is probably due; claim again immediately.
+            if claimed < self.batch_size:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+
+    async def tick(self) -> int:
+        """Claim and deliver one batch. Returns the number of rows claimed."""
+        rows = await claim_due_notifications(self.batch_size)
+        if not rows:
+            return 0
+
+        tasks, executions = await _load_targets(rows)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def deliver(row):
+            task = tasks.get(row["task_id"])
+            execution = executions.get(row["execution_id"])
+            if task is None or execution is None:
+                return None  # Task or execution deleted since; nothing to notify about
+            async with semaphore:
+                return await _send(row, task, execution)
+
+        results = await asyncio.gather(*(deliver(row) for row in rows), return_exceptions=True)
+        await self._record(rows, results)
+        return len(rows)
+
+    async def _record(self, rows: list[asyncpg.Record], results: list) -> None:
+        now = datetime.now(UTC)
+        updates = []
+        failed_executions: set[UUID] = set()
+        for row, result in zip(rows, results, strict=True):
+            attempts = row["attempts"] + 1
+            if isinstance(result, BaseException):
+                logger.error(
+                    f"{row['channel']} notification for task {row['task_id']} failed "
+                    f"(attempt {attempts}): {result}"
+                )
+                if attempts <= len(RETRY_DELAYS):
+                    retry_at = now + timedelta(seconds=RETRY_DELAYS[attempts - 1])
+                    updates.append((row["id"], attempts, str(result)[:2000], retry_at, False))
+                    continue
+                updates.append((row["id"], attempts, str(result)[:2000], now, True))
+                failed_executions.add(row["execution_id"])
+            else:
+                updates.append((row["id"], attempts, None, now, True))
+                if result is False:
+                    failed_executions.add(row["execution_id"])
+
+        async with db.acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany(
+                    """
+                    UPDATE notification_outbox
+                    SET attempts = $2,
+                        last_error = $3,
+                        next_attempt_at = $4,
+                        processed_at = CASE WHEN $5::boolean THEN NOW() END
+                    WHERE id = $1
+                    """,
+                    updates,
+                )
+                if failed_executions:
+                    await conn.execute(
+                        """
+                        UPDATE task_executions
+                        SET result = COALESCE(result, '{}'::jsonb)
+                                     || '{"notification_failed": true}'::jsonb
+                        WHERE id = ANY($1::uuid[])
+                        """,
+                        list(failed_executions),
+                    )
@@ -0,0 +1,203 @@
+"""Execution history retention.
+
+enforce_execution_retention runs as an interval job and keeps
+task_executions (the hot table every task page, RSS feed and agent prompt
+reads) bounded:
+
+- Finished executions started more than execution_retention_days ago move,
+  in batches, to task_executions_archive. The archived copy drops the agent
+  activity trace and internal error text, which make up most of a row.
+- A task's newest execution_keep_last_per_task successful executions, and
+  its last_execution_id, are never moved, so prompt history and RSS keep
+  working for tasks that run rarely.
+- The archive is partitioned by month; partitions older than
+  execution_archive_retention_months are dropped whole.
+- Processed notification_outbox rows are pruned on the same schedule
+  (torale.scheduler.outbox.prune_processed_notifications).
+
+Moving an execution deletes it from task_executions, and foreign keys decide
+what happens to rows that reference it: webhook_deliveries and
+notification_outbox rows would be deleted (ON DELETE CASCADE), so executions
+that still have any are not moved. An execution becomes movable once its
+outbox rows are pruned; executions with a webhook delivery log stay in
+task_executions. notification_sends rows are kept with execution_id set to
+NULL (ON DELETE SET NULL); the send history survives, unlinked from the
+archived execution.
+
+task_executions itself stays unpartitioned: tasks, notification_sends,
+webhook_deliveries and notification_outbox reference its id, and a table
+partitioned by started_at cannot keep id unique on its own.
+"""
+
+import logging
+import re
+from datetime import UTC, datetime, timedelta
+
+from torale.core.config import settings
+from torale.core.database import db
+from torale.scheduler.outbox import prune_processed_notifications
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_TABLE = "task_executions_archive"
+# Bounds one run's work; the next run picks up where this one stopped
+MAX_BATCHES_PER_RUN = 50
+
+_PARTITION_NAME = re.compile(rf"^{ARCHIVE_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def _month_start(moment: datetime) -> datetime:
+    return moment.astimezone(UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{ARCHIVE_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+async def ensure_archive_partitions(oldest: datetime, newest: datetime) -> None:
+    """Create the monthly archive partitions covering [oldest, newest]."""
+    month = _month_start(oldest)
+    while month <= newest:
+        following = _add_months(month, 1)
+        # Names and bounds are generated here, never user input
+        await db.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {partition_name(month)}
+            PARTITION OF {ARCHIVE_TABLE}
+            FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')
+            """
+        )
+        month = following
+
+
+async def archive_batch(cutoff: datetime) -> int:
+    """Move one batch of expired executions to the archive. Returns rows moved."""
+    result = await db.execute(
+        """
+        WITH doomed AS (
+            SELECT e.id
+            FROM task_executions e
+            -- Started time of the task's Nth newest success; older ones may go
+            LEFT JOIN LATERAL (
+                SELECT k.started_at, k.id
+                FROM task_executions k
+                WHERE k.task_id = e.task_id AND k.status = 'success'
+                ORDER BY k.started_at DESC, k.id DESC
+                OFFSET GREATEST($2::int, 1) - 1
+                LIMIT 1
+            ) keep ON TRUE
+            WHERE e.started_at < $1
+              AND e.status IN ('success', 'failed', 'cancelled')
+              AND NOT EXISTS (SELECT 1 FROM tasks t WHERE t.last_execution_id = e.id)
+              -- Deleting would cascade to these; see the module docstring
+              AND NOT EXISTS (SELECT 1 FROM webhook_deliveries w WHERE w.execution_id = e.id)
+              AND NOT EXISTS (SELECT 1 FROM notification_outbox o WHERE o.execution_id = e.id)
+              AND (
+                  e.status <> 'success'
+                  OR (keep.id IS NOT NULL AND (e.started_at, e.id) < (keep.started_at, keep.id))
+              )
+            ORDER BY e.started_at
+            LIMIT $3
+            FOR UPDATE OF e SKIP LOCKED
+        ),
+        moved AS (
+            DELETE FROM task_executions e
+            USING doomed
+            WHERE e.id = doomed.id
+            RETURNING e.*
+        )
+        INSERT INTO task_executions_archive (
+            id, task_id, status, started_at, completed_at, notification,
+            error_message, error_category, retry_count, result, grounding_sources
+        )
+        SELECT id, task_id, status, started_at, completed_at, notification,
+               error_message, error_category, retry_count, result - 'activity',
+               grounding_sources
+        FROM moved
+        """,
+        cutoff,
+        settings.execution_keep_last_per_task,
+        settings.execution_archive_batch_size,
+    )
+    return int(result.split()[-1])
+
+
+async def archive_old_executions(now: datetime | None = None) -> int:
+    """Move executions past retention to the archive. Returns rows moved."""
+    if settings.execution_retention_days <= 0:
+        return 0
+    cutoff = (now or datetime.now(UTC)) - timedelta(days=settings.execution_retention_days)
+
+    oldest = await db.fetch_val(
+        """
+        SELECT MIN(started_at) FROM task_executions
+        WHERE started_at < $1 AND status IN ('success', 'failed', 'cancelled')
+        """,
+        cutoff,
+    )
+    if oldest is None:
+        return 0
+    await ensure_archive_partitions(oldest, cutoff)
+
+    archived = 0
+    for _ in range(MAX_BATCHES_PER_RUN):
+        moved = await archive_batch(cutoff)
+        archived += moved
+        if moved < settings.execution_archive_batch_size:
+            break
+    return archived
+
+
+async def drop_expired_archive_partitions(now: datetime | None = None) -> list[str]:
+    """Drop archive partitions entirely older than the archive retention."""
+    if settings.execution_archive_retention_months <= 0:
+        return []
+    keep_from = _add_months(
+        _month_start(now or datetime.now(UTC)), -settings.execution_archive_retention_months
+    )
+
+    rows = await db.fetch_all(
+        """
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = $1::regclass
+        """,
+        ARCHIVE_TABLE,
+    )
+    dropped = []
+    for row in rows:
+        match = _PARTITION_NAME.match(row["relname"])
+        if match is None:
+            continue
+        month = datetime(int(match[1]), int(match[2]), 1, tzinfo=UTC)
+        if month < keep_from:
+            await db.execute(f"DROP TABLE IF EXISTS {row['relname']}")
+            dropped.append(row["relname"])
+    return dropped
+
+
+async def enforce_execution_retention() -> None:
+    """Interval job: archive expired executions, expire old archive partitions
+    and prune processed notification outbox rows.
+
+    Failures are logged, not raised.
+    """
+    try:
+        archived = await archive_old_executions()
+        dropped = await drop_expired_archive_partitions()
+        pruned = await prune_processed_notifications()
+    except Exception as e:
+        logger.error(f"Failed to enforce execution retention: {e}", exc_info=True)
+        return
+    if archived or dropped or pruned:
+        logger.info(
+            f"Execution retention: archived {archived} executions, "
+            f"dropped {len(dropped)} archive partitions, "
+            f"pruned {pruned} processed outbox rows"
+        )
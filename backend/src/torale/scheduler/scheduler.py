@@ -1,36 +1,23 @@
 import logging
+from typing import Any
 
-from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.job import Job
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-from torale.core.config import settings
+from torale.scheduler.jobstore import AsyncpgJobStore
 
 logger = logging.getLogger(__name__)
 
 _scheduler: AsyncIOScheduler | None = None
 
 
-def _make_job_store_url() -> str:
-    """Convert async database URL to sync for APScheduler 3.x SQLAlchemy job store."""
-    url = settings.database_url
-    # APScheduler 3.x uses sync SQLAlchemy, needs postgresql+psycopg2://
-    if url.startswith("postgresql+asyncpg://"):
-        url = url.replace("postgresql+asyncpg://", "postgresql+psycopg2://", 1)
-    elif url.startswith("postgres://"):
-        url = url.replace("postgres://", "postgresql+psycopg2://", 1)
-    elif url.startswith("postgresql://"):
-        url = url.replace("postgresql://", "postgresql+psycopg2://", 1)
-    return url
-
-
 def get_scheduler() -> AsyncIOScheduler:
     """Get the singleton scheduler instance."""
     global _scheduler
     if _scheduler is None:
-        jobstore_url = _make_job_store_url()
         _scheduler = AsyncIOScheduler(
             jobstores={
-                "default": SQLAlchemyJobStore(url=jobstore_url),
+                "default": AsyncpgJobStore(),
             },
             job_defaults={
                 "coalesce": True,
@@ -39,3 +26,71 @@ def get_scheduler() -> AsyncIOScheduler:
             },
         )
     return _scheduler
+
+
+async def start_scheduler() -> AsyncIOScheduler:
+    """Load persisted jobs through the shared asyncpg pool, then start the scheduler.
+
+    Requires db.connect() to have run.
+    """
+    scheduler = get_scheduler()
+    loaded = await scheduler._jobstores["default"].load()
+    scheduler.start()
+    logger.info(f"APScheduler started ({loaded} persisted jobs)")
+    return scheduler
+
+
+async def shutdown_scheduler() -> None:
+    """Stop the scheduler and flush pending job store writes before the pool closes."""
+    scheduler = get_scheduler()
+    jobstore = scheduler._jobstores["default"]
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    await jobstore.close()
+    logger.info("APScheduler shut down")
+
+
+async def flush_job_store() -> None:
+    """Wait until every job change has been written to apscheduler_jobs."""
+    await get_scheduler()._jobstores["default"].flush()
+
+
+def add_jobs_bulk(func: str, specs: list[dict[str, Any]]) -> int:
+    """Add many jobs sharing `func` to the running scheduler's default store.
+
+    Each spec holds id, trigger, args and next_run_time (None for paused).
+    The first job goes through scheduler.add_job for full validation and
+    defaults; the rest are cloned from its state instead of re-validating
+    the callable per job. Returns the number of jobs added.
+    """
+    if not specs:
+        return 0
+    scheduler = get_scheduler()
+    first, rest = specs[0], specs[1:]
+    template = scheduler.add_job(func, replace_existing=True, **first)
+    if not rest:
+        return 1
+
+    jobstore = scheduler._jobstores["default"]
+    base_state = template.__getstate__()
+    jobs = []
+    for spec in rest:
+        state = {**base_state, **spec, "args": tuple(spec["args"])}
+        job = Job.__new__(Job)
+        job.__setstate__(state)
+        job._scheduler = scheduler
+        job._jobstore_alias = "default"
+        jobs.append(job)
+
+    with scheduler._jobstores_lock:
+        jobstore.remove_jobs([job.id for job in jobs])
+        jobstore.add_jobs(jobs)
+    scheduler.wakeup()
+    return len(specs)
+
+
+def remove_jobs_bulk(job_ids: list[str]) -> int:
+    """Remove many jobs from the default store in one pass. Returns the count removed."""
+    scheduler = get_scheduler()
+    with scheduler._jobstores_lock:
+        return scheduler._jobstores["default"].remove_jobs(job_ids)
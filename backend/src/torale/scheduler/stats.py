@@ -0,0 +1,132 @@
+"""Rollups behind the admin dashboard.
+
+refresh_platform_stats runs as an interval job and writes:
+
+- execution_stats_hourly: per-hour execution totals. Each run re-aggregates
+  only the hours from the newest stored hour minus a lookback (executions
+  can still change status shortly after they start), so its cost depends
+  on recent volume, not on the size of task_executions.
+- platform_stats: a single-row snapshot of task totals and the most popular
+  search queries.
+
+/admin/stats then reads a fixed number of rows however large history grows.
+"""
+
+import logging
+from datetime import timedelta
+
+from torale.core.config import settings
+from torale.core.database import db
+from torale.utils.jsonb import parse_jsonb
+
+logger = logging.getLogger(__name__)
+
+POPULAR_QUERY_LIMIT = 10
+
+
+async def refresh_execution_rollups() -> None:
+    """Re-aggregate recent hours of task_executions into execution_stats_hourly."""
+    latest_hour = await db.fetch_val("SELECT MAX(hour) FROM execution_stats_hourly")
+    # First run backfills everything; later runs only revisit the lookback window
+    since = (
+        latest_hour - timedelta(hours=settings.admin_stats_rollup_lookback_hours)
+        if latest_hour is not None
+        else None
+    )
+    await db.execute(
+        """
+        INSERT INTO execution_stats_hourly
+            (hour, total_executions, failed_executions, notifications, refreshed_at)
+        SELECT date_trunc('hour', started_at),
+               COUNT(*),
+               COUNT(*) FILTER (WHERE status = 'failed'),
+               COUNT(*) FILTER (WHERE notification IS NOT NULL),
+               NOW()
+        FROM task_executions
+        WHERE started_at IS NOT NULL AND ($1::timestamptz IS NULL OR started_at >= $1)
+        GROUP BY 1
+        ON CONFLICT (hour) DO UPDATE SET
+            total_executions = EXCLUDED.total_executions,
+            failed_executions = EXCLUDED.failed_executions,
+            notifications = EXCLUDED.notifications,
+            refreshed_at = EXCLUDED.refreshed_at
+        """,
+        since,
+    )
+
+
+async def refresh_task_snapshot() -> None:
+    """Recompute the platform_stats row from the maintained task counters."""
+    await db.execute(
+        """
+        INSERT INTO platform_stats (id, total_tasks, triggered_tasks, popular_queries, refreshed_at)
+        SELECT TRUE,
+               (SELECT COUNT(*) FROM tasks WHERE state = 'active'),
+               (SELECT COUNT(*) FROM tasks WHERE state = 'active' AND notification_count > 0),
+               COALESCE(
+                   (
+                       SELECT jsonb_agg(q ORDER BY q.count DESC)
+                       FROM (
+                           SELECT search_query,
+                                  COUNT(*) AS count,
+                                  COUNT(*) FILTER (WHERE notification_count > 0)
+                                      AS triggered_count
+                           FROM tasks
+                           WHERE search_query IS NOT NULL
+                           GROUP BY search_query
+                           ORDER BY count DESC
+                           LIMIT $1
+                       ) q
+                   ),
+                   '[]'::jsonb
+               ),
+               NOW()
+        ON CONFLICT (id) DO UPDATE SET
+            total_tasks = EXCLUDED.total_tasks,
+            triggered_tasks = EXCLUDED.triggered_tasks,
+            popular_queries = EXCLUDED.popular_queries,
+            refreshed_at = EXCLUDED.refreshed_at
+        """,
+        POPULAR_QUERY_LIMIT,
+    )
+
+
+async def refresh_platform_stats() -> None:
+    """Interval job: refresh both rollups. Failures are logged, not raised."""
+    try:
+        await refresh_execution_rollups()
+        await refresh_task_snapshot()
+    except Exception as e:
+        logger.error(f"Failed to refresh admin stats rollups: {e}", exc_info=True)
+
+
+async def read_platform_stats() -> dict:
+    """Snapshot and 24h execution totals for /admin/stats, refreshing once if empty."""
+    snapshot = await db.fetch_one(
+        "SELECT total_tasks, triggered_tasks, popular_queries, refreshed_at FROM platform_stats"
+    )
+    if snapshot is None:
+        await refresh_platform_stats()
+        snapshot = await db.fetch_one(
+            "SELECT total_tasks, triggered_tasks, popular_queries, refreshed_at FROM platform_stats"
+        )
+
+    executions = await db.fetch_one(
+        """
+        SELECT COALESCE(SUM(total_executions), 0) AS total_executions,
+               COALESCE(SUM(failed_executions), 0) AS failed_executions
+        FROM execution_stats_hourly
+        WHERE hour >= date_trunc('hour', NOW() - INTERVAL '24 hours')
+        """
+    )
+
+    return {
+        "total_tasks": snapshot["total_tasks"] if snapshot else 0,
+        "triggered_tasks": snapshot["triggered_tasks"] if snapshot else 0,
+        "popular_queries": parse_jsonb(
+            snapshot["popular_queries"] if snapshot else None, "popular_queries", list, []
+        ),
+        "refreshed_at": snapshot["refreshed_at"] if snapshot else None,
+        "total_executions": executions["total_executions"] if executions else 0,
+        "failed_executions": executions["failed_executions"] if executions else 0,
+    }
@@ -0,0 +1,152 @@
+"""Durable webhook redelivery from webhook_deliveries.next_retry_at.
+
+A first delivery that fails is recorded with next_retry_at (see
+send_webhook_notification). retry_due_webhooks claims due rows with
+FOR UPDATE SKIP LOCKED, pushes next_retry_at out by a claim lease so no
+other replica picks them up mid-delivery, redelivers them concurrently
+and records the outcome on the same row: delivered_at on success, the next
+backoff step (WebhookDeliveryService.RETRY_DELAYS) on failure, failed_at
+once the schedule is exhausted. The agent run is never repeated.
+
+Runs as an interval job in the API scheduler and in the standalone worker.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from uuid import UUID
+
+import asyncpg
+
+from torale.core.config import settings
+from torale.core.database import db
+from torale.notifications import WebhookDeliveryService, WebhookPayload
+from torale.scheduler.activities import resolve_webhook_headers
+from torale.utils.jsonb import parse_jsonb
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed delivery stays invisible to other claimers
+CLAIM_LEASE_SECONDS = 300
+
+
+async def claim_due_deliveries(limit: int) -> list[asyncpg.Record]:
+    """Claim up to `limit` deliveries whose retry is due."""
+    return await db.fetch_all(
+        """
+        WITH due AS (
+            SELECT id FROM webhook_deliveries
+            WHERE delivered_at IS NULL
+              AND failed_at IS NULL
+              AND next_retry_at <= NOW()
+            ORDER BY next_retry_at
+            LIMIT $1
+            FOR UPDATE SKIP LOCKED
+        )
+        UPDATE webhook_deliveries d
+        SET next_retry_at = NOW() + make_interval(secs => $2)
+        FROM due
+        WHERE d.id = due.id
+        RETURNING d.id, d.task_id, d.webhook_url, d.payload, d.attempt_number
+        """,
+        limit,
+        CLAIM_LEASE_SECONDS,
+    )
+
+
+async def _fetch_webhook_configs(task_ids: list[UUID]) -> dict[UUID, dict]:
+    rows = await db.fetch_all(
+        """
+        SELECT t.id, t.webhook_secret, t.notifications,
+               u.webhook_secret AS user_webhook_secret
+        FROM tasks t
+        JOIN users u ON t.user_id = u.id
+        WHERE t.id = ANY($1::uuid[])
+        """,
+        task_ids,
+    )
+    return {row["id"]: dict(row) for row in rows}
+
+
+async def _redeliver(
+    service: WebhookDeliveryService, delivery: asyncpg.Record, task: dict | None
+) -> tuple:
+    """Attempt one redelivery. Returns the executemany row for _record_outcomes."""
+    attempt = delivery["attempt_number"] + 1
+    secret = task and (task.get("webhook_secret") or task.get("user_webhook_secret"))
+    if not secret:
+        return (
+            delivery["id"],
+            attempt - 1,
+            None,
+            "Webhook no longer configured",
+            None,
+            False,
+            None,
+        )
+
+    payload = WebhookPayload.model_validate(parse_jsonb(delivery["payload"], "payload", dict, {}))
+    success, http_status, error, signature = await service.deliver(
+        delivery["webhook_url"],
+        payload,
+        secret,
+        attempt=attempt,
+        custom_headers=resolve_webhook_headers(task),
+    )
+    next_retry_at: datetime | None = None
+    if not success:
+        next_retry_at = WebhookDeliveryService.get_next_retry_time(attempt)
+    return (delivery["id"], attempt, http_status, error, signature, success, next_retry_at)
+
+
+async def _record_outcomes(outcomes: list[tuple]) -> None:
+    await db.executemany(
+        """
+        UPDATE webhook_deliveries
+        SET attempt_number = $2,
+            http_status = COALESCE($3, http_status),
+            error_message = $4,
+            signature = COALESCE($5, signature),
+            delivered_at = CASE WHEN $6::boolean THEN NOW() END,
+            next_retry_at = $7,
+            failed_at = CASE WHEN NOT $6::boolean AND $7::timestamptz IS NULL
+                             THEN NOW() END
+        WHERE id = $1
+        """,
+        outcomes,
+    )
+
+
+async def retry_due_webhooks(limit: int | None = None) -> dict:
+    """Redeliver one batch of due webhook retries. Returns outcome counts."""
+    deliveries = await claim_due_deliveries(limit or settings.webhook_retry_batch_size)
+    if not deliveries:
+        return {"delivered": 0, "rescheduled": 0, "failed": 0}
+
+    configs = await _fetch_webhook_configs(list({d["task_id"] for d in deliveries}))
+    service = WebhookDeliveryService()
+    results = await asyncio.gather(
+        *(_redeliver(service, d, configs.get(d["task_id"])) for d in deliveries),
+        return_exceptions=True,
+    )
+
+    outcomes = []
+    for delivery, result in zip(deliveries, results, strict=True):
+        if isinstance(result, BaseException):
+            # Leave the row to be picked up again once the claim lease expires
+            logger.error(f"Webhook redelivery {delivery['id']} errored: {result}")
+            continue
+        outcomes.append(result)
+    if outcomes:
+        await _record_outcomes(outcomes)
+
+    counts = {
+        "delivered": sum(1 for o in outcomes if o[5]),
+        "rescheduled": sum(1 for o in outcomes if not o[5] and o[6] is not None),
+        "failed": sum(1 for o in outcomes if not o[5] and o[6] is None),
+    }
+    logger.info(
+        f"Webhook retries: {counts['delivered']} delivered, "
+        f"{counts['rescheduled']} rescheduled, {counts['failed']} failed"
+    )
+    return counts
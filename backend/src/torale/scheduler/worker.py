@@ -0,0 +1,211 @@
+"""Lease dispatcher: runs due tasks claimed from tasks.next_run.
+
+Runs inside the API process (SCHEDULER_DISPATCH_IN_API=true) or as a
+standalone worker deployment:
+
+    python -m torale.scheduler.worker
+
+Every dispatcher polls for due tasks, claims a batch with SKIP LOCKED leases
+(see torale.scheduler.leases) and executes them, so throughput scales with
+the number of worker pods and an API deploy never pauses monitoring.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+
+import asyncpg
+
+from torale.core.config import settings
+from torale.core.database import db
+from torale.lib.posthog import shutdown as shutdown_posthog
+from torale.notifications import close_webhook_client
+from torale.scheduler.job import execute_task_job
+from torale.scheduler.leases import (
+    backfill_missing_next_run,
+    claim_due_tasks,
+    extend_lease,
+    release_lease,
+)
+from torale.scheduler.migrate import reap_stale_executions
+from torale.scheduler.outbox import NotificationDispatcher
+from torale.scheduler.webhook_retries import retry_due_webhooks
+
+logger = logging.getLogger(__name__)
+
+REAP_INTERVAL_SECONDS = 15 * 60
+
+
+def _default_owner() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class LeaseDispatcher:
+    """Poll-claim-execute loop over tasks.next_run."""
+
+    def __init__(
+        self,
+        owner: str | None = None,
+        poll_interval: float | None = None,
+        batch_size: int | None = None,
+        max_in_flight: int | None = None,
+        lease_seconds: int | None = None,
+    ):
+        self.owner = owner or _default_owner()
+        self.poll_interval = poll_interval or settings.scheduler_poll_interval_seconds
+        self.batch_size = batch_size or settings.scheduler_claim_batch_size
+        self.max_in_flight = max_in_flight or settings.scheduler_max_in_flight
+        self.lease_seconds = lease_seconds or settings.scheduler_lease_seconds
+        self._loop_task: asyncio.Task | None = None
+        self._in_flight: set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._loop_task is not None and not self._loop_task.done()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop_task = asyncio.create_task(self._run_loop(), name="lease-dispatcher")
+        logger.info(f"Lease dispatcher started (owner={self.owner})")
+
+    async def stop(self, drain_timeout: float = 30.0) -> None:
+        """Stop claiming and wait up to drain_timeout for in-flight executions.
+
+        Executions still running after the timeout keep their lease until it
+        expires, at which point another node re-claims them.
+        """
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+        if self._in_flight:
+            await asyncio.wait(self._in_flight, timeout=drain_timeout)
+        logger.info(f"Lease dispatcher stopped (owner={self.owner})")
+
+    async def _run_loop(self) -> None:
+        while True:
+            try:
+                claimed = await self.tick()
+            except Exception as e:
+                # Keep polling through any failure (e.g. a dropped connection)
+                logger.error(f"Lease dispatcher claim failed: {e}", exc_info=True)
+                claimed = 0
+            # A full batch means more is probably due; claim again immediately.
+            if claimed < self.batch_size or self.in_flight >= self.max_in_flight:
+                await asyncio.sleep(self.poll_interval)
+
+    async def tick(self) -> int:
+        """Claim one batch of due tasks and start executing them. Returns claimed count."""
+        capacity = min(self.batch_size, self.max_in_flight - self.in_flight)
+        rows = await claim_due_tasks(self.owner, capacity, self.lease_seconds)
+        for row in rows:
+            task = asyncio.create_task(self._run_claimed(row))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+        if rows:
+            logger.info(f"Claimed {len(rows)} due tasks (owner={self.owner})")
+        return len(rows)
+
+    async def _heartbeat(self, task_id) -> None:
+        """Extend a claimed lease until cancelled.
+
+        The execution may wait in the execution queue and then run for longer
+        than one lease; without this another node could claim it again.
+        """
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await extend_lease(task_id, self.owner, self.lease_seconds):
+                    logger.warning(f"Lost lease for task {task_id} (owner={self.owner})")
+                    return
+            except Exception as e:
+                logger.error(f"Failed to extend lease for task {task_id}: {e}", exc_info=True)
+
+    async def _run_claimed(self, row: asyncpg.Record) -> None:
+        task_id = row["id"]
+        execution_id = row["scheduled_execution_id"]
+        heartbeat = asyncio.create_task(self._heartbeat(task_id))
+        try:
+            await execute_task_job(
+                str(task_id),
+                str(row["user_id"]),
+                row["name"],
+                row["scheduled_retry_count"],
+                str(execution_id) if execution_id else None,
+            )
+        except Exception as e:
+            logger.error(f"Leased execution failed for task {task_id}: {e}", exc_info=True)
+        finally:
+            heartbeat.cancel()
+            try:
+                await release_lease(task_id, self.owner, row["next_run"])
+            except Exception as e:
+                logger.error(f"Failed to release lease for task {task_id}: {e}", exc_info=True)
+
+
+async def _reap_periodically() -> None:
+    while True:
+        try:
+            await reap_stale_executions()
+        except Exception as e:
+            logger.error(f"Stale execution reaper failed: {e}", exc_info=True)
+        await asyncio.sleep(REAP_INTERVAL_SECONDS)
+
+
+async def _retry_webhooks_periodically() -> None:
+    while True:
+        try:
+            await retry_due_webhooks()
+        except Exception as e:
+            logger.error(f"Webhook retry dispatcher failed: {e}", exc_info=True)
+        await asyncio.sleep(settings.webhook_retry_interval_seconds)
+
+
+async def run_worker() -> None:
+    """Run a standalone dispatcher until SIGTERM/SIGINT."""
+    await db.connect()
+    await backfill_missing_next_run()
+
+    dispatcher = LeaseDispatcher()
+    dispatcher.start()
+    notification_dispatcher = NotificationDispatcher()
+    notification_dispatcher.start()
+    reaper = asyncio.create_task(_reap_periodically())
+    webhook_retrier = asyncio.create_task(_retry_webhooks_periodically())
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await stop_event.wait()
+    finally:
+        reaper.cancel()
+        webhook_retrier.cancel()
+        await dispatcher.stop()
+        await notification_dispatcher.stop()
+        await close_webhook_client()
+        shutdown_posthog()
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    if settings.scheduler_backend != "lease":
+        raise SystemExit("torale.scheduler.worker requires SCHEDULER_BACKEND=lease")
+    asyncio.run(run_worker())
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
+from torale.sdk.resources.tasks import execution_cursor
 from torale.tasks import NotificationConfig, Task, TaskExecution, TaskState
 
 if TYPE_CHECKING:
@@ -82,6 +84,29 @@ class AsyncTasksResource:
         response = await self.client.get("/api/v1/tasks/", params=params)
         return [Task(**task_data) for task_data in response]
 
+    async def search(self, q: str, limit: int = 20, cursor: str | None = None) -> dict[str, Any]:
+        """Full-text search over public tasks, most relevant first (async)."""
+        params: dict = {"q": q, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = await self.client.get("/api/v1/public/tasks", params=params)
+        return {
+            "tasks": [Task(**task_data) for task_data in response["tasks"]],
+            "total": response["total"],
+            "next_cursor": response.get("next_cursor"),
+        }
+
+    async def iter_search(self, q: str, page_size: int = 20) -> AsyncIterator[Task]:
+        """Iterate over every public task matching q, most relevant first (async)."""
+        cursor = None
+        while True:
+            page = await self.search(q, limit=page_size, cursor=cursor)
+            for task in page["tasks"]:
+                yield task
+            cursor = page["next_cursor"]
+            if not cursor:
+                return
+
     async def get(self, task_id: str | UUID) -> Task:
         """Get task by ID (async)."""
         response = await self.client.get(f"/api/v1/tasks/{task_id}")
@@ -127,16 +152,35 @@ class AsyncTasksResource:
         response = await self.client.post(f"/api/v1/tasks/{task_id}/execute")
         return TaskExecution(**response)
 
-    async def executions(self, task_id: str | UUID, limit: int = 100) -> list[TaskExecution]:
-        """Get task execution history (async)."""
-        response = await self.client.get(
-            f"/api/v1/tasks/{task_id}/executions", params={"limit": limit}
-        )
+    async def executions(
+        self, task_id: str | UUID, limit: int = 100, cursor: str | None = None
+    ) -> list[TaskExecution]:
+        """Get task execution history, newest first (async)."""
+        params: dict = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = await self.client.get(f"/api/v1/tasks/{task_id}/executions", params=params)
         return [TaskExecution(**exec_data) for exec_data in response]
 
-    async def notifications(self, task_id: str | UUID, limit: int = 100) -> list[TaskExecution]:
+    async def iter_executions(
+        self, task_id: str | UUID, page_size: int = 100
+    ) -> AsyncIterator[TaskExecution]:
+        """Iterate over a task's full execution history by keyset cursor (async)."""
+        cursor = None
+        while True:
+            page = await self.executions(task_id, limit=page_size, cursor=cursor)
+            for execution in page:
+                yield execution
+            if len(page) < page_size:
+                return
+            cursor = execution_cursor(page[-1])
+
+    async def notifications(
+        self, task_id: str | UUID, limit: int = 100, cursor: str | None = None
+    ) -> list[TaskExecution]:
         """Get task notifications (async)."""
-        response = await self.client.get(
-            f"/api/v1/tasks/{task_id}/notifications", params={"limit": limit}
-        )
+        params: dict = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = await self.client.get(f"/api/v1/tasks/{task_id}/notifications", params=params)
         return [TaskExecution(**exec_data) for exec_data in response]
@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
 from torale.tasks import NotificationConfig, Task, TaskExecution, TaskState
+from torale.utils.cursor import encode_cursor
 
 if TYPE_CHECKING:
     from torale.sdk.client import ToraleClient
 
 
+def execution_cursor(execution: TaskExecution) -> str:
+    """Cursor for the page of executions after this one."""
+    return encode_cursor(execution.started_at, execution.id)
+
+
 class TasksResource:
     """Resource for managing tasks."""
 
@@ -91,6 +98,43 @@ class TasksResource:
         response = self.client.get("/api/v1/tasks/", params=params)
         return [Task(**task_data) for task_data in response]
 
+    def search(self, q: str, limit: int = 20, cursor: str | None = None) -> dict[str, Any]:
+        """
+        Full-text search over public tasks, most relevant first.
+
+        Args:
+            q: Search terms (web-search syntax: quotes, OR, -exclude)
+            limit: Maximum number of tasks to return
+            cursor: next_cursor from the previous page
+
+        Returns:
+            Dict with "tasks" (list of Task objects), "total" and "next_cursor"
+
+        Example:
+            >>> page = client.tasks.search("iphone release")
+            >>> for task in page["tasks"]:
+            ...     print(task.name)
+        """
+        params: dict = {"q": q, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = self.client.get("/api/v1/public/tasks", params=params)
+        return {
+            "tasks": [Task(**task_data) for task_data in response["tasks"]],
+            "total": response["total"],
+            "next_cursor": response.get("next_cursor"),
+        }
+
+    def iter_search(self, q: str, page_size: int = 20) -> Iterator[Task]:
+        """Iterate over every public task matching q, most relevant first."""
+        cursor = None
+        while True:
+            page = self.search(q, limit=page_size, cursor=cursor)
+            yield from page["tasks"]
+            cursor = page["next_cursor"]
+            if not cursor:
+                return
+
     def get(self, task_id: str | UUID) -> Task:
         """
         Get task by ID.
@@ -187,13 +231,16 @@ class TasksResource:
         response = self.client.post(f"/api/v1/tasks/{task_id}/execute")
         return TaskExecution(**response)
 
-    def executions(self, task_id: str | UUID, limit: int = 100) -> list[TaskExecution]:
+    def executions(
+        self, task_id: str | UUID, limit: int = 100, cursor: str | None = None
+    ) -> list[TaskExecution]:
         """
-        Get task execution history.
+        Get task execution history, newest first.
 
         Args:
             task_id: Task ID
             limit: Maximum number of executions to return
+            cursor: Cursor for the next page (see iter_executions)
 
         Returns:
             List of TaskExecution objects
@@ -203,16 +250,41 @@ class TasksResource:
             >>> for execution in executions:
             ...     print(f"{execution.started_at}: {execution.status}")
         """
-        response = self.client.get(f"/api/v1/tasks/{task_id}/executions", params={"limit": limit})
+        params: dict = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = self.client.get(f"/api/v1/tasks/{task_id}/executions", params=params)
         return [TaskExecution(**exec_data) for exec_data in response]
 
-    def notifications(self, task_id: str | UUID, limit: int = 100) -> list[TaskExecution]:
+    def iter_executions(self, task_id: str | UUID, page_size: int = 100) -> Iterator[TaskExecution]:
+        """
+        Iterate over a task's full execution history, newest first.
+
+        Pages are fetched lazily by keyset cursor, so deep history costs the
+        same per page as the first.
+
+        Example:
+            >>> for execution in client.tasks.iter_executions(task_id):
+            ...     print(execution.status)
+        """
+        cursor = None
+        while True:
+            page = self.executions(task_id, limit=page_size, cursor=cursor)
+            yield from page
+            if len(page) < page_size:
+                return
+            cursor = execution_cursor(page[-1])
+
+    def notifications(
+        self, task_id: str | UUID, limit: int = 100, cursor: str | None = None
+    ) -> list[TaskExecution]:
         """
         Get task notifications (executions where condition was met).
 
         Args:
             task_id: Task ID
             limit: Maximum number of notifications to return
+            cursor: Cursor for the next page (execution_cursor of the last item)
 
         Returns:
             List of TaskExecution objects where notification is present
@@ -222,7 +294,8 @@ class TasksResource:
             >>> for notif in notifications:
             ...     print(f"{notif.started_at}: {notif.notification}")
         """
-        response = self.client.get(
-            f"/api/v1/tasks/{task_id}/notifications", params={"limit": limit}
-        )
+        params: dict = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = self.client.get(f"/api/v1/tasks/{task_id}/notifications", params=params)
         return [TaskExecution(**exec_data) for exec_data in response]
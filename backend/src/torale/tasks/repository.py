@@ -1,12 +1,15 @@
 import json
+from datetime import datetime
 from uuid import UUID
 
 from pypika_tortoise import Order, Parameter, PostgreSQLQuery
 from pypika_tortoise.functions import Now
+from pypika_tortoise.terms import Tuple
 
 from torale.core.database import Database
 from torale.repositories.base import BaseRepository
 from torale.repositories.tables import tables
+from torale.tasks.search import search_document, search_query, search_rank
 from torale.tasks.tasks import TaskData, TaskState, TaskStatus
 
 
@@ -197,29 +200,26 @@ class TaskRepository(BaseRepository):
         Args:
             limit: Maximum results
             offset: Pagination offset
-            search: Optional search term
+            search: Optional full-text search; results are ranked by relevance
 
         Returns:
             List of public task records
         """
-        query = PostgreSQLQuery.from_(self.tasks).select(self.tasks.star)
-        query = query.where(self.tasks.is_public.eq(True))
-
-        if search:
-            search_param = f"%{search}%"
-            search_condition = (
-                (self.tasks.name.like(Parameter("$1")))
-                | (self.tasks.search_query.like(Parameter("$1")))
-                | (self.tasks.condition_description.like(Parameter("$1")))
-            )
-            query = query.where(search_condition)
-
-        query = query.orderby(self.tasks.subscriber_count, order=Order.desc)
-        query = query.limit(limit).offset(offset)
-
-        if search:
-            return await self.db.fetch_all(str(query), search_param)
-        return await self.db.fetch_all(str(query))
+        if not search:
+            query = PostgreSQLQuery.from_(self.tasks).select(self.tasks.star)
+            query = query.where(self.tasks.is_public.eq(True))
+            query = query.orderby(self.tasks.subscriber_count, order=Order.desc)
+            query = query.limit(limit).offset(offset)
+            return await self.db.fetch_all(str(query))
+
+        # Raw SQL: the tsvector expression must match idx_tasks_public_search
+        query = f"""
+            SELECT * FROM tasks
+            WHERE is_public = true AND {search_document()} @@ {search_query("$1")}
+            ORDER BY {search_rank("", "$1")} DESC, subscriber_count DESC
+            LIMIT $2 OFFSET $3
+        """
+        return await self.db.fetch_all(query, search, limit, offset)
 
 
 class TaskExecutionRepository(BaseRepository):
@@ -321,15 +321,15 @@ class TaskExecutionRepository(BaseRepository):
         self,
         task_id: UUID,
         limit: int = 50,
-        offset: int = 0,
+        before: tuple[datetime, UUID] | None = None,
         status: str | None = None,
     ) -> list[dict]:
-        """Find executions for a task.
+        """Find executions for a task, newest first.
 
         Args:
             task_id: Task UUID
             limit: Maximum results
-            offset: Pagination offset
+            before: (started_at, id) of the last row of the previous page
             status: Optional status filter
 
         Returns:
@@ -346,20 +346,21 @@ class TaskExecutionRepository(BaseRepository):
             params.append(status)
             param_index += 1
 
-        query = query.orderby(self.executions.started_at, order=Order.desc)
-        query = query.limit(limit).offset(offset)
-
+        query, params = self._paginate_by_started_at(query, params, param_index, limit, before)
         return await self.db.fetch_all(str(query), *params)
 
     async def find_notifications(
-        self, task_id: UUID, limit: int = 50, offset: int = 0
+        self,
+        task_id: UUID,
+        limit: int = 50,
+        before: tuple[datetime, UUID] | None = None,
     ) -> list[dict]:
-        """Find executions where a notification was sent.
+        """Find executions where a notification was sent, newest first.
 
         Args:
             task_id: Task UUID
             limit: Maximum results
-            offset: Pagination offset
+            before: (started_at, id) of the last row of the previous page
 
         Returns:
             List of execution records where notification IS NOT NULL
@@ -367,10 +368,28 @@ class TaskExecutionRepository(BaseRepository):
         query = PostgreSQLQuery.from_(self.executions).select("*")
         query = query.where(self.executions.task_id == Parameter("$1"))
         query = query.where(self.executions.notification.isnotnull())
-        query = query.orderby(self.executions.started_at, order=Order.desc)
-        query = query.limit(limit).offset(offset)
 
-        return await self.db.fetch_all(str(query), task_id)
+        query, params = self._paginate_by_started_at(query, [task_id], 2, limit, before)
+        return await self.db.fetch_all(str(query), *params)
+
+    def _paginate_by_started_at(
+        self,
+        query: PostgreSQLQuery,
+        params: list,
+        param_index: int,
+        limit: int,
+        before: tuple[datetime, UUID] | None,
+    ) -> tuple[PostgreSQLQuery, list]:
+        """Keyset page on (started_at, id) DESC instead of OFFSET."""
+        if before is not None:
+            query = query.where(
+                Tuple(self.executions.started_at, self.executions.id)
+                < Tuple(Parameter(f"${param_index}"), Parameter(f"${param_index + 1}"))
+            )
+            params = [*params, *before]
+        query = query.orderby(self.executions.started_at, order=Order.desc)
+        query = query.orderby(self.executions.id, order=Order.desc)
+        return query.limit(limit), params
 
     async def get_last_successful(self, task_id: UUID) -> dict | None:
         """Get the last successful execution for a task.
@@ -0,0 +1,30 @@
+"""Full-text search over public tasks.
+
+Tasks are matched against a weighted tsvector of name (A), search_query (B)
+and condition_description (C), served by the GIN expression index
+idx_tasks_public_search. Queries must use search_document() verbatim so the
+planner can match the index expression.
+"""
+
+SEARCH_CONFIG = "english"
+
+
+def search_document(alias: str = "") -> str:
+    """The indexed tsvector expression, optionally qualified with a table alias."""
+    prefix = f"{alias}." if alias else ""
+    return (
+        f"(setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({prefix}name, '')), 'A')"
+        f" || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({prefix}search_query, '')), 'B')"
+        f" || setweight(to_tsvector('{SEARCH_CONFIG}', "
+        f"coalesce({prefix}condition_description, '')), 'C'))"
+    )
+
+
+def search_query(param: str) -> str:
+    """tsquery for a user-entered search string (web-search syntax, never errors)."""
+    return f"websearch_to_tsquery('{SEARCH_CONFIG}', {param})"
+
+
+def search_rank(alias: str, param: str) -> str:
+    """Relevance of a task to the search, as float8 for exact keyset comparison."""
+    return f"ts_rank_cd({search_document(alias)}, {search_query(param)})::float8"
@@ -2,11 +2,10 @@
 
 This service consolidates:
 1. State Management (Transitions, Validations)
-2. APScheduler Job Coordination (Create/Pause/Resume/Remove)
+2. Scheduling Coordination (APScheduler jobs, or tasks.next_run under lease dispatch)
 3. High-level business logic
 """
 
-import asyncio
 import logging
 from datetime import UTC, datetime, timedelta
 from uuid import UUID
@@ -16,6 +15,7 @@ from apscheduler.triggers.date import DateTrigger
 
 from torale.core.database import Database
 from torale.scheduler import JOB_FUNC_REF
+from torale.scheduler.leases import leases_enabled, schedule_task
 from torale.scheduler.scheduler import get_scheduler
 from torale.tasks.tasks import TaskState
 
@@ -210,21 +210,23 @@ class TaskService:
         if not all([task_name, user_id, next_run]):
             raise ValueError("Cannot activate task: missing task_name, user_id, or next_run")
 
+        if leases_enabled():
+            # The tasks row is the schedule; also resets any pending retry state
+            await schedule_task(task_id, next_run)
+            return {"success": True, "schedule_action": "created", "error": None}
+
         scheduler = get_scheduler()
         job_id = f"task-{task_id}"
-        existing = await asyncio.to_thread(scheduler.get_job, job_id)
+        existing = scheduler.get_job(job_id)
 
         if existing is not None:
             # Job exists, resume it and update trigger
-            await asyncio.to_thread(scheduler.resume_job, job_id)
-            await asyncio.to_thread(
-                scheduler.reschedule_job, job_id, trigger=DateTrigger(run_date=next_run)
-            )
+            scheduler.resume_job(job_id)
+            scheduler.reschedule_job(job_id, trigger=DateTrigger(run_date=next_run))
             logger.info(f"Resumed job {job_id}")
         else:
             # Create new job
-            await asyncio.to_thread(
-                scheduler.add_job,
+            scheduler.add_job(
                 JOB_FUNC_REF,
                 trigger=DateTrigger(run_date=next_run),
                 id=job_id,
@@ -243,24 +245,31 @@ class TaskService:
         return {"success": True, "schedule_action": "created", "error": None}
 
     async def _pause_job(self, task_id: UUID) -> dict:
+        if leases_enabled():
+            # Dispatchers only claim active tasks; the paused state is enough
+            return {"success": True, "schedule_action": "paused", "error": None}
+
         scheduler = get_scheduler()
         job_id = f"task-{task_id}"
-        existing = await asyncio.to_thread(scheduler.get_job, job_id)
+        existing = scheduler.get_job(job_id)
 
         if existing is None:
             logger.info(f"Job {job_id} not found when pausing - already deleted or never existed")
             return {"success": True, "schedule_action": "not_found_ok", "error": None}
 
-        await asyncio.to_thread(scheduler.pause_job, job_id)
+        scheduler.pause_job(job_id)
         logger.info(f"Paused job {job_id}")
         return {"success": True, "schedule_action": "paused", "error": None}
 
     async def _remove_job(self, task_id: UUID) -> dict:
+        if leases_enabled():
+            return {"success": True, "schedule_action": "deleted", "error": None}
+
         scheduler = get_scheduler()
         job_id = f"task-{task_id}"
 
         try:
-            await asyncio.to_thread(scheduler.remove_job, job_id)
+            scheduler.remove_job(job_id)
             logger.info(f"Removed job {job_id}")
             return {"success": True, "schedule_action": "deleted", "error": None}
         except JobLookupError:
@@ -137,6 +137,12 @@ class Task(TaskBase):
     # Next scheduled run time (persisted in DB, set by agent)
     next_run: datetime | None = None
 
+    # Execution counters, maintained by the scheduler alongside each execution
+    success_count: int = 0
+    notification_count: int = 0
+    failure_count: int = 0
+    last_success_at: datetime | None = None
+
     # Immediate execution error (only set when run_immediately fails during creation)
     immediate_execution_error: str | None = None
 
@@ -0,0 +1,41 @@
+"""Opaque keyset pagination cursors.
+
+A cursor encodes the sort key of the last row on a page, e.g.
+(started_at, id), so the next page is read with
+``WHERE (started_at, id) < ($n, $m)`` from an index instead of skipping rows
+with OFFSET.
+"""
+
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+def _jsonable(value: datetime | UUID | int | str) -> int | str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: datetime | UUID | int | str) -> str:
+    raw = json.dumps([_jsonable(value) for value in values]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """Decode a cursor into values of the given types. Raises ValueError."""
+    try:
+        parts = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(parts, list) or len(parts) != len(types):
+            raise ValueError("wrong arity")
+        values = []
+        for part, type_ in zip(parts, types, strict=True):
+            if type_ is int and not isinstance(part, int):
+                raise ValueError("expected an integer")
+            values.append(datetime.fromisoformat(part) if type_ is datetime else type_(part))
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ValueError("Malformed cursor") from e
+    return tuple(values)
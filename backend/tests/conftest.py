@@ -13,15 +13,28 @@ from a2a.types import (
     Part,
     SendMessageResponse,
     SendMessageSuccessResponse,
+    SendStreamingMessageResponse,
+    SendStreamingMessageSuccessResponse,
     Task,
     TaskState,
     TaskStatus,
     TextPart,
 )
 
+from torale.core.response_cache import response_cache
+from torale.scheduler.models import ExecutionContext
+
 JOB_MODULE = "torale.scheduler.job"
 
 
+@pytest.fixture(autouse=True)
+def _clear_response_cache():
+    """The in-process response cache is module-level; keep tests independent."""
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
 # --- A2A test helpers ---
 
 
@@ -61,6 +74,20 @@ def poll_success(task):
     return GetTaskResponse(root=GetTaskSuccessResponse(id="req-1", result=task))
 
 
+def stream_of(*events):
+    """Build an async iterator of SendStreamingMessageResponse successes."""
+
+    async def _gen():
+        for event in events:
+            if isinstance(event, Exception):
+                raise event
+            yield SendStreamingMessageResponse(
+                root=SendStreamingMessageSuccessResponse(id="req-1", result=event)
+            )
+
+    return _gen()
+
+
 class MockTransaction:
     """Mock database transaction context manager."""
 
@@ -115,32 +142,40 @@ def sample_execution(sample_task):
 
 @pytest.fixture
 def job_mocks():
-    """Patch all job.py dependencies, yield a namespace of mocks."""
+    """Patch all job.py dependencies, yield a namespace of mocks.
+
+    `load_ctx` returns an ExecutionContext with an empty task; tests set
+    `load_ctx.return_value` to the context they need. `finalizer` is the
+    ExecutionFinalizer instance the run buffers its terminal writes and
+    outbox notifications in.
+    """
     with (
         patch(f"{JOB_MODULE}.db") as mock_db,
         patch(f"{JOB_MODULE}.call_agent", new_callable=AsyncMock) as mock_agent,
-        patch(f"{JOB_MODULE}.persist_execution_result", new_callable=AsyncMock) as mock_persist,
-        patch(f"{JOB_MODULE}.fetch_notification_context", new_callable=AsyncMock) as mock_fetch_ctx,
-        patch(f"{JOB_MODULE}.send_email_notification", new_callable=AsyncMock) as mock_email,
-        patch(f"{JOB_MODULE}.send_webhook_notification", new_callable=AsyncMock) as mock_webhook,
+        patch(f"{JOB_MODULE}.load_execution_context", new_callable=AsyncMock) as mock_load_ctx,
+        patch(f"{JOB_MODULE}.ExecutionFinalizer") as mock_finalizer_cls,
+        patch(f"{JOB_MODULE}.wake_notification_dispatcher") as mock_wake,
         patch(f"{JOB_MODULE}.get_scheduler") as mock_scheduler,
         patch(f"{JOB_MODULE}.TaskService") as mock_service_cls,
-        patch(f"{JOB_MODULE}.fetch_recent_executions", new_callable=AsyncMock) as mock_recent_execs,
     ):
         mock_db.execute = AsyncMock()
         mock_db.fetch_one = AsyncMock()
         mock_db.fetch_val = AsyncMock(return_value=0)
-        mock_recent_execs.return_value = []
+        mock_load_ctx.return_value = ExecutionContext(task={}, execution={})
+
+        mock_finalizer = MagicMock()
+        mock_finalizer.commit = AsyncMock()
+        mock_finalizer.completed_at = datetime.now(UTC)
+        mock_finalizer_cls.return_value = mock_finalizer
 
         mocks = MagicMock()
         mocks.db = mock_db
         mocks.agent = mock_agent
-        mocks.persist = mock_persist
-        mocks.fetch_ctx = mock_fetch_ctx
-        mocks.email = mock_email
-        mocks.webhook = mock_webhook
+        mocks.load_ctx = mock_load_ctx
+        mocks.finalizer_cls = mock_finalizer_cls
+        mocks.finalizer = mock_finalizer
+        mocks.wake = mock_wake
         mocks.scheduler = mock_scheduler
         mocks.service_cls = mock_service_cls
-        mocks.recent_execs = mock_recent_execs
 
         yield mocks
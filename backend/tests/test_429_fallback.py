@@ -28,6 +28,7 @@ class TestPaidTierFallback:
     ):
         """Fallback-eligible upstream failures on free tier should retry on paid tier."""
         mock_settings.agent_url_free = "http://agent-free:8000"
+        mock_settings.agent_streaming = False
         mock_settings.agent_url_paid = "http://agent-paid:8000"
 
         completed_task = make_a2a_task(
@@ -80,6 +81,7 @@ class TestPaidTierFallback:
     async def test_non_fallback_error_does_not_fallback(self, mock_settings):
         """Non-retryable errors (e.g. 500) should not trigger paid tier fallback."""
         mock_settings.agent_url_free = "http://agent-free:8000"
+        mock_settings.agent_streaming = False
         mock_settings.agent_url_paid = "http://agent-paid:8000"
 
         with patch("torale.scheduler.agent.A2AClient") as mock_client_class:
@@ -100,6 +102,7 @@ class TestPaidTierFallback:
     async def test_429_during_poll_propagates(self, mock_settings):
         """429 during polling should not trigger fallback (already submitted)."""
         mock_settings.agent_url_free = "http://agent-free:8000"
+        mock_settings.agent_streaming = False
         mock_settings.agent_url_paid = "http://agent-paid:8000"
 
         with patch("torale.scheduler.agent.A2AClient") as mock_client_class:
@@ -128,6 +131,7 @@ class TestPaidTierFallback:
     async def test_both_tiers_429_propagates_error(self, mock_settings):
         """If both free and paid tiers return 429, error should propagate."""
         mock_settings.agent_url_free = "http://agent-free:8000"
+        mock_settings.agent_streaming = False
         mock_settings.agent_url_paid = "http://agent-paid:8000"
 
         with patch("torale.scheduler.agent.A2AClient") as mock_client_class:
@@ -1,4 +1,5 @@
-"""Tests for scheduler activities (persist_execution_result, fetch_recent_executions)."""
+"""Tests for scheduler activities (persist_execution_result, ExecutionFinalizer,
+load_execution_context, fetch_recent_executions)."""
 
 import json
 from contextlib import asynccontextmanager
@@ -8,7 +9,7 @@ from uuid import uuid4
 
 import pytest
 
-from torale.scheduler.models import AgentExecutionResult, GroundingSource
+from torale.scheduler.models import AgentExecutionResult, EnrichedExecutionResult, GroundingSource
 
 MODULE = "torale.scheduler.activities"
 
@@ -89,6 +90,126 @@ class TestPersistExecutionResult:
         assert json.loads(task_args[1]) == {"evidence": "Price is $999"}
 
 
+class TestExecutionFinalizer:
+    @pytest.mark.asyncio
+    @patch(f"{MODULE}.db")
+    async def test_commits_all_writes_in_one_transaction(self, mock_db):
+        """Result, task update and outbox rows share one connection/transaction."""
+        mock_conn = _setup_db_mock(mock_db)
+
+        from torale.scheduler.activities import ExecutionFinalizer
+
+        finalizer = ExecutionFinalizer(TASK_ID, EXECUTION_ID)
+        finalizer.succeed(_make_agent_result())
+        finalizer.rename_task("Renamed")
+        finalizer.merge_result({"notification_failed": True})
+        next_run = datetime(2099, 1, 1, tzinfo=UTC)
+        finalizer.set_next_run(next_run)
+        user_id = str(uuid4())
+        result = EnrichedExecutionResult(
+            execution_id=EXECUTION_ID, summary="Condition met", notification="Condition met"
+        )
+        finalizer.enqueue_notification(user_id, "email", "Monitor", result)
+        finalizer.enqueue_notification(user_id, "webhook", "Monitor", result)
+        await finalizer.commit()
+
+        mock_db.acquire.assert_called_once()
+        execution_sql, *execution_args = mock_conn.execute.call_args_list[0].args
+        assert "task_executions" in execution_sql
+        assert json.loads(execution_args[6]) == {"notification_failed": True}
+        task_sql, *task_args = mock_conn.execute.call_args_list[1].args
+        assert "UPDATE tasks" in task_sql
+        assert "success_count = success_count +" in task_sql
+        assert task_args[4] == "Renamed"
+        assert task_args[7] is True  # success counted
+        assert task_args[8] is False  # no notification text -> not counted
+        assert task_args[5] is True
+        assert task_args[6] == next_run
+
+        outbox_sql, rows = mock_conn.executemany.call_args.args
+        assert "notification_outbox" in outbox_sql
+        assert [row[3] for row in rows] == ["email", "webhook"]
+        payload = json.loads(rows[0][4])
+        assert payload["task_name"] == "Monitor"
+        assert payload["result"]["notification"] == "Condition met"
+
+    @pytest.mark.asyncio
+    @patch(f"{MODULE}.db")
+    async def test_next_run_untouched_unless_set(self, mock_db):
+        mock_conn = _setup_db_mock(mock_db)
+
+        from torale.scheduler.activities import ExecutionFinalizer
+
+        finalizer = ExecutionFinalizer(TASK_ID, EXECUTION_ID)
+        finalizer.succeed(_make_agent_result())
+        await finalizer.commit()
+
+        task_args = mock_conn.execute.call_args_list[1].args
+        assert task_args[6] is False
+        mock_conn.executemany.assert_not_awaited()
+
+
+class TestLoadExecutionContext:
+    @pytest.mark.asyncio
+    @patch(f"{MODULE}.db")
+    async def test_resets_and_loads_in_one_query(self, mock_db):
+        """One query resets the row to RUNNING and returns task, connectors and history."""
+        started_at = datetime.now(UTC)
+        mock_db.fetch_one = AsyncMock(
+            return_value={
+                "id": TASK_ID,
+                "name": "Monitor",
+                "clerk_email": "user@example.com",
+                "execution_started_at": started_at,
+                "execution_retry_count": 1,
+                "active_connector_slugs": ["notion"],
+                "execution_history": json.dumps(
+                    [
+                        {
+                            "completed_at": "2026-02-05T14:30:00+00:00",
+                            "result": {"evidence": "Checked", "confidence": 70},
+                            "notification": None,
+                            "grounding_sources": [{"url": "https://a.com"}],
+                        }
+                    ]
+                ),
+            }
+        )
+
+        from torale.scheduler.activities import load_execution_context
+
+        ctx = await load_execution_context(TASK_ID, EXECUTION_ID)
+
+        mock_db.fetch_one.assert_awaited_once()
+        sql = mock_db.fetch_one.call_args.args[0]
+        # Retries reuse execution_id: the RUNNING reset must clear prior terminal state
+        for clause in (
+            "error_message = NULL",
+            "internal_error = NULL",
+            "error_category = NULL",
+            "completed_at = NULL",
+            "result = '{}'::jsonb",
+        ):
+            assert clause in sql
+        assert ctx.task == {"id": TASK_ID, "name": "Monitor", "clerk_email": "user@example.com"}
+        assert ctx.execution["started_at"] == started_at
+        assert ctx.execution["retry_count"] == 1
+        assert ctx.active_connector_slugs == ["notion"]
+        assert len(ctx.history) == 1
+        assert ctx.history[0].completed_at == "2026-02-05T14:30:00+00:00"
+        assert ctx.history[0].sources == ["https://a.com"]
+
+    @pytest.mark.asyncio
+    @patch(f"{MODULE}.db")
+    async def test_missing_task_raises(self, mock_db):
+        mock_db.fetch_one = AsyncMock(return_value=None)
+
+        from torale.scheduler.activities import load_execution_context
+
+        with pytest.raises(RuntimeError, match="not found"):
+            await load_execution_context(TASK_ID, EXECUTION_ID)
+
+
 class TestFetchRecentExecutions:
     @pytest.mark.asyncio
     @patch(f"{MODULE}.db")
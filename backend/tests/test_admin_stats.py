@@ -0,0 +1,110 @@
+"""Tests for the admin dashboard rollups (scheduler.stats) and /admin/stats."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from torale.api.routers.admin import get_platform_stats
+from torale.scheduler.stats import (
+    read_platform_stats,
+    refresh_execution_rollups,
+    refresh_platform_stats,
+)
+
+MODULE = "torale.scheduler.stats"
+
+
+@pytest.fixture
+def mock_db():
+    with patch(f"{MODULE}.db") as mock_db:
+        mock_db.fetch_val = AsyncMock(return_value=None)
+        mock_db.fetch_one = AsyncMock(return_value=None)
+        mock_db.execute = AsyncMock()
+        yield mock_db
+
+
+class TestExecutionRollups:
+    @pytest.mark.asyncio
+    async def test_first_run_backfills_all_hours(self, mock_db):
+        await refresh_execution_rollups()
+
+        sql, since = mock_db.execute.call_args.args
+        assert "ON CONFLICT (hour) DO UPDATE" in sql
+        assert since is None
+
+    @pytest.mark.asyncio
+    async def test_later_runs_only_revisit_lookback_window(self, mock_db):
+        latest = datetime(2026, 3, 1, 12, tzinfo=UTC)
+        mock_db.fetch_val.return_value = latest
+
+        with patch(f"{MODULE}.settings") as mock_settings:
+            mock_settings.admin_stats_rollup_lookback_hours = 6
+            await refresh_execution_rollups()
+
+        _, since = mock_db.execute.call_args.args
+        assert since == latest - timedelta(hours=6)
+
+    @pytest.mark.asyncio
+    async def test_refresh_failure_is_logged_not_raised(self, mock_db):
+        mock_db.execute.side_effect = RuntimeError("db down")
+
+        await refresh_platform_stats()
+
+
+class TestReadPlatformStats:
+    @pytest.mark.asyncio
+    async def test_reads_snapshot_and_hourly_rollups(self, mock_db):
+        refreshed_at = datetime(2026, 3, 1, 12, tzinfo=UTC)
+        mock_db.fetch_one.side_effect = [
+            {
+                "total_tasks": 10,
+                "triggered_tasks": 4,
+                "popular_queries": '[{"search_query": "btc", "count": 3, "triggered_count": 1}]',
+                "refreshed_at": refreshed_at,
+            },
+            {"total_executions": 50, "failed_executions": 5},
+        ]
+
+        stats = await read_platform_stats()
+
+        assert stats["total_tasks"] == 10
+        assert stats["popular_queries"][0]["search_query"] == "btc"
+        assert stats["total_executions"] == 50
+        assert "task_executions" not in mock_db.fetch_one.call_args_list[1].args[0]
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_snapshot_is_refreshed_once(self, mock_db):
+        mock_db.fetch_one.side_effect = [None, None, None]
+
+        stats = await read_platform_stats()
+
+        assert stats["total_tasks"] == 0
+        assert mock_db.execute.await_count == 2  # hourly rollups + snapshot
+
+
+class TestPlatformStatsEndpoint:
+    @pytest.mark.asyncio
+    async def test_formats_rollups(self):
+        db = AsyncMock()
+        db.fetch_val.return_value = 7
+        stats = {
+            "total_tasks": 10,
+            "triggered_tasks": 4,
+            "popular_queries": [{"search_query": "btc", "count": 3, "triggered_count": 1}],
+            "refreshed_at": datetime(2026, 3, 1, 12, tzinfo=UTC),
+            "total_executions": 50,
+            "failed_executions": 5,
+        }
+
+        with patch("torale.api.routers.admin.read_platform_stats", AsyncMock(return_value=stats)):
+            result = await get_platform_stats(admin=MagicMock(), db=db)
+
+        assert result["users"]["total"] == 7
+        assert result["tasks"]["trigger_rate"] == "40.0%"
+        assert result["executions_24h"] == {"total": 50, "failed": 5, "success_rate": "90.0%"}
+        assert result["popular_queries"] == [
+            {"search_query": "btc", "count": 3, "triggered_count": 1}
+        ]
+        assert result["refreshed_at"] == "2026-03-01T12:00:00+00:00"
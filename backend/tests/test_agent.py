@@ -1,10 +1,10 @@
 """Tests for the A2A agent client (call_agent + _parse_agent_response)."""
 
 import json
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from a2a.client.errors import A2AClientHTTPError
+from a2a.client.errors import A2AClientHTTPError, A2AClientJSONRPCError
 from a2a.types import (
     Artifact,
     DataPart,
@@ -14,12 +14,22 @@ from a2a.types import (
     Part,
     Role,
     SendMessageResponse,
+    TaskArtifactUpdateEvent,
     TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
     TextPart,
 )
 from pydantic import ValidationError
 
-from tests.conftest import data_artifact, make_a2a_task, poll_success, send_success, text_artifact
+from tests.conftest import (
+    data_artifact,
+    make_a2a_task,
+    poll_success,
+    send_success,
+    stream_of,
+    text_artifact,
+)
 from torale.scheduler.agent import (
     _extract_error_details,
     _handle_failed_task,
@@ -416,6 +426,7 @@ class TestCallAgent:
     @patch("torale.scheduler.agent.settings")
     async def test_happy_path(self, mock_settings):
         mock_settings.agent_url = "http://agent:8000"
+        mock_settings.agent_streaming = False
 
         submitted_task = make_a2a_task(status_state=TaskState.submitted)
         working_task = make_a2a_task(status_state=TaskState.working)
@@ -453,6 +464,7 @@ class TestCallAgent:
     @patch("torale.scheduler.agent.settings")
     async def test_agent_failed_state_raises(self, mock_settings):
         mock_settings.agent_url = "http://agent:8000"
+        mock_settings.agent_streaming = False
 
         submitted_task = make_a2a_task(status_state=TaskState.submitted)
         failed_task = make_a2a_task(status_state=TaskState.failed)
@@ -472,6 +484,7 @@ class TestCallAgent:
     @patch("torale.scheduler.agent.settings")
     async def test_timeout_raises(self, mock_settings):
         mock_settings.agent_url = "http://agent:8000"
+        mock_settings.agent_streaming = False
 
         submitted_task = make_a2a_task(status_state=TaskState.submitted)
         working_task = make_a2a_task(status_state=TaskState.working)
@@ -501,6 +514,7 @@ class TestCallAgent:
     @patch("torale.scheduler.agent.settings")
     async def test_send_error_raises_runtime(self, mock_settings, exception):
         mock_settings.agent_url = "http://agent:8000"
+        mock_settings.agent_streaming = False
 
         mock_client = AsyncMock()
         mock_client.send_message = AsyncMock(side_effect=exception)
@@ -513,6 +527,7 @@ class TestCallAgent:
     @patch("torale.scheduler.agent.settings")
     async def test_transient_poll_failure_then_recovery(self, mock_settings):
         mock_settings.agent_url = "http://agent:8000"
+        mock_settings.agent_streaming = False
 
         submitted_task = make_a2a_task(status_state=TaskState.submitted)
         completed_task = make_a2a_task(
@@ -550,6 +565,7 @@ class TestCallAgent:
     @patch("torale.scheduler.agent.settings")
     async def test_consecutive_poll_failures_raises(self, mock_settings):
         mock_settings.agent_url = "http://agent:8000"
+        mock_settings.agent_streaming = False
 
         submitted_task = make_a2a_task(status_state=TaskState.submitted)
 
@@ -572,6 +588,7 @@ class TestCallAgent:
     @patch("torale.scheduler.agent.settings")
     async def test_send_jsonrpc_error_raises(self, mock_settings):
         mock_settings.agent_url = "http://agent:8000"
+        mock_settings.agent_streaming = False
 
         error_response = SendMessageResponse(
             root=JSONRPCErrorResponse(
@@ -586,3 +603,155 @@ class TestCallAgent:
         with patch("torale.scheduler.agent.A2AClient", return_value=mock_client):
             with pytest.raises(RuntimeError, match="Agent returned error"):
                 await call_agent("test prompt")
+
+
+COMPLETED_RESULT = {
+    "evidence": "streamed",
+    "sources": ["https://example.com"],
+    "confidence": 90,
+    "next_run": None,
+    "notification": None,
+    "topic": None,
+}
+
+
+def status_event(state, *, final=False):
+    return TaskStatusUpdateEvent(
+        task_id="task-abc",
+        context_id="ctx-test",
+        final=final,
+        status=TaskStatus(state=state),
+    )
+
+
+class TestCallAgentStreaming:
+    """Tests for the message/stream completion path and its polling fallback."""
+
+    @pytest.fixture
+    def mock_settings(self):
+        with patch("torale.scheduler.agent.settings") as mock_settings:
+            mock_settings.agent_url_free = "http://agent-free:8000"
+            mock_settings.agent_url_paid = "http://agent-paid:8000"
+            mock_settings.agent_streaming = True
+            yield mock_settings
+
+    @pytest.mark.asyncio
+    async def test_returns_on_terminal_stream_event_without_polling(self, mock_settings):
+        completed_task = make_a2a_task(artifacts=[data_artifact(COMPLETED_RESULT)])
+
+        mock_client = AsyncMock()
+        mock_client.send_message_streaming = MagicMock(
+            return_value=stream_of(
+                make_a2a_task(status_state=TaskState.submitted),
+                status_event(TaskState.working),
+                completed_task,
+            )
+        )
+
+        with patch("torale.scheduler.agent.A2AClient", return_value=mock_client):
+            result = await call_agent("test prompt")
+
+        assert result.evidence == "streamed"
+        mock_client.send_message.assert_not_called()
+        mock_client.get_task.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_artifact_updates_assembled_on_final_status(self, mock_settings):
+        mock_client = AsyncMock()
+        mock_client.send_message_streaming = MagicMock(
+            return_value=stream_of(
+                status_event(TaskState.working),
+                TaskArtifactUpdateEvent(
+                    task_id="task-abc",
+                    context_id="ctx-test",
+                    artifact=data_artifact(COMPLETED_RESULT),
+                ),
+                status_event(TaskState.completed, final=True),
+            )
+        )
+
+        with patch("torale.scheduler.agent.A2AClient", return_value=mock_client):
+            result = await call_agent("test prompt")
+
+        assert result.confidence == 90
+        mock_client.get_task.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_dropped_stream_resumes_by_polling_without_resending(self, mock_settings):
+        completed_task = make_a2a_task(artifacts=[data_artifact(COMPLETED_RESULT)])
+
+        mock_client = AsyncMock()
+        mock_client.send_message_streaming = MagicMock(
+            return_value=stream_of(
+                make_a2a_task(status_state=TaskState.submitted),
+                ConnectionError("stream reset"),
+            )
+        )
+        mock_client.get_task = AsyncMock(return_value=poll_success(completed_task))
+
+        with patch("torale.scheduler.agent.A2AClient", return_value=mock_client):
+            with patch("torale.scheduler.agent.asyncio.sleep", new_callable=AsyncMock):
+                result = await call_agent("test prompt")
+
+        assert result.evidence == "streamed"
+        mock_client.send_message.assert_not_called()
+        assert mock_client.get_task.await_args.args[0].params.id == "task-abc"
+
+    @pytest.mark.asyncio
+    async def test_unsupported_stream_falls_back_to_send_and_poll(self, mock_settings):
+        completed_task = make_a2a_task(artifacts=[data_artifact(COMPLETED_RESULT)])
+
+        mock_client = AsyncMock()
+        mock_client.send_message_streaming = MagicMock(
+            return_value=stream_of(
+                A2AClientJSONRPCError(
+                    JSONRPCErrorResponse(
+                        error=JSONRPCError(code=-32004, message="Streaming not supported")
+                    )
+                )
+            )
+        )
+        mock_client.send_message = AsyncMock(
+            return_value=send_success(make_a2a_task(status_state=TaskState.submitted))
+        )
+        mock_client.get_task = AsyncMock(return_value=poll_success(completed_task))
+
+        with patch("torale.scheduler.agent.A2AClient", return_value=mock_client):
+            with patch("torale.scheduler.agent.asyncio.sleep", new_callable=AsyncMock):
+                result = await call_agent("test prompt")
+
+        assert result.evidence == "streamed"
+        mock_client.send_message.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_429_before_accept_falls_back_to_paid_tier(self, mock_settings):
+        free_client = AsyncMock()
+        free_client.send_message_streaming = MagicMock(
+            return_value=stream_of(A2AClientHTTPError(429, "Rate limit exceeded"))
+        )
+        paid_client = AsyncMock()
+        paid_client.send_message_streaming = MagicMock(
+            return_value=stream_of(make_a2a_task(artifacts=[data_artifact(COMPLETED_RESULT)]))
+        )
+
+        def get_client(**kwargs):
+            return free_client if "free" in kwargs["url"] else paid_client
+
+        with patch("torale.scheduler.agent.A2AClient", side_effect=get_client):
+            result = await call_agent("test prompt")
+
+        assert result.evidence == "streamed"
+        free_client.send_message.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_stream_event_raises(self, mock_settings):
+        mock_client = AsyncMock()
+        mock_client.send_message_streaming = MagicMock(
+            return_value=stream_of(make_a2a_task(status_state=TaskState.failed))
+        )
+
+        with patch("torale.scheduler.agent.A2AClient", return_value=mock_client):
+            with pytest.raises(RuntimeError, match="failed without error details"):
+                await call_agent("test prompt")
+
+        mock_client.get_task.assert_not_called()
@@ -0,0 +1,124 @@
+"""Tests for the API key verification cache and batched last_used_at writes."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import bcrypt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+import torale.access.api_keys as cache_module
+from torale.access.api_keys import ApiKeyCache, flush_api_key_last_used
+from torale.access.auth_provider import ProductionAuthProvider
+
+MODULE = "torale.access.api_keys"
+PROVIDER_MODULE = "torale.access.auth_provider"
+
+API_KEY = "sk_test_0123456789abcdefghijklmnop"
+KEY_PREFIX = API_KEY[:15] + "..."
+
+
+@pytest.fixture
+def provider():
+    cache = ApiKeyCache(ttl_seconds=60, max_entries=10)
+    key_id, user_id = uuid4(), uuid4()
+    key_hash = bcrypt.hashpw(API_KEY.encode(), bcrypt.gensalt(rounds=4)).decode()
+    with (
+        patch(f"{MODULE}.redis_client") as mock_redis,
+        patch(f"{PROVIDER_MODULE}.api_key_cache", cache),
+        patch(f"{PROVIDER_MODULE}.ApiKeyRepository") as mock_repo_cls,
+        patch.dict(cache_module._pending_last_used, clear=True),
+    ):
+        mock_redis.client = None
+        repo = mock_repo_cls.return_value
+        repo.find_by_prefix = AsyncMock(
+            return_value={
+                "key_id": key_id,
+                "user_id": user_id,
+                "key_hash": key_hash,
+                "clerk_user_id": "user_1",
+                "email": "a@example.com",
+            }
+        )
+        repo.update_last_used = AsyncMock()
+        yield ProductionAuthProvider(), repo, cache, key_id, user_id
+
+
+def _credentials(key=API_KEY):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=key)
+
+
+class TestVerifyApiKey:
+    @pytest.mark.asyncio
+    async def test_repeat_requests_skip_bcrypt_and_lookup(self, provider):
+        provider, repo, _, key_id, user_id = provider
+
+        with patch(f"{PROVIDER_MODULE}.bcrypt.checkpw", wraps=bcrypt.checkpw) as checkpw:
+            first = await provider.get_current_user(_credentials(), MagicMock())
+            second = await provider.get_current_user(_credentials(), MagicMock())
+
+        assert first.id == second.id == user_id
+        assert second.clerk_user_id == "user_1"
+        checkpw.assert_called_once()
+        repo.find_by_prefix.assert_awaited_once()
+        repo.update_last_used.assert_not_awaited()
+        assert key_id in cache_module._pending_last_used
+
+    @pytest.mark.asyncio
+    async def test_cached_prefix_does_not_admit_other_key(self, provider):
+        provider, repo, _, _, _ = provider
+        await provider.get_current_user(_credentials(), MagicMock())
+
+        forged = API_KEY[:15] + "something-else-entirely"
+        with pytest.raises(HTTPException) as exc:
+            await provider.get_current_user(_credentials(forged), MagicMock())
+
+        assert exc.value.status_code == 401
+        assert repo.find_by_prefix.await_count == 2  # fell through to bcrypt
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_reverification(self, provider):
+        provider, repo, cache, _, _ = provider
+        await provider.get_current_user(_credentials(), MagicMock())
+
+        await cache.invalidate(KEY_PREFIX)
+        repo.find_by_prefix.return_value = None  # revoked
+
+        with pytest.raises(HTTPException):
+            await provider.get_current_user(_credentials(), MagicMock())
+
+
+class TestFlushLastUsed:
+    @pytest.mark.asyncio
+    async def test_pending_uses_written_in_one_statement(self):
+        key_a, key_b = uuid4(), uuid4()
+        with (
+            patch(f"{MODULE}.db") as mock_db,
+            patch.dict(cache_module._pending_last_used, clear=True),
+        ):
+            mock_db.execute = AsyncMock()
+            cache_module.record_api_key_use(key_a)
+            cache_module.record_api_key_use(key_b)
+            cache_module.record_api_key_use(key_a)
+
+            assert await flush_api_key_last_used() == 2
+            assert await flush_api_key_last_used() == 0
+
+            mock_db.execute.assert_awaited_once()
+            sql, ids, _ = mock_db.execute.call_args.args
+            assert "unnest" in sql
+            assert set(ids) == {key_a, key_b}
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_pending(self):
+        key_id = uuid4()
+        with (
+            patch(f"{MODULE}.db") as mock_db,
+            patch.dict(cache_module._pending_last_used, clear=True),
+        ):
+            mock_db.execute = AsyncMock(side_effect=OSError("connection refused"))
+            cache_module.record_api_key_use(key_id)
+
+            assert await flush_api_key_last_used() == 0
+            assert key_id in cache_module._pending_last_used
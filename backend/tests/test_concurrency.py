@@ -0,0 +1,112 @@
+"""Tests for the fair execution limiter (scheduler/concurrency.py)."""
+
+import asyncio
+
+import pytest
+
+from torale.scheduler.concurrency import FairLimiter
+
+
+async def _hold(limiter: FairLimiter, key: str, started: list, release: asyncio.Event):
+    async with limiter.slot(key):
+        started.append(key)
+        await release.wait()
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestFairLimiter:
+    @pytest.mark.asyncio
+    async def test_global_cap_queues_excess(self):
+        limiter = FairLimiter("test", max_concurrent=2)
+        started, release = [], asyncio.Event()
+
+        tasks = [asyncio.create_task(_hold(limiter, f"u{i}", started, release)) for i in range(3)]
+        await _settle()
+
+        assert len(started) == 2
+        stats = limiter.stats()
+        assert stats["in_flight"] == 2
+        assert stats["queued"] == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert len(started) == 3
+        assert limiter.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_per_key_cap_lets_other_keys_through(self):
+        limiter = FairLimiter("test", max_concurrent=10, max_per_key=1)
+        started, release = [], asyncio.Event()
+
+        tasks = [
+            asyncio.create_task(_hold(limiter, key, started, release))
+            for key in ("heavy", "heavy", "heavy", "light")
+        ]
+        await _settle()
+
+        assert sorted(started) == ["heavy", "light"]
+        assert limiter.stats()["queued"] == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_waiters_served_round_robin_across_keys(self):
+        limiter = FairLimiter("test", max_concurrent=1)
+        order = []
+        gate = asyncio.Event()
+
+        async def run(key):
+            async with limiter.slot(key):
+                order.append(key)
+                await gate.wait()
+
+        blocker = asyncio.create_task(run("blocker"))
+        await _settle()
+        keys = ["a", "a", "a", "b", "c"]
+        tasks = [asyncio.create_task(run(k)) for k in keys]
+        await _settle()
+
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+
+        assert order == ["blocker", "a", "b", "c", "a", "a"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        limiter = FairLimiter("test", max_concurrent=1)
+        started, release = [], asyncio.Event()
+
+        holder = asyncio.create_task(_hold(limiter, "a", started, release))
+        waiter = asyncio.create_task(_hold(limiter, "b", started, release))
+        await _settle()
+        assert limiter.stats()["queued"] == 1
+
+        waiter.cancel()
+        await _settle()
+        assert limiter.stats()["queued"] == 0
+
+        release.set()
+        await holder
+        assert limiter.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slot_reports_wait_time(self):
+        limiter = FairLimiter("test", max_concurrent=1)
+        waits = []
+
+        async def run(delay):
+            async with limiter.slot("k") as waited:
+                waits.append(waited)
+                await asyncio.sleep(delay)
+
+        await asyncio.gather(run(0.05), run(0))
+
+        assert waits[0] == 0.0
+        assert waits[1] >= 0.04
+        assert limiter.stats()["max_wait_seconds"] >= 0.04
+        assert limiter.stats()["total_acquired"] == 2
@@ -0,0 +1,147 @@
+"""Tests for conditional GET on RSS, sitemaps and public task reads."""
+
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import Request
+
+from torale.api.routers.public_tasks import get_task_rss_feed, rss_router
+from torale.api.routers.sitemap import generate_sitemap_dynamic
+from torale.api.utils.conditional import is_not_modified, make_etag
+
+UPDATED_AT = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=UTC)
+
+
+def _request(path: str, headers: dict[str, str] | None = None) -> Request:
+    return Request(
+        scope={
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "server": ("api.torale.ai", 80),
+            "path": path,
+            "query_string": b"",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+            "client": ("127.0.0.1", 1234),
+            "router": rss_router,
+        }
+    )
+
+
+class TestIsNotModified:
+    def test_if_none_match_weak_comparison(self):
+        etag = make_etag("a", 1)
+        strong = etag.removeprefix("W/")
+
+        assert is_not_modified(_request("/", {"If-None-Match": f'"x", {strong}'}), etag, None)
+        assert is_not_modified(_request("/", {"If-None-Match": "*"}), etag, None)
+        assert not is_not_modified(_request("/", {"If-None-Match": make_etag("b")}), etag, None)
+
+    def test_if_none_match_takes_precedence_over_if_modified_since(self):
+        headers = {
+            "If-None-Match": make_etag("stale"),
+            "If-Modified-Since": format_datetime(UPDATED_AT + timedelta(days=1), usegmt=True),
+        }
+        assert not is_not_modified(_request("/", headers), make_etag("fresh"), UPDATED_AT)
+
+    def test_if_modified_since_second_resolution(self):
+        same_second = format_datetime(UPDATED_AT.replace(microsecond=0), usegmt=True)
+        earlier = format_datetime(UPDATED_AT - timedelta(seconds=1), usegmt=True)
+
+        assert is_not_modified(_request("/", {"If-Modified-Since": same_second}), "e", UPDATED_AT)
+        assert not is_not_modified(_request("/", {"If-Modified-Since": earlier}), "e", UPDATED_AT)
+        assert not is_not_modified(_request("/", {"If-Modified-Since": "garbage"}), "e", UPDATED_AT)
+
+
+class TestTaskRss:
+    @pytest.mark.asyncio
+    async def test_matching_etag_skips_render(self):
+        task_id = uuid4()
+        db = AsyncMock()
+        db.fetch_one.return_value = {
+            "is_public": True,
+            "updated_at": UPDATED_AT,
+            "last_execution_id": uuid4(),
+        }
+
+        with patch("torale.api.routers.public_tasks._render_task_rss") as render:
+            render.return_value = "<rss/>"
+            first = await get_task_rss_feed(_request(f"/tasks/{task_id}/rss"), task_id, db)
+            etag = first.headers["etag"]
+            second = await get_task_rss_feed(
+                _request(f"/tasks/{task_id}/rss", {"If-None-Match": etag}), task_id, db
+            )
+
+        assert first.status_code == 200
+        assert first.headers["cache-control"].startswith("public, max-age=")
+        assert first.headers["last-modified"] == format_datetime(UPDATED_AT, usegmt=True)
+        assert second.status_code == 304
+        assert second.body == b""
+        assert second.headers["etag"] == etag
+        render.assert_called_once()
+        db.fetch_all.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_new_execution_changes_etag(self):
+        task_id = uuid4()
+        db = AsyncMock()
+        db.fetch_one.return_value = {
+            "is_public": True,
+            "updated_at": UPDATED_AT,
+            "last_execution_id": uuid4(),
+        }
+
+        with patch("torale.api.routers.public_tasks._render_task_rss", return_value="<rss/>"):
+            first = await get_task_rss_feed(_request(f"/tasks/{task_id}/rss"), task_id, db)
+            db.fetch_one.return_value = {
+                "is_public": True,
+                "updated_at": UPDATED_AT + timedelta(minutes=5),
+                "last_execution_id": uuid4(),
+            }
+            second = await get_task_rss_feed(
+                _request(f"/tasks/{task_id}/rss", {"If-None-Match": first.headers["etag"]}),
+                task_id,
+                db,
+            )
+
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
+
+
+class TestSitemap:
+    @pytest.mark.asyncio
+    async def test_if_modified_since_returns_304_without_task_scan(self):
+        db = AsyncMock()
+        db.fetch_one.return_value = {"last_modified": UPDATED_AT, "total": 3}
+        tomorrow = datetime.now(UTC) + timedelta(days=1)
+
+        response = await generate_sitemap_dynamic(
+            _request(
+                "/sitemap-dynamic.xml",
+                {"If-Modified-Since": format_datetime(tomorrow, usegmt=True)},
+            ),
+            db,
+        )
+
+        assert response.status_code == 304
+        assert "etag" in response.headers
+        db.fetch_all.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_task_going_private_changes_etag(self):
+        db = AsyncMock()
+        db.fetch_one.return_value = {"last_modified": UPDATED_AT, "total": 3}
+        db.fetch_val.return_value = UPDATED_AT
+
+        first = await generate_sitemap_dynamic(_request("/sitemap-dynamic.xml"), db)
+        db.fetch_one.return_value = {"last_modified": UPDATED_AT, "total": 2}
+        second = await generate_sitemap_dynamic(
+            _request("/sitemap-dynamic.xml", {"If-None-Match": first.headers["etag"]}), db
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
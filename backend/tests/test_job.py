@@ -12,7 +12,7 @@ import pytest
 
 from torale.scheduler.history import ExecutionRecord
 from torale.scheduler.job import _execute, execute_task_job
-from torale.scheduler.models import MonitoringResponse, NotificationContext
+from torale.scheduler.models import ExecutionContext, MonitoringResponse
 
 TASK_ID = str(uuid4())
 EXECUTION_ID = str(uuid4())
@@ -33,15 +33,15 @@ def _make_task_row(attached_connector_slugs=None):
         "state": "active",
         "user_id": USER_ID,
         "attached_connector_slugs": attached_connector_slugs or [],
+        "success_count": 1,
     }
 
 
-def _make_notification_context(channels=None):
-    return NotificationContext(
-        task={"id": TASK_ID, "name": TASK_NAME},
-        execution={"id": EXECUTION_ID},
-        clerk_email="test@example.com",
-        notification_channels=channels or ["email"],
+def _make_context(history=None, **task_fields):
+    return ExecutionContext(
+        task={**_make_task_row(), **task_fields},
+        execution={"id": EXECUTION_ID, "task_id": TASK_ID, "status": "running"},
+        history=history or [],
     )
 
 
@@ -60,24 +60,23 @@ class TestExecute:
     @pytest.mark.asyncio
     async def test_no_notification_skips_notify(self, job_mocks):
         """Agent returns no notification -> no notifications sent."""
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
+        job_mocks.load_ctx.return_value = _make_context()
         job_mocks.agent.return_value = _make_agent_response()
 
         await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME)
 
-        job_mocks.persist.assert_awaited_once()
-        job_mocks.email.assert_not_awaited()
-        job_mocks.webhook.assert_not_awaited()
+        job_mocks.finalizer.succeed.assert_called_once()
+        job_mocks.finalizer.commit.assert_awaited_once()
+        job_mocks.finalizer.enqueue_notification.assert_not_called()
+        job_mocks.wake.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_next_run_none_completes_task(self, job_mocks):
         """Agent returns next_run=null -> task completed after notification."""
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
+        job_mocks.load_ctx.return_value = _make_context()
         job_mocks.agent.return_value = _make_agent_response(
             notification="Release date is Sept 9", next_run=None
         )
-        job_mocks.fetch_ctx.return_value = _make_notification_context()
-        job_mocks.email.return_value = True
 
         mock_service = MagicMock()
         mock_service.complete = AsyncMock()
@@ -85,60 +84,53 @@ class TestExecute:
 
         await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME)
 
-        job_mocks.email.assert_awaited_once()
+        job_mocks.finalizer.enqueue_notification.assert_called_once()
         mock_service.complete.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_next_run_set_does_not_complete(self, job_mocks):
         """Agent returns next_run -> notification sent, NOT completed."""
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
+        job_mocks.load_ctx.return_value = _make_context()
         job_mocks.agent.return_value = _make_agent_response(notification="Price dropped")
-        job_mocks.fetch_ctx.return_value = _make_notification_context()
-        job_mocks.email.return_value = True
 
         await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME)
 
-        job_mocks.email.assert_awaited_once()
+        job_mocks.finalizer.enqueue_notification.assert_called_once()
         job_mocks.service_cls.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_notification_failure_still_reschedules(self, job_mocks):
-        """Notification raises -> execution still succeeds, next run still scheduled."""
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
+    async def test_notifications_queued_per_channel(self, job_mocks):
+        """Notifications go to the outbox per channel; the dispatcher is woken after commit."""
+        job_mocks.load_ctx.return_value = _make_context(notification_channels=["email", "webhook"])
         job_mocks.agent.return_value = _make_agent_response(notification="Condition met")
-        job_mocks.fetch_ctx.return_value = _make_notification_context()
-        job_mocks.email.side_effect = RuntimeError("SMTP error")
-
-        mock_sched = MagicMock()
-        job_mocks.scheduler.return_value = mock_sched
+        job_mocks.finalizer.commit.side_effect = lambda: job_mocks.wake.assert_not_called()
 
         await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME)
 
-        job_mocks.service_cls.assert_not_called()
-        mock_sched.add_job.assert_called_once()
+        calls = job_mocks.finalizer.enqueue_notification.call_args_list
+        assert [call.args[1] for call in calls] == ["email", "webhook"]
+        assert calls[0].args[0] == USER_ID
+        assert calls[0].args[2] == TASK_NAME
+        assert calls[0].args[3].notification == "Condition met"
+        job_mocks.finalizer.merge_result.assert_not_called()
+        job_mocks.wake.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_next_run_none_completes_even_if_notification_fails(self, job_mocks):
-        """next_run=null + notification failure -> task still completes."""
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
-        job_mocks.agent.return_value = _make_agent_response(
-            notification="Condition met", next_run=None
-        )
-        job_mocks.fetch_ctx.return_value = _make_notification_context()
-        job_mocks.email.side_effect = RuntimeError("SMTP error")
-
-        mock_service = MagicMock()
-        mock_service.complete = AsyncMock()
-        job_mocks.service_cls.return_value = mock_service
+    async def test_commit_failure_queues_nothing(self, job_mocks):
+        """If the result does not commit, neither does its outbox row, and nothing is woken."""
+        job_mocks.load_ctx.return_value = _make_context()
+        job_mocks.agent.return_value = _make_agent_response(notification="Condition met")
+        job_mocks.finalizer.commit.side_effect = RuntimeError("connection reset")
+        job_mocks.scheduler.return_value = MagicMock()
 
         await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME)
 
-        mock_service.complete.assert_awaited_once()
+        job_mocks.wake.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_agent_failure_marks_failed(self, job_mocks):
         """call_agent raises -> execution marked as retrying or failed (no exception raised)."""
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
+        job_mocks.load_ctx.return_value = _make_context()
         job_mocks.agent.side_effect = RuntimeError("Agent unreachable")
 
         # Should not raise - error is handled and retry is scheduled
@@ -151,8 +143,8 @@ class TestExecute:
     @pytest.mark.asyncio
     async def test_double_failure_logged(self, job_mocks):
         """Agent raises + DB update raises -> DB error propagates, execution update fails."""
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
-        job_mocks.db.execute = AsyncMock(side_effect=[None, Exception("DB down")])
+        job_mocks.load_ctx.return_value = _make_context()
+        job_mocks.db.execute = AsyncMock(side_effect=Exception("DB down"))
         job_mocks.agent.side_effect = RuntimeError("Agent error")
 
         # DB error should be raised when we can't persist the failure state
@@ -162,7 +154,7 @@ class TestExecute:
     @pytest.mark.asyncio
     async def test_dynamic_reschedule(self, job_mocks):
         """Agent returns next_run -> scheduler.add_job called with DateTrigger."""
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
+        job_mocks.load_ctx.return_value = _make_context()
         future_time = (datetime.now(UTC) + timedelta(hours=2)).isoformat()
         job_mocks.agent.return_value = _make_agent_response(next_run=future_time)
 
@@ -175,31 +167,6 @@ class TestExecute:
         call_kwargs = mock_sched.add_job.call_args
         assert call_kwargs.kwargs["id"] == f"task-{TASK_ID}"
 
-    @pytest.mark.asyncio
-    async def test_running_transition_clears_prior_error_fields(self, job_mocks):
-        """On entry to _execute, the RUNNING-state UPDATE must clear error fields.
-
-        Regression: retries reuse execution_id, so the row still holds
-        error_message / internal_error / error_category from the failed prior
-        attempt. If a retry then succeeds, persist_execution_result updates
-        status but doesn't touch the error columns, leaving the success row
-        with a stale user-facing error message.
-        """
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
-        job_mocks.agent.return_value = _make_agent_response()
-
-        await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME)
-
-        # The first db.execute call should be the RUNNING state transition,
-        # and it must clear error fields, completed_at, and stale result flags.
-        first_sql = job_mocks.db.execute.call_args_list[0].args[0]
-        assert "status = $2" in first_sql
-        assert "error_message = NULL" in first_sql
-        assert "internal_error = NULL" in first_sql
-        assert "error_category = NULL" in first_sql
-        assert "completed_at = NULL" in first_sql
-        assert "result = '{}'::jsonb" in first_sql
-
     @pytest.mark.asyncio
     async def test_retry_path_preserves_execution_id(self, job_mocks):
         """Failed-attempt retries must share a row by forwarding execution_id.
@@ -210,7 +177,7 @@ class TestExecute:
         delay. Only successful follow-ups get a fresh row (see
         test_successful_scheduled_run_does_not_forward_execution_id).
         """
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
+        job_mocks.load_ctx.return_value = _make_context()
         job_mocks.agent.side_effect = RuntimeError("Transient agent failure")
 
         mock_sched = MagicMock()
@@ -238,7 +205,7 @@ class TestExecute:
         every subsequent run -- producing multi-day "durations" and collapsing
         execution history onto one row per task.
         """
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
+        job_mocks.load_ctx.return_value = _make_context()
         future_time = (datetime.now(UTC) + timedelta(hours=2)).isoformat()
         job_mocks.agent.return_value = _make_agent_response(next_run=future_time)
 
@@ -256,7 +223,7 @@ class TestExecute:
     @pytest.mark.asyncio
     async def test_execute_task_job_delegates_to_execute(self, job_mocks):
         """execute_task_job delegates to _execute with execution_id=None."""
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
+        job_mocks.load_ctx.return_value = _make_context()
         job_mocks.agent.return_value = _make_agent_response()
 
         with patch(f"{MODULE}.create_execution_record", new_callable=AsyncMock) as mock_create_exec:
@@ -270,9 +237,8 @@ class TestExecute:
     @pytest.mark.asyncio
     async def test_execution_history_in_prompt(self, job_mocks):
         """Recent executions -> prompt includes execution history block with safety tags."""
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
         job_mocks.agent.return_value = _make_agent_response()
-        job_mocks.recent_execs.return_value = [
+        history = [
             ExecutionRecord(
                 completed_at="2026-02-05T14:30:00+00:00",
                 confidence=72,
@@ -288,6 +254,7 @@ class TestExecute:
                 sources=["https://apple.com/newsroom"],
             ),
         ]
+        job_mocks.load_ctx.return_value = _make_context(history=history)
 
         await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME)
 
@@ -303,26 +270,86 @@ class TestExecute:
 
     @pytest.mark.asyncio
     async def test_first_execution_sets_flag(self, job_mocks):
-        """First successful execution -> is_first_execution=True in enriched_result."""
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
+        """No prior successes (tasks.success_count == 0) -> is_first_execution=True."""
+        job_mocks.load_ctx.return_value = _make_context(success_count=0)
         job_mocks.agent.return_value = _make_agent_response(notification="Condition met")
-        job_mocks.fetch_ctx.return_value = _make_notification_context()
-        job_mocks.email.return_value = True
-        job_mocks.db.fetch_val = AsyncMock(return_value=1)
 
         await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME)
 
-        enriched_result = job_mocks.email.call_args[0][3]
+        enriched_result = job_mocks.finalizer.enqueue_notification.call_args.args[3]
         assert enriched_result.is_first_execution is True
 
     @pytest.mark.asyncio
     async def test_first_run_no_history(self, job_mocks):
         """No previous executions -> no history block in prompt."""
-        job_mocks.db.fetch_one = AsyncMock(return_value=_make_task_row())
+        job_mocks.load_ctx.return_value = _make_context(history=[], success_count=0)
         job_mocks.agent.return_value = _make_agent_response()
-        job_mocks.recent_execs.return_value = []
 
         await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME)
 
         prompt = job_mocks.agent.call_args[0][0]
         assert "Execution History" not in prompt
+
+    @pytest.mark.asyncio
+    async def test_terminal_writes_committed_once(self, job_mocks):
+        """Result, rename, outbox rows and next_run go through one finalizer commit."""
+        job_mocks.load_ctx.return_value = _make_context(name="New Monitor")
+        future_time = datetime.now(UTC) + timedelta(hours=2)
+        response = _make_agent_response(
+            notification="Condition met", next_run=future_time.isoformat()
+        )
+        response.topic = "iPhone 17 launch"
+        job_mocks.agent.return_value = response
+
+        mock_sched = MagicMock()
+        job_mocks.scheduler.return_value = mock_sched
+
+        await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME)
+
+        finalizer = job_mocks.finalizer
+        finalizer.rename_task.assert_called_once_with("iPhone 17 launch")
+        finalizer.enqueue_notification.assert_called_once()
+        assert finalizer.set_next_run.call_args.args[0] == future_time
+        finalizer.commit.assert_awaited_once()
+        # next_run is already persisted by the finalizer; only the job is registered
+        mock_sched.add_job.assert_called_once()
+        job_mocks.db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_commit_failure_does_not_reschedule_as_success(self, job_mocks):
+        """A failed finalizer commit is handled by the failure path, not the success path."""
+        job_mocks.load_ctx.return_value = _make_context()
+        job_mocks.agent.return_value = _make_agent_response()
+        job_mocks.finalizer.commit.side_effect = RuntimeError("connection reset")
+
+        mock_sched = MagicMock()
+        job_mocks.scheduler.return_value = mock_sched
+
+        await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME, retry_count=0)
+
+        args = mock_sched.add_job.call_args.kwargs["args"]
+        assert args[3] == 1  # retry scheduled
+        assert args[4] == EXECUTION_ID
+
+    @pytest.mark.asyncio
+    async def test_later_execution_not_first(self, job_mocks):
+        """A maintained success_count > 0 -> is_first_execution=False, no COUNT(*) query."""
+        job_mocks.load_ctx.return_value = _make_context(success_count=4)
+        job_mocks.agent.return_value = _make_agent_response(notification="Condition met")
+
+        await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME)
+
+        enriched_result = job_mocks.finalizer.enqueue_notification.call_args.args[3]
+        assert enriched_result.is_first_execution is False
+        job_mocks.db.fetch_val.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_permanent_failure_bumps_failure_count(self, job_mocks):
+        """The failure update also increments tasks.failure_count when status is failed."""
+        job_mocks.load_ctx.side_effect = RuntimeError("Task not found")
+
+        await _execute(TASK_ID, EXECUTION_ID, USER_ID, TASK_NAME, retry_count=10)
+
+        sql, status, *_ = job_mocks.db.execute.call_args_list[0].args
+        assert "failure_count = failure_count + 1" in sql
+        assert status == "failed"
@@ -0,0 +1,184 @@
+"""Tests for lease-based dispatch (leases.py, worker.LeaseDispatcher)."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from torale.scheduler.job import _schedule_next_run
+from torale.scheduler.worker import LeaseDispatcher
+from torale.tasks import TaskState
+from torale.tasks.service import TaskService
+
+WORKER = "torale.scheduler.worker"
+
+
+def _claimed_row(retry_count=0, execution_id=None):
+    return {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "name": "Leased Task",
+        "next_run": datetime.now(UTC) - timedelta(seconds=5),
+        "scheduled_retry_count": retry_count,
+        "scheduled_execution_id": execution_id,
+    }
+
+
+@pytest.fixture
+def lease_mode():
+    with patch("torale.scheduler.leases.settings") as mock_settings:
+        mock_settings.scheduler_backend = "lease"
+        yield mock_settings
+
+
+class TestScheduleNextRunLeaseMode:
+    @pytest.mark.asyncio
+    async def test_writes_tasks_row_instead_of_apscheduler_job(self, lease_mode):
+        task_id, execution_id = str(uuid4()), str(uuid4())
+        run_at = datetime.now(UTC) + timedelta(minutes=5)
+
+        with (
+            patch("torale.scheduler.job.get_scheduler") as mock_get_scheduler,
+            patch("torale.scheduler.leases.db") as mock_db,
+        ):
+            mock_db.execute = AsyncMock()
+            await _schedule_next_run(task_id, str(uuid4()), "Task", run_at, execution_id, 2)
+
+        mock_get_scheduler.assert_not_called()
+        args = mock_db.execute.await_args.args
+        assert "scheduled_retry_count" in args[0]
+        assert args[1] == run_at
+        assert args[2] == 2
+        assert str(args[3]) == execution_id
+
+
+class TestTaskServiceLeaseMode:
+    @pytest.mark.asyncio
+    async def test_pause_and_complete_do_not_touch_apscheduler(self, lease_mode):
+        service = TaskService(db=MagicMock())
+        service.db.execute = AsyncMock(return_value="UPDATE 1")
+
+        with patch("torale.tasks.service.get_scheduler") as mock_get_scheduler:
+            paused = await service.pause(uuid4(), TaskState.ACTIVE)
+            completed = await service.complete(uuid4(), TaskState.ACTIVE)
+
+        mock_get_scheduler.assert_not_called()
+        assert paused["schedule_action"] == "paused"
+        assert completed["schedule_action"] == "deleted"
+
+    @pytest.mark.asyncio
+    async def test_activate_schedules_via_tasks_row(self, lease_mode):
+        service = TaskService(db=MagicMock())
+        service.db.execute = AsyncMock(return_value="UPDATE 1")
+        task_id = uuid4()
+        run_at = datetime.now(UTC) + timedelta(minutes=1)
+
+        with (
+            patch("torale.tasks.service.schedule_task", new_callable=AsyncMock) as mock_schedule,
+            patch("torale.tasks.service.get_scheduler") as mock_get_scheduler,
+        ):
+            await service.activate(task_id, TaskState.PAUSED, uuid4(), "Task", next_run=run_at)
+
+        mock_get_scheduler.assert_not_called()
+        mock_schedule.assert_awaited_once_with(task_id, run_at)
+
+
+class TestLeaseDispatcher:
+    @pytest.mark.asyncio
+    async def test_tick_executes_claimed_tasks_and_releases_leases(self):
+        execution_id = uuid4()
+        rows = [_claimed_row(), _claimed_row(retry_count=1, execution_id=execution_id)]
+
+        with (
+            patch(f"{WORKER}.claim_due_tasks", new_callable=AsyncMock, return_value=rows),
+            patch(f"{WORKER}.execute_task_job", new_callable=AsyncMock) as mock_execute,
+            patch(f"{WORKER}.release_lease", new_callable=AsyncMock) as mock_release,
+        ):
+            dispatcher = LeaseDispatcher(owner="node-a", batch_size=10, max_in_flight=10)
+            claimed = await dispatcher.tick()
+            await asyncio.gather(*dispatcher._in_flight)
+
+        assert claimed == 2
+        assert mock_execute.await_count == 2
+        retry_call = mock_execute.await_args_list[1].args
+        assert retry_call[3] == 1
+        assert retry_call[4] == str(execution_id)
+        released = {c.args[0] for c in mock_release.await_args_list}
+        assert released == {rows[0]["id"], rows[1]["id"]}
+        assert all(c.args[1] == "node-a" for c in mock_release.await_args_list)
+
+    @pytest.mark.asyncio
+    async def test_lease_released_when_execution_raises(self):
+        row = _claimed_row()
+
+        with (
+            patch(f"{WORKER}.claim_due_tasks", new_callable=AsyncMock, return_value=[row]),
+            patch(
+                f"{WORKER}.execute_task_job",
+                new_callable=AsyncMock,
+                side_effect=RuntimeError("db down"),
+            ),
+            patch(f"{WORKER}.release_lease", new_callable=AsyncMock) as mock_release,
+        ):
+            dispatcher = LeaseDispatcher(owner="node-a")
+            await dispatcher.tick()
+            await asyncio.gather(*dispatcher._in_flight)
+
+        mock_release.assert_awaited_once_with(row["id"], "node-a", row["next_run"])
+
+    @pytest.mark.asyncio
+    async def test_claims_only_remaining_capacity(self):
+        with patch(f"{WORKER}.claim_due_tasks", new_callable=AsyncMock, return_value=[]) as claim:
+            dispatcher = LeaseDispatcher(owner="node-a", batch_size=20, max_in_flight=5)
+            dispatcher._in_flight = {MagicMock(), MagicMock()}
+            await dispatcher.tick()
+
+        claim.assert_awaited_once_with("node-a", 3, dispatcher.lease_seconds)
+
+    @pytest.mark.asyncio
+    async def test_lease_extended_while_execution_waits_or_runs(self):
+        row = _claimed_row()
+        finish = asyncio.Event()
+
+        async def slow_execute(*args):
+            await finish.wait()
+
+        with (
+            patch(f"{WORKER}.claim_due_tasks", new_callable=AsyncMock, return_value=[row]),
+            patch(f"{WORKER}.execute_task_job", side_effect=slow_execute),
+            patch(f"{WORKER}.extend_lease", new_callable=AsyncMock, return_value=True) as extend,
+            patch(f"{WORKER}.release_lease", new_callable=AsyncMock),
+        ):
+            dispatcher = LeaseDispatcher(owner="node-a", lease_seconds=0.03)
+            await dispatcher.tick()
+            await asyncio.sleep(0.05)
+            finish.set()
+            await asyncio.gather(*dispatcher._in_flight)
+            extended = extend.await_count
+            await asyncio.sleep(0.03)
+
+        assert extended >= 2
+        assert extend.await_count == extended  # Heartbeat stops with the execution
+        extend.assert_awaited_with(row["id"], "node-a", 0.03)
+
+    @pytest.mark.asyncio
+    async def test_run_loop_survives_unexpected_errors(self):
+        dispatcher = LeaseDispatcher(owner="node-a", poll_interval=0.001)
+        calls = 0
+
+        async def tick():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("connection is closed")
+            if calls >= 3:
+                raise asyncio.CancelledError
+            return 0
+
+        dispatcher.tick = tick
+        with pytest.raises(asyncio.CancelledError):
+            await dispatcher._run_loop()
+
+        assert calls == 3
@@ -58,13 +58,12 @@ class TestManualRunCoordination:
 
         scheduler_mock = MagicMock()
         job_mock = MagicMock()
-        # Make get_job thread-safe by returning immediately
         scheduler_mock.get_job = MagicMock(return_value=job_mock)
         scheduler_mock.remove_job = MagicMock()
 
         background_tasks = BackgroundTasks()
 
-        with patch("torale.scheduler.scheduler.get_scheduler", return_value=scheduler_mock):
+        with patch("torale.api.routers.tasks.get_scheduler", return_value=scheduler_mock):
             result = await start_task_execution(
                 task_id=TASK_ID,
                 task_name=TASK_NAME,
@@ -76,8 +75,7 @@ class TestManualRunCoordination:
         # Verify execution was created (main behavior)
         assert result["status"] == "pending"
 
-        # Note: Due to asyncio.to_thread, scheduler method calls happen in thread pool
-        # We verify the overall behavior works rather than specific method calls
+        scheduler_mock.remove_job.assert_called_once_with(f"task-{TASK_ID}")
 
     @pytest.mark.asyncio
     async def test_succeeds_when_no_pending_job(self):
@@ -95,7 +93,7 @@ class TestManualRunCoordination:
 
         background_tasks = BackgroundTasks()
 
-        with patch("torale.scheduler.scheduler.get_scheduler", return_value=scheduler_mock):
+        with patch("torale.api.routers.tasks.get_scheduler", return_value=scheduler_mock):
             result = await start_task_execution(
                 task_id=TASK_ID,
                 task_name=TASK_NAME,
@@ -129,7 +127,7 @@ class TestManualRunCoordination:
 
         background_tasks = BackgroundTasks()
 
-        with patch("torale.scheduler.scheduler.get_scheduler", return_value=scheduler_mock):
+        with patch("torale.api.routers.tasks.get_scheduler", return_value=scheduler_mock):
             # First manual run succeeds
             result1 = await start_task_execution(
                 task_id=TASK_ID,
@@ -169,7 +167,7 @@ class TestManualRunCoordination:
 
         background_tasks_mock = MagicMock(spec=BackgroundTasks)
 
-        with patch("torale.scheduler.scheduler.get_scheduler", return_value=scheduler_mock):
+        with patch("torale.api.routers.tasks.get_scheduler", return_value=scheduler_mock):
             await start_task_execution(
                 task_id=TASK_ID,
                 task_name=TASK_NAME,
@@ -205,7 +203,7 @@ class TestManualRunCoordination:
 
         background_tasks = BackgroundTasks()
 
-        with patch("torale.scheduler.scheduler.get_scheduler", return_value=scheduler_mock):
+        with patch("torale.api.routers.tasks.get_scheduler", return_value=scheduler_mock):
             result = await start_task_execution(
                 task_id=TASK_ID,
                 task_name=TASK_NAME,
@@ -9,161 +9,170 @@ import pytest
 MODULE = "torale.scheduler.migrate"
 
 
-def _make_task_row(state="active", next_run=None):
+def _diff_row(state="active", job_id=None, next_run=None, orphan=False):
+    """A row of the sync diff query: task side, job side, or both."""
+    if orphan:
+        return {
+            "task_id": None,
+            "user_id": None,
+            "name": None,
+            "next_run": None,
+            "state": None,
+            "job_id": job_id,
+        }
     return {
-        "id": uuid4(),
+        "task_id": uuid4(),
         "user_id": uuid4(),
         "name": "Test Task",
         "next_run": next_run or (datetime.now(UTC) + timedelta(hours=24)),
         "state": state,
+        "job_id": job_id,
     }
 
 
-def _make_job(job_id, paused=False):
-    job = MagicMock()
-    job.id = job_id
-    job.next_run_time = None if paused else datetime.now(UTC)
-    return job
+@pytest.fixture
+def sync_mocks():
+    """Scheduler whose add_job/remove_job record the bulk helpers' calls per job."""
+    scheduler = MagicMock()
+
+    def add_bulk(func, specs):
+        for spec in specs:
+            scheduler.add_job(func, **spec)
+        return len(specs)
+
+    def remove_bulk(job_ids):
+        for job_id in job_ids:
+            scheduler.remove_job(job_id)
+        return len(job_ids)
+
+    with (
+        patch(f"{MODULE}.get_scheduler", return_value=scheduler),
+        patch(f"{MODULE}.add_jobs_bulk", side_effect=add_bulk),
+        patch(f"{MODULE}.remove_jobs_bulk", side_effect=remove_bulk),
+        patch(f"{MODULE}.flush_job_store", new_callable=AsyncMock) as mock_flush,
+        patch(f"{MODULE}.db") as mock_db,
+    ):
+        mock_db.fetch_all = AsyncMock(return_value=[])
+        yield scheduler, mock_db, mock_flush
 
 
 class TestSyncJobsFromDatabase:
     @pytest.mark.asyncio
-    @patch(f"{MODULE}.get_scheduler")
-    @patch(f"{MODULE}.db")
-    async def test_active_task_no_job_creates_job(self, mock_db, mock_sched_fn):
+    async def test_active_task_no_job_creates_job(self, sync_mocks):
         """Active task with no existing job -> creates job."""
-        row = _make_task_row(state="active")
-        mock_db.fetch_all = AsyncMock(return_value=[row])
+        scheduler, mock_db, _ = sync_mocks
+        row = _diff_row(state="active")
+        mock_db.fetch_all.return_value = [row]
+
+        from torale.scheduler.migrate import sync_jobs_from_database
+
+        report = await sync_jobs_from_database()
+
+        scheduler.add_job.assert_called_once()
+        assert scheduler.add_job.call_args.kwargs["next_run_time"] == row["next_run"]
+        scheduler.pause_job.assert_not_called()
+        assert report["added"] == 1
 
-        scheduler = MagicMock()
-        scheduler.get_job.return_value = None
-        scheduler.get_jobs.return_value = []
-        mock_sched_fn.return_value = scheduler
+    @pytest.mark.asyncio
+    async def test_paused_task_no_job_creates_paused_job(self, sync_mocks):
+        """Paused task with no existing job -> creates the job already paused."""
+        scheduler, mock_db, _ = sync_mocks
+        row = _diff_row(state="paused")
+        mock_db.fetch_all.return_value = [row]
 
         from torale.scheduler.migrate import sync_jobs_from_database
 
         await sync_jobs_from_database()
 
         scheduler.add_job.assert_called_once()
+        assert scheduler.add_job.call_args.kwargs["id"] == f"task-{row['task_id']}"
+        assert scheduler.add_job.call_args.kwargs["next_run_time"] is None
         scheduler.pause_job.assert_not_called()
 
     @pytest.mark.asyncio
-    @patch(f"{MODULE}.get_scheduler")
-    @patch(f"{MODULE}.db")
-    async def test_paused_task_no_job_creates_and_pauses(self, mock_db, mock_sched_fn):
-        """Paused task with no existing job -> creates job then pauses it."""
-        row = _make_task_row(state="paused")
-        mock_db.fetch_all = AsyncMock(return_value=[row])
-
-        scheduler = MagicMock()
-        scheduler.get_job.return_value = None
-        scheduler.get_jobs.return_value = []
-        mock_sched_fn.return_value = scheduler
+    async def test_past_next_run_falls_back_to_24h(self, sync_mocks):
+        """Missing job whose next_run already passed -> scheduled 24h out."""
+        scheduler, mock_db, _ = sync_mocks
+        mock_db.fetch_all.return_value = [
+            _diff_row(state="active", next_run=datetime.now(UTC) - timedelta(hours=1))
+        ]
 
         from torale.scheduler.migrate import sync_jobs_from_database
 
         await sync_jobs_from_database()
 
-        scheduler.add_job.assert_called_once()
-        scheduler.pause_job.assert_called_once_with(f"task-{row['id']}")
+        next_run = scheduler.add_job.call_args.kwargs["next_run_time"]
+        assert next_run > datetime.now(UTC) + timedelta(hours=23)
 
     @pytest.mark.asyncio
-    @patch(f"{MODULE}.get_scheduler")
-    @patch(f"{MODULE}.db")
-    async def test_active_task_paused_job_resumes(self, mock_db, mock_sched_fn):
+    async def test_active_task_paused_job_resumes(self, sync_mocks):
         """Active task with paused job -> resumes job."""
-        row = _make_task_row(state="active")
-        job_id = f"task-{row['id']}"
-        mock_db.fetch_all = AsyncMock(return_value=[row])
-
-        scheduler = MagicMock()
-        scheduler.get_job.return_value = _make_job(job_id, paused=True)
-        scheduler.get_jobs.return_value = [_make_job(job_id, paused=True)]
-        mock_sched_fn.return_value = scheduler
+        scheduler, mock_db, _ = sync_mocks
+        row = _diff_row(state="active", job_id="task-x")
+        mock_db.fetch_all.return_value = [row]
 
         from torale.scheduler.migrate import sync_jobs_from_database
 
         await sync_jobs_from_database()
 
-        scheduler.resume_job.assert_called_once_with(job_id)
+        scheduler.resume_job.assert_called_once_with("task-x")
         scheduler.add_job.assert_not_called()
 
     @pytest.mark.asyncio
-    @patch(f"{MODULE}.get_scheduler")
-    @patch(f"{MODULE}.db")
-    async def test_paused_task_active_job_pauses(self, mock_db, mock_sched_fn):
+    async def test_paused_task_active_job_pauses(self, sync_mocks):
         """Paused task with active job -> pauses job."""
-        row = _make_task_row(state="paused")
-        job_id = f"task-{row['id']}"
-        mock_db.fetch_all = AsyncMock(return_value=[row])
-
-        scheduler = MagicMock()
-        scheduler.get_job.return_value = _make_job(job_id, paused=False)
-        scheduler.get_jobs.return_value = [_make_job(job_id, paused=False)]
-        mock_sched_fn.return_value = scheduler
+        scheduler, mock_db, _ = sync_mocks
+        mock_db.fetch_all.return_value = [_diff_row(state="paused", job_id="task-x")]
 
         from torale.scheduler.migrate import sync_jobs_from_database
 
         await sync_jobs_from_database()
 
-        scheduler.pause_job.assert_called_once_with(job_id)
+        scheduler.pause_job.assert_called_once_with("task-x")
 
     @pytest.mark.asyncio
-    @patch(f"{MODULE}.get_scheduler")
-    @patch(f"{MODULE}.db")
-    async def test_orphaned_job_removed(self, mock_db, mock_sched_fn):
+    async def test_orphaned_job_removed(self, sync_mocks):
         """Job with no matching task -> removed."""
-        mock_db.fetch_all = AsyncMock(return_value=[])
-
-        orphan = _make_job("task-orphan-id", paused=False)
-        scheduler = MagicMock()
-        scheduler.get_jobs.return_value = [orphan]
-        mock_sched_fn.return_value = scheduler
+        scheduler, mock_db, _ = sync_mocks
+        mock_db.fetch_all.return_value = [_diff_row(job_id="task-orphan-id", orphan=True)]
 
         from torale.scheduler.migrate import sync_jobs_from_database
 
-        await sync_jobs_from_database()
+        report = await sync_jobs_from_database()
 
         scheduler.remove_job.assert_called_once_with("task-orphan-id")
+        assert report["removed"] == 1
 
     @pytest.mark.asyncio
-    @patch(f"{MODULE}.get_scheduler")
-    @patch(f"{MODULE}.db")
-    async def test_per_task_failure_continues(self, mock_db, mock_sched_fn):
+    async def test_per_task_failure_continues(self, sync_mocks):
         """Failure on one task doesn't block others."""
-        row1 = _make_task_row(state="active")
-        row2 = _make_task_row(state="active")
-        mock_db.fetch_all = AsyncMock(return_value=[row1, row2])
-
-        scheduler = MagicMock()
-        scheduler.get_job.return_value = None
-        scheduler.add_job.side_effect = [RuntimeError("bad cron"), None]
-        scheduler.get_jobs.return_value = []
-        mock_sched_fn.return_value = scheduler
+        scheduler, mock_db, _ = sync_mocks
+        mock_db.fetch_all.return_value = [_diff_row(), _diff_row()]
+        # Bulk batch fails on the first job, then each job is retried on its own
+        scheduler.add_job.side_effect = [RuntimeError("bad cron"), RuntimeError("bad cron"), None]
 
         from torale.scheduler.migrate import sync_jobs_from_database
 
-        await sync_jobs_from_database()
+        report = await sync_jobs_from_database()
 
-        assert scheduler.add_job.call_count == 2
+        assert scheduler.add_job.call_count == 3
+        assert report["added"] == 1
+        assert report["failed"] == 1
 
     @pytest.mark.asyncio
-    @patch(f"{MODULE}.get_scheduler")
-    @patch(f"{MODULE}.db")
-    async def test_empty_db_no_op(self, mock_db, mock_sched_fn):
-        """Empty database -> no jobs created or removed."""
-        mock_db.fetch_all = AsyncMock(return_value=[])
-
-        scheduler = MagicMock()
-        scheduler.get_jobs.return_value = []
-        mock_sched_fn.return_value = scheduler
+    async def test_empty_diff_no_op(self, sync_mocks):
+        """Nothing out of sync -> no jobs created or removed, timings still reported."""
+        scheduler, _, mock_flush = sync_mocks
 
         from torale.scheduler.migrate import sync_jobs_from_database
 
-        await sync_jobs_from_database()
+        report = await sync_jobs_from_database()
 
         scheduler.add_job.assert_not_called()
         scheduler.remove_job.assert_not_called()
+        # Flushed before the diff and after applying changes
+        assert mock_flush.await_count == 2
+        assert set(report["timings"]) == {"diff", "add", "pause_resume", "remove", "persist"}
 
 
 class TestReapStaleExecutions:
@@ -0,0 +1,194 @@
+"""Tests for the notification outbox dispatcher (outbox.NotificationDispatcher)."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import asyncpg
+import pytest
+
+from torale.scheduler.outbox import (
+    RETRY_DELAYS,
+    NotificationDispatcher,
+    prune_processed_notifications,
+    wake_notification_dispatcher,
+)
+
+MODULE = "torale.scheduler.outbox"
+
+
+def _row(task_id, execution_id, channel="email", attempts=0):
+    payload = {
+        "task_name": "Monitor",
+        "result": {"execution_id": str(execution_id), "summary": "Condition met"},
+    }
+    return {
+        "id": uuid4(),
+        "task_id": task_id,
+        "execution_id": execution_id,
+        "user_id": uuid4(),
+        "channel": channel,
+        "payload": json.dumps(payload),
+        "attempts": attempts,
+    }
+
+
+@pytest.fixture
+def outbox_mocks():
+    with (
+        patch(f"{MODULE}.db") as mock_db,
+        patch(f"{MODULE}.build_notification_context") as mock_build_ctx,
+        patch(f"{MODULE}.send_email_notification", new_callable=AsyncMock) as mock_email,
+        patch(f"{MODULE}.send_webhook_notification", new_callable=AsyncMock) as mock_webhook,
+    ):
+        conn = MagicMock()
+        conn.execute = AsyncMock()
+        conn.executemany = AsyncMock()
+        tx = MagicMock()
+        tx.__aenter__ = AsyncMock()
+        tx.__aexit__ = AsyncMock(return_value=False)
+        conn.transaction.return_value = tx
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        mock_db.acquire = acquire
+        mock_db.fetch_all = AsyncMock()
+
+        mocks = MagicMock()
+        mocks.db = mock_db
+        mocks.conn = conn
+        mocks.build_ctx = mock_build_ctx
+        mocks.email = mock_email
+        mocks.webhook = mock_webhook
+        yield mocks
+
+
+def _claim(mocks, rows, task_ids=None, execution_ids=None):
+    tasks = [{"id": t} for t in (task_ids or {r["task_id"] for r in rows})]
+    executions = [{"id": e} for e in (execution_ids or {r["execution_id"] for r in rows})]
+    mocks.db.fetch_all.side_effect = [rows, tasks, executions]
+
+
+class TestNotificationDispatcher:
+    @pytest.mark.asyncio
+    async def test_nothing_due(self, outbox_mocks):
+        outbox_mocks.db.fetch_all.return_value = []
+
+        assert await NotificationDispatcher(batch_size=10).tick() == 0
+
+        assert "FOR UPDATE SKIP LOCKED" in outbox_mocks.db.fetch_all.call_args.args[0]
+        outbox_mocks.email.assert_not_awaited()
+        outbox_mocks.conn.executemany.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_delivered_rows_marked_processed(self, outbox_mocks):
+        task_id, execution_id = uuid4(), uuid4()
+        email, webhook = _row(task_id, execution_id), _row(task_id, execution_id, "webhook")
+        _claim(outbox_mocks, [email, webhook])
+        outbox_mocks.email.return_value = True
+
+        assert await NotificationDispatcher(batch_size=10).tick() == 2
+
+        user_id, task_name, _, result = outbox_mocks.email.call_args.args
+        assert user_id == str(email["user_id"])
+        assert task_name == "Monitor"
+        assert result.summary == "Condition met"
+        outbox_mocks.webhook.assert_awaited_once()
+        updates = outbox_mocks.conn.executemany.call_args.args[1]
+        assert [(u[1], u[2], u[4]) for u in updates] == [(1, None, True), (1, None, True)]
+        outbox_mocks.conn.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failure_backs_off(self, outbox_mocks):
+        task_id, execution_id = uuid4(), uuid4()
+        _claim(outbox_mocks, [_row(task_id, execution_id)])
+        outbox_mocks.email.side_effect = RuntimeError("Novu 503")
+
+        await NotificationDispatcher(batch_size=10).tick()
+
+        _, attempts, error, retry_at, processed = outbox_mocks.conn.executemany.call_args.args[1][0]
+        assert (attempts, error, processed) == (1, "Novu 503", False)
+        assert retry_at is not None
+        outbox_mocks.conn.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_exhausted_or_skipped_flags_execution(self, outbox_mocks):
+        """Giving up, or an email that was skipped, sets notification_failed on the result."""
+        task_id, exhausted_execution, skipped_execution = uuid4(), uuid4(), uuid4()
+        exhausted = _row(task_id, exhausted_execution, attempts=len(RETRY_DELAYS))
+        skipped = _row(task_id, skipped_execution)
+        _claim(outbox_mocks, [exhausted, skipped])
+        outbox_mocks.email.side_effect = [RuntimeError("Novu 503"), False]
+
+        await NotificationDispatcher(batch_size=10).tick()
+
+        updates = outbox_mocks.conn.executemany.call_args.args[1]
+        assert all(u[4] for u in updates)  # both processed, neither retried
+        sql, execution_ids = outbox_mocks.conn.execute.call_args.args
+        assert "notification_failed" in sql
+        assert set(execution_ids) == {exhausted_execution, skipped_execution}
+
+    @pytest.mark.asyncio
+    async def test_deleted_task_is_dropped(self, outbox_mocks):
+        row = _row(uuid4(), uuid4())
+        outbox_mocks.db.fetch_all.side_effect = [[row], [], [{"id": row["execution_id"]}]]
+
+        await NotificationDispatcher(batch_size=10).tick()
+
+        outbox_mocks.email.assert_not_awaited()
+        assert outbox_mocks.conn.executemany.call_args.args[1][0][4] is True
+
+    @pytest.mark.asyncio
+    async def test_run_loop_survives_interface_errors(self):
+        dispatcher = NotificationDispatcher(poll_interval=0.001, batch_size=10)
+        calls = 0
+
+        async def tick():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise asyncpg.InterfaceError("connection has been released back to the pool")
+            if calls >= 3:
+                raise asyncio.CancelledError
+            return 0
+
+        dispatcher.tick = tick
+        with pytest.raises(asyncio.CancelledError):
+            await dispatcher._run_loop()
+
+        assert calls == 3
+
+    def test_wake_without_dispatcher_is_noop(self):
+        wake_notification_dispatcher()
+
+
+class TestPruneProcessedNotifications:
+    @pytest.mark.asyncio
+    async def test_deletes_in_batches_until_short_batch(self):
+        with patch(f"{MODULE}.db") as mock_db, patch(f"{MODULE}.settings") as mock_settings:
+            mock_settings.notification_outbox_retention_days = 14
+            mock_settings.execution_archive_batch_size = 2
+            mock_db.execute = AsyncMock(side_effect=["DELETE 2", "DELETE 1"])
+
+            pruned = await prune_processed_notifications(datetime(2026, 10, 16, tzinfo=UTC))
+
+        assert pruned == 3
+        sql, cutoff, batch_size = mock_db.execute.call_args.args
+        assert "processed_at < $1" in sql
+        assert cutoff == datetime(2026, 10, 2, tzinfo=UTC)
+        assert batch_size == 2
+
+    @pytest.mark.asyncio
+    async def test_zero_retention_keeps_rows(self):
+        with patch(f"{MODULE}.db") as mock_db, patch(f"{MODULE}.settings") as mock_settings:
+            mock_settings.notification_outbox_retention_days = 0
+            mock_db.execute = AsyncMock()
+
+            assert await prune_processed_notifications() == 0
+
+        mock_db.execute.assert_not_awaited()
@@ -0,0 +1,153 @@
+"""Tests for keyset (cursor) pagination across list endpoints and the SDK."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, Request, Response
+
+from torale.api.routers.public_tasks import _render_public_tasks_page, list_public_tasks
+from torale.api.routers.tasks import get_task_executions
+from torale.sdk.resources.tasks import TasksResource, execution_cursor
+from torale.tasks import TaskExecution
+from torale.tasks.repository import TaskExecutionRepository
+from torale.utils.cursor import decode_cursor, encode_cursor
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+
+
+def _execution_row(task_id, minutes_ago: int) -> dict:
+    return {
+        "id": uuid4(),
+        "task_id": task_id,
+        "status": "success",
+        "started_at": NOW - timedelta(minutes=minutes_ago),
+        "completed_at": NOW - timedelta(minutes=minutes_ago),
+        "result": None,
+        "error_message": None,
+        "notification": None,
+        "grounding_sources": None,
+        "created_at": NOW - timedelta(minutes=minutes_ago),
+    }
+
+
+class TestCursor:
+    def test_round_trip(self):
+        task_id = uuid4()
+        assert decode_cursor(encode_cursor(NOW, task_id), datetime, type(task_id)) == (
+            NOW,
+            task_id,
+        )
+        assert decode_cursor(encode_cursor(42, task_id), int, type(task_id)) == (42, task_id)
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor("x"), encode_cursor("a", "b")])
+    def test_malformed_cursor_raises_value_error(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, datetime, type(uuid4()))
+
+
+class TestPublicTasks:
+    @pytest.mark.asyncio
+    async def test_popular_page_uses_keyset_not_offset_scan(self):
+        db = AsyncMock()
+        db.fetch_all.return_value = []
+        last_id = uuid4()
+
+        await _render_public_tasks_page(db, "popular", None, (17, last_id), 0, 20)
+
+        sql, *params = db.fetch_all.call_args.args
+        assert "(t.view_count, t.id) < ($3, $4)" in sql
+        assert "ORDER BY sort_key DESC, t.id DESC" in sql
+        assert "OVER()" not in sql
+        assert params == [20, 0, 17, last_id]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_400(self):
+        request = Request(
+            scope={"type": "http", "method": "GET", "path": "/", "headers": [], "client": ("1", 1)}
+        )
+        with pytest.raises(HTTPException) as exc:
+            await list_public_tasks(
+                request,
+                user=None,
+                offset=0,
+                limit=20,
+                sort_by="recent",
+                cursor="bogus",
+                q=None,
+                db=AsyncMock(),
+            )
+        assert exc.value.status_code == 400
+
+
+class TestTaskExecutions:
+    @pytest.mark.asyncio
+    async def test_full_page_sets_next_cursor_header(self):
+        task_id, user = uuid4(), MagicMock()
+        rows = [_execution_row(task_id, minutes) for minutes in (1, 2)]
+        db = AsyncMock()
+        db.fetch_one.return_value = {"id": task_id, "user_id": user.id, "is_public": False}
+        db.fetch_all.return_value = rows
+        response = Response()
+
+        before = encode_cursor(NOW, uuid4())
+        executions = await get_task_executions(task_id, user, response, 2, before, db)
+
+        assert len(executions) == 2
+        sql, *params = db.fetch_all.call_args.args
+        assert "(started_at, id) < ($3, $4)" in sql
+        assert params[:2] == [task_id, 2]
+        assert decode_cursor(response.headers["x-next-cursor"], datetime, type(task_id)) == (
+            rows[-1]["started_at"],
+            rows[-1]["id"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_short_page_has_no_cursor(self):
+        task_id, user = uuid4(), MagicMock()
+        db = AsyncMock()
+        db.fetch_one.return_value = {"id": task_id, "user_id": user.id, "is_public": False}
+        db.fetch_all.return_value = [_execution_row(task_id, 1)]
+        response = Response()
+
+        await get_task_executions(task_id, user, response, 2, None, db)
+
+        assert "x-next-cursor" not in response.headers
+
+
+class TestExecutionRepository:
+    @pytest.mark.asyncio
+    async def test_find_by_task_pages_by_keyset(self):
+        db = AsyncMock()
+        task_id, last_id = uuid4(), uuid4()
+
+        await TaskExecutionRepository(db).find_by_task(
+            task_id, limit=10, before=(NOW, last_id), status="success"
+        )
+
+        sql, *params = db.fetch_all.call_args.args
+        assert '("started_at","id")<($3,$4)' in sql
+        assert "OFFSET" not in sql
+        assert params == [task_id, "success", NOW, last_id]
+
+
+class TestSdkIterExecutions:
+    def test_iterates_pages_by_cursor(self):
+        task_id = uuid4()
+        pages = [
+            [_execution_row(task_id, 1), _execution_row(task_id, 2)],
+            [_execution_row(task_id, 3)],
+        ]
+        client = MagicMock()
+        client.get.side_effect = [
+            [TaskExecution(**row).model_dump(mode="json") for row in page] for page in pages
+        ]
+
+        executions = list(TasksResource(client).iter_executions(task_id, page_size=2))
+
+        assert [e.id for e in executions] == [row["id"] for page in pages for row in page]
+        first_params = client.get.call_args_list[0].kwargs["params"]
+        second_params = client.get.call_args_list[1].kwargs["params"]
+        assert "cursor" not in first_params
+        assert second_params["cursor"] == execution_cursor(executions[1])
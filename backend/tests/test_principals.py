@@ -0,0 +1,150 @@
+"""Tests for the verified-principal cache and its use in ProductionAuthProvider."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from torale.access.auth_provider import ProductionAuthProvider
+from torale.access.principals import CachedPrincipal, PrincipalCache
+
+MODULE = "torale.access.principals"
+PROVIDER_MODULE = "torale.access.auth_provider"
+
+
+def _principal(email="a@example.com"):
+    return CachedPrincipal(email=email, email_verified=True, db_user_id=uuid4())
+
+
+@pytest.fixture
+def no_redis():
+    with patch(f"{MODULE}.redis_client") as mock_redis:
+        mock_redis.client = None
+        yield mock_redis
+
+
+class TestLocalCache:
+    @pytest.mark.asyncio
+    async def test_hit_and_session_scoping(self, no_redis):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=10)
+        principal = _principal()
+        await cache.set("user_1", "sess_1", principal)
+
+        assert await cache.get("user_1", "sess_1") == principal
+        assert await cache.get("user_1", "sess_2") is None
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_dropped(self, no_redis):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=10)
+        with patch(f"{MODULE}.time.monotonic", return_value=1000.0):
+            await cache.set("user_1", "sess_1", _principal())
+        with patch(f"{MODULE}.time.monotonic", return_value=1061.0):
+            assert await cache.get("user_1", "sess_1") is None
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, no_redis):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+        await cache.set("user_1", "s", _principal())
+        await cache.set("user_2", "s", _principal())
+        await cache.get("user_1", "s")  # user_2 is now least recently used
+        await cache.set("user_3", "s", _principal())
+
+        assert await cache.get("user_1", "s") is not None
+        assert await cache.get("user_2", "s") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_all_sessions(self, no_redis):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=10)
+        await cache.set("user_1", "sess_1", _principal())
+        await cache.set("user_1", "sess_2", _principal())
+        await cache.set("user_2", "sess_1", _principal())
+
+        await cache.invalidate("user_1")
+
+        assert await cache.get("user_1", "sess_1") is None
+        assert await cache.get("user_1", "sess_2") is None
+        assert await cache.get("user_2", "sess_1") is not None
+
+
+class TestRedisCache:
+    @pytest.mark.asyncio
+    async def test_round_trip_through_redis_hash(self):
+        store = {}
+        client = MagicMock()
+        pipe = MagicMock()
+        pipe.hset = lambda key, field, value: store.__setitem__((key, field), value)
+        pipe.execute = AsyncMock()
+        client.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+        client.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+        client.hget = AsyncMock(side_effect=lambda key, field: store.get((key, field)))
+        client.delete = AsyncMock()
+
+        with patch(f"{MODULE}.redis_client") as mock_redis:
+            mock_redis.client = client
+            cache = PrincipalCache(ttl_seconds=60, max_entries=10)
+            principal = _principal()
+            await cache.set("user_1", "sess_1", principal)
+
+            assert await cache.get("user_1", "sess_1") == principal
+            pipe.expire.assert_called_once_with("auth:principal:user_1", 60)
+            assert not cache._local  # Redis is the store when connected
+
+            await cache.invalidate("user_1")
+            client.delete.assert_awaited_once_with("auth:principal:user_1")
+
+
+class TestProviderUsesCache:
+    @pytest.fixture
+    def provider(self, no_redis):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=10)
+        clerk_user = SimpleNamespace(
+            primary_email_address_id="em_1",
+            email_addresses=[
+                SimpleNamespace(
+                    id="em_1",
+                    email_address="a@example.com",
+                    verification=SimpleNamespace(status="verified"),
+                )
+            ],
+        )
+        with (
+            patch(f"{PROVIDER_MODULE}.settings") as mock_settings,
+            patch(f"{PROVIDER_MODULE}.verify_token") as mock_verify,
+            patch(f"{PROVIDER_MODULE}.principal_cache", cache),
+            patch(f"{PROVIDER_MODULE}.UserRepository") as mock_repo_cls,
+        ):
+            mock_settings.clerk_secret_key = "sk_test"
+            mock_verify.return_value = {"sub": "user_1", "sid": "sess_1"}
+            db_user_id = uuid4()
+            mock_repo_cls.return_value.find_by_clerk_id = AsyncMock(return_value={"id": db_user_id})
+            provider = ProductionAuthProvider()
+            provider.clerk_client = MagicMock()
+            provider.clerk_client.users.get.return_value = clerk_user
+            yield provider, mock_repo_cls.return_value, db_user_id
+
+    @pytest.mark.asyncio
+    async def test_second_request_skips_clerk_and_db(self, provider):
+        provider, repo, db_user_id = provider
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="jwt")
+
+        first = await provider.get_current_user(credentials, MagicMock())
+        second = await provider.get_current_user(credentials, MagicMock())
+
+        assert first.id == second.id == db_user_id
+        assert second.email == "a@example.com"
+        assert second.email_verified is True
+        provider.clerk_client.users.get.assert_called_once()
+        repo.find_by_clerk_id.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unsynced_user_not_cached(self, provider):
+        provider, repo, _ = provider
+        repo.find_by_clerk_id.return_value = None
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="jwt")
+
+        await provider.get_current_user(credentials, MagicMock())
+        await provider.get_current_user(credentials, MagicMock())
+
+        assert provider.clerk_client.users.get.call_count == 2
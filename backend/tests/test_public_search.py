@@ -0,0 +1,112 @@
+"""Tests for full-text search over public tasks (q on /public/tasks, SDK search)."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from torale.api.routers.public_tasks import _count_public_tasks, _render_public_tasks_page
+from torale.sdk.resources.tasks import TasksResource
+from torale.tasks.repository import TaskRepository
+from torale.tasks.search import search_document
+
+
+class TestPublicTaskSearch:
+    @pytest.mark.asyncio
+    async def test_search_filters_by_indexed_document_and_ranks(self):
+        db = AsyncMock()
+        db.fetch_all.return_value = []
+
+        await _render_public_tasks_page(db, "recent", "iphone release", None, 0, 20)
+
+        sql, *params = db.fetch_all.call_args.args
+        assert f"{search_document('t')} @@ websearch_to_tsquery('english', $3)" in sql
+        assert "ts_rank_cd(" in sql
+        assert "ORDER BY sort_key DESC, t.id DESC" in sql
+        assert "LIKE" not in sql
+        assert params == [20, 0, "iphone release"]
+
+    @pytest.mark.asyncio
+    async def test_search_keyset_on_rank(self):
+        db = AsyncMock()
+        db.fetch_all.return_value = []
+        last_id = uuid4()
+
+        await _render_public_tasks_page(db, "recent", "iphone", (0.25, last_id), 0, 20)
+
+        sql, *params = db.fetch_all.call_args.args
+        assert "::float8, t.id) < ($4, $5)" in sql
+        assert params == [20, 0, "iphone", 0.25, last_id]
+
+    @pytest.mark.asyncio
+    async def test_search_total_counts_matches(self):
+        db = AsyncMock()
+        db.fetch_val.return_value = 3
+
+        assert await _count_public_tasks(db, "iphone") == "3"
+
+        sql, q = db.fetch_val.call_args.args
+        assert search_document() in sql
+        assert q == "iphone"
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_total_uses_planner_estimate_when_large(self):
+        db = AsyncMock()
+        db.fetch_val.return_value = json.dumps([{"Plan": {"Plan Rows": 250000}}])
+
+        assert await _count_public_tasks(db, None) == "250000"
+
+        sql = db.fetch_val.call_args.args[0]
+        assert sql.startswith("EXPLAIN (FORMAT JSON)")
+        db.fetch_val.assert_awaited_once()  # no exact COUNT(*)
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_total_counted_exactly_when_small(self):
+        db = AsyncMock()
+        db.fetch_val.side_effect = [json.dumps([{"Plan": {"Plan Rows": 40}}]), 42]
+
+        assert await _count_public_tasks(db, None) == "42"
+
+        assert "SELECT COUNT(*) FROM (" in db.fetch_val.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_repository_search_uses_full_text_index(self):
+        db = AsyncMock()
+
+        await TaskRepository(db).find_public_tasks(limit=5, search="Bitcoin")
+
+        sql, *params = db.fetch_all.call_args.args
+        assert search_document() in sql
+        assert "LIKE" not in sql
+        assert params == ["Bitcoin", 5, 0]
+
+
+class TestSdkSearch:
+    def test_iter_search_follows_next_cursor(self):
+        def task(name):
+            return {
+                "id": str(uuid4()),
+                "user_id": str(uuid4()),
+                "name": name,
+                "search_query": "q",
+                "condition_description": "c",
+                "state": "active",
+                "created_at": "2026-03-01T12:00:00Z",
+                "state_changed_at": "2026-03-01T12:00:00Z",
+            }
+
+        client = MagicMock()
+        client.get.side_effect = [
+            {"tasks": [task("a"), task("b")], "total": 3, "next_cursor": "c1"},
+            {"tasks": [task("c")], "total": 3, "next_cursor": None},
+        ]
+
+        names = [t.name for t in TasksResource(client).iter_search("btc", page_size=2)]
+
+        assert names == ["a", "b", "c"]
+        assert client.get.call_args_list[1].kwargs["params"] == {
+            "q": "btc",
+            "limit": 2,
+            "cursor": "c1",
+        }
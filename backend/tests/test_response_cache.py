@@ -0,0 +1,81 @@
+"""Tests for the public response cache (core.response_cache)."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from torale.core.response_cache import (
+    PUBLIC_FEED,
+    PUBLIC_TASKS,
+    SITEMAP,
+    TASK_RSS,
+    ResponseCache,
+    invalidate_public_task,
+)
+
+MODULE = "torale.core.response_cache"
+
+
+@pytest.fixture
+def no_redis():
+    with patch(f"{MODULE}.redis_client") as mock_redis:
+        mock_redis.client = None
+        yield mock_redis
+
+
+class TestResponseCache:
+    @pytest.mark.asyncio
+    async def test_read_through_builds_once(self, no_redis):
+        cache = ResponseCache(ttl_seconds=60, max_entries=10)
+        build = AsyncMock(return_value="<urlset/>")
+
+        assert await cache.get_or_set(SITEMAP, "dynamic", build) == "<urlset/>"
+        assert await cache.get_or_set(SITEMAP, "dynamic", build) == "<urlset/>"
+
+        build.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_build_error_is_not_cached(self, no_redis):
+        cache = ResponseCache(ttl_seconds=60, max_entries=10)
+        build = AsyncMock(side_effect=[LookupError("404"), "<rss/>"])
+
+        with pytest.raises(LookupError):
+            await cache.get_or_set(TASK_RSS, "k", build)
+        assert await cache.get_or_set(TASK_RSS, "k", build) == "<rss/>"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_public_task_scope(self, no_redis):
+        cache = ResponseCache(ttl_seconds=60, max_entries=10)
+        task_id, other_task_id = uuid4(), uuid4()
+        for namespace in (
+            PUBLIC_TASKS,
+            PUBLIC_FEED,
+            SITEMAP,
+            f"{TASK_RSS}:{task_id}",
+            f"{TASK_RSS}:{other_task_id}",
+        ):
+            await cache.set(namespace, "k", "body")
+
+        with patch(f"{MODULE}.response_cache", cache):
+            await invalidate_public_task(task_id)
+
+        assert await cache.get(PUBLIC_TASKS, "k") is None
+        assert await cache.get(PUBLIC_FEED, "k") is None
+        assert await cache.get(SITEMAP, "k") is None
+        assert await cache.get(f"{TASK_RSS}:{task_id}", "k") is None
+        assert await cache.get(f"{TASK_RSS}:{other_task_id}", "k") == "body"
+
+    @pytest.mark.asyncio
+    async def test_redis_invalidation_deletes_indexed_keys(self):
+        client = MagicMock()
+        client.smembers = AsyncMock(return_value={"cache:sitemap:index", "cache:sitemap:dynamic"})
+        client.delete = AsyncMock()
+
+        with patch(f"{MODULE}.redis_client") as mock_redis:
+            mock_redis.client = client
+            await ResponseCache(ttl_seconds=60, max_entries=10).invalidate(SITEMAP)
+
+        args = client.delete.call_args.args
+        assert args[0] == "cache:sitemap:keys"
+        assert set(args[1:]) == {"cache:sitemap:index", "cache:sitemap:dynamic"}
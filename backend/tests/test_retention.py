@@ -0,0 +1,111 @@
+"""Tests for execution history retention (scheduler.retention)."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from torale.scheduler.retention import (
+    archive_old_executions,
+    drop_expired_archive_partitions,
+    enforce_execution_retention,
+    ensure_archive_partitions,
+)
+
+MODULE = "torale.scheduler.retention"
+NOW = datetime(2026, 10, 16, 12, tzinfo=UTC)
+
+
+@pytest.fixture
+def mock_db():
+    with patch(f"{MODULE}.db") as mock_db:
+        mock_db.fetch_val = AsyncMock(return_value=None)
+        mock_db.fetch_all = AsyncMock(return_value=[])
+        mock_db.execute = AsyncMock(return_value="INSERT 0 0")
+        yield mock_db
+
+
+@pytest.fixture
+def retention_settings():
+    with patch(f"{MODULE}.settings") as mock_settings:
+        mock_settings.execution_retention_days = 90
+        mock_settings.execution_keep_last_per_task = 50
+        mock_settings.execution_archive_retention_months = 12
+        mock_settings.execution_archive_batch_size = 2
+        yield mock_settings
+
+
+class TestArchivePartitions:
+    @pytest.mark.asyncio
+    async def test_creates_one_partition_per_month_across_year_end(self, mock_db):
+        await ensure_archive_partitions(
+            datetime(2025, 11, 20, tzinfo=UTC), datetime(2026, 1, 3, tzinfo=UTC)
+        )
+
+        statements = [c.args[0] for c in mock_db.execute.call_args_list]
+        assert len(statements) == 3
+        assert "task_executions_archive_y2025m11" in statements[0]
+        assert (
+            "FROM ('2025-12-01T00:00:00+00:00') TO ('2026-01-01T00:00:00+00:00')" in statements[1]
+        )
+        assert "task_executions_archive_y2026m01" in statements[2]
+
+    @pytest.mark.asyncio
+    async def test_drops_only_partitions_past_archive_retention(self, mock_db, retention_settings):
+        mock_db.fetch_all.return_value = [
+            {"relname": "task_executions_archive_y2025m09"},
+            {"relname": "task_executions_archive_y2025m10"},
+            {"relname": "task_executions_archive_default"},
+        ]
+
+        dropped = await drop_expired_archive_partitions(NOW)
+
+        assert dropped == ["task_executions_archive_y2025m09"]
+        mock_db.execute.assert_awaited_once_with(
+            "DROP TABLE IF EXISTS task_executions_archive_y2025m09"
+        )
+
+
+class TestArchiveOldExecutions:
+    @pytest.mark.asyncio
+    async def test_moves_batches_until_short_batch(self, mock_db, retention_settings):
+        mock_db.fetch_val.return_value = datetime(2026, 7, 1, tzinfo=UTC)
+        moves = iter(["INSERT 0 2", "INSERT 0 2", "INSERT 0 1"])
+
+        async def execute(sql, *args):
+            return next(moves) if "INSERT INTO task_executions_archive" in sql else "CREATE TABLE"
+
+        mock_db.execute.side_effect = execute
+
+        assert await archive_old_executions(NOW) == 5
+
+        move_sql, cutoff, keep_last, batch_size = next(
+            c.args
+            for c in mock_db.execute.call_args_list
+            if "INSERT INTO task_executions_archive" in c.args[0]
+        )
+        assert cutoff == datetime(2026, 7, 18, 12, tzinfo=UTC)
+        assert (keep_last, batch_size) == (50, 2)
+        assert "t.last_execution_id = e.id" in move_sql
+        # Children that would cascade on delete keep their execution
+        assert "FROM webhook_deliveries w WHERE w.execution_id = e.id" in move_sql
+        assert "FROM notification_outbox o WHERE o.execution_id = e.id" in move_sql
+        assert "result - 'activity'" in move_sql
+
+    @pytest.mark.asyncio
+    async def test_nothing_expired_skips_partitions_and_moves(self, mock_db, retention_settings):
+        assert await archive_old_executions(NOW) == 0
+        mock_db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_disabled_retention_touches_nothing(self, mock_db, retention_settings):
+        retention_settings.execution_retention_days = 0
+
+        assert await archive_old_executions(NOW) == 0
+        mock_db.fetch_val.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_job_failure_is_logged_not_raised(self, mock_db, retention_settings):
+        mock_db.fetch_val.side_effect = RuntimeError("db down")
+
+        await enforce_execution_retention()
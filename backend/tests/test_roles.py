@@ -0,0 +1,139 @@
+"""Tests for cached role resolution (access.roles) used by verify_role."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from torale.access.auth_provider import ProductionAuthProvider, User
+from torale.access.roles import RoleCache
+
+MODULE = "torale.access.roles"
+
+
+def _clerk(role=None):
+    client = MagicMock()
+    client.users.get_async = AsyncMock(
+        return_value=SimpleNamespace(public_metadata={"role": role} if role else {})
+    )
+    return client
+
+
+@pytest.fixture
+def mock_db():
+    with patch(f"{MODULE}.db") as mock_db:
+        mock_db.fetch_one = AsyncMock(return_value=None)
+        mock_db.execute = AsyncMock()
+        yield mock_db
+
+
+class TestRoleCache:
+    @pytest.mark.asyncio
+    async def test_mirrored_role_skips_clerk(self, mock_db):
+        mock_db.fetch_one.return_value = {"role": "admin", "role_synced_at": datetime.now(UTC)}
+        clerk = _clerk()
+        cache = RoleCache(ttl_seconds=60, max_concurrent_fetches=1)
+
+        assert await cache.get_role("user_1", clerk) == "admin"
+        assert await cache.get_role("user_1", clerk) == "admin"
+
+        mock_db.fetch_one.assert_awaited_once()  # second check served from memory
+        clerk.users.get_async.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unsynced_role_fetched_once_and_mirrored(self, mock_db):
+        mock_db.fetch_one.return_value = {"role": None, "role_synced_at": None}
+        clerk = _clerk("developer")
+        cache = RoleCache(ttl_seconds=60, max_concurrent_fetches=1)
+
+        with patch(f"{MODULE}.role_cache", cache):
+            roles = await asyncio.gather(*(cache.get_role("user_1", clerk) for _ in range(5)))
+
+        assert roles == ["developer"] * 5
+        clerk.users.get_async.assert_awaited_once()
+        sql, clerk_user_id, role = mock_db.execute.call_args.args
+        assert "role_synced_at = NOW()" in sql
+        assert (clerk_user_id, role) == ("user_1", "developer")
+
+    @pytest.mark.asyncio
+    async def test_invalidate_rereads_mirror(self, mock_db):
+        mock_db.fetch_one.return_value = {"role": None, "role_synced_at": datetime.now(UTC)}
+        cache = RoleCache(ttl_seconds=60, max_concurrent_fetches=1)
+        assert await cache.get_role("user_1", _clerk()) is None
+
+        mock_db.fetch_one.return_value = {"role": "admin", "role_synced_at": datetime.now(UTC)}
+        cache.invalidate("user_1")
+
+        assert await cache.get_role("user_1", _clerk()) == "admin"
+
+    @pytest.mark.asyncio
+    async def test_stale_mirror_refreshed_from_clerk(self, mock_db):
+        synced_at = datetime.now(UTC) - timedelta(days=2)
+        mock_db.fetch_one.return_value = {"role": "admin", "role_synced_at": synced_at}
+        clerk = _clerk()  # Demoted in the Clerk dashboard
+        cache = RoleCache(ttl_seconds=60, max_concurrent_fetches=1)
+
+        with patch(f"{MODULE}.role_cache", cache):
+            assert await cache.get_role("user_1", clerk) is None
+
+        clerk.users.get_async.assert_awaited_once()
+        assert mock_db.execute.call_args.args[1:] == ("user_1", None)
+
+    @pytest.mark.asyncio
+    async def test_stale_admin_fails_closed_when_clerk_unavailable(self, mock_db):
+        synced_at = datetime.now(UTC) - timedelta(days=2)
+        mock_db.fetch_one.return_value = {"role": "admin", "role_synced_at": synced_at}
+        clerk = _clerk()
+        clerk.users.get_async.side_effect = RuntimeError("clerk down")
+        cache = RoleCache(ttl_seconds=60, max_concurrent_fetches=1)
+
+        assert await cache.get_role("user_1", clerk) == "developer"
+        assert await cache.get_role("user_1", clerk) == "developer"
+
+        assert clerk.users.get_async.await_count == 2  # Not cached; retried next check
+
+    @pytest.mark.asyncio
+    async def test_cancelled_fetch_retried_by_waiting_requests(self, mock_db):
+        mock_db.fetch_one.return_value = {"role": None, "role_synced_at": None}
+        clerk = _clerk("developer")
+        started = asyncio.Event()
+
+        async def slow_get(user_id):
+            started.set()
+            await asyncio.sleep(0.05)
+            return SimpleNamespace(public_metadata={"role": "developer"})
+
+        clerk.users.get_async.side_effect = slow_get
+        cache = RoleCache(ttl_seconds=60, max_concurrent_fetches=2)
+
+        with patch(f"{MODULE}.role_cache", cache):
+            first = asyncio.create_task(cache.get_role("user_1", clerk))
+            await started.wait()
+            waiting = asyncio.create_task(cache.get_role("user_1", clerk))
+            await asyncio.sleep(0)
+            first.cancel()
+
+            assert await waiting == "developer"
+
+        assert clerk.users.get_async.await_count == 2
+
+
+class TestVerifyRole:
+    @pytest.mark.asyncio
+    async def test_roles_checked_without_blocking_clerk_call(self):
+        cache = RoleCache(ttl_seconds=60, max_concurrent_fetches=1)
+        cache.put("user_1", "developer")
+        provider = ProductionAuthProvider()
+        provider.clerk_client = MagicMock()
+        user = User(user_id="user_1", email="a@example.com")
+
+        with patch("torale.access.auth_provider.role_cache", cache):
+            assert await provider.verify_role(user, "developer") is True
+            with pytest.raises(HTTPException) as exc:
+                await provider.verify_role(user, "admin")
+
+        assert exc.value.status_code == 403
+        provider.clerk_client.users.get.assert_not_called()
@@ -0,0 +1,159 @@
+"""Tests for the sharded, streamed public task sitemaps."""
+
+import xml.etree.ElementTree as ET
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, Request
+
+from torale.api.routers.sitemap import (
+    _render_sitemap_index,
+    _stream_task_shard,
+    generate_sitemap_tasks,
+)
+
+NS = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+UPDATED_AT = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+
+
+def _request(path: str) -> Request:
+    return Request(
+        scope={"type": "http", "method": "GET", "path": path, "headers": [], "query_string": b""}
+    )
+
+
+def _db_with_cursor(rows):
+    """Database mock whose acquired connection streams rows from conn.cursor()."""
+    conn = MagicMock()
+
+    async def cursor(query, *args, prefetch=None):
+        conn.cursor_args = (query, args, prefetch)
+        for row in rows:
+            yield row
+
+    conn.cursor = cursor
+    conn.transaction = MagicMock(return_value=AsyncMock())
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    db = MagicMock()
+    db.acquire = acquire
+    return db, conn
+
+
+def _passthrough_cache():
+    """response_cache stand-in that always renders."""
+    cache = MagicMock()
+
+    async def get_or_set(namespace, key, render):
+        return await render()
+
+    cache.get_or_set = get_or_set
+    return cache
+
+
+class TestSitemapIndex:
+    @pytest.mark.asyncio
+    async def test_lists_one_sitemap_per_shard(self):
+        db = AsyncMock()
+        db.fetch_all.return_value = [
+            {"shard": 0, "lastmod": datetime(2026, 1, 5, tzinfo=UTC)},
+            {"shard": 1, "lastmod": UPDATED_AT},
+        ]
+
+        with patch("torale.api.routers.sitemap.settings") as mock_settings:
+            mock_settings.frontend_url = "https://torale.ai"
+            mock_settings.sitemap_shard_size = 50000
+            root = ET.fromstring(await _render_sitemap_index(db))
+
+        locs = [loc.text for loc in root.findall("sm:sitemap/sm:loc", NS)]
+        assert locs == [
+            "https://torale.ai/sitemap-static.xml",
+            "https://torale.ai/sitemap-dynamic.xml",
+            "https://torale.ai/sitemaps/tasks-1.xml",
+            "https://torale.ai/sitemaps/tasks-2.xml",
+        ]
+        lastmods = [lastmod.text for lastmod in root.findall("sm:sitemap/sm:lastmod", NS)]
+        assert lastmods[1:] == ["2026-03-01", "2026-01-05", "2026-03-01"]
+        assert db.fetch_all.call_args.args[1] == 50000
+
+
+class TestTaskShards:
+    @pytest.mark.asyncio
+    async def test_shard_streams_valid_urlset_from_cursor(self):
+        task_ids = [uuid4() for _ in range(3)]
+        db, conn = _db_with_cursor([{"id": t, "updated_at": UPDATED_AT} for t in task_ids])
+
+        with (
+            patch("torale.api.routers.sitemap.settings") as mock_settings,
+            patch("torale.api.routers.sitemap.SHARD_STREAM_BATCH_SIZE", 2),
+        ):
+            mock_settings.frontend_url = "https://torale.ai"
+            mock_settings.sitemap_shard_size = 2
+            start = (UPDATED_AT, task_ids[0])
+            chunks = [chunk async for chunk in _stream_task_shard(db, start)]
+
+        root = ET.fromstring("".join(chunks))
+        locs = [loc.text for loc in root.findall("sm:url/sm:loc", NS)]
+        assert locs == [f"https://torale.ai/tasks/{t}" for t in task_ids]
+        assert len(chunks) == 4  # prolog, two URL batches, closing tag
+        query, args, prefetch = conn.cursor_args
+        assert "(created_at, id) >= ($1, $2)" in query
+        assert "OFFSET" not in query
+        assert (args, prefetch) == ((UPDATED_AT, task_ids[0], 2), 2)
+        conn.transaction.assert_called_once_with(readonly=True)
+
+    @pytest.mark.asyncio
+    async def test_shard_starts_at_its_key_from_the_index_query(self):
+        first_ids = [uuid4(), uuid4()]
+        db, conn = _db_with_cursor([{"id": first_ids[1], "updated_at": UPDATED_AT}])
+        db.fetch_one = AsyncMock(return_value={"last_modified": UPDATED_AT, "total": 50001})
+        db.fetch_all = AsyncMock(
+            return_value=[
+                {
+                    "shard": i,
+                    "lastmod": UPDATED_AT,
+                    "first_created_at": UPDATED_AT,
+                    "first_id": i_id,
+                }
+                for i, i_id in enumerate(first_ids)
+            ]
+        )
+
+        with patch("torale.api.routers.sitemap.response_cache", _passthrough_cache()):
+            response = await generate_sitemap_tasks(_request("/sitemaps/tasks-2.xml"), 2, db)
+            body = "".join([chunk async for chunk in response.body_iterator])
+
+        assert f"/tasks/{first_ids[1]}" in body
+        assert conn.cursor_args[1][:2] == (UPDATED_AT, first_ids[1])
+        assert "first_id" in db.fetch_all.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_shard_past_end_is_404(self):
+        db = AsyncMock()
+        db.fetch_one.return_value = {"last_modified": UPDATED_AT, "total": 50001}
+
+        with pytest.raises(HTTPException) as exc:
+            await generate_sitemap_tasks(_request("/sitemaps/tasks-3.xml"), 3, db)
+
+        assert exc.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_empty_first_shard_is_served(self):
+        db, conn = _db_with_cursor([])
+        db.fetch_one = AsyncMock(return_value={"last_modified": None, "total": 0})
+        db.fetch_all = AsyncMock(return_value=[])
+
+        with patch("torale.api.routers.sitemap.response_cache", _passthrough_cache()):
+            response = await generate_sitemap_tasks(_request("/sitemaps/tasks-1.xml"), 1, db)
+            body = "".join([chunk async for chunk in response.body_iterator])
+
+        assert ET.fromstring(body).findall("sm:url", NS) == []
+        assert "cursor_args" not in vars(conn)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/xml")
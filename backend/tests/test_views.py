@@ -1,5 +1,6 @@
-"""Tests for Redis-based view counting (core/views.py)."""
+"""Tests for view counting (core/views.py)."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
@@ -9,37 +10,158 @@ from redis.exceptions import RedisError, ResponseError
 MODULE = "torale.core.views"
 
 
+@pytest.fixture(autouse=True)
+def aggregator():
+    """A fresh view buffer per test, so views counted elsewhere never leak in."""
+    from torale.core.views import ViewAggregator
+
+    with patch(f"{MODULE}.view_aggregator", ViewAggregator()) as aggregator:
+        yield aggregator
+
+
+def _pipeline(client):
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    client.pipeline = MagicMock(return_value=MagicMock())
+    client.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    client.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+    return pipe
+
+
+def _hscan(client, *hashes):
+    """Serve each hash, in order, to successive hscan_iter calls."""
+
+    async def scan(items):
+        for item in items:
+            yield item
+
+    client.hscan_iter = MagicMock(side_effect=[scan(list(h.items())) for h in hashes])
+
+
 class TestIncrementView:
-    def test_noop_when_redis_not_connected(self):
-        """increment_view is a no-op when redis client is None."""
+    def test_buffers_without_event_loop(self, aggregator):
+        """increment_view only counts in memory; it never blocks or raises."""
+        from torale.core.views import increment_view
+
+        increment_view(uuid4())
+        assert aggregator.pending_events == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesces_views_into_one_pipeline(self, aggregator):
+        """Repeated views of a task become one HINCRBY in a single pipeline."""
+        task_a, task_b = uuid4(), uuid4()
         with patch(f"{MODULE}.redis_client") as mock_rc:
+            mock_rc.client = MagicMock()
+            pipe = _pipeline(mock_rc.client)
+            from torale.core.views import increment_view
+
+            for task_id in (task_a, task_a, task_a, task_b):
+                increment_view(task_id)
+            assert await aggregator.flush() == 2
+
+        mock_rc.client.pipeline.assert_called_once_with(transaction=False)
+        pipe.hincrby.assert_any_call("task_views", str(task_a), 3)
+        pipe.hincrby.assert_any_call("task_views", str(task_b), 1)
+        pipe.execute.assert_awaited_once()
+        assert aggregator.pending_events == 0
+
+    @pytest.mark.asyncio
+    async def test_flushes_in_background_after_max_events(self, aggregator):
+        """Reaching view_flush_max_events starts a flush without waiting for the timer."""
+        with (
+            patch(f"{MODULE}.redis_client") as mock_rc,
+            patch(f"{MODULE}.settings") as mock_settings,
+        ):
+            mock_rc.client = MagicMock()
+            pipe = _pipeline(mock_rc.client)
+            mock_settings.view_flush_max_events = 3
+            mock_settings.view_flush_interval_ms = 60_000
+            from torale.core.views import increment_view
+
+            task_id = uuid4()
+            for _ in range(3):
+                increment_view(task_id)
+            await asyncio.sleep(0)
+
+        pipe.hincrby.assert_called_once_with("task_views", str(task_id), 3)
+
+    @pytest.mark.asyncio
+    async def test_without_redis_writes_to_postgres(self, aggregator):
+        """With no Redis, buffered views go straight to tasks.view_count."""
+        task_id = uuid4()
+        with patch(f"{MODULE}.redis_client") as mock_rc, patch(f"{MODULE}.db") as mock_db:
             mock_rc.client = None
+            mock_db.execute = AsyncMock()
             from torale.core.views import increment_view
 
-            # Should not raise or create any task
-            increment_view(uuid4())
+            increment_view(task_id)
+            increment_view(task_id)
+            await aggregator.flush()
+
+        query, task_ids, counts = mock_db.execute.call_args.args
+        assert "view_count = t.view_count + locked.views" in query
+        assert (task_ids, counts) == ([str(task_id)], [2])
 
     @pytest.mark.asyncio
-    async def test_calls_hincrby(self):
-        """_increment_view calls HINCRBY on the task_views hash."""
+    async def test_redis_error_falls_back_to_postgres(self, aggregator):
+        """A failed pipeline does not drop the views."""
         task_id = uuid4()
-        with patch(f"{MODULE}.redis_client") as mock_rc:
-            mock_rc.client = AsyncMock()
-            from torale.core.views import _increment_view
+        with patch(f"{MODULE}.redis_client") as mock_rc, patch(f"{MODULE}.db") as mock_db:
+            mock_rc.client = MagicMock()
+            _pipeline(mock_rc.client).execute.side_effect = RedisError("connection lost")
+            mock_db.execute = AsyncMock()
+            from torale.core.views import increment_view
+
+            increment_view(task_id)
+            await aggregator.flush()
 
-            await _increment_view(task_id)
-            mock_rc.client.hincrby.assert_awaited_once_with("task_views", str(task_id), 1)
+        mock_db.execute.assert_awaited_once()
 
     @pytest.mark.asyncio
-    async def test_swallows_redis_error(self):
-        """_increment_view catches RedisError silently."""
-        with patch(f"{MODULE}.redis_client") as mock_rc:
-            mock_rc.client = AsyncMock()
-            mock_rc.client.hincrby.side_effect = RedisError("connection lost")
-            from torale.core.views import _increment_view
+    async def test_failed_write_keeps_views_for_next_flush(self, aggregator):
+        with patch(f"{MODULE}.redis_client") as mock_rc, patch(f"{MODULE}.db") as mock_db:
+            mock_rc.client = None
+            mock_db.execute = AsyncMock(side_effect=Exception("DB down"))
+            from torale.core.views import increment_view
 
-            # Should not raise
-            await _increment_view(uuid4())
+            increment_view(uuid4())
+            assert await aggregator.flush() == 0
+
+        assert aggregator.pending_events == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_write_retries_on_timer_not_per_view(self, aggregator):
+        """After a failed write, new views don't each start a flush."""
+        with (
+            patch(f"{MODULE}.redis_client") as mock_rc,
+            patch(f"{MODULE}.db") as mock_db,
+            patch(f"{MODULE}.settings") as mock_settings,
+        ):
+            mock_rc.client = None
+            mock_db.execute = AsyncMock(side_effect=Exception("DB down"))
+            mock_settings.view_flush_max_events = 2
+            mock_settings.view_db_flush_seconds = 0.02
+            mock_settings.view_flush_chunk_size = 100
+            from torale.core.views import increment_view
+
+            task_id = uuid4()
+            increment_view(task_id)
+            increment_view(task_id)  # Threshold: one background flush, which fails
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            assert mock_db.execute.await_count == 1
+
+            for _ in range(10):
+                increment_view(task_id)
+            await asyncio.sleep(0)
+            assert mock_db.execute.await_count == 1
+
+            mock_db.execute.side_effect = None
+            await asyncio.sleep(0.05)  # Retry timer fires
+
+        assert mock_db.execute.await_count == 2
+        assert mock_db.execute.call_args.args[2] == [12]
+        assert aggregator.pending_events == 0
 
 
 class TestFlushViewsToPostgres:
@@ -51,7 +173,7 @@ class TestFlushViewsToPostgres:
             from torale.core.views import flush_views_to_postgres
 
             await flush_views_to_postgres()
-            mock_db.executemany.assert_not_called()
+            mock_db.execute.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_noop_when_no_views(self):
@@ -63,7 +185,7 @@ class TestFlushViewsToPostgres:
             from torale.core.views import flush_views_to_postgres
 
             await flush_views_to_postgres()
-            mock_db.executemany.assert_not_called()
+            mock_db.execute.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_flushes_counts_to_postgres(self):
@@ -75,21 +197,19 @@ class TestFlushViewsToPostgres:
             mock_rc.client = AsyncMock()
             mock_rc.client.exists.return_value = False
             mock_rc.client.rename.return_value = True
-            mock_rc.client.hgetall.return_value = {task_id_1: "5", task_id_2: "3"}
+            _hscan(mock_rc.client, {task_id_1: "5", task_id_2: "3"})
             mock_rc.client.delete.return_value = True
-            mock_db.executemany = AsyncMock()
+            mock_db.execute = AsyncMock()
             from torale.core.views import flush_views_to_postgres
 
             await flush_views_to_postgres()
 
-            mock_db.executemany.assert_awaited_once()
-            call_args = mock_db.executemany.call_args
-            query = call_args[0][0]
-            updates = call_args[0][1]
-            assert "view_count = view_count + $1" in query
-            assert len(updates) == 2
-            assert (5, task_id_1) in updates
-            assert (3, task_id_2) in updates
+            mock_db.execute.assert_awaited_once()
+            query, task_ids, counts = mock_db.execute.call_args.args
+            assert "JOIN unnest($1::uuid[], $2::int[])" in query
+            assert "ORDER BY t.id\n" in query and "FOR UPDATE OF t" in query
+            assert dict(zip(task_ids, counts, strict=True)) == {task_id_1: 5, task_id_2: 3}
+            mock_rc.client.hdel.assert_awaited_once()
             mock_rc.client.delete.assert_awaited()
 
     @pytest.mark.asyncio
@@ -102,20 +222,17 @@ class TestFlushViewsToPostgres:
             mock_rc.client = AsyncMock()
             # First exists() check: stale processing key exists
             mock_rc.client.exists.return_value = True
-            # hgetall called twice: once for stale key, once for new key
-            mock_rc.client.hgetall.side_effect = [
-                {stale_task: "10"},  # stale processing key
-                {new_task: "2"},  # newly renamed key
-            ]
+            # Scanned twice: once for stale key, once for new key
+            _hscan(mock_rc.client, {stale_task: "10"}, {new_task: "2"})
             mock_rc.client.rename.return_value = True
             mock_rc.client.delete.return_value = True
-            mock_db.executemany = AsyncMock()
+            mock_db.execute = AsyncMock()
             from torale.core.views import flush_views_to_postgres
 
             await flush_views_to_postgres()
 
-            # executemany called twice: once for recovery, once for fresh flush
-            assert mock_db.executemany.await_count == 2
+            # One UPDATE each: once for recovery, once for fresh flush
+            assert mock_db.execute.await_count == 2
 
     @pytest.mark.asyncio
     async def test_skips_zero_counts(self):
@@ -126,14 +243,14 @@ class TestFlushViewsToPostgres:
             mock_rc.client = AsyncMock()
             mock_rc.client.exists.return_value = False
             mock_rc.client.rename.return_value = True
-            mock_rc.client.hgetall.return_value = {task_id: "0"}
+            _hscan(mock_rc.client, {task_id: "0"})
             mock_rc.client.delete.return_value = True
-            mock_db.executemany = AsyncMock()
+            mock_db.execute = AsyncMock()
             from torale.core.views import flush_views_to_postgres
 
             await flush_views_to_postgres()
 
-            mock_db.executemany.assert_not_called()
+            mock_db.execute.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_db_failure_preserves_processing_key(self):
@@ -144,8 +261,8 @@ class TestFlushViewsToPostgres:
             mock_rc.client = AsyncMock()
             mock_rc.client.exists.return_value = False
             mock_rc.client.rename.return_value = True
-            mock_rc.client.hgetall.return_value = {task_id: "7"}
-            mock_db.executemany = AsyncMock(side_effect=Exception("DB down"))
+            _hscan(mock_rc.client, {task_id: "7"})
+            mock_db.execute = AsyncMock(side_effect=Exception("DB down"))
             from torale.core.views import flush_views_to_postgres
 
             # Should not raise
@@ -153,6 +270,30 @@ class TestFlushViewsToPostgres:
 
             # Processing key should NOT have been deleted
             mock_rc.client.delete.assert_not_awaited()
+            mock_rc.client.hdel.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_large_hash_is_written_in_chunks(self):
+        """Each chunk is one UPDATE, then removed from the processing hash."""
+        counts = {str(uuid4()): "1" for _ in range(5)}
+
+        with (
+            patch(f"{MODULE}.redis_client") as mock_rc,
+            patch(f"{MODULE}.db") as mock_db,
+            patch(f"{MODULE}.settings") as mock_settings,
+        ):
+            mock_settings.view_flush_chunk_size = 2
+            mock_rc.client = AsyncMock()
+            mock_rc.client.exists.return_value = False
+            _hscan(mock_rc.client, counts)
+            mock_db.execute = AsyncMock()
+            from torale.core.views import flush_views_to_postgres
+
+            await flush_views_to_postgres()
+
+        assert [len(c.args[1]) for c in mock_db.execute.call_args_list] == [2, 2, 1]
+        assert mock_rc.client.hdel.await_count == 3
+        mock_rc.client.hscan_iter.assert_called_once_with("task_views:processing", count=2)
 
 
 class TestRedisClient:
@@ -1,5 +1,6 @@
 """Tests for webhook signing and delivery."""
 
+import asyncio
 import hashlib
 import hmac
 import json
@@ -12,6 +13,8 @@ from torale.notifications import (
     WebhookDeliveryService,
     WebhookSignature,
     build_webhook_payload,
+    close_webhook_client,
+    get_webhook_client,
 )
 from torale.scheduler.models import EnrichedExecutionResult, GroundingSource
 
@@ -174,9 +177,10 @@ class TestWebhookDeliveryService:
     """Tests for WebhookDeliveryService class."""
 
     @pytest.fixture
-    def delivery_service(self):
-        """Create webhook delivery service instance."""
-        return WebhookDeliveryService()
+    async def delivery_service(self):
+        """Create webhook delivery service instance on the shared client."""
+        yield WebhookDeliveryService()
+        await close_webhook_client()
 
     @pytest.fixture
     def sample_payload(self, sample_task, sample_execution, sample_monitoring_result):
@@ -279,3 +283,51 @@ class TestWebhookDeliveryService:
         assert "X-Torale-Signature" in headers
         assert headers["X-Torale-Event"] == "task.condition_met"
         assert "X-Torale-Delivery" in headers
+
+
+class TestSharedWebhookClient:
+    """Tests for the process-wide pooled webhook client."""
+
+    @pytest.mark.asyncio
+    async def test_services_share_one_client_until_closed(self):
+        first = WebhookDeliveryService()
+        second = WebhookDeliveryService()
+        assert first.client is second.client is get_webhook_client()
+
+        await close_webhook_client()
+
+        assert first.client.is_closed
+        assert WebhookDeliveryService().client is not first.client
+        await close_webhook_client()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_deliveries_capped_per_host(self, sample_monitoring_result):
+        payload = build_webhook_payload(
+            "exec-1", {"id": "task-1", "name": "Task"}, {}, sample_monitoring_result
+        )
+        in_flight = {"a.example.com": 0, "b.example.com": 0}
+        peak = dict(in_flight)
+
+        async def slow_post(url, **kwargs):
+            host = url.split("/")[2]
+            in_flight[host] += 1
+            peak[host] = max(peak[host], in_flight[host])
+            await asyncio.sleep(0.01)
+            in_flight[host] -= 1
+            return MagicMock(status_code=200, text="OK")
+
+        client = MagicMock()
+        client.post = slow_post
+        service = WebhookDeliveryService(client=client)
+
+        with patch("torale.notifications.webhook.settings") as mock_settings:
+            mock_settings.webhook_max_connections_per_host = 2
+            results = await asyncio.gather(
+                *(
+                    service.deliver(f"https://{host}/hook", payload, "secret")
+                    for host in ["a.example.com"] * 6 + ["b.example.com"] * 3
+                )
+            )
+
+        assert all(success for success, *_ in results)
+        assert peak == {"a.example.com": 2, "b.example.com": 2}
@@ -197,7 +197,8 @@ class TestTestWebhook:
             assert result["success"] is True
             assert "200" in result["message"]
             mock_service.deliver.assert_called_once()
-            mock_service.close.assert_called_once()
+            # Shared pooled client: the service must not close it per delivery
+            mock_service.close.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_failed_test_delivery(self, mock_user, mock_request):
@@ -217,7 +218,7 @@ class TestTestWebhook:
 
             assert exc_info.value.status_code == 400
             assert "Connection timeout" in exc_info.value.detail
-            mock_service.close.assert_called_once()
+            mock_service.close.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_test_webhook_payload_structure(self, mock_user, mock_request):
@@ -0,0 +1,126 @@
+"""Tests for durable webhook redelivery (webhook_retries.retry_due_webhooks)."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from torale.scheduler.webhook_retries import retry_due_webhooks
+
+MODULE = "torale.scheduler.webhook_retries"
+
+PAYLOAD = {
+    "id": "exec-1",
+    "event_type": "task.condition_met",
+    "created_at": 1700000000,
+    "data": {"task": {"id": "task-1"}},
+}
+
+
+def _delivery(task_id, attempt_number=1):
+    return {
+        "id": uuid4(),
+        "task_id": task_id,
+        "webhook_url": "https://hooks.example.com/torale",
+        "payload": json.dumps(PAYLOAD),
+        "attempt_number": attempt_number,
+    }
+
+
+def _task(task_id, secret="whsec"):
+    return {
+        "id": task_id,
+        "webhook_secret": None,
+        "user_webhook_secret": secret,
+        "notifications": [],
+    }
+
+
+@pytest.fixture
+def retry_mocks():
+    with (
+        patch(f"{MODULE}.db") as mock_db,
+        patch(f"{MODULE}.WebhookDeliveryService") as mock_service_cls,
+    ):
+        mock_db.fetch_all = AsyncMock()
+        mock_db.executemany = AsyncMock()
+        service = MagicMock()
+        service.deliver = AsyncMock()
+        mock_service_cls.return_value = service
+        # Keep the real backoff schedule
+        from torale.notifications import WebhookDeliveryService
+
+        mock_service_cls.get_next_retry_time = WebhookDeliveryService.get_next_retry_time
+        yield mock_db, service
+
+
+class TestRetryDueWebhooks:
+    @pytest.mark.asyncio
+    async def test_nothing_due(self, retry_mocks):
+        mock_db, service = retry_mocks
+        mock_db.fetch_all.return_value = []
+
+        assert await retry_due_webhooks() == {"delivered": 0, "rescheduled": 0, "failed": 0}
+
+        assert "FOR UPDATE SKIP LOCKED" in mock_db.fetch_all.call_args.args[0]
+        service.deliver.assert_not_awaited()
+        mock_db.executemany.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_outcomes_recorded_in_one_batch(self, retry_mocks):
+        mock_db, service = retry_mocks
+        task_id = uuid4()
+        ok, flaky, exhausted = (
+            _delivery(task_id),
+            _delivery(task_id, attempt_number=2),
+            _delivery(task_id, attempt_number=3),
+        )
+        mock_db.fetch_all.side_effect = [[ok, flaky, exhausted], [_task(task_id)]]
+
+        async def deliver(url, payload, secret, attempt, custom_headers):
+            assert secret == "whsec"
+            assert payload.id == "exec-1"
+            if attempt == 2:
+                return True, 200, None, "sig-ok"
+            return False, 503, "HTTP 503", "sig-fail"
+
+        service.deliver.side_effect = deliver
+
+        counts = await retry_due_webhooks()
+
+        assert counts == {"delivered": 1, "rescheduled": 1, "failed": 1}
+        mock_db.executemany.assert_awaited_once()
+        rows = {row[0]: row for row in mock_db.executemany.call_args.args[1]}
+        assert rows[ok["id"]][1:7] == (2, 200, None, "sig-ok", True, None)
+        assert rows[flaky["id"]][1] == 3
+        assert rows[flaky["id"]][5] is False
+        assert rows[flaky["id"]][6] is not None  # backed off, not failed
+        assert rows[exhausted["id"]][1] == 4
+        assert rows[exhausted["id"]][6] is None  # schedule exhausted -> failed_at
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_webhook_fails_without_delivery(self, retry_mocks):
+        mock_db, service = retry_mocks
+        task_id = uuid4()
+        delivery = _delivery(task_id)
+        mock_db.fetch_all.side_effect = [[delivery], [_task(task_id, secret=None)]]
+
+        counts = await retry_due_webhooks()
+
+        assert counts["failed"] == 1
+        service.deliver.assert_not_awaited()
+        row = mock_db.executemany.call_args.args[1][0]
+        assert row[3] == "Webhook no longer configured"
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_leaves_row_for_next_claim(self, retry_mocks):
+        mock_db, service = retry_mocks
+        task_id = uuid4()
+        mock_db.fetch_all.side_effect = [[_delivery(task_id)], [_task(task_id)]]
+        service.deliver.side_effect = RuntimeError("boom")
+
+        counts = await retry_due_webhooks()
+
+        assert counts == {"delivered": 0, "rescheduled": 0, "failed": 0}
+        mock_db.executemany.assert_not_awaited()
@@ -34,6 +34,15 @@ export const TaskListRow: React.FC<TaskListRowProps> = ({
   const status = getTaskStatus(task.state);
   const lastExecution = task.last_execution;
 
+  const runCounts = (
+    <p className="text-xs font-mono text-zinc-500 mb-4">
+      {task.success_count} {task.success_count === 1 ? 'check' : 'checks'}
+      {' · '}
+      {task.notification_count} {task.notification_count === 1 ? 'alert' : 'alerts'}
+      {task.failure_count > 0 && ` · ${task.failure_count} failed`}
+    </p>
+  );
+
   const handleRowClick = () => {
     setExpanded(!expanded);
   };
@@ -154,6 +163,7 @@ export const TaskListRow: React.FC<TaskListRowProps> = ({
                   ) : (
                     <p className="text-sm text-zinc-500 mb-4">No results yet</p>
                   )}
+                  {runCounts}
 
                   {/* Actions */}
                   <TaskActions
@@ -195,6 +205,7 @@ export const TaskListRow: React.FC<TaskListRowProps> = ({
                   ) : (
                     <p className="text-sm text-zinc-500 mb-4">No results yet</p>
                   )}
+                  {runCounts}
 
                   {/* Actions */}
                   <TaskActions
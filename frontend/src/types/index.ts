@@ -34,6 +34,12 @@ export interface Task {
   // Next scheduled check (persisted in DB, set by agent)
   next_run: string | null;
 
+  // Execution counters, maintained by the scheduler
+  success_count: number;
+  notification_count: number;
+  failure_count: number;
+  last_success_at: string | null;
+
   created_at: string;
   updated_at: string | null;
   // Notification channels
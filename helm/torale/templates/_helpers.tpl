@@ -112,6 +112,22 @@ Frontend image
 {{ .Values.image.registry }}/{{ .Values.image.repository }}/{{ .Values.frontend.image.name }}:{{ .Values.image.tag | default .Chart.AppVersion }}
 {{- end }}
 
+{{/*
+Worker specific labels
+*/}}
+{{- define "torale.worker.labels" -}}
+{{ include "torale.labels" . }}
+app.kubernetes.io/component: worker
+{{- end }}
+
+{{/*
+Worker selector labels
+*/}}
+{{- define "torale.worker.selectorLabels" -}}
+{{ include "torale.selectorLabels" . }}
+app.kubernetes.io/component: worker
+{{- end }}
+
 {{/*
 Agent specific labels
 */}}
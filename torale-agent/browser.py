@@ -0,0 +1,244 @@
+"""Warm pool of Lightpanda browsers for fetch_url.
+
+Each pooled browser is a long-lived `lightpanda serve` process speaking CDP on
+a local port. A fetch borrows one browser, opens a fresh browser context
+(isolated cookies and storage) with one page, navigates, reads the rendered
+text and disposes of the context, so fetches cost network time rather than
+process startup. The pool size bounds concurrent fetches; callers beyond it
+wait for a free browser instead of forking more processes. A browser is
+restarted after BROWSER_MAX_FETCHES fetches or on any protocol error or
+timeout. Pages that fail to load are reported without recycling.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+
+import websockets
+
+logger = logging.getLogger(__name__)
+
+BROWSER_POOL_SIZE = 4
+BROWSER_MAX_FETCHES = 100
+BROWSER_START_TIMEOUT = 5.0
+# A browser that can't dispose of a context this fast is treated as hung
+BROWSER_DISPOSE_TIMEOUT = 2.0
+
+# Rendered text of the page; CDP has no standard markdown export
+_READ_TEXT = (
+    "document.body ? document.body.innerText : document.documentElement.textContent"
+)
+
+
+class BrowserError(Exception):
+    """The browser process or protocol failed; the browser is recycled."""
+
+
+class PageLoadError(Exception):
+    """The page itself could not be loaded (DNS, TLS, HTTP errors)."""
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _CDPSession:
+    """Minimal CDP client over one websocket: commands and awaited events."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self._next_id = 0
+        self._events: list[dict] = []
+
+    async def _receive(self) -> dict:
+        message = json.loads(await self.ws.recv())
+        if "method" in message:
+            self._events.append(message)
+        return message
+
+    async def send(
+        self, method: str, params: dict | None = None, session_id: str | None = None
+    ) -> dict:
+        self._next_id += 1
+        command_id = self._next_id
+        command: dict = {"id": command_id, "method": method, "params": params or {}}
+        if session_id:
+            command["sessionId"] = session_id
+        await self.ws.send(json.dumps(command))
+        while True:
+            message = await self._receive()
+            if message.get("id") == command_id:
+                if "error" in message:
+                    raise BrowserError(
+                        f"{method}: {message['error'].get('message', 'CDP error')}"
+                    )
+                return message.get("result", {})
+
+    async def wait_for_event(self, method: str, session_id: str) -> dict:
+        while True:
+            for event in self._events:
+                if event["method"] == method and event.get("sessionId") == session_id:
+                    self._events.remove(event)
+                    return event
+            await self._receive()
+
+
+class PooledBrowser:
+    """One `lightpanda serve` process, started on first use."""
+
+    def __init__(self, http_timeout: float):
+        self.http_timeout = http_timeout
+        self.fetches = 0
+        self._proc: asyncio.subprocess.Process | None = None
+        self._port: int | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    async def start(self) -> None:
+        self._port = _free_port()
+        self._proc = await asyncio.create_subprocess_exec(
+            "lightpanda",
+            "serve",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(self._port),
+            "--http_timeout",
+            str(int(self.http_timeout * 1000)),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self.fetches = 0
+        deadline = asyncio.get_running_loop().time() + BROWSER_START_TIMEOUT
+        while True:
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", self._port)
+                writer.close()
+                await writer.wait_closed()
+                return
+            except OSError:
+                if not self.running or asyncio.get_running_loop().time() > deadline:
+                    await self.stop()
+                    raise BrowserError("Browser did not start") from None
+                await asyncio.sleep(0.05)
+
+    async def stop(self) -> None:
+        if self._proc is None:
+            return
+        if self._proc.returncode is None:
+            self._proc.kill()
+        await self._proc.wait()
+        self._proc = None
+
+    async def read_text(self, url: str) -> str:
+        """Render url in a fresh browser context and return its text."""
+        if not self.running:
+            await self.start()
+        self.fetches += 1
+        async with websockets.connect(
+            f"ws://127.0.0.1:{self._port}/", max_size=None, close_timeout=1
+        ) as ws:
+            cdp = _CDPSession(ws)
+            context = await cdp.send("Target.createBrowserContext")
+            context_id = context["browserContextId"]
+            cancelled = False
+            try:
+                target = await cdp.send(
+                    "Target.createTarget",
+                    {"url": "about:blank", "browserContextId": context_id},
+                )
+                attached = await cdp.send(
+                    "Target.attachToTarget",
+                    {"targetId": target["targetId"], "flatten": True},
+                )
+                session_id = attached["sessionId"]
+                await cdp.send("Page.enable", session_id=session_id)
+                navigation = await cdp.send(
+                    "Page.navigate", {"url": url}, session_id=session_id
+                )
+                if navigation.get("errorText"):
+                    raise PageLoadError(navigation["errorText"])
+                await cdp.wait_for_event("Page.loadEventFired", session_id)
+                evaluated = await cdp.send(
+                    "Runtime.evaluate",
+                    {"expression": _READ_TEXT, "returnByValue": True},
+                    session_id=session_id,
+                )
+                return evaluated.get("result", {}).get("value") or ""
+            except asyncio.CancelledError:
+                # Timed out: the pool stops this browser, so don't wait on it
+                cancelled = True
+                raise
+            finally:
+                if not cancelled:
+                    await asyncio.wait_for(
+                        cdp.send(
+                            "Target.disposeBrowserContext",
+                            {"browserContextId": context_id},
+                        ),
+                        timeout=BROWSER_DISPOSE_TIMEOUT,
+                    )
+
+
+class BrowserPool:
+    """Bounded set of PooledBrowsers; fetches wait for a free one."""
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_fetches: int = BROWSER_MAX_FETCHES,
+        http_timeout: float = 15.0,
+    ):
+        self.size = size
+        self.max_fetches = max_fetches
+        self._browsers = [PooledBrowser(http_timeout) for _ in range(size)]
+        self._idle: asyncio.Queue[PooledBrowser] = asyncio.Queue()
+        for browser in self._browsers:
+            self._idle.put_nowait(browser)
+
+    @classmethod
+    def from_env(cls, http_timeout: float = 15.0) -> "BrowserPool | None":
+        """Build from BROWSER_POOL_SIZE / BROWSER_MAX_FETCHES; None when size is 0."""
+        size = int(os.environ.get("BROWSER_POOL_SIZE", BROWSER_POOL_SIZE))
+        if size <= 0:
+            return None
+        return cls(
+            size=size,
+            max_fetches=int(os.environ.get("BROWSER_MAX_FETCHES", BROWSER_MAX_FETCHES)),
+            http_timeout=http_timeout,
+        )
+
+    async def read_text(self, url: str, timeout: float) -> str:
+        """Render url on a pooled browser.
+
+        Raises PageLoadError when the page fails to load, and BrowserError
+        (after recycling the browser) when the browser itself misbehaves.
+        """
+        browser = await self._idle.get()
+        try:
+            return await asyncio.wait_for(browser.read_text(url), timeout=timeout)
+        except PageLoadError:
+            raise
+        except (
+            BrowserError,
+            OSError,
+            TimeoutError,
+            websockets.WebSocketException,
+        ) as e:
+            logger.warning(f"Recycling browser after failed fetch of {url}: {e!r}")
+            await browser.stop()
+            raise BrowserError(str(e) or type(e).__name__) from e
+        finally:
+            if browser.running and browser.fetches >= self.max_fetches:
+                await browser.stop()
+            self._idle.put_nowait(browser)
+
+    async def aclose(self) -> None:
+        for browser in self._browsers:
+            await browser.stop()
@@ -0,0 +1,162 @@
+"""Caches for upstream tool results shared across agent runs.
+
+Forks of a popular monitor often run the same search within minutes of each
+other. Results are cached per tool and normalized query for a short TTL in a
+bounded in-process LRU, and shared through Redis when SEARCH_CACHE_REDIS_URL
+is set (requires the optional `redis` package). Concurrent identical lookups
+in one process share a single upstream call. Errors are never cached.
+
+fetch_url uses a second, longer-lived instance (FETCH_CACHE_*) for page
+content and validators; see tools._fetch_with_cache.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # Optional; only needed to share the cache across replicas
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_TTL_SECONDS = 600
+SEARCH_CACHE_MAX_ENTRIES = 1000
+# Long enough to span the gap between runs of a daily or weekly monitor
+FETCH_CACHE_TTL_SECONDS = 8 * 24 * 3600
+FETCH_CACHE_MAX_ENTRIES = 2000
+REDIS_KEY_PREFIX = "agent-cache"
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query."""
+    return " ".join(query.casefold().split())
+
+
+class ToolResultCache:
+    """(tool, key) -> JSON result, with a TTL, an LRU bound and optional Redis."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = SEARCH_CACHE_TTL_SECONDS,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+        redis_client=None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self._local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def from_env(
+        cls,
+        prefix: str = "SEARCH_CACHE",
+        ttl_seconds: float = SEARCH_CACHE_TTL_SECONDS,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+    ) -> "ToolResultCache":
+        """Build from {prefix}_* env vars. A TTL of 0 disables caching."""
+        redis_client = None
+        redis_url = os.environ.get(f"{prefix}_REDIS_URL")
+        if redis_url:
+            if redis is None:
+                logger.warning(
+                    f"{prefix}_REDIS_URL set but the redis package is not installed; "
+                    "results are cached per process only"
+                )
+            else:
+                redis_client = redis.from_url(redis_url, decode_responses=True)
+        return cls(
+            ttl_seconds=float(os.environ.get(f"{prefix}_TTL_SECONDS", ttl_seconds)),
+            max_entries=int(os.environ.get(f"{prefix}_MAX_ENTRIES", max_entries)),
+            redis_client=redis_client,
+        )
+
+    @staticmethod
+    def make_key(tool: str, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return f"{tool}:{digest}"
+
+    async def get(self, cache_key: str) -> str | None:
+        entry = self._local.get(cache_key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._local.move_to_end(cache_key)
+                return entry[1]
+            del self._local[cache_key]
+
+        if self.redis is not None:
+            try:
+                value = await self.redis.get(f"{REDIS_KEY_PREFIX}:{cache_key}")
+            except Exception:
+                logger.debug("Redis cache read failed", exc_info=True)
+                return None
+            if value is not None:
+                self._put_local(cache_key, value)
+            return value
+        return None
+
+    async def set(self, cache_key: str, value: str) -> None:
+        self._put_local(cache_key, value)
+        if self.redis is not None:
+            try:
+                await self.redis.set(
+                    f"{REDIS_KEY_PREFIX}:{cache_key}",
+                    value,
+                    ex=max(1, int(self.ttl_seconds)),
+                )
+            except Exception:
+                logger.debug("Redis cache write failed", exc_info=True)
+
+    def _put_local(self, cache_key: str, value: str) -> None:
+        self._local[cache_key] = (time.monotonic() + self.ttl_seconds, value)
+        self._local.move_to_end(cache_key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def get_or_set(
+        self, tool: str, key: str, build: Callable[[], Awaitable[str]]
+    ) -> str:
+        """Return the cached result for (tool, key), or build, cache and return it."""
+        if self.ttl_seconds <= 0:
+            return await build()
+        cache_key = self.make_key(tool, key)
+        value = await self.get(cache_key)
+        if value is not None:
+            return value
+
+        # One upstream call for concurrent identical lookups
+        while (in_flight := self._in_flight.get(cache_key)) is not None:
+            try:
+                # Shielded, so a cancelled follower doesn't cancel the shared build
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The leader was cancelled; take over (or follow the next leader)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[cache_key] = future
+        try:
+            value = await build()
+            await self.set(cache_key, value)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        except BaseException:
+            future.cancel()  # Followers retry rather than inherit our cancellation
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._in_flight[cache_key]
+
+    async def aclose(self) -> None:
+        if self.redis is not None:
+            await self.redis.aclose()
@@ -11,6 +11,9 @@ from parallel import AsyncParallel
 from perplexity import AsyncPerplexity
 from pydantic import BaseModel, ConfigDict, Field
 
+from browser import BrowserPool
+from cache import FETCH_CACHE_MAX_ENTRIES, FETCH_CACHE_TTL_SECONDS, ToolResultCache
+
 DEFAULT_MODEL = "google-gla:gemini-3.1-flash-lite-preview"
 
 
@@ -79,11 +82,23 @@ class Clients:
     perplexity: AsyncPerplexity
     mem0: AsyncMemoryClient
     twitter: httpx.AsyncClient
+    # Fetches pages for fetch_url revalidation; never follows redirects
+    web: httpx.AsyncClient
+    # Warm Lightpanda browsers for fetch_url (None when BROWSER_POOL_SIZE=0)
+    browser_pool: BrowserPool | None
+    # Search results and fetched pages shared across runs (see cache.py)
+    search_cache: ToolResultCache
+    fetch_cache: ToolResultCache
 
 
 @asynccontextmanager
 async def create_clients() -> AsyncIterator[Clients]:
     """Create and manage async HTTP client lifecycles."""
+    search_cache = ToolResultCache.from_env()
+    fetch_cache = ToolResultCache.from_env(
+        "FETCH_CACHE", FETCH_CACHE_TTL_SECONDS, FETCH_CACHE_MAX_ENTRIES
+    )
+    browser_pool = BrowserPool.from_env()
     async with (
         AsyncParallel() as parallel,
         AsyncPerplexity() as perplexity,
@@ -93,10 +108,24 @@ async def create_clients() -> AsyncIterator[Clients]:
             headers={"X-API-Key": os.environ["TWITTERIO_API_KEY"]},
             timeout=15,
         ) as twitter,
+        httpx.AsyncClient(timeout=15, follow_redirects=False) as web,
     ):
-        yield Clients(
-            parallel=parallel, perplexity=perplexity, mem0=mem0, twitter=twitter
-        )
+        try:
+            yield Clients(
+                parallel=parallel,
+                perplexity=perplexity,
+                mem0=mem0,
+                twitter=twitter,
+                web=web,
+                browser_pool=browser_pool,
+                search_cache=search_cache,
+                fetch_cache=fetch_cache,
+            )
+        finally:
+            await search_cache.aclose()
+            await fetch_cache.aclose()
+            if browser_pool is not None:
+                await browser_pool.aclose()
 
 
 class MonitoringDeps(BaseModel):
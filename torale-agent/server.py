@@ -314,7 +314,7 @@ agent_card = AgentCard(
     version="0.1.0",
     default_input_modes=["text"],
     default_output_modes=["text"],
-    capabilities=AgentCapabilities(),
+    capabilities=AgentCapabilities(streaming=True),
     skills=[],
 )
 
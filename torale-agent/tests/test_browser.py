@@ -0,0 +1,223 @@
+"""Tests for the Lightpanda browser pool (browser.BrowserPool, PooledBrowser)."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+import browser
+from browser import BrowserError, BrowserPool, PageLoadError, PooledBrowser
+
+
+class FakeBrowser:
+    """Stands in for PooledBrowser; read_text behaviour is set per test."""
+
+    def __init__(self):
+        self.fetches = 0
+        self.stops = 0
+        self.started = True
+        self.active = 0
+        self.max_active = 0
+        self.fail_with: Exception | None = None
+        self.delay = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self.started
+
+    async def stop(self) -> None:
+        self.stops += 1
+        self.started = False
+
+    async def read_text(self, url: str) -> str:
+        if not self.started:
+            self.started = True  # Restarted, like PooledBrowser.start
+            self.fetches = 0
+        self.fetches += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_with is not None:
+                raise self.fail_with
+            return f"text of {url}"
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def fake_browsers():
+    browsers: list[FakeBrowser] = []
+
+    def make(http_timeout: float) -> FakeBrowser:
+        browsers.append(FakeBrowser())
+        return browsers[-1]
+
+    with patch("browser.PooledBrowser", make):
+        yield browsers
+
+
+class TestBrowserPool:
+    def test_browser_restarted_after_max_fetches(self, fake_browsers):
+        pool = BrowserPool(size=1, max_fetches=2)
+
+        async def run():
+            return [
+                await pool.read_text(f"https://example.com/{i}", timeout=1)
+                for i in range(3)
+            ]
+
+        assert asyncio.run(run())[-1] == "text of https://example.com/2"
+        # Stopped after its second fetch, restarted for the third
+        (only,) = fake_browsers
+        assert only.stops == 1
+
+    def test_fetches_beyond_pool_size_wait_for_a_browser(self, fake_browsers):
+        pool = BrowserPool(size=2, max_fetches=100)
+        for fake in fake_browsers:
+            fake.delay = 0.01
+
+        async def run():
+            return await asyncio.gather(
+                *(
+                    pool.read_text(f"https://example.com/{i}", timeout=1)
+                    for i in range(6)
+                )
+            )
+
+        assert len(asyncio.run(run())) == 6
+        assert [fake.max_active for fake in fake_browsers] == [1, 1]
+        assert sum(fake.fetches for fake in fake_browsers) == 6
+
+    def test_browser_failure_recycles_and_raises_browser_error(self, fake_browsers):
+        pool = BrowserPool(size=1, max_fetches=100)
+        fake_browsers[0].fail_with = ConnectionResetError("gone")
+
+        async def run():
+            with pytest.raises(BrowserError):
+                await pool.read_text("https://example.com/", timeout=1)
+            fake_browsers[0].fail_with = None
+            return await pool.read_text("https://example.com/", timeout=1)
+
+        assert asyncio.run(run()) == "text of https://example.com/"
+        assert fake_browsers[0].stops == 1
+
+    def test_timeout_recycles_browser(self, fake_browsers):
+        pool = BrowserPool(size=1, max_fetches=100)
+        fake_browsers[0].delay = 1
+
+        async def run():
+            with pytest.raises(BrowserError):
+                await pool.read_text("https://example.com/", timeout=0.01)
+
+        asyncio.run(run())
+        assert fake_browsers[0].stops == 1
+        assert pool._idle.qsize() == 1
+
+    def test_page_load_error_keeps_browser(self, fake_browsers):
+        pool = BrowserPool(size=1, max_fetches=100)
+        fake_browsers[0].fail_with = PageLoadError("net::ERR_NAME_NOT_RESOLVED")
+
+        async def run():
+            with pytest.raises(PageLoadError):
+                await pool.read_text("https://nowhere.invalid/", timeout=1)
+
+        asyncio.run(run())
+        assert fake_browsers[0].stops == 0
+
+    def test_from_env_size_zero_disables_pool(self, monkeypatch):
+        monkeypatch.setenv("BROWSER_POOL_SIZE", "0")
+        assert BrowserPool.from_env() is None
+
+
+# Replies of a healthy browser to the commands read_text sends
+_CDP_RESULTS = {
+    "Target.createBrowserContext": {"browserContextId": "ctx-1"},
+    "Target.createTarget": {"targetId": "target-1"},
+    "Target.attachToTarget": {"sessionId": "session-1"},
+    "Page.navigate": {"frameId": "frame-1"},
+    "Runtime.evaluate": {"result": {"value": "Rendered text"}},
+}
+
+
+class FakeCDPSocket:
+    """Websocket to a fake browser that never answers the methods in `hang_on`."""
+
+    def __init__(self, hang_on: tuple[str, ...] = ()):
+        self.hang_on = hang_on
+        self.sent: list[str] = []
+        self._replies: asyncio.Queue = asyncio.Queue()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def send(self, raw: str) -> None:
+        command = json.loads(raw)
+        self.sent.append(command["method"])
+        if command["method"] in self.hang_on:
+            return
+        await self._replies.put(
+            {"id": command["id"], "result": _CDP_RESULTS.get(command["method"], {})}
+        )
+        if command["method"] == "Page.navigate":
+            await self._replies.put(
+                {"method": "Page.loadEventFired", "sessionId": "session-1"}
+            )
+
+    async def recv(self) -> str:
+        return json.dumps(await self._replies.get())
+
+
+@pytest.fixture
+def cdp_socket():
+    """Patch the browser to talk to a FakeCDPSocket without starting a process."""
+    sockets: list[FakeCDPSocket] = []
+
+    def connect(url, **kwargs):
+        return sockets[-1]
+
+    async def start(self):
+        self.fetches = 0
+
+    with (
+        patch("browser.websockets.connect", connect),
+        patch.object(PooledBrowser, "start", start),
+        patch.object(browser, "BROWSER_DISPOSE_TIMEOUT", 0.05),
+    ):
+        yield sockets
+
+
+class TestPooledBrowser:
+    def test_reads_text_and_disposes_context(self, cdp_socket):
+        async def run():
+            cdp_socket.append(FakeCDPSocket())
+            return await BrowserPool(size=1).read_text(
+                "https://example.com/", timeout=1
+            )
+
+        assert asyncio.run(run()) == "Rendered text"
+        assert cdp_socket[0].sent[-1] == "Target.disposeBrowserContext"
+
+    def test_timed_out_read_skips_dispose(self, cdp_socket):
+        async def run():
+            cdp_socket.append(FakeCDPSocket(hang_on=("Runtime.evaluate",)))
+            pool = BrowserPool(size=1)
+            started = asyncio.get_running_loop().time()
+            with pytest.raises(BrowserError):
+                await pool.read_text("https://example.com/", timeout=0.05)
+            return asyncio.get_running_loop().time() - started
+
+        assert asyncio.run(run()) < 0.5
+        assert "Target.disposeBrowserContext" not in cdp_socket[0].sent
+
+    def test_hung_dispose_bounded_and_recycles(self, cdp_socket):
+        async def run():
+            cdp_socket.append(FakeCDPSocket(hang_on=("Target.disposeBrowserContext",)))
+            with pytest.raises(BrowserError):
+                await BrowserPool(size=1).read_text("https://example.com/", timeout=5)
+
+        asyncio.run(run())
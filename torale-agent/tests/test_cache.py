@@ -0,0 +1,150 @@
+"""Tests for the shared tool result cache (cache.ToolResultCache)."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from cache import ToolResultCache, normalize_query
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch("cache.time.monotonic", fake):
+        yield fake
+
+
+def _counting_build(value: str = "result", delay: float = 0):
+    calls = []
+
+    async def build() -> str:
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return f"{value}-{len(calls)}"
+
+    return build, calls
+
+
+def test_normalize_query_ignores_case_and_whitespace():
+    assert normalize_query("  iPhone   17\trelease ") == "iphone 17 release"
+
+
+class TestTTLAndLRU:
+    def test_hit_within_ttl_then_rebuilt_after_expiry(self, clock):
+        cache = ToolResultCache(ttl_seconds=60, max_entries=10)
+        build, calls = _counting_build()
+
+        async def run():
+            first = await cache.get_or_set("search", "q", build)
+            clock.now += 59
+            second = await cache.get_or_set("search", "q", build)
+            clock.now += 2
+            third = await cache.get_or_set("search", "q", build)
+            return first, second, third
+
+        assert asyncio.run(run()) == ("result-1", "result-1", "result-2")
+        assert len(calls) == 2
+
+    def test_least_recently_used_entry_evicted(self, clock):
+        cache = ToolResultCache(ttl_seconds=60, max_entries=2)
+        a, b, c = (ToolResultCache.make_key("search", k) for k in "abc")
+
+        async def run():
+            await cache.set(a, "A")
+            await cache.set(b, "B")
+            await cache.get(a)  # a is now the most recently used
+            await cache.set(c, "C")
+            return await cache.get(a), await cache.get(b), await cache.get(c)
+
+        assert asyncio.run(run()) == ("A", None, "C")
+
+    def test_zero_ttl_disables_caching(self, clock):
+        cache = ToolResultCache(ttl_seconds=0, max_entries=10)
+        build, calls = _counting_build()
+
+        async def run():
+            await cache.get_or_set("search", "q", build)
+            await cache.get_or_set("search", "q", build)
+
+        asyncio.run(run())
+        assert len(calls) == 2
+
+
+class TestInFlight:
+    def test_concurrent_lookups_share_one_build(self):
+        cache = ToolResultCache(ttl_seconds=60, max_entries=10)
+        build, calls = _counting_build(delay=0.01)
+
+        async def run():
+            return await asyncio.gather(
+                *(cache.get_or_set("search", "q", build) for _ in range(5))
+            )
+
+        assert asyncio.run(run()) == ["result-1"] * 5
+        assert len(calls) == 1
+
+    def test_errors_reach_followers_and_are_not_cached(self):
+        cache = ToolResultCache(ttl_seconds=60, max_entries=10)
+        attempts = []
+
+        async def failing() -> str:
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        async def run():
+            results = await asyncio.gather(
+                *(cache.get_or_set("search", "q", failing) for _ in range(3)),
+                return_exceptions=True,
+            )
+            retry = await cache.get_or_set("search", "q", _counting_build()[0])
+            return results, retry
+
+        results, retry = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert len(attempts) == 1
+        assert retry == "result-1"
+
+    def test_cancelled_leader_hands_build_to_followers(self):
+        cache = ToolResultCache(ttl_seconds=60, max_entries=10)
+        build, calls = _counting_build(delay=0.05)
+
+        async def run():
+            leader = asyncio.create_task(cache.get_or_set("search", "q", build))
+            await asyncio.sleep(0)
+            followers = [
+                asyncio.create_task(cache.get_or_set("search", "q", build))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await asyncio.gather(*followers)
+
+        assert asyncio.run(run()) == ["result-2"] * 3
+        assert len(calls) == 2
+
+    def test_cancelled_follower_leaves_build_running(self):
+        cache = ToolResultCache(ttl_seconds=60, max_entries=10)
+        build, calls = _counting_build(delay=0.05)
+
+        async def run():
+            leader = asyncio.create_task(cache.get_or_set("search", "q", build))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(cache.get_or_set("search", "q", build))
+            await asyncio.sleep(0.01)
+            follower.cancel()
+            return await leader
+
+        assert asyncio.run(run()) == "result-1"
+        assert len(calls) == 1
@@ -0,0 +1,198 @@
+"""Tests for fetch_url page caching and revalidation (tools._fetch_with_cache)."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+pytest.importorskip("pydantic_ai")
+
+import tools
+from cache import ToolResultCache
+
+URL = "https://example.com/page"
+
+
+class FakeSite:
+    """An origin serving one HTML body (with an ETag) and a renderer for it."""
+
+    def __init__(self):
+        self.body = b"<html>v1</html>"
+        self.etag: str | None = '"v1"'
+        self.rendered = "Price: $10"
+        self.format = "text"
+        self.renders = 0
+        self.requests = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        headers = {"etag": self.etag} if self.etag else {}
+        if self.etag and request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, headers=headers, content=self.body)
+
+    async def render(self, url, browser_pool=None) -> dict:
+        self.renders += 1
+        return tools._page_result(url, self.rendered, self.format)
+
+
+@pytest.fixture
+def site():
+    site = FakeSite()
+    with (
+        patch("tools._is_safe_url", AsyncMock(return_value=True)),
+        patch("tools._render_page", side_effect=site.render),
+        patch("tools.time.time", return_value=1_000_000.0) as clock,
+    ):
+        site.clock = clock
+        yield site
+
+
+@pytest.fixture
+def fetch(site):
+    """fetch(task_id, include_unchanged) through one shared page cache; the clock
+    advances a minute per call."""
+    cache = ToolResultCache(ttl_seconds=30 * 24 * 3600, max_entries=100)
+
+    async def run(task_id, include_unchanged):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(site.handle)) as web:
+            clients = SimpleNamespace(web=web, browser_pool=None, fetch_cache=cache)
+            return await tools._fetch_with_cache(
+                clients, task_id, URL, include_unchanged
+            )
+
+    def fetch(task_id="t1", include_unchanged=False):
+        result = asyncio.run(run(task_id, include_unchanged))
+        site.clock.return_value += 60
+        return result
+
+    return fetch
+
+
+class TestChangedSinceLastRun:
+    def test_unchanged_content_omitted_per_task(self, fetch):
+        first = fetch("t1")
+        second = fetch("t1")
+        other_task = fetch("t2")
+        included = fetch("t1", include_unchanged=True)
+
+        assert first["changed_since_last_run"] is None
+        assert first["content"] == "Price: $10"
+        assert second["changed_since_last_run"] is False
+        assert second["content"] is None
+        assert "include_unchanged" in second["note"]
+        assert other_task["changed_since_last_run"] is None  # t2's first fetch
+        assert included["changed_since_last_run"] is False
+        assert included["content"] == "Price: $10"
+
+    def test_changed_page_rerendered_and_reported(self, site, fetch):
+        fetch()
+        site.body, site.etag, site.rendered = b"<html>v2</html>", '"v2"', "Price: $12"
+
+        result = fetch()
+
+        assert site.renders == 2
+        assert result["changed_since_last_run"] is True
+        assert result["content"] == "Price: $12"
+
+
+class TestRevalidation:
+    def test_static_page_reused_after_confirming_render(self, site, fetch):
+        for _ in range(4):
+            fetch()
+
+        # First render, then one re-render of the unchanged HTML confirms the
+        # page is static; later 304s reuse the stored render
+        assert site.renders == 2
+        assert site.requests == 4
+
+    def test_identical_body_without_validators_counts_as_unchanged(self, site, fetch):
+        site.etag = None
+        for _ in range(3):
+            fetch()
+
+        assert site.renders == 2
+
+    def test_script_rendered_page_rerendered_while_html_unchanged(self, site, fetch):
+        results = []
+        for price in (10, 11, 12):
+            site.rendered = f"Price: ${price}"
+            results.append(fetch())
+
+        assert site.renders == 3
+        assert [r["changed_since_last_run"] for r in results] == [None, True, True]
+        assert results[-1]["content"] == "Price: $12"
+
+    def test_reuse_capped_by_render_age(self, site, fetch):
+        for _ in range(3):  # render, confirm static, reuse
+            fetch()
+        assert site.renders == 2
+
+        site.clock.return_value += tools.FETCH_REUSE_MAX_AGE_SECONDS
+        fetch()
+        fetch()
+
+        # Re-rendered once the stored render aged out, then reused again
+        assert site.renders == 3
+
+    def test_render_errors_are_not_cached(self, site, fetch):
+        async def failing_render(url, browser_pool=None):
+            site.renders += 1
+            return {"url": url, "error": "Fetch timed out"}
+
+        with patch("tools._render_page", side_effect=failing_render):
+            results = [fetch(), fetch()]
+
+        assert [r["error"] for r in results] == ["Fetch timed out"] * 2
+        assert site.renders == 2
+
+    def test_format_switch_not_reported_as_change(self, site, fetch):
+        fetch()
+        site.format, site.rendered = "markdown", "**Price:** $10"
+
+        result = fetch()
+
+        assert result["format"] == "markdown"
+        assert result["changed_since_last_run"] is None
+
+
+class FakeProcess:
+    returncode = 0
+
+    async def communicate(self):
+        return b"# Title\n\nBody", b""
+
+
+class TestRenderPage:
+    def test_pooled_browser_returns_text(self):
+        pool = AsyncMock()
+        pool.read_text.return_value = "Title\nBody"
+
+        result = asyncio.run(tools._render_page(URL, pool))
+
+        assert (result["content"], result["format"]) == ("Title\nBody", "text")
+
+    def test_browser_failure_falls_back_to_one_off_fetch(self):
+        pool = AsyncMock()
+        pool.read_text.side_effect = tools.BrowserError("crashed")
+
+        with patch(
+            "tools.asyncio.create_subprocess_exec",
+            AsyncMock(return_value=FakeProcess()),
+        ) as spawn:
+            result = asyncio.run(tools._render_page(URL, pool))
+
+        assert (result["content"], result["format"]) == ("# Title\nBody", "markdown")
+        assert spawn.call_args.args[:4] == ("lightpanda", "fetch", "--dump", "markdown")
+
+    def test_page_load_error_reported_without_fallback(self):
+        pool = AsyncMock()
+        pool.read_text.side_effect = tools.PageLoadError("net::ERR_NAME_NOT_RESOLVED")
+
+        with patch("tools.asyncio.create_subprocess_exec") as spawn:
+            result = asyncio.run(tools._render_page(URL, pool))
+
+        assert result == {"url": URL, "error": "net::ERR_NAME_NOT_RESOLVED"}
+        spawn.assert_not_called()
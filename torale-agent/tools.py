@@ -1,8 +1,10 @@
 """Agent tool definitions: search, memory, fetch, and activity extraction."""
 
 import asyncio
+import hashlib
 import json
 import socket
+import time
 from ipaddress import ip_address
 from urllib.parse import urlparse
 
@@ -10,6 +12,8 @@ import httpx
 from pydantic_ai import Agent, RunContext
 from pydantic_ai.messages import ModelResponse, ToolCallPart
 
+from browser import BrowserError, BrowserPool, PageLoadError
+from cache import normalize_query
 from models import ActivityStep, Clients, MonitoringDeps, MonitoringResponse
 
 _NO_CLIENTS = json.dumps({"error": "No context available"})
@@ -27,6 +31,10 @@ PARALLEL_SEARCH_MAX_EXCERPTS = 2
 
 FETCH_MAX_CHARS = 5000
 FETCH_TIMEOUT = 15.0
+# Larger pages are not hashed for revalidation; they always re-render
+FETCH_PROBE_MAX_BYTES = 5_000_000
+# Even an unchanged static page is re-rendered once its stored render is this old
+FETCH_REUSE_MAX_AGE_SECONDS = 3 * 24 * 3600
 
 TWITTER_SEARCH_MAX_RESULTS = 10
 
@@ -80,9 +88,26 @@ async def _is_safe_url(url: str) -> bool:
 
 
 async def _fetch_and_extract(url: str) -> dict:
-    """Fetch a URL using Lightpanda headless browser and return content as markdown."""
+    """Fetch a URL using Lightpanda headless browser and return its content."""
     if not await _is_safe_url(url):
         return {"url": url, "error": "URL blocked: private or internal address"}
+    return await _render_page(url)
+
+
+async def _render_page(url: str, browser_pool: BrowserPool | None = None) -> dict:
+    """Render a page on a pooled browser, or a one-off Lightpanda fetch.
+
+    Pooled browsers return the page's rendered text and one-off fetches
+    return markdown; the result's "format" says which.
+    """
+    if browser_pool is not None:
+        try:
+            text = await browser_pool.read_text(url, timeout=FETCH_TIMEOUT + 5)
+            return _page_result(url, text, "text")
+        except PageLoadError as e:
+            return {"url": url, "error": str(e)}
+        except BrowserError:
+            pass  # Browser recycled; fall back to a one-off fetch
 
     proc = await asyncio.create_subprocess_exec(
         "lightpanda",
@@ -112,7 +137,10 @@ async def _fetch_and_extract(url: str) -> dict:
         )
         return {"url": url, "error": error_msg}
 
-    content = stdout.decode()
+    return _page_result(url, stdout.decode(), "markdown")
+
+
+def _page_result(url: str, content: str, content_format: str) -> dict:
     content = "\n".join(line for line in content.splitlines() if line.strip())
 
     full_length = len(content)
@@ -121,11 +149,129 @@ async def _fetch_and_extract(url: str) -> dict:
     return {
         "url": url,
         "content": content[:FETCH_MAX_CHARS],
+        "format": content_format,
         "content_length": full_length,
         "truncated": truncated,
     }
 
 
+async def _probe_page(
+    web: httpx.AsyncClient, url: str, cached: dict | None
+) -> dict | None:
+    """GET a page (conditionally, given cached validators) and return its validators.
+
+    Returns {"not_modified", "etag", "last_modified", "body_hash"}, or None when
+    the response can't be used to revalidate (error, redirect, oversized body).
+    """
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    try:
+        async with web.stream("GET", url, headers=headers) as resp:
+            if resp.status_code == 304 and cached:
+                return {
+                    "not_modified": True,
+                    "etag": resp.headers.get("etag", cached.get("etag")),
+                    "last_modified": resp.headers.get(
+                        "last-modified", cached.get("last_modified")
+                    ),
+                    "body_hash": cached.get("body_hash"),
+                }
+            if resp.status_code != 200:
+                return None
+            digest = hashlib.sha256()
+            size = 0
+            async for chunk in resp.aiter_bytes():
+                size += len(chunk)
+                if size > FETCH_PROBE_MAX_BYTES:
+                    return None
+                digest.update(chunk)
+            return {
+                "not_modified": False,
+                "etag": resp.headers.get("etag"),
+                "last_modified": resp.headers.get("last-modified"),
+                "body_hash": digest.hexdigest(),
+            }
+    except httpx.HTTPError:
+        return None
+
+
+async def _fetch_with_cache(
+    clients: Clients, task_id: str, url: str, include_unchanged: bool
+) -> dict:
+    """fetch_url through clients.fetch_cache.
+
+    A cached page is revalidated with a plain conditional GET. The response
+    only describes the raw HTML, and a script-rendered page can change while
+    its HTML shell stays the same, so a 304 or identical body reuses the
+    stored render only for pages marked static: ones whose render came out
+    identical when re-rendered from an unchanged body. Unconfirmed pages are
+    re-rendered, which is also how they get confirmed, and a stored render is
+    never reused past FETCH_REUSE_MAX_AGE_SECONDS. changed_since_last_run
+    compares the content with what this task saw on its previous fetch of the
+    URL in the same format (null when it has none); unchanged content is left
+    out unless include_unchanged is set, to save tokens.
+    """
+    if not await _is_safe_url(url):
+        return {"url": url, "error": "URL blocked: private or internal address"}
+    cache = clients.fetch_cache
+    if cache.ttl_seconds <= 0:
+        return await _render_page(url, clients.browser_pool)
+
+    page_key = cache.make_key("fetch_url", url)
+    raw = await cache.get(page_key)
+    cached = json.loads(raw) if raw else None
+
+    if cached is None:
+        # Capture validators alongside the first render, not before it
+        probe, result = await asyncio.gather(
+            _probe_page(clients.web, url, None),
+            _render_page(url, clients.browser_pool),
+        )
+        entry = {"static": False}
+    else:
+        probe = await _probe_page(clients.web, url, cached)
+        body_unchanged = bool(probe) and (
+            probe["not_modified"] or probe["body_hash"] == cached.get("body_hash")
+        )
+        if (
+            body_unchanged
+            and cached.get("static")
+            and time.time() - cached.get("rendered_at", 0) < FETCH_REUSE_MAX_AGE_SECONDS
+        ):
+            result = cached["result"]
+            entry = {"static": True, "rendered_at": cached["rendered_at"]}
+        else:
+            result = await _render_page(url, clients.browser_pool)
+            # Static once the same HTML renders to the same content twice
+            entry = {
+                "static": body_unchanged
+                and result.get("content") == cached["result"]["content"]
+            }
+    if "error" in result:
+        return result
+    entry.setdefault("rendered_at", time.time())
+    await cache.set(page_key, json.dumps({**(probe or {}), **entry, "result": result}))
+
+    # Tracked per format, so switching render paths isn't reported as a change
+    content_hash = hashlib.sha256(result["content"].encode()).hexdigest()
+    seen_key = cache.make_key("fetch_seen", f"{task_id}\n{url}\n{result.get('format')}")
+    previous_hash = await cache.get(seen_key)
+    await cache.set(seen_key, content_hash)
+
+    changed = None if previous_hash is None else previous_hash != content_hash
+    result = {**result, "changed_since_last_run": changed}
+    if changed is False and not include_unchanged:
+        result["content"] = None
+        result["note"] = (
+            "Unchanged since this monitor last fetched it; "
+            "call again with include_unchanged=true to read it"
+        )
+    return result
+
+
 def register_tools(agent: Agent[MonitoringDeps, MonitoringResponse]) -> None:
     """Attach monitoring tools (search_memories, add_memory, perplexity_search, parallel_search, fetch_url) to an agent."""
 
@@ -160,77 +306,103 @@ def register_tools(agent: Agent[MonitoringDeps, MonitoringResponse]) -> None:
         """Search the web using Perplexity for current information. Include the current year in queries for time-sensitive topics."""
         if (clients := _get_clients(ctx)) is None:
             return _NO_CLIENTS
-        response = await clients.perplexity.search.create(query=query)
-        results = [
-            {
-                "title": r.title,
-                "url": r.url,
-                "snippet": r.snippet,
-                "date": r.date,
-                "last_updated": r.last_updated,
-            }
-            for r in response.results
-        ]
-        return json.dumps(results)
+
+        async def search() -> str:
+            response = await clients.perplexity.search.create(query=query)
+            results = [
+                {
+                    "title": r.title,
+                    "url": r.url,
+                    "snippet": r.snippet,
+                    "date": r.date,
+                    "last_updated": r.last_updated,
+                }
+                for r in response.results
+            ]
+            return json.dumps(results)
+
+        return await clients.search_cache.get_or_set(
+            "perplexity_search", normalize_query(query), search
+        )
 
     @agent.tool
     async def parallel_search(ctx: RunContext[MonitoringDeps], query: str) -> str:
         """Search the web using Parallel for current information. Returns structured results with URLs, titles, and content excerpts. Often finds different authoritative sources than Perplexity."""
         if (clients := _get_clients(ctx)) is None:
             return _NO_CLIENTS
-        result = await clients.parallel.beta.search(
-            objective=query,
-            search_queries=[query],
-            max_results=PARALLEL_SEARCH_MAX_RESULTS,
-            max_chars_per_result=PARALLEL_SEARCH_MAX_CHARS,
-            betas=PARALLEL_SEARCH_BETAS,
+
+        async def search() -> str:
+            result = await clients.parallel.beta.search(
+                objective=query,
+                search_queries=[query],
+                max_results=PARALLEL_SEARCH_MAX_RESULTS,
+                max_chars_per_result=PARALLEL_SEARCH_MAX_CHARS,
+                betas=PARALLEL_SEARCH_BETAS,
+            )
+            results = [
+                {
+                    "title": r.title,
+                    "url": r.url,
+                    "excerpts": r.excerpts[:PARALLEL_SEARCH_MAX_EXCERPTS]
+                    if r.excerpts
+                    else [],
+                }
+                for r in (result.results or [])
+            ]
+            return json.dumps(results)
+
+        return await clients.search_cache.get_or_set(
+            "parallel_search", normalize_query(query), search
         )
-        results = [
-            {
-                "title": r.title,
-                "url": r.url,
-                "excerpts": r.excerpts[:PARALLEL_SEARCH_MAX_EXCERPTS]
-                if r.excerpts
-                else [],
-            }
-            for r in (result.results or [])
-        ]
-        return json.dumps(results)
 
     @agent.tool
     async def twitter_search(ctx: RunContext[MonitoringDeps], query: str) -> str:
         """Search Twitter/X for recent tweets. Best for real-time public reactions, social sentiment, and announcements posted on Twitter. Uses Twitter's advanced search syntax (e.g. 'from:user', 'min_faves:10')."""
         if (clients := _get_clients(ctx)) is None:
             return _NO_CLIENTS
-        try:
+
+        async def search() -> str:
             resp = await clients.twitter.get(
                 "/twitter/tweet/advanced_search",
                 params={"query": query, "queryType": "Latest"},
             )
             resp.raise_for_status()
             tweets = resp.json().get("tweets", [])
+            results = [
+                {
+                    "text": t.get("text", ""),
+                    "author": t.get("author", {}).get("userName", ""),
+                    "url": t.get("url", ""),
+                    "likes": t.get("likeCount", 0),
+                    "retweets": t.get("retweetCount", 0),
+                    "created_at": t.get("createdAt", ""),
+                }
+                for t in tweets[:TWITTER_SEARCH_MAX_RESULTS]
+            ]
+            return json.dumps(results)
+
+        # Only whitespace is normalized; advanced-search operators are case-sensitive
+        try:
+            return await clients.search_cache.get_or_set(
+                "twitter_search", " ".join(query.split()), search
+            )
         except httpx.HTTPStatusError as e:
             return json.dumps({"error": f"Twitter API error: {e.response.status_code}"})
         except json.JSONDecodeError:
             return json.dumps({"error": "Failed to decode response from Twitter API"})
-        results = [
-            {
-                "text": t.get("text", ""),
-                "author": t.get("author", {}).get("userName", ""),
-                "url": t.get("url", ""),
-                "likes": t.get("likeCount", 0),
-                "retweets": t.get("retweetCount", 0),
-                "created_at": t.get("createdAt", ""),
-            }
-            for t in tweets[:TWITTER_SEARCH_MAX_RESULTS]
-        ]
-        return json.dumps(results)
 
-    @agent.tool_plain
-    async def fetch_url(url: str) -> str:
-        """Fetch a URL directly and extract its content as markdown. Uses a headless browser, so JS-rendered pages work. Useful when search snippets are stale or you need to check the source."""
+    @agent.tool
+    async def fetch_url(
+        ctx: RunContext[MonitoringDeps], url: str, include_unchanged: bool = False
+    ) -> str:
+        """Fetch a URL directly and extract its readable content (plain text, or markdown; see format). Uses a headless browser, so JS-rendered pages work. Useful when search snippets are stale or you need to check the source. Reports changed_since_last_run; content of a page unchanged since this monitor's last fetch is omitted unless include_unchanged is true."""
         try:
-            result = await _fetch_and_extract(url)
+            if (clients := _get_clients(ctx)) is None:
+                result = await _fetch_and_extract(url)
+            else:
+                result = await _fetch_with_cache(
+                    clients, ctx.deps.task_id, url, include_unchanged
+                )
             return json.dumps(result)
         except Exception as e:
             return json.dumps({"url": url, "error": str(e)})